@@ -0,0 +1,119 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+"""Microbenchmark of event firing overhead, and of setting a group of bindables with and without batching their
+change notifications.
+
+Run from the project root with:
+
+    python -m benchmarks.events [--handlers 10] [--bindables 12] [--repeat 20]
+"""
+
+import argparse
+import timeit
+from typing import Tuple
+
+from opendrop.utility.bindable import VariableBindable, batch
+from opendrop.utility.events import Event
+
+
+class Handler:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def method(self) -> None:
+        self.calls += 1
+
+
+def bench_fire(num_handlers: int, repeat: int, **opts) -> float:
+    event = Event()
+    handlers = [Handler() for _ in range(num_handlers)]
+    for handler in handlers:
+        event.connect(handler.method, **opts)
+
+    number = 10000
+    best = min(timeit.repeat(event.fire, number=number, repeat=repeat))
+
+    return best/number
+
+
+def bench_set(num_bindables: int, num_handlers: int, repeat: int, batched: bool) -> Tuple[float, float]:
+    """Return the time taken to set every bindable, and the number of handler calls this made."""
+    bindables = [VariableBindable(0) for _ in range(num_bindables)]
+
+    # Each handler watches every bindable, like a graph or overview that recomputes when any value of an analysis
+    # changes.
+    handlers = [Handler() for _ in range(num_handlers)]
+    for bn in bindables:
+        for handler in handlers:
+            bn.on_changed.connect(handler.method)
+
+    value = 0
+
+    def set_all() -> None:
+        nonlocal value
+        value += 1
+        for bn in bindables:
+            bn.set(value)
+
+    def set_all_batched() -> None:
+        with batch():
+            set_all()
+
+    number = 1000
+    best = min(timeit.repeat(set_all_batched if batched else set_all, number=number, repeat=repeat))
+    calls = sum(handler.calls for handler in handlers) / (number * repeat)
+
+    return best/number, calls
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--handlers', type=int, default=10)
+    parser.add_argument('--bindables', type=int, default=12)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    print('Event.fire() with {} handlers, best of {} runs'.format(args.handlers, args.repeat))
+    print('{:<20} {:>12}'.format('Connection', 'Time (us)'))
+    for label, opts in (('weak_ref=True', dict(weak_ref=True)), ('weak_ref=False', dict(weak_ref=False))):
+        t = bench_fire(args.handlers, args.repeat, **opts)
+        print('{:<20} {:>12.2f}'.format(label, t*1e6))
+
+    print()
+    print('Setting {} bindables watched by {} handlers, best of {} runs'
+          .format(args.bindables, args.handlers, args.repeat))
+    print('{:<20} {:>12} {:>16}'.format('Mode', 'Time (us)', 'Handler calls'))
+    for label, batched in (('Unbatched', False), ('Batched', True)):
+        t, calls = bench_set(args.bindables, args.handlers, args.repeat, batched)
+        print('{:<20} {:>12.2f} {:>16.0f}'.format(label, t*1e6, calls))
+
+
+if __name__ == '__main__':
+    main()
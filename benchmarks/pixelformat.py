@@ -0,0 +1,118 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+"""Benchmark conversion of raw camera frames to 8-bit RGB for each supported PFNC pixel format, comparing against the
+previous floating point implementation.
+
+Run from the project root with:
+
+    python -m benchmarks.pixelformat [--width 2448] [--height 2048] [--repeat 20]
+"""
+
+import argparse
+import re
+import timeit
+
+import cv2
+import numpy as np
+
+from opendrop.utility.pixelformat import PixelFormatConverter, SUPPORTED_PIXEL_FORMATS
+
+_BAYER_CODES = {
+    'GR': cv2.COLOR_BayerGB2RGB,
+    'RG': cv2.COLOR_BayerBG2RGB,
+    'BG': cv2.COLOR_BayerRG2RGB,
+    'GB': cv2.COLOR_BayerGR2RGB,
+}
+
+
+def format_bits(data_format: str) -> int:
+    return int(re.search(r'\d+$', data_format).group())
+
+
+def format_channels(data_format: str) -> int:
+    return 3 if data_format.startswith(('RGB', 'BGR')) else 1
+
+
+def make_frame(data_format: str, width: int, height: int) -> np.ndarray:
+    bits = format_bits(data_format)
+    dtype = np.uint8 if bits == 8 else np.uint16
+    rng = np.random.RandomState(0)
+    return rng.randint(0, 2**bits, size=(height, width * format_channels(data_format))).astype(dtype)
+
+
+def legacy_convert(data_format: str, data: np.ndarray, width: int, height: int) -> np.ndarray:
+    bits = format_bits(data_format)
+
+    if data_format.startswith('Mono'):
+        image = cv2.cvtColor(data, cv2.COLOR_GRAY2RGB)
+    elif data_format.startswith('RGB'):
+        image = data.reshape(height, width, 3).copy()
+    elif data_format.startswith('BGR'):
+        image = cv2.cvtColor(data.reshape(height, width, 3), code=cv2.COLOR_BGR2RGB)
+    else:
+        image = cv2.cvtColor(data, code=_BAYER_CODES[data_format[5:7]])
+
+    if bits != 8:
+        image = (image/(2**bits - 1)*255).astype(np.uint8)
+
+    return image
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--width', type=int, default=2448)
+    parser.add_argument('--height', type=int, default=2048)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    converter = PixelFormatConverter()
+
+    print('{}x{} frames, best of {} runs'.format(args.width, args.height, args.repeat))
+    print('{:<12} {:>12} {:>12} {:>8}'.format('Format', 'Legacy (ms)', 'New (ms)', 'Speedup'))
+
+    for data_format in SUPPORTED_PIXEL_FORMATS:
+        data = make_frame(data_format, args.width, args.height)
+
+        legacy = min(timeit.repeat(
+            lambda: legacy_convert(data_format, data, args.width, args.height),
+            number=1,
+            repeat=args.repeat,
+        ))
+        new = min(timeit.repeat(
+            lambda: converter.convert(data_format, data, args.width, args.height),
+            number=1,
+            repeat=args.repeat,
+        ))
+
+        print('{:<12} {:>12.2f} {:>12.2f} {:>7.1f}x'.format(data_format, legacy*1e3, new*1e3, legacy/new))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+"""Benchmark saving contact angle analyses, comparing the serial export (every task run one after the other on the
+calling thread, like the old save_drops) against the pipelined ExportJob on a pool of worker processes.
+
+Run from the project root with:
+
+    python -m benchmarks.save_drops [--drops 200] [--width 1280] [--height 1024] [--workers N]
+"""
+
+import argparse
+import asyncio
+import functools
+import math
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Iterator, List
+
+import numpy as np
+
+from opendrop.app.common.analysis_saver.export_job import ExportJob
+from opendrop.app.conan.analysis_saver.save_functions import DropSnapshot, _save_individual, _save_summary
+from opendrop.utility.geometry import Line2, Rect2, Vector2
+
+
+def make_drop(i: int, width: int, height: int) -> DropSnapshot:
+    rng = np.random.RandomState(i)
+
+    drop = DropSnapshot.__new__(DropSnapshot)
+    drop.is_image_replicated = False
+    drop.image_timestamp = float(i)
+    drop.image = rng.randint(0, 256, size=(height, width, 3)).astype(np.uint8)
+
+    theta = np.linspace(0, math.pi, 2000)
+    drop.drop_profile_extract = np.column_stack((
+        width/2 - width/4 * np.cos(theta),
+        2*height/3 - height/4 * np.sin(theta),
+    )).astype(np.int32)
+    drop.drop_region = Rect2(position=(width/4, height/3), size=(width/2, height/3))
+    drop.surface_line = Line2(pt0=(0, 2*height/3), pt1=(width, 2*height/3))
+
+    drop.left_angle = drop.right_angle = math.pi/2
+    drop.left_point = Vector2(width/4, 2*height/3)
+    drop.right_point = Vector2(3*width/4, 2*height/3)
+    drop.left_tangent = np.poly1d((-1e3, 1e3*width/4 + 2*height/3))
+    drop.right_tangent = np.poly1d((1e3, -1e3*3*width/4 + 2*height/3))
+
+    return drop
+
+
+def make_tasks(drops: List[DropSnapshot], out_dir: Path) -> Iterator[Callable[[], None]]:
+    for i, drop in enumerate(drops):
+        yield functools.partial(_save_individual, drop, out_dir/'drop{}'.format(i))
+
+    yield functools.partial(_save_summary, drops, out_dir, ((10, 10), 300))
+
+
+def run_serial(drops: List[DropSnapshot], out_dir: Path) -> None:
+    for task in make_tasks(drops, out_dir):
+        task()
+
+
+def run_pooled(drops: List[DropSnapshot], out_dir: Path, max_workers: int) -> None:
+    loop = asyncio.new_event_loop()
+    try:
+        job = ExportJob(make_tasks(drops, out_dir), len(drops) + 1, max_workers=max_workers, loop=loop)
+        status = loop.run_until_complete(job.wait())
+    finally:
+        loop.close()
+
+    if status is not ExportJob.Status.FINISHED:
+        raise RuntimeError('Export {}'.format(status)) from job.exception
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--drops', type=int, default=200)
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=1024)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    drops = [make_drop(i, args.width, args.height) for i in range(args.drops)]
+
+    print('{} drops, {}x{} images'.format(args.drops, args.width, args.height))
+    print('{:<8} {:>10} {:>12}'.format('Mode', 'Time (s)', 'Drops/s'))
+
+    for name, run in (
+            ('Serial', run_serial),
+            ('Pooled', functools.partial(run_pooled, max_workers=args.workers)),
+    ):
+        with tempfile.TemporaryDirectory() as out_dir:
+            start = time.perf_counter()
+            run(drops, Path(out_dir))
+            elapsed = time.perf_counter() - start
+
+        print('{:<8} {:>10.2f} {:>12.1f}'.format(name, elapsed, args.drops/elapsed))
+
+
+if __name__ == '__main__':
+    main()
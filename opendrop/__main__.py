@@ -28,11 +28,17 @@
 
 
 import sys
-from opendrop.app import OpendropApplication
-from opendrop.appfw import Injector
 
 
 def main(*argv) -> int:
+    if len(argv) > 1 and argv[1] == 'batch':
+        # Headless mode, don't import any of the GUI.
+        from opendrop.batch import main as batch_main
+        return batch_main(argv[2:])
+
+    from opendrop.app import OpendropApplication
+    from opendrop.appfw import Injector
+
     injector = Injector()
     app = injector.create_object(OpendropApplication)
     return app.run(argv)
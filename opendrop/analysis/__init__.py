@@ -0,0 +1,44 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+"""Processing pipelines built on `opendrop.processing`, shared by the GUI and headless tools.
+
+Nothing in this package may import GTK (or anything else from `gi`), so that it can be imported by worker processes
+and on machines without a display. The functions here are run in process pools, so they and their parameter and
+result types must stay picklable."""
+
+from .conan import ConanAnalysisResult, ConanParams, conan_analyse, conan_results_to_array
+from .ift import (
+    PendantAnalysisResult,
+    PendantEdgeDetectionParams,
+    PendantPhysicalParams,
+    pendant_analyse,
+    pendant_results_to_array,
+)
+from .pipeline import FrameResult, Pipeline, PipelineError, conan_pipeline, ift_pipeline
@@ -0,0 +1,70 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+"""The result cache shared by the analysis services, see `default_cache()`."""
+
+import functools
+import os
+import sys
+from pathlib import Path
+from typing import Optional
+
+from opendrop.utility.diskcache import DiskCache
+
+DEFAULT_MAX_SIZE = 512 * 2**20
+
+
+@functools.lru_cache(maxsize=None)
+def default_cache() -> Optional[DiskCache]:
+    """Return the cache used by the analysis services, or None if caching is disabled.
+
+    The cache is kept in the 'opendrop' directory of the user's cache directory, unless the OPENDROP_CACHE_DIR
+    environment variable is set (to an empty string to disable caching). OPENDROP_CACHE_SIZE sets the size limit in
+    megabytes."""
+    directory = os.environ.get('OPENDROP_CACHE_DIR')
+    if directory is None:
+        directory = _user_cache_dir()/'opendrop'
+    elif directory == '':
+        return None
+
+    max_size = DEFAULT_MAX_SIZE
+    size_env = os.environ.get('OPENDROP_CACHE_SIZE')
+    if size_env:
+        max_size = int(float(size_env) * 2**20)
+
+    return DiskCache(directory, max_size)
+
+
+def _user_cache_dir() -> Path:
+    if sys.platform == 'win32':
+        return Path(os.environ.get('LOCALAPPDATA') or Path.home()/'AppData'/'Local')
+    elif sys.platform == 'darwin':
+        return Path.home()/'Library'/'Caches'
+    else:
+        return Path(os.environ.get('XDG_CACHE_HOME') or Path.home()/'.cache')
@@ -0,0 +1,209 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import math
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from opendrop.processing.conan import (
+    apply_foreground_detection,
+    calculate_contact_angles,
+    extract_drop_profile,
+)
+from opendrop.utility.geometry import Line2, Rect2, Vector2
+
+
+ContactAngleResult = Tuple[np.poly1d, float, Vector2[float], np.poly1d, float, Vector2[float]]
+
+
+def conan_foreground_detect(image: Optional[np.ndarray], thresh: int) -> Optional[np.ndarray]:
+    if image is None:
+        return None
+
+    return apply_foreground_detection(
+        image=image,
+        thresh=thresh,
+    )
+
+
+def conan_extract_drop_profile(binary_image: Optional[np.ndarray], drop_region: Optional[Rect2]) \
+        -> Optional[np.ndarray]:
+    if binary_image is None:
+        return None
+
+    if drop_region is None:
+        return None
+
+    drop_region = drop_region.map(int)
+
+    drop_image = binary_image[drop_region.y0:drop_region.y1, drop_region.x0:drop_region.x1]
+
+    drop_profile_px = extract_drop_profile(drop_image)
+    drop_profile_px += drop_region.position
+
+    return drop_profile_px
+
+
+def conan_calculate_contact_angles(drop_profiles: Sequence[np.ndarray], surface: Line2) \
+        -> List[ContactAngleResult]:
+    """Return the (left tangent, left angle, left contact point, right tangent, right angle, right contact point) of
+    each drop profile, all in image coordinates."""
+    surface_poly1d = np.poly1d((surface.gradient, surface.eval(x=0).y))
+
+    # ContactAngle expects the coordinates of drop profile to be such that the surface has a lower y-coordinate than
+    # the drop, so mirror the drop in y-direction. (Remember drop profile is in 'image coordinates', where
+    # increasing y-coordinate is 'downwards')
+    surface_poly1d = -surface_poly1d
+
+    conancalcs = calculate_contact_angles(
+        [drop_profile * [1, -1] for drop_profile in drop_profiles],
+        surface_poly1d,
+    )
+
+    # Mirror the tangents and contact points back to original coordinate system as well.
+    return [
+        (
+            -conancalc.left_tangent,
+            conancalc.left_angle,
+            Vector2(x=conancalc.left_point.x, y=-conancalc.left_point.y),
+            -conancalc.right_tangent,
+            conancalc.right_angle,
+            Vector2(x=conancalc.right_point.x, y=-conancalc.right_point.y),
+        )
+        for conancalc in conancalcs
+    ]
+
+
+class ConanParams:
+    """Plain Old Data structure"""
+
+    thresh: int
+    drop_region: Optional[Rect2[int]]
+    surface_line: Optional[Line2]
+
+    def __init__(self, thresh: int, drop_region: Optional[Rect2[int]], surface_line: Optional[Line2]) -> None:
+        self.thresh = thresh
+        self.drop_region = drop_region
+        self.surface_line = surface_line
+
+    def _key(self) -> tuple:
+        # Line2 compares by identity, so compare its end points instead.
+        surface_line = self.surface_line
+        if surface_line is not None:
+            surface_line = (surface_line.pt0, surface_line.pt1)
+
+        return self.thresh, self.drop_region, surface_line
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ConanParams):
+            return NotImplemented
+
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+
+class ConanAnalysisResult:
+    """Contact angles measured from one image, in radians, with lengths in pixels. Attributes are named like those of
+    the conan analysis saver's drop snapshots, so these can be passed to the same export functions."""
+
+    __slots__ = (
+        'image_timestamp', 'drop_region', 'surface_line', 'drop_profile_extract',
+        'left_tangent', 'left_angle', 'left_point', 'right_tangent', 'right_angle', 'right_point',
+    )
+
+    # Scalar fields, as stored by `conan_results_to_array()`.
+    DTYPE = np.dtype([
+        ('timestamp', float),
+        ('left_angle', float),
+        ('right_angle', float),
+        ('left_x', float),
+        ('left_y', float),
+        ('right_x', float),
+        ('right_y', float),
+    ])
+
+    def __init__(
+            self,
+            image_timestamp: float,
+            drop_region: Optional[Rect2[int]],
+            surface_line: Optional[Line2],
+            drop_profile_extract: Optional[np.ndarray],
+            angles: Optional[ContactAngleResult],
+    ) -> None:
+        self.image_timestamp = image_timestamp
+        self.drop_region = drop_region
+        self.surface_line = surface_line
+        self.drop_profile_extract = drop_profile_extract
+
+        if angles is None:
+            angles = (
+                np.poly1d((math.nan, math.nan)), math.nan, Vector2(math.nan, math.nan),
+                np.poly1d((math.nan, math.nan)), math.nan, Vector2(math.nan, math.nan),
+            )
+
+        (self.left_tangent, self.left_angle, self.left_point,
+         self.right_tangent, self.right_angle, self.right_point) = angles
+
+
+def conan_analyse(image: np.ndarray, image_timestamp: float, params: ConanParams) -> ConanAnalysisResult:
+    """Run the whole contact angle analysis of one image, the same steps a ConanAnalysis goes through."""
+    foreground = conan_foreground_detect(image, params.thresh)
+    drop_profile = conan_extract_drop_profile(foreground, params.drop_region)
+
+    if drop_profile is not None and params.surface_line is not None:
+        angles = conan_calculate_contact_angles([drop_profile], params.surface_line)[0]
+    else:
+        angles = None
+
+    return ConanAnalysisResult(
+        image_timestamp=image_timestamp,
+        drop_region=params.drop_region,
+        surface_line=params.surface_line,
+        drop_profile_extract=drop_profile,
+        angles=angles,
+    )
+
+
+def conan_results_to_array(results: Sequence[ConanAnalysisResult]) -> np.ndarray:
+    """Return the scalar fields of `results` as a structured array of dtype `ConanAnalysisResult.DTYPE`."""
+    return np.array([
+        (
+            r.image_timestamp,
+            r.left_angle,
+            r.right_angle,
+            r.left_point.x,
+            r.left_point.y,
+            r.right_point.x,
+            r.right_point.y,
+        )
+        for r in results
+    ], dtype=ConanAnalysisResult.DTYPE)
@@ -0,0 +1,164 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+"""Writers for the analysis results files that are shared by the GUI savers and headless tools.
+
+Each function takes a sequence of 'drops', any objects with the attributes it reads, e.g. the saver's drop snapshots
+or the results of `opendrop.analysis.ift.pendant_analyse()` and `opendrop.analysis.conan.conan_analyse()`."""
+
+import csv
+import datetime
+import math
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Mapping, Optional, Sequence
+
+import numpy as np
+
+from opendrop.metadata import __version__
+from opendrop.utility.resultsarchive import write_results_archive
+
+
+def write_ift_timeline(drops: Sequence[Any], out_file, header: bool = True) -> None:
+    writer = csv.writer(out_file)
+
+    if header:
+        writer.writerow([
+            'Time (s)',
+            'IFT (N/m)',
+            'Volume (m3)',
+            'Surface area (m2)',
+            'Apex radius (m)',
+            'Worthington',
+            'Bond number',
+            'Image angle (degrees)',
+            'Apex x-coordinate (px)',
+            'Apex y-coordinate (px)',
+            'Needle width (px)',
+        ])
+
+    for drop in drops:
+        writer.writerow([
+            format(drop.image_timestamp, '.1f'),
+            format(drop.interfacial_tension, '.3g'),
+            format(drop.volume, '.3g'),
+            format(drop.surface_area, '.3g'),
+            format(drop.apex_radius, '.3g'),
+            format(drop.worthington, '.3g'),
+            format(drop.bond_number, '.3g'),
+            format(math.degrees(drop.rotation), '.3g'),
+            format(drop.apex_coords_px[0], '.1f'),
+            format(drop.apex_coords_px[1], '.1f'),
+            format(drop.needle_width_px, '.1f'),
+        ])
+
+
+def write_ift_archive(drops: Sequence[Any], out_file_path: Path, parameters: Optional[Mapping[str, Any]] = None) \
+        -> None:
+    def regions(attr: str) -> np.ndarray:
+        return np.array([
+            tuple(getattr(drop, attr)) if getattr(drop, attr) is not None else (math.nan,)*4
+            for drop in drops
+        ], dtype=float).reshape(-1, 4)
+
+    write_results_archive(
+        out_file_path,
+        columns=OrderedDict((
+            ('timestamp', [drop.image_timestamp for drop in drops]),
+            ('interfacial_tension', [drop.interfacial_tension for drop in drops]),
+            ('volume', [drop.volume for drop in drops]),
+            ('surface_area', [drop.surface_area for drop in drops]),
+            ('apex_radius', [drop.apex_radius for drop in drops]),
+            ('worthington', [drop.worthington for drop in drops]),
+            ('bond_number', [drop.bond_number for drop in drops]),
+            ('image_angle', [drop.rotation for drop in drops]),
+            ('apex_coordinates', np.array([tuple(drop.apex_coords_px) for drop in drops], dtype=float).reshape(-1, 2)),
+            ('needle_width', [drop.needle_width_px for drop in drops]),
+            ('drop_region', regions('drop_region')),
+            ('needle_region', regions('needle_region')),
+        )),
+        ragged=OrderedDict((
+            ('profile_extracted', [drop.drop_profile_extract for drop in drops]),
+            ('profile_fit', [drop.drop_profile_fit for drop in drops]),
+            ('profile_fit_residuals', [drop.residuals for drop in drops]),
+        )),
+        metadata=OrderedDict((
+            ('software', 'OpenDrop'),
+            ('version', __version__),
+            ('created', datetime.datetime.now().astimezone().isoformat()),
+            ('analysis', 'interfacial tension'),
+            ('units', OrderedDict((
+                ('timestamp', 's'),
+                ('interfacial_tension', 'N/m'),
+                ('volume', 'm3'),
+                ('surface_area', 'm2'),
+                ('apex_radius', 'm'),
+                ('image_angle', 'rad'),
+                ('apex_coordinates', 'px'),
+                ('needle_width', 'px'),
+                ('drop_region', 'px (left, top, right, bottom)'),
+                ('needle_region', 'px (left, top, right, bottom)'),
+                ('profile_extracted', 'px'),
+                ('profile_fit', 'px'),
+            ))),
+            ('parameters', dict(parameters or {})),
+        )),
+    )
+
+
+def write_conan_timeline(drops: Sequence[Any], out_file, header: bool = True) -> None:
+    writer = csv.writer(out_file)
+
+    if header:
+        writer.writerow([
+            'Time (s)',
+            'Left angle (degrees)',
+            'Right angle (degrees)',
+            'Left contact x-coordinate (px)',
+            'Left contact y-coordinate (px)',
+            'Right contact x-coordinate (px)',
+            'Right contact y-coordinate (px)',
+        ])
+
+    for drop in drops:
+        timestamp = drop.image_timestamp
+        left_angle = math.degrees(drop.left_angle)
+        left_point = drop.left_point
+        right_angle = math.degrees(drop.right_angle)
+        right_point = drop.right_point
+
+        writer.writerow([
+            format(timestamp, '.1f'),
+            format(left_angle, '.1f'),
+            format(right_angle, '.1f'),
+            format(left_point.x, '.1f'),
+            format(left_point.y, '.1f'),
+            format(right_point.x, '.1f'),
+            format(right_point.y, '.1f'),
+        ])
@@ -0,0 +1,430 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import math
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from opendrop.processing.ift import (
+    apply_edge_detection,
+    calculate_ift,
+    calculate_volsur,
+    calculate_width_from_needle_profile,
+    calculate_worthington,
+    extract_drop_profile,
+    extract_needle_profile,
+    young_laplace,
+)
+from opendrop.utility.diskcache import DiskCache, cache_key
+from opendrop.utility.geometry import Rect2, Vector2
+
+# Part of every cache key, bump this when a change to a stage changes its results.
+CACHE_VERSION = 1
+
+
+class PendantEdgeDetectionParams:
+    """Plain Old Data structure"""
+
+    canny_min: int
+    canny_max: int
+    needle_region: Optional[Rect2[int]]
+    drop_region: Optional[Rect2[int]]
+
+    def __init__(
+            self,
+            canny_min: int,
+            canny_max: int,
+            needle_region: Optional[Rect2[int]],
+            drop_region: Optional[Rect2[int]],
+    ) -> None:
+        self.canny_min = canny_min
+        self.canny_max = canny_max
+        self.needle_region = needle_region
+        self.drop_region = drop_region
+
+    def _key(self) -> tuple:
+        return self.canny_min, self.canny_max, self.needle_region, self.drop_region
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PendantEdgeDetectionParams):
+            return NotImplemented
+
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+
+class PendantEdgeDetection:
+    # None if the detection was loaded from a cache.
+    edge_map: Optional[np.ndarray]
+    drop_edge: np.ndarray
+    needle_left_edge: np.ndarray
+    needle_right_edge: np.ndarray
+
+    def __init__(
+            self,
+            edge_map: Optional[np.ndarray],
+            drop_edge: np.ndarray,
+            needle_left_edge: np.ndarray,
+            needle_right_edge: np.ndarray,
+    ) -> None:
+        self.edge_map = edge_map
+        self.drop_edge = drop_edge
+        self.needle_left_edge = needle_left_edge
+        self.needle_right_edge = needle_right_edge
+
+
+def pendant_edge_detect(
+        image: np.ndarray,
+        params: PendantEdgeDetectionParams,
+        cache: Optional[DiskCache] = None,
+) -> PendantEdgeDetection:
+    """If `cache` is given, the extracted edges are looked up in (or saved to) it. Edge maps are too big to be worth
+    caching, so detections loaded from the cache have no edge map."""
+    if cache is None:
+        return _pendant_edge_detect(image, params)
+
+    key = cache_key('pendant_edge_detect', CACHE_VERSION, image, *params._key())
+
+    edges = cache.get(key)
+    if edges is not None:
+        drop_edge, needle_left_edge, needle_right_edge = edges
+        return PendantEdgeDetection(
+            edge_map=None,
+            drop_edge=drop_edge,
+            needle_left_edge=needle_left_edge,
+            needle_right_edge=needle_right_edge,
+        )
+
+    detection = _pendant_edge_detect(image, params)
+    cache.put(key, (detection.drop_edge, detection.needle_left_edge, detection.needle_right_edge))
+
+    return detection
+
+
+def _pendant_edge_detect(image: np.ndarray, params: PendantEdgeDetectionParams) -> PendantEdgeDetection:
+    edge_map = apply_edge_detection(image, canny_min=params.canny_min, canny_max=params.canny_max)
+
+    drop_region = params.drop_region
+    if drop_region is not None:
+        cropped = edge_map[drop_region.y0:drop_region.y1, drop_region.x0:drop_region.x1]
+        drop_edge = extract_drop_profile(cropped)
+        drop_edge += drop_region.position
+    else:
+        drop_edge = np.empty((0, 2))
+
+    needle_region = params.needle_region
+    if needle_region is not None:
+        cropped = edge_map[needle_region.y0:needle_region.y1, needle_region.x0:needle_region.x1]
+        needle_edges = extract_needle_profile(cropped)
+        needle_edges = tuple(s + needle_region.position for s in needle_edges)
+    else:
+        needle_edges = np.empty((0, 2)), np.empty((0, 2))
+
+    return PendantEdgeDetection(
+        edge_map=edge_map,
+        drop_edge=drop_edge,
+        needle_left_edge=needle_edges[0],
+        needle_right_edge=needle_edges[1],
+    )
+
+
+class YoungLaplaceFit:
+    def __init__(
+            self,
+            bond: float,
+            radius: float,
+            arc_length: float,
+            apex: Tuple[float, float],
+            rotation: float,
+            fitted_profile: np.ndarray,
+            residuals: np.ndarray,
+    ) -> None:
+        self.bond = bond
+        self.radius = radius
+        self.arc_length = arc_length
+        self.apex = Vector2(apex)
+        self.rotation = rotation
+        self.fitted_profile = fitted_profile
+        self.residuals = residuals
+
+
+def pendant_needle_width(
+        needle_left_edge: np.ndarray,
+        needle_right_edge: np.ndarray,
+        cache: Optional[DiskCache] = None,
+) -> float:
+    """Return the width of the needle in pixels, or nan if an edge is empty."""
+    if cache is None:
+        return calculate_width_from_needle_profile((needle_left_edge, needle_right_edge))
+
+    key = cache_key('pendant_needle_width', CACHE_VERSION, np.asarray(needle_left_edge), np.asarray(needle_right_edge))
+
+    width = cache.get(key)
+    if width is None:
+        width = calculate_width_from_needle_profile((needle_left_edge, needle_right_edge))
+        cache.put(key, width)
+
+    return width
+
+
+def young_laplace_fit(profile: Sequence[Tuple[float, float]], cache: Optional[DiskCache] = None) -> YoungLaplaceFit:
+    if cache is None:
+        return _young_laplace_fit(profile)
+
+    key = cache_key('young_laplace_fit', CACHE_VERSION, np.asarray(profile))
+
+    fit = cache.get(key)
+    if fit is None:
+        fit = _young_laplace_fit(profile)
+        cache.put(key, fit)
+
+    return fit
+
+
+def _young_laplace_fit(profile: Sequence[Tuple[float, float]]) -> YoungLaplaceFit:
+    fit = young_laplace.YoungLaplaceFit(profile)
+
+    rotation = fit.rotation
+    if rotation < -np.pi/2:
+        rotation += np.pi
+    elif rotation > np.pi/2:
+        rotation -= np.pi
+
+    residuals = fit.residuals
+    residuals = residuals[residuals[:,0].argsort()]
+
+    return YoungLaplaceFit(
+        bond=fit.bond_number,
+        radius=fit.apex_radius,
+        arc_length=fit._profile_size,
+        apex=(fit.apex_x, fit.apex_y),
+        rotation=rotation,
+        fitted_profile=fit(residuals[:,0]),
+        residuals=residuals,
+    )
+
+
+class PendantPhysicalParams:
+    """Variables are in SI units."""
+
+    def __init__(
+            self,
+            drop_density: float,
+            continuous_density: float,
+            needle_diameter: float,
+            gravity: float
+    ) -> None:
+        self.drop_density = drop_density
+        self.continuous_density = continuous_density
+        self.needle_diameter = needle_diameter
+        self.gravity = gravity
+
+
+class PendantDerivedProperties:
+    """Variables are in SI units."""
+
+    def __init__(
+            self,
+            interfacial_tension: float,
+            volume: float,
+            surface_area: float,
+            worthington: float,
+    ) -> None:
+        self.interfacial_tension = interfacial_tension
+        self.volume = volume
+        self.surface_area = surface_area
+        self.worthington = worthington
+
+
+def pendant_derive_properties(
+        bond: float,
+        arc_length: float,
+        radius: float,
+        params: PendantPhysicalParams
+) -> PendantDerivedProperties:
+    """
+    Parameters `bond` and `arc_length` are dimensionless. Parameter `radius` is in metres.
+    """
+    drop_density = params.drop_density
+    continuous_density = params.continuous_density
+    needle_diameter = params.needle_diameter
+    gravity = params.gravity
+
+    if not math.isfinite(drop_density) \
+            or not math.isfinite(continuous_density) \
+            or not math.isfinite(needle_diameter) \
+            or not math.isfinite(gravity):
+        return PendantDerivedProperties(
+            interfacial_tension=math.nan,
+            volume=math.nan,
+            surface_area=math.nan,
+            worthington=math.nan,
+        )
+
+    interfacial_tension = calculate_ift(
+        inner_density=drop_density,
+        outer_density=continuous_density,
+        bond_number=bond,
+        apex_radius=radius,
+        gravity=gravity,
+    )
+
+    volume, surface_area = calculate_volsur(bond, arc_length)
+    volume *= radius**3
+    surface_area *= radius**2
+
+    worthington = calculate_worthington(
+        inner_density=drop_density,
+        outer_density=continuous_density,
+        gravity=gravity,
+        ift=interfacial_tension,
+        volume=volume,
+        needle_width=needle_diameter,
+    )
+
+    return PendantDerivedProperties(
+        interfacial_tension=interfacial_tension,
+        volume=volume,
+        surface_area=surface_area,
+        worthington=worthington,
+    )
+
+
+class PendantAnalysisResult:
+    """Everything measured from one image of a pendant drop. Lengths are in pixels unless otherwise noted, physical
+    quantities are in SI units. Attributes are named like those of the IFT analysis saver's drop snapshots, so these
+    can be passed to the same export functions."""
+
+    __slots__ = (
+        'image_timestamp', 'drop_region', 'needle_region', 'drop_profile_extract', 'needle_profile_extract',
+        'needle_width_px', 'bond_number', 'apex_coords_px', 'apex_radius_px', 'rotation', 'drop_profile_fit',
+        'residuals', 'interfacial_tension', 'volume', 'surface_area', 'worthington', 'apex_radius',
+    )
+
+    # Scalar fields, as stored by `pendant_results_to_array()`.
+    DTYPE = np.dtype([
+        ('timestamp', float),
+        ('interfacial_tension', float),
+        ('volume', float),
+        ('surface_area', float),
+        ('apex_radius', float),
+        ('worthington', float),
+        ('bond_number', float),
+        ('rotation', float),
+        ('apex_x', float),
+        ('apex_y', float),
+        ('apex_radius_px', float),
+        ('needle_width_px', float),
+    ])
+
+    def __init__(
+            self,
+            image_timestamp: float,
+            drop_region: Optional[Rect2[int]],
+            needle_region: Optional[Rect2[int]],
+            edges: PendantEdgeDetection,
+            needle_width_px: float,
+            fit: YoungLaplaceFit,
+            derived: PendantDerivedProperties,
+            apex_radius: float,
+    ) -> None:
+        self.image_timestamp = image_timestamp
+        self.drop_region = drop_region
+        self.needle_region = needle_region
+
+        self.drop_profile_extract = edges.drop_edge
+        self.needle_profile_extract = (edges.needle_left_edge, edges.needle_right_edge)
+        self.needle_width_px = needle_width_px
+
+        self.bond_number = fit.bond
+        self.apex_coords_px = fit.apex
+        self.apex_radius_px = fit.radius
+        self.rotation = fit.rotation
+        self.drop_profile_fit = fit.fitted_profile
+        self.residuals = fit.residuals
+
+        self.interfacial_tension = derived.interfacial_tension
+        self.volume = derived.volume
+        self.surface_area = derived.surface_area
+        self.worthington = derived.worthington
+        self.apex_radius = apex_radius
+
+
+def pendant_analyse(
+        image: np.ndarray,
+        image_timestamp: float,
+        edge_params: PendantEdgeDetectionParams,
+        phys_params: PendantPhysicalParams,
+        cache: Optional[DiskCache] = None,
+) -> PendantAnalysisResult:
+    """Run the whole IFT analysis of one image, the same steps a PendantAnalysisJob goes through. If `cache` is given,
+    each stage is looked up in it before being computed. Physical properties are cheap to derive, so they are always
+    recomputed, e.g. after only the fluid densities have changed."""
+    edges = pendant_edge_detect(image, edge_params, cache)
+    needle_width_px = pendant_needle_width(edges.needle_left_edge, edges.needle_right_edge, cache)
+
+    fit = young_laplace_fit(edges.drop_edge, cache)
+
+    pixel_size = phys_params.needle_diameter/needle_width_px
+    derived = pendant_derive_properties(fit.bond, fit.arc_length, fit.radius * pixel_size, phys_params)
+
+    return PendantAnalysisResult(
+        image_timestamp=image_timestamp,
+        drop_region=edge_params.drop_region,
+        needle_region=edge_params.needle_region,
+        edges=edges,
+        needle_width_px=needle_width_px,
+        fit=fit,
+        derived=derived,
+        apex_radius=fit.radius * pixel_size,
+    )
+
+
+def pendant_results_to_array(results: Sequence[PendantAnalysisResult]) -> np.ndarray:
+    """Return the scalar fields of `results` as a structured array of dtype `PendantAnalysisResult.DTYPE`."""
+    return np.array([
+        (
+            r.image_timestamp,
+            r.interfacial_tension,
+            r.volume,
+            r.surface_area,
+            r.apex_radius,
+            r.worthington,
+            r.bond_number,
+            r.rotation,
+            r.apex_coords_px.x,
+            r.apex_coords_px.y,
+            r.apex_radius_px,
+            r.needle_width_px,
+        )
+        for r in results
+    ], dtype=PendantAnalysisResult.DTYPE)
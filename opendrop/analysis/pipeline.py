@@ -0,0 +1,298 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+"""Streaming analysis of many frames in parallel.
+
+A `Pipeline` takes an iterable (or async iterable) of frames and yields a `FrameResult` for each one, e.g.
+
+    pipeline = ift_pipeline(edge_params, phys_params, jobs=4)
+    for result in pipeline.run(frames):
+        print(result.timestamp, result.value.interfacial_tension)
+
+Each frame can be an image (whose timestamp is then its position in the stream), an `(image, timestamp)` pair, or an
+object with a `timestamp` attribute and a `read()` method that returns the image. The last kind is only read in the
+worker process, so e.g. frames of a file on disk needn't be loaded and sent over by the caller.
+"""
+
+import asyncio
+import collections
+import concurrent.futures
+import functools
+import os
+import time
+import traceback
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Generic, Iterable, Iterator, Optional, Tuple, TypeVar, \
+    Union
+
+import numpy as np
+
+from opendrop.utility.diskcache import DiskCache
+
+from .conan import ConanAnalysisResult, ConanParams, conan_analyse
+from .ift import PendantAnalysisResult, PendantEdgeDetectionParams, PendantPhysicalParams, pendant_analyse
+
+T = TypeVar('T')
+
+
+class FrameResult(Generic[T]):
+    """The result of analysing one frame. If the analysis raised an exception, `value` is None and `error` describes
+    the exception. `worker_time` is the time in seconds the worker spent on the frame."""
+
+    __slots__ = ('frame', 'index', 'timestamp', 'value', 'error', 'worker_time')
+
+    def __init__(
+            self,
+            frame: Any,
+            index: int,
+            timestamp: float,
+            value: Optional[T],
+            error: Optional[str],
+            worker_time: float,
+    ) -> None:
+        self.frame = frame
+        self.index = index
+        self.timestamp = timestamp
+        self.value = value
+        self.error = error
+        self.worker_time = worker_time
+
+
+class PipelineError(Exception):
+    """Raised by a pipeline with `raise_errors` set when a frame fails to be analysed."""
+
+    def __init__(self, result: FrameResult) -> None:
+        super().__init__('Failed to analyse frame {}: {}'.format(result.index, result.error))
+        self.result = result
+
+
+class Pipeline(Generic[T]):
+    """Analyses frames with `analyse(image, timestamp)` on a pool of `jobs` worker processes (or `executor`, if given).
+    `analyse` must be picklable, e.g. a `functools.partial()` of a module level function.
+
+    If `ordered` is true, results are yielded in the order of their frames, otherwise as they complete. At most
+    `window` frames are taken from the input and held in flight at once (by default four per worker), so a large or
+    endless stream of frames is never loaded into memory all at once.
+
+    If `raise_errors` is true, a frame that fails to be analysed raises a PipelineError, otherwise its result is yielded
+    with `error` set."""
+
+    def __init__(
+            self,
+            analyse: Callable[[np.ndarray, float], T],
+            *,
+            jobs: Optional[int] = None,
+            ordered: bool = True,
+            window: Optional[int] = None,
+            raise_errors: bool = True,
+            executor: Optional[Executor] = None,
+    ) -> None:
+        self.analyse = analyse
+        self.jobs = jobs or os.cpu_count() or 1
+        self.ordered = ordered
+        self.window = window or 4*self.jobs
+        self.raise_errors = raise_errors
+
+        self._executor = executor
+
+        if self.window < 1:
+            raise ValueError("'window' must be >= 1, got {}".format(self.window))
+
+    def run(self, frames: Iterable[Any]) -> Iterator[FrameResult[T]]:
+        executor, owns_executor = self._get_executor()
+        # Holds (frame, index, timestamp) of each in flight future.
+        pending = collections.OrderedDict()  # type: collections.OrderedDict[Future, Tuple[Any, int, float]]
+
+        def done() -> Iterator[Future]:
+            if self.ordered:
+                while pending:
+                    fut = next(iter(pending))
+                    if not fut.done(): break
+                    yield fut
+            else:
+                for fut in [fut for fut in pending if fut.done()]:
+                    yield fut
+
+        def wait() -> None:
+            if self.ordered:
+                concurrent.futures.wait([next(iter(pending))])
+            else:
+                concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+
+        try:
+            for index, frame in enumerate(frames):
+                timestamp = _timestamp(frame, index)
+                fut = executor.submit(_analyse_frame, self.analyse, frame, timestamp)
+                pending[fut] = frame, index, timestamp
+
+                if len(pending) >= self.window:
+                    wait()
+
+                for fut in done():
+                    yield self._result(fut, *pending.pop(fut))
+
+            while pending:
+                wait()
+                for fut in done():
+                    yield self._result(fut, *pending.pop(fut))
+        finally:
+            for fut in pending:
+                fut.cancel()
+
+            if owns_executor:
+                executor.shutdown()
+
+    async def run_async(self, frames: Union[Iterable[Any], AsyncIterable[Any]]) -> AsyncIterator[FrameResult[T]]:
+        """Like `run()`, but frames may also come from an async iterable, and results are yielded asynchronously, so
+        the event loop is never blocked waiting for workers."""
+        loop = asyncio.get_event_loop()
+        executor, owns_executor = self._get_executor()
+
+        pending = collections.OrderedDict()  # type: collections.OrderedDict[asyncio.Future, Tuple[Any, int, float]]
+
+        def done() -> Iterator[asyncio.Future]:
+            if self.ordered:
+                while pending:
+                    fut = next(iter(pending))
+                    if not fut.done(): break
+                    yield fut
+            else:
+                for fut in [fut for fut in pending if fut.done()]:
+                    yield fut
+
+        async def wait() -> None:
+            if self.ordered:
+                await asyncio.wait([next(iter(pending))])
+            else:
+                await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+        try:
+            index = 0
+            async for frame in _aiter(frames):
+                timestamp = _timestamp(frame, index)
+                fut = asyncio.wrap_future(
+                    executor.submit(_analyse_frame, self.analyse, frame, timestamp),
+                    loop=loop,
+                )
+                pending[fut] = frame, index, timestamp
+                index += 1
+
+                if len(pending) >= self.window:
+                    await wait()
+
+                for fut in done():
+                    yield self._result(fut, *pending.pop(fut))
+
+            while pending:
+                await wait()
+                for fut in done():
+                    yield self._result(fut, *pending.pop(fut))
+        finally:
+            for fut in pending:
+                fut.cancel()
+
+            if owns_executor:
+                executor.shutdown(wait=False)
+
+    def _get_executor(self) -> Tuple[Executor, bool]:
+        if self._executor is not None:
+            return self._executor, False
+
+        return ProcessPoolExecutor(max_workers=self.jobs), True
+
+    def _result(self, fut: Union[Future, asyncio.Future], frame: Any, index: int, timestamp: float) \
+            -> FrameResult[T]:
+        value, error, worker_time = fut.result()
+        result = FrameResult(frame, index, timestamp, value, error, worker_time)
+
+        if error is not None and self.raise_errors:
+            raise PipelineError(result)
+
+        return result
+
+
+def ift_pipeline(
+        edge_params: PendantEdgeDetectionParams,
+        phys_params: PendantPhysicalParams,
+        cache: Optional[DiskCache] = None,
+        **options
+) -> Pipeline[PendantAnalysisResult]:
+    """Return a pipeline that runs `pendant_analyse()` on each frame, see Pipeline for `options`. If `cache` is given,
+    workers look up the results of each analysis stage in it."""
+    return Pipeline(
+        functools.partial(pendant_analyse, edge_params=edge_params, phys_params=phys_params, cache=cache),
+        **options
+    )
+
+
+def conan_pipeline(params: ConanParams, **options) -> Pipeline[ConanAnalysisResult]:
+    """Return a pipeline that runs `conan_analyse()` on each frame, see Pipeline for `options`."""
+    return Pipeline(functools.partial(conan_analyse, params=params), **options)
+
+
+def _timestamp(frame: Any, index: int) -> float:
+    if isinstance(frame, tuple):
+        return frame[1]
+
+    if isinstance(frame, np.ndarray):
+        return float(index)
+
+    return frame.timestamp
+
+
+def _read(frame: Any) -> np.ndarray:
+    if isinstance(frame, tuple):
+        return frame[0]
+
+    if isinstance(frame, np.ndarray):
+        return frame
+
+    return frame.read()
+
+
+async def _aiter(iterable: Union[Iterable[Any], AsyncIterable[Any]]) -> AsyncIterator[Any]:
+    if hasattr(iterable, '__aiter__'):
+        async for item in iterable:
+            yield item
+    else:
+        for item in iterable:
+            yield item
+
+
+# Runs in the worker process.
+def _analyse_frame(analyse: Callable[[np.ndarray, float], T], frame: Any, timestamp: float) \
+        -> Tuple[Optional[T], Optional[str], float]:
+    time_start = time.perf_counter()
+
+    try:
+        value = analyse(_read(frame), timestamp)
+    except Exception as e:
+        return None, ''.join(traceback.format_exception_only(type(e), e)).strip(), time.perf_counter() - time_start
+
+    return value, None, time.perf_counter() - time_start
@@ -1,2 +1,5 @@
+from ._setup import setup_gui
+setup_gui()
+
 from . import main_menu, ift, conan, common
 from .app import OpendropApplication
@@ -36,6 +36,7 @@ from injector import inject
 
 from opendrop.appfw import ComponentFactory
 from opendrop.vendor import aioglib
+from .diagnostics import Diagnostics
 
 
 class OpendropApplication(Gtk.Application):
@@ -53,6 +54,7 @@ class OpendropApplication(Gtk.Application):
         super().__init__(**properties)
 
         self._loop = aioglib.GLibEventLoop(GLib.MainContext.default())
+        self._diagnostics = Diagnostics.from_environ(self._loop)
         self._cf = cf
 
         self._state = OpendropApplication._State.NONE
@@ -65,10 +67,21 @@ class OpendropApplication(Gtk.Application):
         asyncio.set_event_loop(self._loop)
         self._loop.set_is_running(True)
 
+        if self._diagnostics is not None:
+            self._diagnostics.start()
+
+            show_diagnostics = Gio.SimpleAction(name='show-diagnostics')
+            show_diagnostics.connect('activate', lambda *_: self._diagnostics.show_window())
+            self.add_action(show_diagnostics)
+            self.set_accels_for_action('app.show-diagnostics', ['<Primary><Shift>d'])
+
     def do_activate(self) -> None:
         self._goto_main_menu()
 
     def do_shutdown(self) -> None:
+        if self._diagnostics is not None:
+            self._diagnostics.stop()
+
         self._loop.set_is_running(False)
 
         # Chain up to parent implementation.
@@ -0,0 +1,202 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import asyncio
+import itertools
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from enum import Enum
+from typing import Any, Callable, Iterable, Iterator, MutableSet, Optional
+
+from opendrop.utility.bindable import AccessorBindable, VariableBindable
+
+
+class ExportJob:
+    """Runs export tasks in the background on a pool of worker processes.
+
+    `tasks` is iterated on the main thread, lazily, only as workers become free. This lets the iterator snapshot
+    whatever it needs from the analyses just before each task is submitted, so the analyses don't all need to be
+    copied up front. Each task must be picklable (e.g. a functools.partial of a module level function).
+
+    If `keep_open` is True, the job doesn't finish when it runs out of tasks, more can be added with add_tasks() until
+    close() is called."""
+
+    class Status(Enum):
+        EXPORTING = ('Exporting', False)
+        FINISHED = ('Finished', True)
+        CANCELLED = ('Cancelled', True)
+        FAILED = ('Failed', True)
+
+        def __init__(self, display_name: str, is_terminal: bool) -> None:
+            self.display_name = display_name
+            self.is_terminal = is_terminal
+
+        def __str__(self) -> str:
+            return self.display_name
+
+    def __init__(
+            self,
+            tasks: Iterable[Callable[[], Any]],
+            num_tasks: int,
+            *,
+            executor: Optional[Executor] = None,
+            max_workers: Optional[int] = None,
+            keep_open: bool = False,
+            loop: Optional[asyncio.AbstractEventLoop] = None
+    ) -> None:
+        self._loop = loop or asyncio.get_event_loop()
+
+        max_workers = max_workers or os.cpu_count() or 1
+
+        self._owns_executor = executor is None
+        self._executor = executor or ProcessPoolExecutor(max_workers=max_workers)
+
+        # Keep a couple of tasks queued per worker so workers don't idle, but don't submit (and pickle) everything at
+        # once.
+        self._max_in_flight = 2 * max_workers
+
+        self._tasks = iter(tasks)
+        self._is_open = keep_open
+        self._num_tasks = num_tasks
+        self._num_done = 0
+        self._in_flight = set()  # type: MutableSet[asyncio.Future]
+        self._exhausted = False
+
+        self.exception = None  # type: Optional[BaseException]
+
+        self.bn_status = VariableBindable(self.Status.EXPORTING)
+        self.bn_progress = AccessorBindable(getter=self._get_progress)
+        self.bn_is_done = AccessorBindable(getter=self._get_is_done)
+
+        self.bn_status.on_changed.connect(self.bn_is_done.poke)
+
+        self._submit_more()
+
+    def _submit_more(self) -> None:
+        while not self._exhausted and len(self._in_flight) < self._max_in_flight:
+            try:
+                task = next(self._tasks)
+            except StopIteration:
+                self._exhausted = True
+                break
+            except Exception as exc:
+                self._fail(exc)
+                return
+
+            fut = asyncio.wrap_future(self._executor.submit(task), loop=self._loop)
+            fut.add_done_callback(self._hdl_task_done)
+            self._in_flight.add(fut)
+
+        if self._exhausted and not self._in_flight and not self._is_open:
+            self._finish(self.Status.FINISHED)
+
+    def add_tasks(self, tasks: Iterable[Callable[[], Any]]) -> None:
+        """Queue more tasks to run after the current ones. The job must have been created with `keep_open`, and not
+        closed yet."""
+        assert self._is_open
+
+        if self.bn_status.get().is_terminal:
+            return
+
+        if self._exhausted:
+            self._tasks = iter(tasks)
+        else:
+            self._tasks = itertools.chain(self._tasks, tasks)
+        self._exhausted = False
+
+        self._submit_more()
+
+    def close(self) -> None:
+        """No more tasks will be added, finish once the queued tasks are done."""
+        if not self._is_open:
+            return
+
+        self._is_open = False
+
+        if self.bn_status.get().is_terminal:
+            return
+
+        self._submit_more()
+
+    def _hdl_task_done(self, fut: asyncio.Future) -> None:
+        self._in_flight.discard(fut)
+
+        if self.bn_status.get().is_terminal:
+            return
+
+        if fut.cancelled():
+            return
+
+        exc = fut.exception()
+        if exc is not None:
+            self._fail(exc)
+            return
+
+        self._num_done += 1
+        self.bn_progress.poke()
+
+        self._submit_more()
+
+    def _fail(self, exc: BaseException) -> None:
+        self.exception = exc
+        self._cancel_in_flight()
+        self._finish(self.Status.FAILED)
+
+    def cancel(self) -> None:
+        """Stop submitting tasks. Tasks that have already started are left to finish."""
+        if self.bn_status.get().is_terminal:
+            return
+
+        self._cancel_in_flight()
+        self._finish(self.Status.CANCELLED)
+
+    def _cancel_in_flight(self) -> None:
+        for fut in tuple(self._in_flight):
+            fut.cancel()
+
+    def _finish(self, status: 'ExportJob.Status') -> None:
+        if self._owns_executor:
+            self._executor.shutdown(wait=False)
+
+        self.bn_status.set(status)
+
+    def _get_progress(self) -> float:
+        if self._num_tasks == 0:
+            return 1
+
+        return self._num_done / self._num_tasks
+
+    def _get_is_done(self) -> bool:
+        return self.bn_status.get().is_terminal
+
+    async def wait(self) -> 'ExportJob.Status':
+        while not self.bn_is_done.get():
+            await self.bn_is_done.on_changed.wait()
+
+        return self.bn_status.get()
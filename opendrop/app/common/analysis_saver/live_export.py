@@ -0,0 +1,169 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import asyncio
+import hashlib
+import pickle
+from pathlib import Path
+from typing import Any, Callable, Hashable, Iterable, List, MutableMapping, Optional, Sequence
+
+from opendrop.utility.events import EventConnection
+from .export_job import ExportJob
+
+
+class SaveRecord:
+    """Remembers what was last saved to a save directory, so that a later save to the same directory with the same
+    options only has to write the drops that have changed since."""
+
+    def __init__(self) -> None:
+        self._root_dir = None  # type: Optional[Path]
+        self._options_key = None  # type: Optional[Hashable]
+        self._fingerprints = {}  # type: MutableMapping[int, str]
+
+    def reuse(self, root_dir: Path, options_key: Hashable) -> bool:
+        """Return True if the previous save can be updated in place, otherwise forget the previous save, start
+        recording a new one, and return False."""
+        if root_dir == self._root_dir and options_key == self._options_key and root_dir.is_dir():
+            return True
+
+        self._root_dir = root_dir
+        self._options_key = options_key
+        self._fingerprints.clear()
+
+        return False
+
+    def has_changed(self, index: int, snapshot: Any) -> bool:
+        """Return True unless drop `index` was last saved with exactly the values in `snapshot`."""
+        return self._fingerprints.get(index) != _fingerprint(snapshot)
+
+    def update(self, index: int, snapshot: Any) -> bool:
+        """Record that drop `index` is being saved with the values in `snapshot`, return False if exactly these values
+        were already saved."""
+        fingerprint = _fingerprint(snapshot)
+        if self._fingerprints.get(index) == fingerprint:
+            return False
+
+        self._fingerprints[index] = fingerprint
+
+        return True
+
+    def clear(self) -> None:
+        self._root_dir = None
+        self._options_key = None
+        self._fingerprints.clear()
+
+
+def _fingerprint(snapshot: Any) -> str:
+    return hashlib.sha1(pickle.dumps(snapshot, protocol=4)).hexdigest()
+
+
+class LiveExport:
+    """Feeds an open ExportJob with tasks to save analyses as they finish, instead of waiting for all of them.
+
+    Finished analyses are collected and handed to `save` in batches, at most every `flush_interval` seconds. Once every
+    analysis is done, the tasks from `finish` are added and the job is closed."""
+
+    FLUSH_INTERVAL = 5.0
+
+    def __init__(
+            self,
+            job: ExportJob,
+            analyses: Sequence[Any],
+            *,
+            save: Callable[[Sequence[int]], Iterable[Callable[[], Any]]],
+            finish: Callable[[], Iterable[Callable[[], Any]]],
+            flush_interval: float = FLUSH_INTERVAL,
+            loop: Optional[asyncio.AbstractEventLoop] = None
+    ) -> None:
+        self._loop = loop or asyncio.get_event_loop()
+
+        self._job = job
+        self._analyses = analyses
+        self._save = save
+        self._finish = finish
+        self._flush_interval = flush_interval
+
+        self._pending = []  # type: List[int]
+        self._flush_handle = None  # type: Optional[asyncio.TimerHandle]
+
+        self._num_remaining = 0
+        self._is_done_conns = {}  # type: MutableMapping[int, EventConnection]
+
+        for i, analysis in enumerate(analyses):
+            if analysis.bn_is_done.get():
+                self._pending.append(i)
+            else:
+                self._num_remaining += 1
+                self._is_done_conns[i] = analysis.bn_is_done.on_changed.connect(
+                    lambda i=i: self._hdl_analysis_is_done_changed(i),
+                    weak_ref=False,
+                )
+
+        self._job_status_conn = job.bn_status.on_changed.connect(self._hdl_job_status_changed, weak_ref=False)
+
+        self._flush()
+
+    def _hdl_analysis_is_done_changed(self, index: int) -> None:
+        if not self._analyses[index].bn_is_done.get(): return
+
+        self._is_done_conns.pop(index).disconnect()
+        self._num_remaining -= 1
+        self._pending.append(index)
+
+        if self._num_remaining == 0:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = self._loop.call_later(self._flush_interval, self._flush)
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        if self._pending:
+            self._pending.sort()
+            self._job.add_tasks(self._save(self._pending))
+            self._pending = []
+
+        if self._num_remaining == 0:
+            self._job.add_tasks(self._finish())
+            self._job.close()
+
+    def _hdl_job_status_changed(self) -> None:
+        if not self._job.bn_status.get().is_terminal: return
+
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        for conn in self._is_done_conns.values():
+            conn.disconnect()
+        self._is_done_conns.clear()
+
+        self._job_status_conn.disconnect()
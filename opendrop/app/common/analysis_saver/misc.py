@@ -36,6 +36,7 @@ import numpy as np
 from matplotlib.figure import Figure
 from matplotlib.ticker import MultipleLocator
 
+from opendrop.utility.decimate import decimate
 from opendrop.utility.geometry import Line2, Rect2, Vector2
 
 INCHES_PER_CM = 0.393701
@@ -50,6 +51,11 @@ def simple_grapher(label_x: str, label_y: str, data_x: Sequence[float], data_y:
     fig_size_in = INCHES_PER_CM * fig_size[0], INCHES_PER_CM * fig_size[1]
     fig = Figure(figsize=fig_size_in, dpi=dpi)
 
+    if line_style not in ('', ' ', 'None') and np.all(np.diff(data_x) >= 0):
+        # Long series are reduced to what can be resolved at the figure's width. Only done for lines, since in a
+        # scatter plot, points between the extremes of a pixel column would still be visible.
+        data_x, data_y = decimate(data_x, data_y, num_buckets=int(fig_size_in[0] * dpi))
+
     axes = fig.add_subplot(1, 1, 1)
     axes.plot(data_x, data_y, marker=marker, linestyle=line_style, color=color)
 
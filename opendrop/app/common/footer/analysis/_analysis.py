@@ -46,6 +46,9 @@ class AnalysisFooterPresenter(Presenter):
     _time_start = None
     _time_complete = None
 
+    _save_active = False
+    _save_progress = 0.0
+
     @install
     @GObject.Property
     def status(self) -> AnalysisFooterStatus:
@@ -55,7 +58,6 @@ class AnalysisFooterPresenter(Presenter):
     def status(self, status: AnalysisFooterStatus) -> None:
         self._status = status
         self.notify('progress-text')
-        self.notify('save-enabled')
         self.notify('stop-visible')
         self.notify('previous-visible')
         self.notify('time-count')
@@ -69,10 +71,6 @@ class AnalysisFooterPresenter(Presenter):
         else:
             return ''
 
-    @GObject.Property(type=bool, default=False, flags=GObject.ParamFlags.READABLE)
-    def save_enabled(self) -> bool:
-        return self._status is not AnalysisFooterStatus.IN_PROGRESS
-
     @GObject.Property(type=bool, default=True, flags=GObject.ParamFlags.READABLE)
     def stop_visible(self) -> bool:
         return self._status is AnalysisFooterStatus.IN_PROGRESS
@@ -112,11 +110,34 @@ class AnalysisFooterPresenter(Presenter):
     def time_complete(self, time_complete: Optional[float]) -> None:
         self._time_complete = time_complete
 
+    @install
+    @GObject.Property(type=bool, default=False)
+    def save_active(self) -> bool:
+        return self._save_active
+
+    @save_active.setter
+    def save_active(self, active: bool) -> None:
+        self._save_active = active
+
+    @install
+    @GObject.Property(type=float)
+    def save_progress(self) -> float:
+        return self._save_progress
+
+    @save_progress.setter
+    def save_progress(self, progress: float) -> None:
+        self._save_progress = progress
+
     @install
     @GObject.Signal
     def save(self) -> None:
         pass
 
+    @install
+    @GObject.Signal
+    def cancel_save(self) -> None:
+        pass
+
     @install
     @GObject.Signal
     def stop(self) -> None:
@@ -130,6 +151,9 @@ class AnalysisFooterPresenter(Presenter):
     def save_clicked(self, *_) -> None:
         self.emit('save')
 
+    def cancel_save_clicked(self, *_) -> None:
+        self.emit('cancel-save')
+
     def stop_clicked(self, *_) -> None:
         self.emit('stop')
 
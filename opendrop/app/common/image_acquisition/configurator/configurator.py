@@ -33,13 +33,17 @@ from gi.repository import GObject, Gtk
 from injector import inject
 
 from opendrop.app.common.services.acquisition import (
+    FolderWatchAcquirer,
     GenicamAcquirer,
     ImageAcquirer,
+    ImageStackAcquirer,
     LocalStorageAcquirer,
     USBCameraAcquirer,
 )
 from opendrop.appfw import ComponentFactory, Presenter, component, install
 
+from .folder_watch import folder_watch_cs
+from .image_stack import image_stack_cs
 from .local_storage import local_storage_cs
 from .usb_camera import usb_camera_cs
 
@@ -69,6 +73,10 @@ class ImageAcquisitionConfiguratorPresenter(Presenter[Gtk.Bin]):
             self.remove_configurator()
         elif isinstance(acquirer, LocalStorageAcquirer):
             self.load_local_storage_configurator()
+        elif isinstance(acquirer, ImageStackAcquirer):
+            self.load_image_stack_configurator()
+        elif isinstance(acquirer, FolderWatchAcquirer):
+            self.load_folder_watch_configurator()
         elif isinstance(acquirer, USBCameraAcquirer):
             self.load_usb_camera_configurator()
         elif isinstance(acquirer, GenicamAcquirer):
@@ -99,6 +107,26 @@ class ImageAcquisitionConfiguratorPresenter(Presenter[Gtk.Bin]):
         self.configurator_component.view_rep.show()
         self.host.add(self.configurator_component.view_rep)
 
+    def load_image_stack_configurator(self) -> None:
+        self.remove_configurator()
+
+        self.configurator_component = image_stack_cs.factory(
+            acquirer=self._acquirer
+        ).create()
+
+        self.configurator_component.view_rep.show()
+        self.host.add(self.configurator_component.view_rep)
+
+    def load_folder_watch_configurator(self) -> None:
+        self.remove_configurator()
+
+        self.configurator_component = folder_watch_cs.factory(
+            acquirer=self._acquirer
+        ).create()
+
+        self.configurator_component.view_rep.show()
+        self.host.add(self.configurator_component.view_rep)
+
     def load_usb_camera_configurator(self) -> None:
         self.remove_configurator()
 
@@ -0,0 +1,164 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+from pathlib import Path
+
+from gi.repository import Gtk, Gdk
+
+from opendrop.app.common.services.acquisition import FolderWatchAcquirer, TimestampSource
+from opendrop.mvp import ComponentSymbol, Presenter, View
+from opendrop.utility.bindable import AccessorBindable
+from opendrop.utility.bindable.gextension import GObjectPropertyBindable
+from opendrop.widgets.integer_entry import IntegerEntry
+
+folder_watch_cs = ComponentSymbol()  # type: ComponentSymbol[Gtk.Widget]
+
+
+@folder_watch_cs.view()
+class FolderWatchView(View['FolderWatchPresenter', Gtk.Widget]):
+    STYLE = '''
+    .small-pad {
+         min-height: 0px;
+         min-width: 0px;
+         padding: 6px 4px 6px 4px;
+    }
+    '''
+
+    _STYLE_PROV = Gtk.CssProvider()
+    _STYLE_PROV.load_from_data(bytes(STYLE, 'utf-8'))
+    Gtk.StyleContext.add_provider_for_screen(Gdk.Screen.get_default(), _STYLE_PROV, Gtk.STYLE_PROVIDER_PRIORITY_USER)
+
+    def _do_init(self) -> Gtk.Widget:
+        self._widget = Gtk.Grid(row_spacing=10, column_spacing=10)
+
+        directory_lbl = Gtk.Label('Watch folder:', xalign=0)
+        self._widget.attach(directory_lbl, 0, 0, 1, 1)
+
+        self._directory_inp = Gtk.FileChooserButton(
+            title='Select folder to watch',
+            action=Gtk.FileChooserAction.SELECT_FOLDER,
+        )
+        self._directory_inp.connect('file-set', lambda *_: self.bn_directory.poke())
+        self._widget.attach_next_to(self._directory_inp, directory_lbl, Gtk.PositionType.RIGHT, 1, 1)
+
+        pattern_lbl = Gtk.Label('File pattern:', xalign=0)
+        self._widget.attach(pattern_lbl, 0, 1, 1, 1)
+
+        self._pattern_inp = Gtk.Entry(width_chars=10)
+        self._pattern_inp.get_style_context().add_class('small-pad')
+        self._widget.attach_next_to(self._pattern_inp, pattern_lbl, Gtk.PositionType.RIGHT, 1, 1)
+
+        num_frames_lbl = Gtk.Label('Number of images:', xalign=0)
+        self._widget.attach(num_frames_lbl, 0, 2, 1, 1)
+
+        num_frames_inp_container = Gtk.Grid()
+        self._widget.attach_next_to(num_frames_inp_container, num_frames_lbl, Gtk.PositionType.RIGHT, 1, 1)
+
+        self._num_frames_inp = IntegerEntry(lower=1, default=1, width_chars=6)
+        self._num_frames_inp.get_style_context().add_class('small-pad')
+        num_frames_inp_container.add(self._num_frames_inp)
+
+        timestamp_lbl = Gtk.Label('Timestamp from:', xalign=0)
+        self._widget.attach(timestamp_lbl, 0, 3, 1, 1)
+
+        self._timestamp_inp = Gtk.ComboBoxText(halign=Gtk.Align.START)
+        for source in TimestampSource:
+            self._timestamp_inp.append(id=source.name, text=source.display_name)
+        self._widget.attach_next_to(self._timestamp_inp, timestamp_lbl, Gtk.PositionType.RIGHT, 1, 1)
+
+        self._widget.show_all()
+
+        self.bn_directory = AccessorBindable(getter=self._get_directory, setter=self._set_directory)
+        self.bn_pattern = GObjectPropertyBindable(self._pattern_inp, 'text')
+        self.bn_num_frames = GObjectPropertyBindable(self._num_frames_inp, 'value')
+        self.bn_timestamp_source_id = GObjectPropertyBindable(self._timestamp_inp, 'active-id')
+
+        self.presenter.view_ready()
+
+        return self._widget
+
+    def _get_directory(self) -> str:
+        return self._directory_inp.get_filename()
+
+    def _set_directory(self, directory: str) -> None:
+        self._directory_inp.set_filename(directory)
+
+    def _do_destroy(self) -> None:
+        self._widget.destroy()
+
+
+@folder_watch_cs.presenter(options=['acquirer'])
+class FolderWatchPresenter(Presenter['FolderWatchView']):
+    def _do_init(self, acquirer: FolderWatchAcquirer) -> None:
+        self._acquirer = acquirer
+
+        self.__data_bindings = []
+        self.__event_connections = []
+
+    def view_ready(self) -> None:
+        self.__data_bindings.extend([
+            self._acquirer.bn_pattern.bind(
+                self.view.bn_pattern
+            ),
+            self._acquirer.bn_num_frames.bind(
+                self.view.bn_num_frames
+            ),
+        ])
+
+        self.__event_connections.extend([
+            self.view.bn_directory.on_changed.connect(self._hdl_view_directory_changed),
+            self.view.bn_timestamp_source_id.on_changed.connect(self._hdl_view_timestamp_source_changed),
+        ])
+
+        directory = self._acquirer.bn_directory.get()
+        if directory is not None:
+            self.view.bn_directory.set(str(directory))
+
+        self.view.bn_timestamp_source_id.set(self._acquirer.bn_timestamp_source.get().name)
+
+    def _hdl_view_directory_changed(self) -> None:
+        directory = self.view.bn_directory.get()
+        if directory is None:
+            return
+
+        self._acquirer.bn_directory.set(Path(directory))
+
+    def _hdl_view_timestamp_source_changed(self) -> None:
+        source_id = self.view.bn_timestamp_source_id.get()
+        if source_id is None:
+            return
+
+        self._acquirer.bn_timestamp_source.set(TimestampSource[source_id])
+
+    def _do_destroy(self) -> None:
+        for db in self.__data_bindings:
+            db.unbind()
+
+        for ec in self.__event_connections:
+            ec.disconnect()
@@ -0,0 +1,217 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+from gi.repository import Gtk, Gdk, GObject
+
+from opendrop.app.common.services.acquisition import ImageStackAcquirer
+from opendrop.mvp import ComponentSymbol, Presenter, View
+from opendrop.utility.bindable.gextension import GObjectPropertyBindable
+from opendrop.widgets.file_chooser_button import FileChooserButton
+from opendrop.widgets.float_entry import FloatEntry
+from opendrop.widgets.integer_entry import IntegerEntry
+
+image_stack_cs = ComponentSymbol()  # type: ComponentSymbol[Gtk.Widget]
+
+
+@image_stack_cs.view()
+class ImageStackView(View['ImageStackPresenter', Gtk.Widget]):
+    STYLE = '''
+    .small-pad {
+         min-height: 0px;
+         min-width: 0px;
+         padding: 6px 4px 6px 4px;
+    }
+
+    .error-text {
+        color: red;
+    }
+    '''
+
+    _STYLE_PROV = Gtk.CssProvider()
+    _STYLE_PROV.load_from_data(bytes(STYLE, 'utf-8'))
+    Gtk.StyleContext.add_provider_for_screen(Gdk.Screen.get_default(), _STYLE_PROV, Gtk.STYLE_PROVIDER_PRIORITY_USER)
+
+    _FILE_INPUT_FILTER = Gtk.FileFilter()
+    _FILE_INPUT_FILTER.add_pattern('*.tif')
+    _FILE_INPUT_FILTER.add_pattern('*.tiff')
+    _FILE_INPUT_FILTER.add_pattern('*.TIF')
+    _FILE_INPUT_FILTER.add_pattern('*.TIFF')
+    _FILE_INPUT_FILTER.add_pattern('*.npy')
+
+    def _do_init(self) -> Gtk.Widget:
+        self._widget = Gtk.Grid(row_spacing=10, column_spacing=10)
+
+        file_chooser_lbl = Gtk.Label('Stack file:', xalign=0)
+        self._widget.attach(file_chooser_lbl, 0, 0, 1, 1)
+
+        self._file_chooser_inp = FileChooserButton(
+            label='Choose file',
+            dialog_title='Select stack file',
+            file_filter=self._FILE_INPUT_FILTER,
+            select_multiple=False,
+        )
+        self._file_chooser_inp.get_style_context().add_class('small-pad')
+        self._widget.attach_next_to(self._file_chooser_inp, file_chooser_lbl, Gtk.PositionType.RIGHT, 1, 1)
+
+        frames_lbl = Gtk.Label('Frames (first, last, step):', xalign=0)
+        self._widget.attach(frames_lbl, 0, 1, 1, 1)
+
+        frames_inp_container = Gtk.Grid(column_spacing=5)
+        self._widget.attach_next_to(frames_inp_container, frames_lbl, Gtk.PositionType.RIGHT, 1, 1)
+
+        self._frame_start_inp = IntegerEntry(lower=1, default=1, width_chars=6)
+        self._frame_start_inp.get_style_context().add_class('small-pad')
+        frames_inp_container.add(self._frame_start_inp)
+
+        self._frame_last_inp = IntegerEntry(lower=1, width_chars=6)
+        self._frame_last_inp.get_style_context().add_class('small-pad')
+        frames_inp_container.add(self._frame_last_inp)
+
+        self._frame_step_inp = IntegerEntry(lower=1, default=1, width_chars=4)
+        self._frame_step_inp.get_style_context().add_class('small-pad')
+        frames_inp_container.add(self._frame_step_inp)
+
+        self._num_frames_lbl = Gtk.Label(xalign=0)
+        self._widget.attach_next_to(self._num_frames_lbl, frames_inp_container, Gtk.PositionType.RIGHT, 1, 1)
+
+        frame_interval_lbl = Gtk.Label('Frame interval (s):', xalign=0)
+        self._widget.attach(frame_interval_lbl, 0, 2, 1, 1)
+
+        frame_interval_inp_container = Gtk.Grid()
+        self._widget.attach_next_to(frame_interval_inp_container, frame_interval_lbl, Gtk.PositionType.RIGHT, 1, 1)
+
+        self._frame_interval_inp = FloatEntry(lower=0, width_chars=6)
+        self._frame_interval_inp.get_style_context().add_class('small-pad')
+        frame_interval_inp_container.add(self._frame_interval_inp)
+
+        self._file_chooser_err_msg_lbl = Gtk.Label(xalign=0)
+        self._file_chooser_err_msg_lbl.get_style_context().add_class('error-text')
+        self._widget.attach(self._file_chooser_err_msg_lbl, 0, 3, 3, 1)
+
+        self._widget.show_all()
+
+        self.bn_selected_paths = GObjectPropertyBindable(self._file_chooser_inp, 'file-paths')
+        self.bn_frame_start = GObjectPropertyBindable(self._frame_start_inp, 'value')
+        self.bn_frame_last = GObjectPropertyBindable(self._frame_last_inp, 'value')
+        self.bn_frame_step = GObjectPropertyBindable(self._frame_step_inp, 'value')
+        self.bn_frame_interval = GObjectPropertyBindable(self._frame_interval_inp, 'value')
+        self.bn_num_frames_text = GObjectPropertyBindable(self._num_frames_lbl, 'label')
+        self.bn_error_text = GObjectPropertyBindable(self._file_chooser_err_msg_lbl, 'label')
+
+        self._file_chooser_inp.grab_focus()
+
+        self.presenter.view_ready()
+
+        return self._widget
+
+    def _do_destroy(self) -> None:
+        self._widget.destroy()
+
+
+@image_stack_cs.presenter(options=['acquirer'])
+class ImageStackPresenter(Presenter['ImageStackView']):
+    def _do_init(self, acquirer: ImageStackAcquirer) -> None:
+        self._acquirer = acquirer
+
+        self.__data_bindings = []
+        self.__event_connections = []
+
+    def view_ready(self) -> None:
+        self.__data_bindings.extend([
+            self._acquirer.bn_frame_interval.bind(
+                self.view.bn_frame_interval
+            ),
+            self._acquirer.bn_frame_step.bind(
+                self.view.bn_frame_step
+            ),
+        ])
+
+        self.__event_connections.extend([
+            self._acquirer.bn_last_loaded_path.on_changed.connect(self._hdl_model_last_loaded_path_changed),
+            self._acquirer.bn_images.on_changed.connect(self._hdl_model_images_changed),
+            self.view.bn_selected_paths.on_changed.connect(self._hdl_view_selected_paths_changed),
+            self.view.bn_frame_start.on_changed.connect(self._hdl_view_frame_range_changed),
+            self.view.bn_frame_last.on_changed.connect(self._hdl_view_frame_range_changed),
+        ])
+
+        self._hdl_model_last_loaded_path_changed()
+
+    def _hdl_model_last_loaded_path_changed(self) -> None:
+        path = self._acquirer.bn_last_loaded_path.get()
+        if path is None:
+            return
+
+        if tuple(self.view.bn_selected_paths.get()) != (str(path),):
+            self.view.bn_selected_paths.set((str(path),))
+
+        # Frame numbers shown to the user are 1-based and inclusive.
+        start = self._acquirer.bn_frame_start.get() or 0
+        stop = self._acquirer.bn_frame_stop.get()
+        if stop is None:
+            stop = self._acquirer.bn_num_stack_frames.get()
+
+        self.view.bn_frame_start.set(start + 1)
+        self.view.bn_frame_last.set(stop)
+
+        self._hdl_model_images_changed()
+
+    def _hdl_model_images_changed(self) -> None:
+        self.view.bn_num_frames_text.set(
+            '{} of {} frames'.format(len(self._acquirer.bn_images.get()), self._acquirer.bn_num_stack_frames.get())
+        )
+
+    def _hdl_view_selected_paths_changed(self) -> None:
+        selected_paths = self.view.bn_selected_paths.get()
+        if not selected_paths:
+            return
+
+        last_loaded_path = self._acquirer.bn_last_loaded_path.get()
+        if last_loaded_path is not None and str(last_loaded_path) == selected_paths[0]:
+            return
+
+        try:
+            self._acquirer.load_stack(selected_paths[0])
+        except ValueError as e:
+            self.view.bn_error_text.set(str(e))
+        else:
+            self.view.bn_error_text.set('')
+
+    def _hdl_view_frame_range_changed(self) -> None:
+        start = self.view.bn_frame_start.get()
+        last = self.view.bn_frame_last.get()
+
+        self._acquirer.bn_frame_start.set(start - 1 if start is not None else 0)
+        self._acquirer.bn_frame_stop.set(last)
+
+    def _do_destroy(self) -> None:
+        for db in self.__data_bindings:
+            db.unbind()
+
+        for ec in self.__event_connections:
+            ec.disconnect()
@@ -28,8 +28,7 @@
 
 
 import asyncio
-import itertools
-from typing import Optional, Hashable, Iterable, MutableSequence
+from typing import Optional, Hashable, MutableMapping, Sequence
 
 import numpy as np
 
@@ -46,9 +45,9 @@ class AcquirerController:
 
 class ImageSequenceAcquirerController(AcquirerController):
     class _ImageRegistration:
-        def __init__(self, image_id: Hashable, image: np.ndarray) -> None:
+        def __init__(self, image_id: Hashable, index: int) -> None:
             self.image_id = image_id
-            self.image = image
+            self.index = index
 
     def __init__(
             self, *,
@@ -58,7 +57,11 @@ class ImageSequenceAcquirerController(AcquirerController):
         self._acquirer = acquirer
         self._source_image_out = source_image_out
 
-        self._image_registry = []  # type: MutableSequence[self._ImageRegistration]
+        # Registered images indexed by image id, the keys given by `acquirer.get_image_keys()`. Registrations only
+        # record where an image is in the acquirer's sequence, images are read from the acquirer when they are needed
+        # (the sequence may load frames lazily).
+        self._image_registry = {}  # type: MutableMapping[Hashable, ImageSequenceAcquirerController._ImageRegistration]
+        self._image_keys = ()  # type: Sequence[Hashable]
 
         self.bn_num_images = AccessorBindable(
             getter=self._get_num_images,
@@ -84,65 +87,40 @@ class ImageSequenceAcquirerController(AcquirerController):
         self._update_showing_image()
 
     def _update_image_registry(self) -> None:
-        acquirer_images = list(self._acquirer.bn_images.get())
-
-        for image_reg in tuple(self._get_unassociated_registered_images(acquirer_images)):
-            self._image_registry.remove(image_reg)
-            self._on_image_deregistered(image_reg.image_id)
-
-        for image in self._filter_unregistered_images(acquirer_images):
-            new_image_reg = self._ImageRegistration(
-                image_id=id(image),
-                image=image,
-            )
-            self._image_registry.append(new_image_reg)
-            self._on_image_registered(
-                image_id=new_image_reg.image_id,
-                image=image,
+        image_keys = tuple(self._acquirer.get_image_keys())
+        self._image_keys = image_keys
+
+        for image_id in tuple(self._image_registry.keys() - set(image_keys)):
+            del self._image_registry[image_id]
+            self._on_image_deregistered(image_id)
+
+        for index, image_id in enumerate(image_keys):
+            image_reg = self._image_registry.get(image_id)
+            if image_reg is not None:
+                image_reg.index = index
+                continue
+
+            self._image_registry[image_id] = self._ImageRegistration(
+                image_id=image_id,
+                index=index,
             )
+            self._on_image_registered(image_id)
 
         self.bn_num_images.poke()
 
-    def _filter_unregistered_images(self, images: Iterable[np.ndarray]) -> Iterable[np.ndarray]:
-        return itertools.filterfalse(self._is_image_registered, images)
-
-    def _is_image_registered(self, image: np.ndarray) -> bool:
-        try:
-            self._get_image_reg_by_image(image)
-        except ValueError:
-            return False
-        else:
-            return True
-
-    def _get_unassociated_registered_images(self, images: Iterable[np.ndarray]) -> Iterable[_ImageRegistration]:
-        return (
-            image_reg
-            for image_reg in self._image_registry
-            if not self._is_registered_image_associated(images, image_reg)
-        )
-
-    @staticmethod
-    def _is_registered_image_associated(images: Iterable[np.ndarray], image_reg: _ImageRegistration) -> bool:
-        for image in images:
-            if np.array_equal(image_reg.image, image):
-                return True
-        else:
-            return False
-
     def _update_showing_image(self) -> None:
-        acquirer_images = list(self._acquirer.bn_images.get())
-        if self._showing_image_index is None and len(acquirer_images) > 0:
-            self._showing_image_index = 0
-            self.bn_showing_image_index.poke()
-
-        if self._showing_image_index is None:
+        image_keys = self._image_keys
+        if len(image_keys) == 0:
             return
 
-        new_showing_image_reg = self._get_image_reg_by_image(
-            image=acquirer_images[self._showing_image_index]
-        )
+        if self._showing_image_index is None:
+            self._showing_image_index = 0
+            self.bn_showing_image_index.poke()
+        elif self._showing_image_index >= len(image_keys):
+            self._showing_image_index = len(image_keys) - 1
+            self.bn_showing_image_index.poke()
 
-        new_showing_image_id = new_showing_image_reg.image_id
+        new_showing_image_id = image_keys[self._showing_image_index]
 
         if new_showing_image_id == self._showing_image_id:
             return
@@ -152,29 +130,17 @@ class ImageSequenceAcquirerController(AcquirerController):
         self._update_source_image_out()
 
     def _update_source_image_out(self) -> None:
-        image_reg = self._get_image_reg_by_image_id(
-            image_id=self._showing_image_id,
-        )
-
-        image = image_reg.image
-
+        image = self._get_image(self._showing_image_id)
         self._source_image_out.set(image)
 
-    def _get_image_reg_by_image(self, image: np.ndarray) -> _ImageRegistration:
-        for image_reg in self._image_registry:
-            if np.array_equal(image_reg.image, image):
-                return image_reg
-        else:
-            raise ValueError(
-                "No _ImageRegistration found for image '{}'"
-                .format(image)
-            )
+    def _get_image(self, image_id: Hashable) -> np.ndarray:
+        image_reg = self._get_image_reg_by_image_id(image_id)
+        return self._acquirer.bn_images.get()[image_reg.index]
 
     def _get_image_reg_by_image_id(self, image_id: Hashable) -> _ImageRegistration:
-        for image_reg in self._image_registry:
-            if image_reg.image_id == image_id:
-                return image_reg
-        else:
+        try:
+            return self._image_registry[image_id]
+        except KeyError:
             raise ValueError(
                 "No _ImageRegistration found for image_id '{}'"
                 .format(image_id)
@@ -194,7 +160,7 @@ class ImageSequenceAcquirerController(AcquirerController):
     def _get_num_images(self) -> int:
         return len(self._acquirer.bn_images.get())
 
-    def _on_image_registered(self, image_id: Hashable, image: np.ndarray) -> None:
+    def _on_image_registered(self, image_id: Hashable) -> None:
         pass
 
     def _on_image_deregistered(self, image_id: Hashable) -> None:
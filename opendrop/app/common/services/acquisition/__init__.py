@@ -1,2 +1,2 @@
 from ._acquisition import ImageAcquisitionService, AcquirerType
-from ._acquirer import ImageAcquirer, InputImage, ImageSequenceAcquirer, CameraAcquirer, LocalStorageAcquirer, USBCameraAcquirer, GenicamAcquirer
+from ._acquirer import ImageAcquirer, InputImage, ImageSequenceAcquirer, ImageStackAcquirer, FolderWatchAcquirer, TimestampSource, CameraAcquirer, LocalStorageAcquirer, USBCameraAcquirer, GenicamAcquirer
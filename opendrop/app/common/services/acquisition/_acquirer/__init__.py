@@ -29,7 +29,9 @@
 
 from .base import ImageAcquirer, InputImage
 from .camera import CameraAcquirer
+from .folder_watch import FolderWatchAcquirer, TimestampSource
 from .image_sequence import ImageSequenceAcquirer
+from .image_stack import ImageStackAcquirer
 from .local_storage import LocalStorageAcquirer
 from .usb_camera import USBCameraAcquirer
 from .genicam import GenicamAcquirer
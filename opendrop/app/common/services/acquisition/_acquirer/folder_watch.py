@@ -0,0 +1,240 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import asyncio
+import math
+import operator
+import re
+from enum import Enum
+from pathlib import Path
+from typing import Sequence, Tuple, Optional, MutableSequence, Union
+
+import cv2
+import numpy as np
+
+from opendrop.utility.bindable import VariableBindable
+from opendrop.utility.bindable.typing import Bindable
+from opendrop.utility.dirwatch import DirectoryWatcher
+from .base import InputImage
+from .image_sequence import ImageSequenceAcquirer
+
+
+class TimestampSource(Enum):
+    MODIFIED_TIME = ('File modified time',)
+    FILENAME = ('File name',)
+
+    def __init__(self, display_name: str) -> None:
+        self.display_name = display_name
+
+
+class FolderWatchAcquirer(ImageSequenceAcquirer):
+    """Acquire images as they are written into a directory by some external software (e.g. vendor capture software).
+    The most recent image already in the directory is used as the preview image, and `acquire_images()` returns input
+    images that are read in order as new files appear."""
+
+    IS_REPLICATED = True
+
+    # Poll interval used when inotify is not available.
+    POLL_INTERVAL = 0.5
+
+    def __init__(self) -> None:
+        super().__init__()
+
+        self._loop = asyncio.get_event_loop()
+
+        # Only ever holds the latest image, avoid comparing full frames every time a new one arrives.
+        self.bn_images = VariableBindable(tuple(), check_equals=operator.is_)  # type: Bindable[Sequence[np.ndarray]]
+
+        self.bn_directory = VariableBindable(None)  # type: Bindable[Optional[Path]]
+        self.bn_pattern = VariableBindable('*')  # type: Bindable[str]
+        self.bn_num_frames = VariableBindable(1)  # type: Bindable[Optional[int]]
+        self.bn_timestamp_source = VariableBindable(TimestampSource.MODIFIED_TIME)  # type: Bindable[TimestampSource]
+
+        self._watcher = None  # type: Optional[DirectoryWatcher]
+        self._pending = []  # type: MutableSequence[_FolderWatchInputImage]
+        self._first_file_time = math.nan
+
+        self.bn_directory.on_changed.connect(self.refresh_preview)
+        self.bn_pattern.on_changed.connect(self.refresh_preview)
+
+    def refresh_preview(self) -> None:
+        """Load the most recently modified image in the watched directory as the preview image."""
+        directory = self.bn_directory.get()
+        if directory is None or not directory.is_dir():
+            self.bn_images.set(tuple())
+            return
+
+        candidates = [p for p in directory.glob(self.bn_pattern.get()) if p.is_file()]
+        candidates.sort(key=lambda p: p.stat().st_mtime, reverse=True)
+
+        for path in candidates:
+            image = _read_image(path)
+            if image is not None:
+                self.bn_images.set((image,))
+                return
+
+        self.bn_images.set(tuple())
+
+    def acquire_images(self) -> Sequence[InputImage]:
+        directory = self.bn_directory.get()
+        if directory is None:
+            raise ValueError("'directory' can't be None")
+
+        num_frames = self.bn_num_frames.get()
+        if num_frames is None or num_frames <= 0:
+            raise ValueError(
+                "'num_frames' must be > 0 and not None, currently: '{}'"
+                .format(num_frames)
+            )
+
+        self._stop_watching()
+
+        self._first_file_time = math.nan
+        self._pending = [_FolderWatchInputImage(self, loop=self._loop) for _ in range(num_frames)]
+
+        # Read here since the bindable shouldn't be accessed from the watcher thread.
+        timestamp_source = self.bn_timestamp_source.get()
+
+        watcher = DirectoryWatcher(
+            directory,
+            on_file_ready=lambda path: self._file_ready_threadsafe(watcher, path, timestamp_source),
+            pattern=self.bn_pattern.get(),
+            poll_interval=self.POLL_INTERVAL,
+        )
+        watcher.start()
+        self._watcher = watcher
+
+        return tuple(self._pending)
+
+    # Called on the watcher thread, decode images here so full frames aren't read on the event loop.
+    def _file_ready_threadsafe(
+            self,
+            watcher: DirectoryWatcher,
+            path: Path,
+            timestamp_source: TimestampSource,
+    ) -> None:
+        image = _read_image(path)
+        if image is None:
+            # Not an image file.
+            return
+
+        try:
+            file_time = _get_file_time(path, timestamp_source)
+        except OSError:
+            # File was removed.
+            return
+
+        self._loop.call_soon_threadsafe(self._file_ready, watcher, image, file_time)
+
+    def _file_ready(self, watcher: DirectoryWatcher, image: np.ndarray, file_time: float) -> None:
+        # Ignore images reported by a watcher that has since been stopped.
+        if watcher is not self._watcher or not self._pending:
+            return
+
+        if math.isnan(self._first_file_time):
+            self._first_file_time = file_time
+
+        input_image = self._pending.pop(0)
+        input_image.set_image(image, file_time - self._first_file_time)
+
+        self.bn_images.set((image,))
+
+        if not self._pending:
+            self._stop_watching()
+
+    def _input_image_cancelled(self, input_image: '_FolderWatchInputImage') -> None:
+        if input_image in self._pending:
+            self._pending.remove(input_image)
+
+        if not self._pending:
+            self._stop_watching()
+
+    def _stop_watching(self) -> None:
+        if self._watcher is None:
+            return
+
+        # Don't block the event loop waiting for the watcher thread to exit.
+        self._watcher.stop(block=False)
+        self._watcher = None
+
+    def destroy(self) -> None:
+        for input_image in tuple(self._pending):
+            input_image.cancel()
+
+        self._stop_watching()
+        super().destroy()
+
+
+class _FolderWatchInputImage(InputImage):
+    is_replicated = True
+
+    def __init__(self, acquirer: FolderWatchAcquirer, *, loop: asyncio.AbstractEventLoop) -> None:
+        self._acquirer = acquirer
+        self._read_fut = loop.create_future()
+
+    def set_image(self, image: np.ndarray, timestamp: float) -> None:
+        if self._read_fut.done():
+            return
+
+        self._read_fut.set_result((image, round(timestamp, 3)))
+
+    async def read(self) -> Tuple[np.ndarray, float]:
+        return await self._read_fut
+
+    def cancel(self) -> None:
+        self._read_fut.cancel()
+        self._acquirer._input_image_cancelled(self)
+
+
+def _read_image(path: Union[Path, str]) -> Optional[np.ndarray]:
+    image = cv2.imread(str(path))
+    if image is None:
+        return None
+
+    return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
+
+def _get_file_time(path: Path, source: TimestampSource) -> float:
+    if source is TimestampSource.FILENAME:
+        return _time_from_filename(path)
+    else:
+        return path.stat().st_mtime
+
+
+_NUMBER_RE = re.compile(r'\d+(?:\.\d+)?')
+
+
+def _time_from_filename(path: Path) -> float:
+    """Return the last number in the file name (excluding the extension), e.g. 'drop_0012.5.png' gives 12.5. If the
+    file name contains no numbers, return NaN."""
+    numbers = _NUMBER_RE.findall(path.stem)
+    if not numbers:
+        return math.nan
+
+    return float(numbers[-1])
@@ -31,8 +31,6 @@ import os
 from pathlib import Path
 from typing import Tuple, Optional, NamedTuple, Sequence
 
-import cv2
-
 import genicam.gentl
 import numpy as np
 import opendrop.vendor.harvesters.core as harvesters
@@ -40,6 +38,7 @@ import opendrop.vendor.harvesters.core as harvesters
 from opendrop.utility.bindable import VariableBindable, AccessorBindable
 from opendrop.utility.bindable.typing import ReadBindable
 from opendrop.utility.events import EventConnection
+from opendrop.utility.pixelformat import PixelFormatConverter, UnsupportedPixelFormat
 from .camera import CameraAcquirer, Camera, CameraCaptureError
 
 
@@ -157,6 +156,7 @@ class GenicamAcquirer(CameraAcquirer):
 class GenicamCamera(Camera):
     def __init__(self, hacquirer: harvesters.ImageAcquirer) -> None:
         self._hacquirer = hacquirer
+        self._converter = PixelFormatConverter()
         self.bn_alive = VariableBindable(False)
 
         try:
@@ -184,75 +184,10 @@ class GenicamCamera(Camera):
                 writeable=False,
             )
 
-            data_format = component.data_format
-
-            if data_format == 'Mono8':
-                image = cv2.cvtColor(data, cv2.COLOR_GRAY2RGB)
-            elif data_format == 'Mono10':
-                image = cv2.cvtColor(data, cv2.COLOR_GRAY2RGB)
-                image = (image/1023*255).astype(np.uint8)
-            elif data_format == 'Mono12':
-                image = cv2.cvtColor(data, cv2.COLOR_GRAY2RGB)
-                image = (image/4095*255).astype(np.uint8)
-            elif data_format == 'RGB8':
-                image = data.reshape(height, width, 3).copy()
-            elif data_format == 'RGB10':
-                image = data.reshape(height, width, 3)
-                image = (image/1023*255).astype(np.uint8)
-            elif data_format == 'RGB12':
-                image = data.reshape(height, width, 3)
-                image = (image/4095*255).astype(np.uint8)
-            elif data_format == 'BGR8':
-                image = cv2.cvtColor(
-                    data.reshape(height, width, 3),
-                    code=cv2.COLOR_BGR2RGB,
-                )
-            elif data_format == 'BGR10':
-                image = cv2.cvtColor(
-                    data.reshape(height, width, 3),
-                    code=cv2.COLOR_BGR2RGB,
-                )
-                image = (image/1023*255).astype(np.uint8)
-            elif data_format == 'BGR12':
-                image = cv2.cvtColor(
-                    data.reshape(height, width, 3),
-                    code=cv2.COLOR_BGR2RGB,
-                )
-                image = (image/4095*255).astype(np.uint8)
-            elif data_format in {'BayerGR8', 'BayerRG8', 'BayerBG8', 'BayerGB8'}:
-                image = cv2.cvtColor(
-                    data,
-                    # OpenCV has a different Bayer pattern naming convention.
-                    code={'BayerGR8': cv2.COLOR_BayerGB2RGB,
-                          'BayerRG8': cv2.COLOR_BayerBG2RGB,
-                          'BayerBG8': cv2.COLOR_BayerRG2RGB,
-                          'BayerGB8': cv2.COLOR_BayerGR2RGB,
-                    }[data_format]
-                )
-            elif data_format in {'BayerGR10', 'BayerRG10', 'BayerBG10', 'BayerGB10'}:
-                image = cv2.cvtColor(
-                    data,
-                    # OpenCV has a different Bayer pattern naming convention.
-                    code={'BayerGR10': cv2.COLOR_BayerGB2RGB,
-                          'BayerRG10': cv2.COLOR_BayerBG2RGB,
-                          'BayerBG10': cv2.COLOR_BayerRG2RGB,
-                          'BayerGB10': cv2.COLOR_BayerGR2RGB,
-                    }[data_format]
-                )
-                image = (image/1023*255).astype(np.uint8)
-            elif data_format in {'BayerGR12', 'BayerRG12', 'BayerBG12', 'BayerGB12'}:
-                image = cv2.cvtColor(
-                    data,
-                    # OpenCV has a different Bayer pattern naming convention.
-                    code={'BayerGR12': cv2.COLOR_BayerGB2RGB,
-                          'BayerRG12': cv2.COLOR_BayerBG2RGB,
-                          'BayerBG12': cv2.COLOR_BayerRG2RGB,
-                          'BayerGB12': cv2.COLOR_BayerGR2RGB,
-                    }[data_format]
-                )
-                image = (image/4095*255).astype(np.uint8)
-            else:
-                raise CameraCaptureError('Unsupported pixel format {}'.format(data_format))
+            try:
+                image = self._converter.convert(component.data_format, data, width, height)
+            except UnsupportedPixelFormat as e:
+                raise CameraCaptureError(str(e)) from e
 
             return image
 
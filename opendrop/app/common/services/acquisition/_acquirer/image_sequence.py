@@ -27,7 +27,7 @@
 # with this software.  If not, see <https://www.gnu.org/licenses/>.
 
 
-from typing import Sequence, Tuple, Optional
+from typing import Sequence, Tuple, Optional, Hashable
 
 import numpy as np
 
@@ -44,6 +44,20 @@ class ImageSequenceAcquirer(ImageAcquirer):
 
         self.bn_frame_interval = VariableBindable(None)  # type: Bindable[Optional[int]]
 
+        self._keyed_images = None  # type: Optional[Sequence[np.ndarray]]
+        self._keys_generation = 0
+
+    def get_image_keys(self) -> Sequence[Hashable]:
+        """Return a key for each image in `bn_images`, a key identifies the same image for as long as it stays in
+        `bn_images`. Images don't need to be read to compute their keys."""
+        images = self.bn_images.get()
+
+        if images is not self._keyed_images:
+            self._keyed_images = images
+            self._keys_generation += 1
+
+        return tuple((self._keys_generation, i) for i in range(len(images)))
+
     def acquire_images(self) -> Sequence[InputImage]:
         images = self.bn_images.get()
         if len(images) == 0:
@@ -0,0 +1,155 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import operator
+from pathlib import Path
+from typing import Sequence, Tuple, Optional, Union, Hashable
+
+import numpy as np
+
+from opendrop.utility.bindable import VariableBindable
+from opendrop.utility.bindable.typing import Bindable
+from opendrop.utility.mmstack import ImageStack
+from .base import InputImage
+from .image_sequence import ImageSequenceAcquirer
+
+
+class ImageStackAcquirer(ImageSequenceAcquirer):
+    """Acquire images from a multi-page TIFF or '.npy' stack. The stack is memory-mapped, so frames are only read
+    from disk as they are needed."""
+
+    IS_REPLICATED = True
+
+    def __init__(self) -> None:
+        super().__init__()
+
+        # Frames are lazily loaded, so avoid the default equality check which would read in every frame.
+        self.bn_images = VariableBindable(tuple(), check_equals=operator.is_)  # type: Bindable[Sequence[np.ndarray]]
+
+        self._stack = None  # type: Optional[ImageStack]
+        # Incremented every time a stack is loaded, so frame keys of different stacks don't collide.
+        self._stack_generation = 0
+        # Indices of the stack frames currently in `bn_images`.
+        self._frame_indices = range(0)
+
+        self.bn_last_loaded_path = VariableBindable(None)  # type: Bindable[Optional[Path]]
+        self.bn_num_stack_frames = VariableBindable(0)  # type: Bindable[int]
+
+        self.bn_frame_start = VariableBindable(0)  # type: Bindable[Optional[int]]
+        self.bn_frame_stop = VariableBindable(None)  # type: Bindable[Optional[int]]
+        self.bn_frame_step = VariableBindable(1)  # type: Bindable[Optional[int]]
+
+        self.bn_frame_start.on_changed.connect(self._update_images)
+        self.bn_frame_stop.on_changed.connect(self._update_images)
+        self.bn_frame_step.on_changed.connect(self._update_images)
+
+    def load_stack(self, path: Union[Path, str]) -> None:
+        path = Path(path)
+        stack = ImageStack.open(path)
+
+        self._stack = stack
+        self._stack_generation += 1
+        self.bn_num_stack_frames.set(len(stack))
+        self._update_images()
+        self.bn_last_loaded_path.set(path)
+
+    def _get_frame_indices(self) -> range:
+        if self._stack is None:
+            return range(0)
+
+        start = self.bn_frame_start.get() or 0
+        stop = self.bn_frame_stop.get()
+        step = self.bn_frame_step.get() or 1
+
+        if step <= 0:
+            raise ValueError(
+                "'frame_step' must be > 0, currently: '{}'"
+                .format(step)
+            )
+
+        return range(len(self._stack))[start:stop:step]
+
+    def _update_images(self) -> None:
+        if self._stack is None:
+            self._frame_indices = range(0)
+            self.bn_images.set(tuple())
+            return
+
+        indices = self._get_frame_indices()
+        self._frame_indices = indices
+        self.bn_images.set(self._stack.rgb8_frames(indices.start, indices.stop, indices.step))
+
+    def get_image_keys(self) -> Sequence[Hashable]:
+        # Key frames by their index in the stack, so changing the frame range keeps the keys of frames still in range.
+        return tuple((self._stack_generation, index) for index in self._frame_indices)
+
+    def acquire_images(self) -> Sequence[InputImage]:
+        indices = self._get_frame_indices()
+        if len(indices) == 0:
+            raise ValueError("No frames selected")
+
+        frame_interval = self.bn_frame_interval.get()
+        if frame_interval is None or frame_interval <= 0:
+            if len(indices) == 1:
+                frame_interval = 0
+            else:
+                raise ValueError(
+                    "'frame_interval' must be > 0 and not None, currently: '{}'"
+                    .format(frame_interval)
+                )
+
+        input_images = []
+
+        for index in indices:
+            input_image = _ImageStackInputImage(
+                stack=self._stack,
+                index=index,
+                # Frame interval is the time between consecutive frames of the stack, so skipped frames still count.
+                timestamp=(index - indices.start) * frame_interval,
+            )
+            input_image.is_replicated = self.IS_REPLICATED
+            input_images.append(input_image)
+
+        return input_images
+
+    def get_image_size_hint(self) -> Optional[Tuple[int, int]]:
+        if self._stack is None or len(self._stack) == 0:
+            return None
+
+        return self._stack.frame_size
+
+
+class _ImageStackInputImage(InputImage):
+    def __init__(self, stack: ImageStack, index: int, timestamp: float) -> None:
+        self._stack = stack
+        self._index = index
+        self._timestamp = timestamp
+
+    async def read(self) -> Tuple[np.ndarray, float]:
+        return self._stack.get_rgb8(self._index), self._timestamp
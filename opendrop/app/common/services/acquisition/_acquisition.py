@@ -30,7 +30,15 @@
 from enum import Enum
 from typing import Optional, Tuple, Sequence
 
-from ._acquirer import ImageAcquirer, InputImage, LocalStorageAcquirer, USBCameraAcquirer, GenicamAcquirer
+from ._acquirer import (
+    ImageAcquirer,
+    InputImage,
+    LocalStorageAcquirer,
+    ImageStackAcquirer,
+    FolderWatchAcquirer,
+    USBCameraAcquirer,
+    GenicamAcquirer,
+)
 from opendrop.utility.bindable import AccessorBindable
 
 
@@ -49,6 +57,10 @@ class ImageAcquisitionService:
 
         if isinstance(acquirer, LocalStorageAcquirer):
             return AcquirerType.LOCAL_STORAGE
+        elif isinstance(acquirer, ImageStackAcquirer):
+            return AcquirerType.IMAGE_STACK
+        elif isinstance(acquirer, FolderWatchAcquirer):
+            return AcquirerType.FOLDER_WATCH
         elif isinstance(acquirer, USBCameraAcquirer):
             return AcquirerType.USB_CAMERA
         elif isinstance(acquirer, GenicamAcquirer):
@@ -69,6 +81,10 @@ class ImageAcquisitionService:
 
         if acquirer_type is AcquirerType.LOCAL_STORAGE:
             new_acquirer = LocalStorageAcquirer()
+        elif acquirer_type is AcquirerType.IMAGE_STACK:
+            new_acquirer = ImageStackAcquirer()
+        elif acquirer_type is AcquirerType.FOLDER_WATCH:
+            new_acquirer = FolderWatchAcquirer()
         elif acquirer_type is AcquirerType.USB_CAMERA:
             new_acquirer = USBCameraAcquirer()
         elif acquirer_type is AcquirerType.GENICAM:
@@ -113,6 +129,8 @@ class ImageAcquisitionService:
 
 class AcquirerType(Enum):
     LOCAL_STORAGE = ('Filesystem',)
+    IMAGE_STACK = ('Image stack',)
+    FOLDER_WATCH = ('Watch folder',)
     USB_CAMERA = ('OpenCV',)
     GENICAM = ('GenICam',)
 
@@ -28,5 +28,5 @@
 
 
 from .analysis import ConanAnalysis
-from .contact_angle import ContactAngleCalculator, ContactAngleCalculatorParams
-from .features import FeatureExtractor, FeatureExtractorParams
+from .contact_angle import ContactAngleBatchCalculator, ContactAngleCalculator, ContactAngleCalculatorParams
+from .features import FeatureExtractor, FeatureExtractorParams, FeatureExtractorPool
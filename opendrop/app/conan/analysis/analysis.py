@@ -89,6 +89,8 @@ class ConanAnalysis:
         self._extracted_features = None  # type: Optional[FeatureExtractor]
         self._calculated_conan = None  # type: Optional[ContactAngleCalculator]
 
+        self._priority = False
+
         self.bn_image = AccessorBindable(self._get_image)
         self.bn_image_timestamp = AccessorBindable(self._get_image_timestamp)
 
@@ -139,6 +141,7 @@ class ConanAnalysis:
         self._image.flags.writeable = False
 
         extracted_features = self._do_extract_features(VariableBindable(self._image))
+        extracted_features.set_priority(self._priority)
         calculated_conan = self._do_calculate_conan(extracted_features)
 
         self._extracted_features = extracted_features
@@ -183,6 +186,13 @@ class ConanAnalysis:
             self.bn_surface_line
         )
 
+    def set_priority(self, priority: bool) -> None:
+        """Update this analysis before others when parameters change, use this for the analysis on screen."""
+        self._priority = priority
+
+        if self._extracted_features is not None:
+            self._extracted_features.set_priority(priority)
+
     def cancel(self) -> None:
         if self.bn_status.get().is_terminal:
             # This is already at the end of its life.
@@ -27,15 +27,18 @@
 # with this software.  If not, see <https://www.gnu.org/licenses/>.
 
 
+import asyncio
 import math
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Sequence, MutableSet, Tuple, List
 
 import numpy as np
 
-from opendrop.processing.conan import ContactAngle
-from opendrop.utility.bindable import VariableBindable
+from opendrop.analysis.conan import ContactAngleResult, conan_calculate_contact_angles
+from opendrop.utility.bindable import VariableBindable, batch
 from opendrop.utility.bindable.typing import Bindable
 from opendrop.utility.geometry import Line2, Vector2
+from opendrop.utility.memo import MemoizedStage
 from .features import FeatureExtractor
 
 
@@ -44,10 +47,108 @@ class ContactAngleCalculatorParams:
         self.bn_surface_line_px = VariableBindable(None)  # type: Bindable[Optional[Line2]]
 
 
+class ContactAngleBatchCalculator:
+    """Recalculates contact angles for many ContactAngleCalculator's at once.
+
+    Calculators queue themselves when their drop profile or the surface line changes. Queued calculators are collected
+    on the next iteration of the event loop and, if their inputs differ from those of their last result, calculated
+    together in one job on a background thread. Changes made while a job is running are picked up by a following job
+    once it finishes."""
+
+    def __init__(self, *, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        self._loop = loop or asyncio.get_event_loop()
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+        self._queued = set()  # type: MutableSet[ContactAngleCalculator]
+        self._flush_handle = None  # type: Optional[asyncio.Handle]
+        self._running = None  # type: Optional[asyncio.Future]
+
+    # Must be called on the main thread.
+    def queue(self, calculator: 'ContactAngleCalculator') -> None:
+        self._queued.add(calculator)
+
+        if self._flush_handle is None and self._running is None:
+            self._flush_handle = self._loop.call_soon(self._flush)
+
+    def _flush(self) -> None:
+        self._flush_handle = None
+
+        queued = self._queued
+        self._queued = set()
+
+        batch = []  # type: List[Tuple[ContactAngleCalculator, np.ndarray, Line2]]
+        for calculator in queued:
+            inputs = calculator._get_inputs()
+            if inputs is None or calculator._stage.matches(*inputs):
+                continue
+
+            batch.append((calculator, *inputs))
+
+        if not batch:
+            return
+
+        # Calculators share their params, but group by surface line anyway in case they don't.
+        surfaces = {id(surface): surface for _, _, surface in batch}
+        groups = [
+            [item for item in batch if item[2] is surface]
+            for surface in surfaces.values()
+        ]
+
+        self._running = self._loop.run_in_executor(self._executor, self._calculate_groups, groups)
+        self._running.add_done_callback(self._hdl_batch_done)
+
+    # Runs on the executor thread.
+    def _calculate_groups(self, groups: Sequence[Sequence[Tuple['ContactAngleCalculator', np.ndarray, Line2]]]) \
+            -> List[Tuple['ContactAngleCalculator', np.ndarray, Line2, ContactAngleResult]]:
+        completed = []
+
+        for group in groups:
+            surface = group[0][2]
+            try:
+                results = conan_calculate_contact_angles([drop_profile for _, drop_profile, _ in group], surface)
+            except Exception as exc:
+                # Other groups can still be calculated, report the failure to the loop.
+                self._loop.call_soon_threadsafe(self._loop.call_exception_handler, {
+                    'message': 'Contact angle calculation failed',
+                    'exception': exc,
+                })
+                continue
+
+            completed.extend(
+                (calculator, drop_profile, surface, result)
+                for (calculator, drop_profile, _), result in zip(group, results)
+            )
+
+        return completed
+
+    def _hdl_batch_done(self, fut: asyncio.Future) -> None:
+        self._running = None
+
+        if not fut.cancelled():
+            for calculator, drop_profile, surface, result in fut.result():
+                calculator._apply(drop_profile, surface, result)
+
+        if self._queued:
+            self._flush()
+
+    def shutdown(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        self._queued.clear()
+        self._executor.shutdown(wait=False)
+
+
 class ContactAngleCalculator:
-    def __init__(self, features: FeatureExtractor, params: ContactAngleCalculatorParams) -> None:
+    def __init__(self, features: FeatureExtractor, params: ContactAngleCalculatorParams, *,
+                 batch: ContactAngleBatchCalculator) -> None:
         self._features = features
         self.params = params
+        self._batch = batch
+
+        # Result of the tangent fit and angle stage, keyed on the drop profile and surface line.
+        self._stage = MemoizedStage()  # type: MemoizedStage[ContactAngleResult]
 
         self.bn_left_tangent = VariableBindable(np.poly1d((math.nan, math.nan)))
         self.bn_left_angle = VariableBindable(math.nan)
@@ -57,43 +158,38 @@ class ContactAngleCalculator:
         self.bn_right_point = VariableBindable(Vector2(math.nan, math.nan))
 
         # Recalculate when inputs change
-        features.bn_drop_profile_px.on_changed.connect(self._recalculate)
-        params.bn_surface_line_px.on_changed.connect(self._recalculate)
+        features.bn_drop_profile_px.on_changed.connect(self._queue_recalculate)
+        params.bn_surface_line_px.on_changed.connect(self._queue_recalculate)
 
-        self._recalculate()
+        self._queue_recalculate()
 
-    def _recalculate(self) -> None:
-        features = self._features
-        params = self.params
+    def _queue_recalculate(self) -> None:
+        self._batch.queue(self)
 
-        drop_profile = features.bn_drop_profile_px.get()
+    def _get_inputs(self) -> Optional[Tuple[np.ndarray, Line2]]:
+        drop_profile = self._features.bn_drop_profile_px.get()
         if drop_profile is None:
-            return
+            return None
 
-        surface = params.bn_surface_line_px.get()
+        surface = self.params.bn_surface_line_px.get()
         if surface is None:
+            return None
+
+        return drop_profile, surface
+
+    def _apply(self, drop_profile: np.ndarray, surface: Line2, result: ContactAngleResult) -> None:
+        self._stage.store((drop_profile, surface), result)
+
+        if not self._stage.matches(*(self._get_inputs() or ())):
+            # Inputs changed while this was being calculated, a newer result is on its way.
             return
 
-        drop_profile = drop_profile.copy()
-        surface_poly1d = np.poly1d((surface.gradient, surface.eval(x=0).y))
-
-        # ContactAngle expects the coordinates of drop profile to be such that the surface has a lower y-coordinate than
-        # the drop, so mirror the drop in y-direction. (Remember drop profile is in 'image coordinates', where
-        # increasing y-coordinate is 'downwards')
-        drop_profile[:, 1] *= -1
-        surface_poly1d = -surface_poly1d
-
-        conancalc = ContactAngle(drop_profile, surface_poly1d)
-
-        # Mirror the tangents and contact points back to original coordinate system as well.
-        left_tangent = -conancalc.left_tangent
-        left_point = Vector2(x=conancalc.left_point.x, y=-conancalc.left_point.y)
-        right_tangent = -conancalc.right_tangent
-        right_point = Vector2(x=conancalc.right_point.x, y=-conancalc.right_point.y)
-
-        self.bn_left_tangent.set(left_tangent)
-        self.bn_left_angle.set(conancalc.left_angle)
-        self.bn_left_point.set(left_point)
-        self.bn_right_tangent.set(right_tangent)
-        self.bn_right_angle.set(conancalc.right_angle)
-        self.bn_right_point.set(right_point)
+        left_tangent, left_angle, left_point, right_tangent, right_angle, right_point = result
+
+        with batch():
+            self.bn_left_tangent.set(left_tangent)
+            self.bn_left_angle.set(left_angle)
+            self.bn_left_point.set(left_point)
+            self.bn_right_tangent.set(right_tangent)
+            self.bn_right_angle.set(right_angle)
+            self.bn_right_point.set(right_point)
@@ -28,17 +28,18 @@
 
 
 import asyncio
-from typing import Optional
+import collections
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, MutableMapping, Deque
 
 import numpy as np
 
-from opendrop.processing.conan import (
-    apply_foreground_detection,
-    extract_drop_profile,
-)
+from opendrop.analysis.conan import conan_extract_drop_profile, conan_foreground_detect
 from opendrop.utility.bindable import VariableBindable, AccessorBindable, thread_safe_bindable_collection
 from opendrop.utility.bindable.typing import ReadBindable
-from opendrop.utility.updaterworker import UpdaterWorker
+from opendrop.utility.memo import MemoizedStage
 
 
 class FeatureExtractorParams:
@@ -47,6 +48,142 @@ class FeatureExtractorParams:
         self.bn_thresh = VariableBindable(30)
 
 
+class FeatureExtractorPool:
+    """Runs feature extractor updates on a bounded number of shared threads.
+
+    Each extractor has at most one update queued at a time. Queueing an extractor that is already waiting does nothing
+    (the update reads the latest image and params when it runs), and queueing an extractor whose update is running
+    makes it run once more afterwards. Extractors with priority run before all others."""
+
+    class _State:
+        PENDING = 'pending'
+        RUNNING = 'running'
+        RUNNING_DIRTY = 'running_dirty'
+
+    def __init__(self, max_workers: Optional[int] = None, *, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        self._loop = loop or asyncio.get_event_loop()
+
+        self._max_workers = max_workers or os.cpu_count() or 1
+        self._executor = ThreadPoolExecutor(max_workers=self._max_workers)
+
+        self._lock = threading.Lock()
+        self._states = {}  # type: MutableMapping[FeatureExtractor, str]
+        self._priority_pending = collections.deque()  # type: Deque[FeatureExtractor]
+        self._pending = collections.deque()  # type: Deque[FeatureExtractor]
+        self._num_drains = 0
+        self._is_shutdown = False
+
+        self.is_busy = AccessorBindable(getter=self.get_is_busy)
+
+    # Must be called on the main thread.
+    def queue(self, extractor: 'FeatureExtractor') -> None:
+        with self._lock:
+            if self._is_shutdown:
+                return
+
+            state = self._states.get(extractor)
+            if state is self._State.PENDING or state is self._State.RUNNING_DIRTY:
+                return
+            elif state is self._State.RUNNING:
+                self._states[extractor] = self._State.RUNNING_DIRTY
+                return
+
+            was_busy = bool(self._states)
+
+            self._states[extractor] = self._State.PENDING
+            if extractor.priority:
+                self._priority_pending.append(extractor)
+            else:
+                self._pending.append(extractor)
+
+            if self._num_drains < self._max_workers:
+                self._num_drains += 1
+                self._executor.submit(self._drain)
+
+        if not was_busy:
+            self.is_busy.poke()
+
+    # Must be called on the main thread.
+    def reprioritize(self, extractor: 'FeatureExtractor') -> None:
+        with self._lock:
+            if self._states.get(extractor) is not self._State.PENDING:
+                return
+
+            if extractor.priority:
+                self._pending.remove(extractor)
+                self._priority_pending.appendleft(extractor)
+            else:
+                self._priority_pending.remove(extractor)
+                self._pending.appendleft(extractor)
+
+    def is_queued(self, extractor: 'FeatureExtractor') -> bool:
+        with self._lock:
+            return extractor in self._states
+
+    # Runs on a pool thread, keeps taking extractors off the queues until they are empty.
+    def _drain(self) -> None:
+        while True:
+            with self._lock:
+                if self._priority_pending:
+                    extractor = self._priority_pending.popleft()
+                elif self._pending:
+                    extractor = self._pending.popleft()
+                else:
+                    self._num_drains -= 1
+                    return
+
+                self._states[extractor] = self._State.RUNNING
+
+            try:
+                extractor._update()
+            except Exception as exc:
+                # Don't let one failed update stop the rest of the queue from being processed, report it to the loop.
+                self._loop.call_soon_threadsafe(self._loop.call_exception_handler, {
+                    'message': 'Feature extractor update failed',
+                    'exception': exc,
+                    'extractor': extractor,
+                })
+
+            with self._lock:
+                if self._states[extractor] is self._State.RUNNING_DIRTY and not self._is_shutdown:
+                    self._states[extractor] = self._State.PENDING
+                    if extractor.priority:
+                        self._priority_pending.append(extractor)
+                    else:
+                        self._pending.append(extractor)
+                    extractor_done = False
+                else:
+                    del self._states[extractor]
+                    extractor_done = True
+
+                pool_done = not self._states
+
+            if extractor_done:
+                self._loop.call_soon_threadsafe(extractor.is_busy.poke)
+            if pool_done:
+                self._loop.call_soon_threadsafe(self.is_busy.poke)
+
+    def get_is_busy(self) -> bool:
+        with self._lock:
+            return bool(self._states)
+
+    async def wait_until_not_busy(self) -> None:
+        """Wait until every queued extractor has finished updating."""
+        while self.is_busy.get():
+            await self.is_busy.on_changed.wait()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._is_shutdown = True
+            self._priority_pending.clear()
+            self._pending.clear()
+            for extractor, state in tuple(self._states.items()):
+                if state is self._State.PENDING:
+                    del self._states[extractor]
+
+        self._executor.shutdown(wait=False)
+
+
 class FeatureExtractor:
     _Data = thread_safe_bindable_collection(
         fields=[
@@ -56,13 +193,19 @@ class FeatureExtractor:
     )
 
     def __init__(self, image: ReadBindable[np.ndarray], params: 'FeatureExtractorParams', *,
-                 loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+                 pool: FeatureExtractorPool, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
         self._loop = loop or asyncio.get_event_loop()
+        self._pool = pool
+        self._priority = False
 
         self._bn_image = image
 
         self.params = params
 
+        # Memoized stages, only used by _update() which the pool never runs concurrently for the same extractor.
+        self._foreground_detection_stage = MemoizedStage(conan_foreground_detect)
+        self._drop_profile_stage = MemoizedStage(conan_extract_drop_profile)
+
         self._data = self._Data(
             _loop=self._loop,
             bn_foreground_detection=None,
@@ -70,11 +213,6 @@ class FeatureExtractor:
         )
 
         self.is_busy = AccessorBindable(getter=self.get_is_busy)
-        self._updater_worker = UpdaterWorker(
-            do_update=self._update,
-            on_idle=self.is_busy.poke,
-            loop=self._loop,
-        )
 
         self.bn_foreground_detection = self._data.bn_foreground_detection  # type: ReadBindable[Optional[np.ndarray]]
         self.bn_drop_profile_px = self._data.bn_drop_profile_px  # type: ReadBindable[Optional[np.ndarray]]
@@ -88,20 +226,38 @@ class FeatureExtractor:
         self._queue_update()
 
     def _queue_update(self) -> None:
-        was_busy = self._updater_worker.is_busy
-        self._updater_worker.queue_update()
+        was_busy = self._pool.is_queued(self)
+        self._pool.queue(self)
         if not was_busy:
             self.is_busy.poke()
 
-    # This method will be run on different threads (could be called by UpdaterWorker), so make sure it stays
+    @property
+    def priority(self) -> bool:
+        return self._priority
+
+    def set_priority(self, priority: bool) -> None:
+        """Prioritised extractors are updated before all others in the pool, use this for the extractor on screen."""
+        if priority == self._priority:
+            return
+
+        self._priority = priority
+        self._pool.reprioritize(self)
+
+    # This method will be run on different threads (could be called by FeatureExtractorPool), so make sure it stays
     # thread-safe.
     def _update(self) -> None:
         editor = self._data.edit(timeout=1)
         assert editor is not None
 
         try:
-            new_foreground_detection = self._apply_foreground_detection()
-            new_drop_profile_px = self._extract_drop_profile_px(new_foreground_detection)
+            image = self._bn_image.get()
+            thresh = self.params.bn_thresh.get()
+            drop_region = self.params.bn_drop_region_px.get()
+
+            # Each stage only recomputes if its own inputs changed, e.g. moving the drop region reuses the foreground
+            # detection.
+            new_foreground_detection = self._foreground_detection_stage(image, thresh)
+            new_drop_profile_px = self._drop_profile_stage(new_foreground_detection, drop_region)
 
             editor.set_value('bn_foreground_detection', new_foreground_detection)
             editor.set_value('bn_drop_profile_px', new_drop_profile_px)
@@ -113,35 +269,8 @@ class FeatureExtractor:
             # Otherwise commit the changes.
             editor.commit()
 
-    def _apply_foreground_detection(self) -> Optional[np.ndarray]:
-        image = self._bn_image.get()
-        if image is None:
-            return None
-
-        return apply_foreground_detection(
-            image=image,
-            thresh=self.params.bn_thresh.get(),
-        )
-
-    def _extract_drop_profile_px(self, binary_image: Optional[np.ndarray]) -> Optional[np.ndarray]:
-        if binary_image is None:
-            return None
-
-        drop_region = self.params.bn_drop_region_px.get()
-        if drop_region is None:
-            return None
-
-        drop_region = drop_region.map(int)
-
-        drop_image = binary_image[drop_region.y0:drop_region.y1, drop_region.x0:drop_region.x1]
-
-        drop_profile_px = extract_drop_profile(drop_image)
-        drop_profile_px += drop_region.position
-
-        return drop_profile_px
-
     def get_is_busy(self) -> bool:
-        return self._updater_worker.is_busy
+        return self._pool.is_queued(self)
 
     async def wait_until_not_busy(self) -> None:
         while self.is_busy.get():
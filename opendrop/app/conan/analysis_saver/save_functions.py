@@ -27,44 +27,164 @@
 # with this software.  If not, see <https://www.gnu.org/licenses/>.
 
 
-import csv
+import functools
+import itertools
 import math
+import shutil
 from pathlib import Path
-from typing import Sequence, Tuple, Iterable
+from typing import Sequence, Tuple, Iterable, Iterator, Callable, Any, Optional, Hashable
 
 import cv2
 import numpy as np
 
+from opendrop.analysis.export import write_conan_timeline
+from opendrop.app.common.analysis_saver.export_job import ExportJob
+from opendrop.app.common.analysis_saver.live_export import LiveExport, SaveRecord
 from opendrop.app.common.analysis_saver.misc import simple_grapher, draw_line, draw_angle_marker
 from opendrop.app.conan.analysis import ConanAnalysis
 from opendrop.utility.misc import clear_directory_contents
 from .model import ConanAnalysisSaverOptions
 
 
-def save_drops(drops: Iterable[ConanAnalysis], options: ConanAnalysisSaverOptions) -> None:
+class DropSnapshot:
+    """The values of a ConanAnalysis that get saved, copied out of its bindables so that the drop can be saved on
+    another thread or process."""
+
+    def __init__(self, drop: ConanAnalysis, *, images: bool = True, profiles: bool = True) -> None:
+        self.is_image_replicated = drop.is_image_replicated
+        self.image_timestamp = drop.bn_image_timestamp.get()
+        self.left_angle = drop.bn_left_angle.get()
+        self.left_point = drop.bn_left_point.get()
+        self.left_tangent = drop.bn_left_tangent.get()
+        self.right_angle = drop.bn_right_angle.get()
+        self.right_point = drop.bn_right_point.get()
+        self.right_tangent = drop.bn_right_tangent.get()
+        self.surface_line = drop.bn_surface_line.get()
+        self.drop_region = drop.bn_drop_region.get()
+
+        self.image = drop.bn_image.get() if images else None
+        self.drop_profile_extract = drop.bn_drop_profile_extract.get() if profiles else None
+
+
+_FigureSettings = Optional[Tuple[Tuple[float, float], int]]
+
+
+def _figure_settings(figure_opts) -> _FigureSettings:
+    if not figure_opts.bn_should_save.get():
+        return None
+
+    return figure_opts.size, figure_opts.bn_dpi.get()
+
+
+def save_drops(
+        drops: Iterable[ConanAnalysis],
+        options: ConanAnalysisSaverOptions,
+        record: Optional[SaveRecord] = None,
+) -> ExportJob:
+    """Start saving `drops` in the background, return the job doing the saving.
+
+    If `record` remembers a previous save to the same place with the same options, only the drops that have changed
+    since are written again. Drops that are still being analysed are saved as they finish (the job finishes when the
+    last one has been saved)."""
     drops = list(drops)
+    record = record if record is not None else SaveRecord()
+
+    full_dir = options.save_root_dir
+    if not record.reuse(full_dir, _options_key(options, len(drops))):
+        assert full_dir.is_dir() or not full_dir.exists()
+        full_dir.mkdir(parents=True, exist_ok=True)
+        clear_directory_contents(full_dir)
+
+    finished = [i for i, drop in enumerate(drops) if drop.bn_is_done.get()]
+    num_changed = sum(record.has_changed(i, DropSnapshot(drops[i], images=False)) for i in finished)
+    num_unfinished = len(drops) - len(finished)
+
+    # One task for each drop to save, plus one for the timeline and figures.
+    num_tasks = num_changed + num_unfinished + 1
+
+    if num_unfinished == 0:
+        return ExportJob(
+            tasks=itertools.chain(
+                _save_individual_tasks(drops, finished, options, record),
+                _save_summary_tasks(drops, options),
+            ),
+            num_tasks=num_tasks,
+        )
+
+    # Rows are appended to the timeline as drops finish, it's rewritten in order at the end.
+    timeline_path = full_dir/'timeline.csv'
+    if timeline_path.exists():
+        timeline_path.unlink()
+
+    def save(indices: Sequence[int]) -> Iterator[Callable[[], Any]]:
+        with timeline_path.open('a', newline='') as out_file:
+            write_conan_timeline(
+                [DropSnapshot(drops[i], images=False, profiles=False) for i in indices],
+                out_file,
+                header=out_file.tell() == 0,
+            )
+
+        return _save_individual_tasks(drops, indices, options, record)
+
+    job = ExportJob(tasks=(), num_tasks=num_tasks, keep_open=True)
+    LiveExport(job, drops, save=save, finish=lambda: _save_summary_tasks(drops, options))
 
+    return job
+
+
+def _options_key(options: ConanAnalysisSaverOptions, num_drops: int) -> Hashable:
+    return (
+        options.bn_save_dir_name.get(),
+        num_drops,
+        _figure_settings(options.angle_figure_opts),
+    )
+
+
+def _save_individual_tasks(
+        drops: Sequence[ConanAnalysis],
+        indices: Iterable[int],
+        options: ConanAnalysisSaverOptions,
+        record: SaveRecord,
+) -> Iterator[Callable[[], Any]]:
     full_dir = options.save_root_dir
-    assert full_dir.is_dir() or not full_dir.exists()
-    full_dir.mkdir(parents=True, exist_ok=True)
-    clear_directory_contents(full_dir)
 
     padding = len(str(len(drops)))
     dir_name = options.bn_save_dir_name.get()
-    for i, drop in enumerate(drops):
+    for i in indices:
+        drop = drops[i]
+        if not record.update(i, DropSnapshot(drop, images=False)):
+            # Already saved.
+            continue
+
         drop_dir_name = dir_name + '{n:0>{padding}}'.format(n=(i+1), padding=padding)  # i+1 for 1-based indexing.
-        _save_individual(drop, drop_dir_name, options)
+        yield functools.partial(
+            _save_individual,
+            DropSnapshot(drop),
+            full_dir/drop_dir_name,
+        )
 
+
+def _save_summary_tasks(
+        drops: Sequence[ConanAnalysis],
+        options: ConanAnalysisSaverOptions,
+) -> Iterator[Callable[[], Any]]:
+    yield functools.partial(
+        _save_summary,
+        [DropSnapshot(drop, images=False, profiles=False) for drop in drops],
+        options.save_root_dir,
+        _figure_settings(options.angle_figure_opts),
+    )
+
+
+def _save_summary(drops: Sequence[DropSnapshot], full_dir: Path, angle_figure: _FigureSettings) -> None:
     with (full_dir/'timeline.csv').open('w', newline='') as out_file:
-        _save_timeline_data(drops, out_file)
+        write_conan_timeline(drops, out_file)
 
     if len(drops) <= 1:
         return
 
-    figure_opts = options.angle_figure_opts
-    if figure_opts.bn_should_save.get():
-        fig_size = figure_opts.size
-        dpi = figure_opts.bn_dpi.get()
+    if angle_figure is not None:
+        fig_size, dpi = angle_figure
         with (full_dir/'left_angle_plot.png').open('wb') as out_file:
             _save_left_angle_figure(
                 drops=drops,
@@ -79,8 +199,11 @@ def save_drops(drops: Iterable[ConanAnalysis], options: ConanAnalysisSaverOption
                 dpi=dpi)
 
 
-def _save_individual(drop: ConanAnalysis, drop_dir_name: str, options: ConanAnalysisSaverOptions) -> None:
-    full_dir = options.save_root_dir/drop_dir_name
+def _save_individual(drop: DropSnapshot, full_dir: Path) -> None:
+    if full_dir.exists():
+        # Replace an out of date save of this drop.
+        shutil.rmtree(str(full_dir))
+
     full_dir.mkdir(parents=True)
 
     _save_drop_image(drop, out_file_path=full_dir / 'image_original.png')
@@ -96,27 +219,27 @@ def _save_individual(drop: ConanAnalysis, drop_dir_name: str, options: ConanAnal
         _save_surface_line(drop, out_file=out_file)
 
 
-def _save_drop_image(drop: ConanAnalysis, out_file_path: Path) -> None:
+def _save_drop_image(drop: DropSnapshot, out_file_path: Path) -> None:
     if drop.is_image_replicated:
         # A copy of the image already exists somewhere, we don't need to save it again.
         return
 
-    image = drop.bn_image.get()
+    image = drop.image
     if image is None:
         return
 
     cv2.imwrite(str(out_file_path), cv2.cvtColor(image, cv2.COLOR_RGB2BGR))
 
 
-def _save_drop_image_annotated(drop: ConanAnalysis, out_file_path: Path) -> None:
-    image = drop.bn_image.get()
+def _save_drop_image_annotated(drop: DropSnapshot, out_file_path: Path) -> None:
+    image = drop.image
     if image is None:
         return
 
     # Draw on a copy
     image = image.copy()
 
-    drop_profile_extract = drop.bn_drop_profile_extract.get()
+    drop_profile_extract = drop.drop_profile_extract
     if drop_profile_extract is not None:
         # Draw extracted drop profile
         image = cv2.polylines(
@@ -129,7 +252,7 @@ def _save_drop_image_annotated(drop: ConanAnalysis, out_file_path: Path) -> None
         )
 
     # Draw drop region
-    drop_region = drop.bn_drop_region.get()
+    drop_region = drop.drop_region
     if drop_region is not None:
         drop_region = drop_region.map(int)
         image = cv2.rectangle(
@@ -141,7 +264,7 @@ def _save_drop_image_annotated(drop: ConanAnalysis, out_file_path: Path) -> None
         )
 
     # Draw surface line
-    surface_line = drop.bn_surface_line.get()
+    surface_line = drop.surface_line
     if surface_line is not None:
         draw_line(image, surface_line, color=(64, 255, 64))
 
@@ -151,42 +274,42 @@ def _save_drop_image_annotated(drop: ConanAnalysis, out_file_path: Path) -> None
     # Draw left angle marker
     draw_angle_marker(
         image=image,
-        vertex_pos=drop.bn_left_point.get(),
+        vertex_pos=drop.left_point,
         start_angle=surface_angle,
-        delta_angle=drop.bn_left_angle.get(),
+        delta_angle=drop.left_angle,
         radius=int(0.1 * image.shape[0]),
         color=(255, 0, 128))
 
     # Draw right angle marker
     draw_angle_marker(
         image=image,
-        vertex_pos=drop.bn_right_point.get(),
+        vertex_pos=drop.right_point,
         start_angle=math.pi + surface_angle,
-        delta_angle=-drop.bn_right_angle.get(),
+        delta_angle=-drop.right_angle,
         radius=int(0.1 * image.shape[0]),
         color=(255, 0, 128))
 
     cv2.imwrite(str(out_file_path), cv2.cvtColor(image, cv2.COLOR_RGB2BGR))
 
 
-def _save_drop_contour(drop: ConanAnalysis, out_file) -> None:
-    drop_profile_extract = drop.bn_drop_profile_extract.get()
+def _save_drop_contour(drop: DropSnapshot, out_file) -> None:
+    drop_profile_extract = drop.drop_profile_extract
     if drop_profile_extract is None or len(drop_profile_extract) == 0:
         return
 
     np.savetxt(out_file, drop_profile_extract, fmt='%.1f,%.1f')
 
 
-def _save_drop_contact_tangents(drop: ConanAnalysis, out_file) -> None:
-    left_tangent = drop.bn_left_tangent.get()
-    right_tangent = drop.bn_right_tangent.get()
+def _save_drop_contact_tangents(drop: DropSnapshot, out_file) -> None:
+    left_tangent = drop.left_tangent
+    right_tangent = drop.right_tangent
 
     tangents = np.vstack((left_tangent, right_tangent))
     np.savetxt(out_file, tangents, fmt='%.6e,%.6e')
 
 
-def _save_surface_line(drop: ConanAnalysis, out_file) -> None:
-    surface_line = drop.bn_surface_line.get()
+def _save_surface_line(drop: DropSnapshot, out_file) -> None:
+    surface_line = drop.surface_line
     if surface_line is None:
         return
 
@@ -195,16 +318,16 @@ def _save_surface_line(drop: ConanAnalysis, out_file) -> None:
     np.savetxt(out_file, coefficients, fmt='%.6e,%.6e')
 
 
-def _save_left_angle_figure(drops: Sequence[ConanAnalysis], out_file, fig_size: Tuple[float, float], dpi: int) -> None:
+def _save_left_angle_figure(drops: Sequence[DropSnapshot], out_file, fig_size: Tuple[float, float], dpi: int) -> None:
     drops = [
         drop
         for drop in drops
-        if math.isfinite(drop.bn_image_timestamp.get()) and
-           math.isfinite(drop.bn_left_angle.get())
+        if math.isfinite(drop.image_timestamp) and
+           math.isfinite(drop.left_angle)
     ]
 
     data = [*zip(*(
-        (drop.bn_image_timestamp.get(), math.degrees(drop.bn_left_angle.get()))
+        (drop.image_timestamp, math.degrees(drop.left_angle))
         for drop in drops
     ))]
 
@@ -222,16 +345,16 @@ def _save_left_angle_figure(drops: Sequence[ConanAnalysis], out_file, fig_size:
     fig.savefig(out_file)
 
 
-def _save_right_angle_figure(drops: Sequence[ConanAnalysis], out_file, fig_size: Tuple[float, float], dpi: int) -> None:
+def _save_right_angle_figure(drops: Sequence[DropSnapshot], out_file, fig_size: Tuple[float, float], dpi: int) -> None:
     drops = [
         drop
         for drop in drops
-        if math.isfinite(drop.bn_image_timestamp.get()) and
-           math.isfinite(drop.bn_right_angle.get())
+        if math.isfinite(drop.image_timestamp) and
+           math.isfinite(drop.right_angle)
     ]
 
     data = [*zip(*(
-        (drop.bn_image_timestamp.get(), math.degrees(drop.bn_right_angle.get()))
+        (drop.image_timestamp, math.degrees(drop.right_angle))
         for drop in drops
     ))]
 
@@ -247,33 +370,3 @@ def _save_right_angle_figure(drops: Sequence[ConanAnalysis], out_file, fig_size:
     )
 
     fig.savefig(out_file)
-
-
-def _save_timeline_data(drops: Sequence[ConanAnalysis], out_file) -> None:
-    writer = csv.writer(out_file)
-    writer.writerow([
-        'Time (s)',
-        'Left angle (degrees)',
-        'Right angle (degrees)',
-        'Left contact x-coordinate (px)',
-        'Left contact y-coordinate (px)',
-        'Right contact x-coordinate (px)',
-        'Right contact y-coordinate (px)',
-    ])
-
-    for drop in drops:
-        timestamp = drop.bn_image_timestamp.get()
-        left_angle = math.degrees(drop.bn_left_angle.get())
-        left_point = drop.bn_left_point.get()
-        right_angle = math.degrees(drop.bn_right_angle.get())
-        right_point = drop.bn_right_point.get()
-
-        writer.writerow([
-            format(timestamp, '.1f'),
-            format(left_angle, '.1f'),
-            format(right_angle, '.1f'),
-            format(left_point.x, '.1f'),
-            format(left_point.y, '.1f'),
-            format(right_point.x, '.1f'),
-            format(right_point.y, '.1f'),
-        ])
@@ -36,7 +36,12 @@ import numpy as np
 from opendrop.app.common.services.acquisition import ImageAcquisitionService
 from opendrop.app.common.image_processing.plugins.define_line import DefineLinePluginModel
 from opendrop.app.common.image_processing.plugins.define_region import DefineRegionPluginModel
-from opendrop.app.conan.analysis import FeatureExtractor, FeatureExtractorParams, ContactAngleCalculatorParams
+from opendrop.app.conan.analysis import (
+    ContactAngleCalculatorParams,
+    FeatureExtractor,
+    FeatureExtractorParams,
+    FeatureExtractorPool,
+)
 from opendrop.utility.bindable import VariableBindable, AccessorBindable
 from opendrop.utility.geometry import Rect2
 from .plugins import ToolID
@@ -50,12 +55,14 @@ class ConanImageProcessingModel:
             self, *,
             image_acquisition: ImageAcquisitionService,
             feature_extractor_params: FeatureExtractorParams,
+            feature_extractor_pool: FeatureExtractorPool,
             conancalc_params: ContactAngleCalculatorParams,
     ) -> None:
         self._loop = asyncio.get_event_loop()
 
         self._image_acquisition = image_acquisition
         self._feature_extractor_params = feature_extractor_params
+        self._feature_extractor_pool = feature_extractor_pool
         self._conancalc_params = conancalc_params
 
         self.bn_active_tool = VariableBindable(ToolID.DROP_REGION)
@@ -85,7 +92,7 @@ class ConanImageProcessingModel:
         )
 
     def _extract_features(self, image: np.ndarray) -> FeatureExtractor:
-        return FeatureExtractor(image, self._feature_extractor_params, loop=self._loop)
+        return FeatureExtractor(image, self._feature_extractor_params, pool=self._feature_extractor_pool, loop=self._loop)
 
     def _get_region_clip(self) -> Optional[Rect2[int]]:
         image_size_hint = self._image_acquisition.get_image_size_hint()
@@ -36,7 +36,6 @@ from opendrop.app.common.image_processing.plugins.preview import AcquirerControl
     image_sequence_navigator_cs
 from opendrop.mvp import ComponentSymbol, View, Presenter
 from opendrop.utility.geometry import Rect2
-from opendrop.utility.gmisc import pixbuf_from_array
 from opendrop.widgets.render.objects import PixbufFill, Polyline, MaskFill
 from .model import ConanPreviewPluginModel
 
@@ -73,10 +72,10 @@ class ConanPreviewPluginView(View['ConanPreviewPluginPresenter', None]):
 
     def set_background_image(self, image: Optional[np.ndarray]) -> None:
         if image is None:
-            self._background_ro.props.pixbuf = None
+            self._background_ro.props.image = None
             return
 
-        self._background_ro.props.pixbuf = pixbuf_from_array(image)
+        self._background_ro.props.image = image
 
         self._render.props.canvas_size = image.shape[1::-1]
         self._render.viewport_extents = Rect2(position=(0, 0), size=image.shape[1::-1])
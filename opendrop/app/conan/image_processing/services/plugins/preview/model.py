@@ -145,22 +145,29 @@ class ConanImageSequenceAcquirerController(ImageSequenceAcquirerController):
             source_image_out=source_image_out,
         )
 
-    def _on_image_registered(self, image_id: Hashable, image: np.ndarray) -> None:
-        extracted_feature = self._do_extract_features(VariableBindable(image))
-        self._extracted_features[image_id] = extracted_feature
-
     def _on_image_deregistered(self, image_id: Hashable) -> None:
-        del self._extracted_features[image_id]
+        self._extracted_features.pop(image_id, None)
 
     def _on_image_changed(self, image_id: Hashable) -> None:
-        extracted_feature = self._extracted_features[image_id]
+        # Features are only extracted for images that have been shown, so frames aren't read in until needed.
+        extracted_feature = self._extracted_features.get(image_id)
+        if extracted_feature is None:
+            extracted_feature = self._do_extract_features(VariableBindable(self._get_image(image_id)))
+            self._extracted_features[image_id] = extracted_feature
+
         self._set_showing_extracted_feature(extracted_feature)
 
     def _set_showing_extracted_feature(self, extracted_feature: Optional[FeatureExtractor]) -> None:
         self._unbind_showing_extracted_feature()
 
+        if self._showing_extracted_feature is not None:
+            self._showing_extracted_feature.set_priority(False)
+
         self._showing_extracted_feature = extracted_feature
 
+        if extracted_feature is not None:
+            extracted_feature.set_priority(True)
+
         if extracted_feature is None:
             self._foreground_detection_out.set(None)
             return
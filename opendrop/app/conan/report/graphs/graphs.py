@@ -30,7 +30,7 @@
 import math
 from typing import Sequence, Iterable
 
-from gi.repository import Gtk, GObject
+from gi.repository import Gtk, GLib, GObject
 from injector import inject
 from matplotlib import ticker
 from matplotlib.backends.backend_gtk3cairo import FigureCanvasGTK3Cairo as FigureCanvas
@@ -38,6 +38,7 @@ from matplotlib.figure import Figure
 
 from opendrop.app.conan.analysis import ConanAnalysis
 from opendrop.appfw import Presenter, TemplateChild, component, install
+from opendrop.utility.decimate import DecimatedLine
 
 from .services.graphs import ConanReportGraphsService
 
@@ -49,7 +50,11 @@ class ConanReportGraphsPresenter(Presenter[Gtk.Stack]):
     no_data_label = TemplateChild('no_data_label')
     figure_container = TemplateChild('figure_container')  # type: TemplateChild[Gtk.Container]
 
+    # Minimum time between redraws (in milliseconds), since data can change many times a second during an analysis.
+    REDRAW_INTERVAL = 250
+
     _analyses = ()
+    _redraw_timer = None
 
     @inject
     def __init__(self, graphs_service: ConanReportGraphsService) -> None:
@@ -85,10 +90,13 @@ class ConanReportGraphsPresenter(Presenter[Gtk.Stack]):
         for lbl in self.left_angle_axes.get_xticklabels():
             lbl.set_visible(False)
 
-        self._left_angle_line = self.left_angle_axes.plot([], marker='o', color='blue')[0]
-        self._right_angle_line = right_angle_axes.plot([], marker='o', color='blue')[0]
-        self.graphs_service.connect('notify::left-angle', self.data_changed)
-        self.graphs_service.connect('notify::right-angle', self.data_changed)
+        # Series can have hundreds of thousands of points, only draw as many as can be seen.
+        self._left_angle_line = DecimatedLine(self.left_angle_axes.plot([], marker='o', color='blue')[0])
+        self._right_angle_line = DecimatedLine(right_angle_axes.plot([], marker='o', color='blue')[0])
+        self._graphs_service_handler_ids = [
+            self.graphs_service.connect('notify::left-angle', self.data_changed),
+            self.graphs_service.connect('notify::right-angle', self.data_changed),
+        ]
 
     @install
     @GObject.Property
@@ -101,11 +109,24 @@ class ConanReportGraphsPresenter(Presenter[Gtk.Stack]):
         self.graphs_service.analyses = analyses
 
     def data_changed(self, *_) -> None:
+        if self._redraw_timer is not None:
+            # Already scheduled.
+            return
+
+        self._redraw_timer = GLib.timeout_add(self.REDRAW_INTERVAL, self._redraw_timer_timeout)
+
+    def _redraw_timer_timeout(self) -> bool:
+        self._redraw_timer = None
+        self.update_data()
+        return GLib.SOURCE_REMOVE
+
+    def update_data(self) -> None:
         left_angle_data = self.graphs_service.left_angle
         right_angle_data = self.graphs_service.right_angle
 
-        if len(left_angle_data) <= 1 and len(right_angle_data) <=1:
+        if len(left_angle_data[0]) <= 1 and len(right_angle_data[0]) <= 1:
             self.show_waiting_placeholder()
+            return
 
         self.hide_waiting_placeholder()
 
@@ -119,19 +140,23 @@ class ConanReportGraphsPresenter(Presenter[Gtk.Stack]):
         self._right_angle_line.axes.relim()
         self._right_angle_line.axes.margins(y=0.1)
 
-        self.figure_canvas.draw()
+        self.figure_canvas.draw_idle()
 
     def update_xlim(self) -> None:
-        all_xdata = (
-            *self._left_angle_line.get_xdata(),
-            *self._right_angle_line.get_xdata(),
-        )
+        all_xdata = [
+            xdata for xdata in (
+                self._left_angle_line.get_xdata(),
+                self._right_angle_line.get_xdata(),
+            )
+            if len(xdata) > 0
+        ]
 
-        if len(all_xdata) <= 1:
+        if sum(map(len, all_xdata)) <= 1:
             return
 
-        xmin = min(all_xdata)
-        xmax = max(all_xdata)
+        # Data is in ascending order.
+        xmin = min(xdata[0] for xdata in all_xdata)
+        xmax = max(xdata[-1] for xdata in all_xdata)
 
         if xmin == xmax:
             return
@@ -143,3 +168,11 @@ class ConanReportGraphsPresenter(Presenter[Gtk.Stack]):
 
     def hide_waiting_placeholder(self) -> None:
         self.host.set_visible_child(self.figure_container)
+
+    def destroy(self, *_) -> None:
+        if self._redraw_timer is not None:
+            GLib.source_remove(self._redraw_timer)
+            self._redraw_timer = None
+
+        for handler_id in self._graphs_service_handler_ids:
+            self.graphs_service.disconnect(handler_id)
@@ -27,18 +27,16 @@
 # with this software.  If not, see <https://www.gnu.org/licenses/>.
 
 
-import math
-from typing import Sequence, Iterable, Tuple
+from typing import Sequence, Iterable, MutableMapping, Tuple
 
 from gi.repository import GObject
 
 from opendrop.app.conan.analysis import ConanAnalysis
+from opendrop.utility.timeseries import TimeSeries
 
 
 class ConanReportGraphsService(GObject.Object):
     _analyses = ()  # type: Sequence[ConanAnalysis]
-    _left_angle = ((), ())  # type: Tuple[Sequence[float], Sequence[float]]
-    _right_angle = ((), ())  # type: Tuple[Sequence[float], Sequence[float]]
 
     class _AnalysisWatcher:
         def __init__(self, analysis: ConanAnalysis, owner: 'ConanReportGraphsService') -> None:
@@ -47,22 +45,30 @@ class ConanReportGraphsService(GObject.Object):
             self._cleanup_tasks = []
 
             event_connections = [
+                self.analysis.bn_image_timestamp.on_changed.connect(
+                    self._hdl_analysis_data_changed
+                ),
                 self.analysis.bn_left_angle.on_changed.connect(
-                    owner._tracked_analysis_data_changed
+                    self._hdl_analysis_data_changed
                 ),
                 self.analysis.bn_right_angle.on_changed.connect(
-                    owner._tracked_analysis_data_changed
+                    self._hdl_analysis_data_changed
                 ),
             ]
 
             self._cleanup_tasks.extend(conn.disconnect for conn in event_connections)
 
+        def _hdl_analysis_data_changed(self) -> None:
+            self._owner._tracked_analysis_data_changed(self.analysis)
+
         def destroy(self) -> None:
             for f in self._cleanup_tasks:
                 f()
 
     def __init__(self, **properties) -> None:
-        self._watchers = []
+        self._watchers = {}  # type: MutableMapping[ConanAnalysis, ConanReportGraphsService._AnalysisWatcher]
+        self._left_angle = TimeSeries()  # type: TimeSeries[ConanAnalysis]
+        self._right_angle = TimeSeries()  # type: TimeSeries[ConanAnalysis]
         super().__init__(**properties)
 
     @GObject.Property
@@ -76,64 +82,40 @@ class ConanReportGraphsService(GObject.Object):
 
     @GObject.Property
     def left_angle(self) -> Tuple[Sequence[float], Sequence[float]]:
-        return self._left_angle
+        return self._left_angle.data()
 
     @GObject.Property
     def right_angle(self) -> Tuple[Sequence[float], Sequence[float]]:
-        return self._right_angle
+        return self._right_angle.data()
 
     def _analyses_changed(self) -> None:
-        analyses = self._analyses
-        watching = [w.analysis for w in self._watchers]
-
-        to_watch = set(analyses) - set(watching)
-        for analysis in to_watch:
-            self._watchers.append(self._AnalysisWatcher(analysis, self))
-
-        to_unwatch = set(watching) - set(analyses)
-        for analysis in to_unwatch:
-            for w in tuple(self._watchers):
-                if w.analysis == analysis:
-                    w.destroy()
-                    self._watchers.remove(w)
-
-        self._tracked_analysis_data_changed()
-
-    def _tracked_analysis_data_changed(self) -> None:
-        left_angle_data = []
-        right_angle_data = []
-
-        analyses = self._analyses
+        analyses = set(self._analyses)
+        watching = set(self._watchers)
 
-        for analysis in analyses:
-            timestamp = analysis.bn_image_timestamp.get()
-            if timestamp is None or not math.isfinite(timestamp):
-                continue
+        for analysis in watching - analyses:
+            self._watchers.pop(analysis).destroy()
+            self._left_angle.discard(analysis)
+            self._right_angle.discard(analysis)
 
-            left_angle_value = analysis.bn_left_angle.get()
-            right_angle_value = analysis.bn_right_angle.get()
+        for analysis in analyses - watching:
+            self._watchers[analysis] = self._AnalysisWatcher(analysis, self)
+            self._update_series(analysis)
 
-            if left_angle_value is not None and math.isfinite(left_angle_value):
-                left_angle_data.append((timestamp, left_angle_value))
-
-            if right_angle_value is not None and math.isfinite(right_angle_value):
-                right_angle_data.append((timestamp, right_angle_value))
-
-        # Sort in ascending order of timestamp
-        left_angle_data = sorted(left_angle_data, key=lambda x: x[0])
-        right_angle_data = sorted(right_angle_data, key=lambda x: x[0])
-
-        left_angle_data = tuple(zip(*left_angle_data))
-        right_angle_data = tuple(zip(*right_angle_data))
+        self.notify('left-angle')
+        self.notify('right-angle')
 
-        if len(left_angle_data) == 0:
-            left_angle_data = (tuple(), tuple())
+    def _tracked_analysis_data_changed(self, analysis: ConanAnalysis) -> None:
+        left_angle_changed, right_angle_changed = self._update_series(analysis)
 
-        if len(right_angle_data) == 0:
-            right_angle_data = (tuple(), tuple())
+        if left_angle_changed:
+            self.notify('left-angle')
+        if right_angle_changed:
+            self.notify('right-angle')
 
-        self._left_angle = left_angle_data
-        self._right_angle = right_angle_data
+    def _update_series(self, analysis: ConanAnalysis) -> Tuple[bool, bool]:
+        timestamp = analysis.bn_image_timestamp.get()
 
-        self.notify('left-angle')
-        self.notify('right-angle')
+        return (
+            self._left_angle.set(analysis, timestamp, analysis.bn_left_angle.get()),
+            self._right_angle.set(analysis, timestamp, analysis.bn_right_angle.get()),
+        )
@@ -32,7 +32,6 @@ from typing import Optional
 
 from gi.repository import Gtk, GObject
 
-from opendrop.utility.gmisc import pixbuf_from_array
 from opendrop.utility.geometry import Rect2
 from opendrop.widgets.render import Render
 from opendrop.widgets.render.objects import PixbufFill, Line, Polyline, Angle
@@ -114,11 +113,11 @@ class ConanReportOverviewImagePresenter(Presenter[Gtk.Container]):
 
         image = analysis.bn_image.get()
         if image is not None:
-            self.background_ro.props.pixbuf = pixbuf_from_array(image)
+            self.background_ro.props.image = image
             self.render.props.canvas_size = image.shape[1::-1]
             self.render.viewport_extents = Rect2(position=(0, 0), size=image.shape[1::-1])
         else:
-            self.background_ro.props.pixbuf = None
+            self.background_ro.props.image = None
 
         left_angle = analysis.bn_left_angle.get()
         if left_angle is not None and math.isfinite(left_angle):
@@ -34,6 +34,7 @@ from gi.repository import Gtk, GObject
 
 from opendrop.app.conan.analysis import ConanAnalysis
 from opendrop.appfw import Presenter, TemplateChild, component, install
+from opendrop.widgets.lazy_list_model import LazyListModel
 
 
 @component(
@@ -41,7 +42,6 @@ from opendrop.appfw import Presenter, TemplateChild, component, install
 )
 class ConanReportOverviewMasterPresenter(Presenter):
     tree_view = TemplateChild('tree_view')  # type: TemplateChild[Gtk.TreeView]
-    tree_model = TemplateChild('tree_model')  # type: TemplateChild[Gtk.ListStore]
     tree_selection = TemplateChild('tree_selection')  # type: TemplateChild[Gtk.TreeSelection]
 
     _initial_selection = None
@@ -49,78 +49,19 @@ class ConanReportOverviewMasterPresenter(Presenter):
 
     view_ready = False
 
-    class _RowPresenter:
-        TIMESTAMP_COL = 0
-        STATUS_COL = 1
-        LEFT_ANGLE_COL = 2
-        RIGHT_ANGLE_COL = 3
-
-        def __init__(self, row_ref: Gtk.TreeRowReference, analysis: ConanAnalysis) -> None:
-            self.row_ref = row_ref
-            self.analysis = analysis
-
-            self._event_connections = [
-                analysis.bn_image_timestamp.on_changed.connect(
-                    self._update_timestamp
-                ),
-                analysis.bn_status.on_changed.connect(
-                    self._update_status_text
-                ),
-                analysis.bn_left_angle.on_changed.connect(
-                    self._update_left_angle
-                ),
-                analysis.bn_right_angle.on_changed.connect(
-                    self._update_right_angle
-                ),
-            ]
-
-            self._update_timestamp()
-            self._update_status_text()
-            self._update_left_angle()
-            self._update_right_angle()
-
-        def _update_timestamp(self) -> None:
-            timestamp = self.analysis.bn_image_timestamp.get()
-            text = format(timestamp, '.1f')
-            self._tree_model.set_value(self._tree_iter, column=self.TIMESTAMP_COL, value=text)
-
-        def _update_status_text(self) -> None:
-            status = self.analysis.bn_status.get()
-            text = status.display_name
-            self._tree_model.set_value(self._tree_iter, column=self.STATUS_COL, value=text)
-
-        def _update_left_angle(self) -> None:
-            left_angle = self.analysis.bn_left_angle.get()
-            if left_angle is not None and math.isfinite(left_angle):
-                text = format(math.degrees(left_angle), '.1f')
-            else:
-                text = ''
-            self._tree_model.set_value(self._tree_iter, column=self.LEFT_ANGLE_COL, value=text)
-
-        def _update_right_angle(self) -> None:
-            right_angle = self.analysis.bn_right_angle.get()
-            if right_angle is not None and math.isfinite(right_angle):
-                text = format(math.degrees(right_angle), '.1f')
-            else:
-                text = ''
-            self._tree_model.set_value(self._tree_iter, column=self.RIGHT_ANGLE_COL, value=text)
-
-        @property
-        def _tree_iter(self) -> Gtk.TreeIter:
-            return self._tree_model.get_iter(self.row_ref.get_path())
-
-        @property
-        def _tree_model(self) -> Gtk.TreeModel:
-            return self.row_ref.get_model()
-
-        def destroy(self) -> None:
-            for conn in self._event_connections:
-                conn.disconnect()
-
     def after_view_init(self) -> None:
-        self.row_presenters = []
+        self.analysis_connections = {}
         self.ignore_tree_selection_changes = False
 
+        # Cells are only formatted when the tree view draws their row.
+        self.tree_model = LazyListModel(columns=[
+            (str, lambda analysis: format(analysis.bn_image_timestamp.get(), '.1f')),
+            (str, lambda analysis: analysis.bn_status.get().display_name),
+            (str, lambda analysis: format_angle(analysis.bn_left_angle.get())),
+            (str, lambda analysis: format_angle(analysis.bn_right_angle.get())),
+        ])
+        self.tree_view.set_model(self.tree_model)
+
         self.tree_view.append_column(Gtk.TreeViewColumn(
             title='Timestamp (s)',
             cell_renderer=Gtk.CellRendererText(),
@@ -145,6 +86,14 @@ class ConanReportOverviewMasterPresenter(Presenter):
             text=3,
         ))
 
+        # With fixed size columns and rows, the tree view doesn't need to measure every row up front, so only the
+        # visible rows are ever formatted.
+        for column in self.tree_view.get_columns():
+            column.set_sizing(Gtk.TreeViewColumnSizing.FIXED)
+            column.set_fixed_width(110)
+            column.set_resizable(True)
+        self.tree_view.set_fixed_height_mode(True)
+
         self.view_ready = True
         self.analyses_changed()
         self.selection = self.selection
@@ -159,16 +108,7 @@ class ConanReportOverviewMasterPresenter(Presenter):
         if tree_iter is None:
             return None
 
-        row_ref = Gtk.TreeRowReference(
-            model=self.tree_model,
-            path=self.tree_model.get_path(tree_iter)
-        )
-
-        for p in self.row_presenters:
-            if p.row_ref.get_path() == row_ref.get_path():
-                return p.analysis
-        else:
-            raise RuntimeError
+        return self.tree_model.get_item(tree_iter)
 
     @selection.setter
     def selection(self, selection: Optional[ConanAnalysis]) -> None:
@@ -181,14 +121,11 @@ class ConanReportOverviewMasterPresenter(Presenter):
         self.ignore_tree_selection_changes = True
         try:
             if selection is not None:
-                for p in self.row_presenters:
-                    if p.analysis == selection:
-                        row_presenter = p
-                        break
-                else:
+                tree_iter = self.tree_model.get_iter_of(selection)
+                if tree_iter is None:
                     raise ValueError
 
-                self.tree_selection.select_path(row_presenter.row_ref.get_path())
+                self.tree_selection.select_iter(tree_iter)
             else:
                 self.tree_selection.unselect_all()
         finally:
@@ -206,9 +143,13 @@ class ConanReportOverviewMasterPresenter(Presenter):
             self.analyses_changed()
 
     def analyses_changed(self) -> None:
-        current = [p.analysis for p in self.row_presenters]
+        current = self.analysis_connections.keys()
         new = self.analyses
 
+        to_remove = current - set(new)
+        for a in to_remove:
+            self.remove_analysis(a)
+
         to_show = [
             analysis
             for analysis in new if analysis not in current
@@ -216,59 +157,50 @@ class ConanReportOverviewMasterPresenter(Presenter):
         for a in to_show:
             self.add_analysis(a)
 
-        to_remove = set(current) - set(new)
-        for a in to_remove:
-            self.remove_analysis(a)
+        selection = self.selection
+        selection_index = self.tree_model.index_of(selection) if selection is not None else None
 
-    def add_analysis(self, analysis: ConanAnalysis) -> None:
-        row_ref = self.new_row()
-
-        row_presenter = self._RowPresenter(row_ref, analysis)
-        self.row_presenters.append(row_presenter)
-
-        if self.selection is None:
-            self.selection = analysis
+        self.tree_model.set_items(new)
+        self.host.queue_resize()
 
-    def remove_analysis(self, analysis: ConanAnalysis) -> None:
-        for p in self.row_presenters:
-            if p.analysis == analysis:
-                row_presenter = p
-                break
-        else:
-            raise ValueError("analysis not added to this model")
-
-        if self.selection == analysis:
-            next_selection = None
-            if len(self.row_presenters) > 1:
-                row_presenter_index = self.row_presenters.index(row_presenter)
-                if row_presenter_index + 1 < len(self.row_presenters):
-                    next_selection = self.row_presenters[row_presenter_index + 1].analysis
-                else:
-                    next_selection = self.row_presenters[row_presenter_index - 1].analysis
-            self.selection = next_selection
-
-        self.row_presenters.remove(row_presenter)
-        row_presenter.destroy()
-
-        self.remove_row(row_presenter.row_ref)
-
-    def new_row(self) -> Gtk.TreeRowReference:
-        tree_iter = self.tree_model.append((None, None, None, None))
-        row_ref = Gtk.TreeRowReference(
-            model=self.tree_model,
-            path=self.tree_model.get_path(tree_iter)
-        )
+        if selection is not None and self.tree_model.index_of(selection) is None:
+            # Selected analysis was removed, select its neighbour instead.
+            if new:
+                self.selection = new[min(selection_index, len(new) - 1)]
+            else:
+                self.selection = None
+        elif self.selection is None and new:
+            self.selection = new[0]
 
-        self.host.queue_resize()
-        self.tree_view.queue_resize()
-        self.tree_view.queue_allocate()
+    def add_analysis(self, analysis: ConanAnalysis) -> None:
+        row_changed = lambda: self.tree_model.row_changed_later(analysis)
 
-        return row_ref
+        self.analysis_connections[analysis] = [
+            analysis.bn_image_timestamp.on_changed.connect(row_changed, weak_ref=False),
+            analysis.bn_status.on_changed.connect(row_changed, weak_ref=False),
+            analysis.bn_left_angle.on_changed.connect(row_changed, weak_ref=False),
+            analysis.bn_right_angle.on_changed.connect(row_changed, weak_ref=False),
+        ]
 
-    def remove_row(self, row_ref: Gtk.TreeRowReference) -> None:
-        tree_iter = self.tree_model.get_iter(row_ref.get_path())
-        self.tree_model.remove(tree_iter)
+    def remove_analysis(self, analysis: ConanAnalysis) -> None:
+        for conn in self.analysis_connections.pop(analysis):
+            conn.disconnect()
 
     def tree_selection_changed(self, tree_selection: Gtk.TreeSelection) -> None:
         if self.ignore_tree_selection_changes: return
         self.notify('selection')
+
+    def destroy(self, *_) -> None:
+        if not self.view_ready: return
+
+        for analysis in tuple(self.analysis_connections):
+            self.remove_analysis(analysis)
+
+        self.tree_model.destroy()
+
+
+def format_angle(angle: Optional[float]) -> str:
+    if angle is None or not math.isfinite(angle):
+        return ''
+
+    return format(math.degrees(angle), '.1f')
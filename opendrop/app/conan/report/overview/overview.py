@@ -57,4 +57,10 @@ class ConanReportOverviewPresenter(Presenter):
 
     @selection.setter
     def selection(self, selection: Optional[ConanAnalysis]) -> None:
+        if self._selection is not None:
+            self._selection.set_priority(False)
+
         self._selection = selection
+
+        if selection is not None:
+            selection.set_priority(True)
@@ -1,9 +1,10 @@
 from enum import Enum
-from typing import Iterable, Sequence, Optional
+from typing import Iterable, MutableMapping, Sequence, Optional
 
 from gi.repository import GObject
 
 from opendrop.app.conan.analysis import ConanAnalysis
+from opendrop.utility.progresstracker import ProgressTracker
 
 
 class ConanAnalysisProgressHelper(GObject.Object):
@@ -20,16 +21,18 @@ class ConanAnalysisProgressHelper(GObject.Object):
 
             event_connections = [
                 self.analysis.bn_status.on_changed.connect(
-                    lambda: (owner.notify('status'), owner.notify('est-complete')), weak_ref=False,
+                    lambda: owner._hdl_analysis_changed(analysis, 'status', 'fraction', 'est-complete'),
+                    weak_ref=False,
                 ),
                 self.analysis.bn_is_done.on_changed.connect(
-                    lambda: owner.notify('fraction'), weak_ref=False,
+                    lambda: owner._hdl_analysis_changed(analysis, 'status', 'fraction', 'est-complete'),
+                    weak_ref=False,
                 ),
                 self.analysis.bn_time_start.on_changed.connect(
-                    lambda: owner.notify('time-start'), weak_ref=False,
+                    lambda: owner._hdl_analysis_changed(analysis, 'time-start'), weak_ref=False,
                 ),
                 self.analysis.bn_time_est_complete.on_changed.connect(
-                    lambda: owner.notify('est-complete'), weak_ref=False,
+                    lambda: owner._hdl_analysis_changed(analysis, 'est-complete'), weak_ref=False,
                 ),
             ]
 
@@ -41,7 +44,8 @@ class ConanAnalysisProgressHelper(GObject.Object):
 
     def __init__(self, **properties) -> None:
         self._analyses = ()
-        self._watchers = []
+        self._watchers = {}  # type: MutableMapping[ConanAnalysis, 'ConanAnalysisProgressHelper._AnalysisWatcher']
+        self._tracker = ProgressTracker()  # type: ProgressTracker[ConanAnalysis]
         super().__init__(**properties)
 
     @GObject.Property
@@ -54,82 +58,61 @@ class ConanAnalysisProgressHelper(GObject.Object):
         self._update_watchers()
 
     def _update_watchers(self) -> None:
-        analyses = self._analyses
-        watching = [watcher.analysis for watcher in self._watchers]
+        analyses = set(self._analyses)
+        watching = self._watchers.keys()
 
-        to_watch = set(analyses) - set(watching)
-        for analysis in to_watch:
-            self._watchers.append(self._AnalysisWatcher(analysis, self))
+        for analysis in analyses - watching:
+            self._watchers[analysis] = self._AnalysisWatcher(analysis, self)
+            self._track(analysis)
 
-        to_unwatch = set(watching) - set(analyses)
-        for analysis in to_unwatch:
-            for w in tuple(self._watchers):
-                if w.analysis == analysis:
-                    self._watchers.remove(w)
-                    w.destroy()
+        for analysis in watching - analyses:
+            self._watchers.pop(analysis).destroy()
+            self._tracker.discard(analysis)
 
         self.notify('status')
         self.notify('fraction')
         self.notify('time-start')
         self.notify('est-complete')
 
+    def _hdl_analysis_changed(self, analysis: ConanAnalysis, *props: str) -> None:
+        self._track(analysis)
+        for prop in props:
+            self.notify(prop)
+
+    def _track(self, analysis: ConanAnalysis) -> None:
+        self._tracker.update(
+            analysis,
+            is_done=analysis.bn_is_done.get(),
+            is_cancelled=analysis.bn_is_cancelled.get(),
+            time_start=analysis.bn_time_start.get(),
+            time_est_complete=analysis.bn_time_est_complete.get(),
+        )
+
     @GObject.Property
     def status(self) -> Status:
-        analyses = self._analyses
+        tracker = self._tracker
 
-        is_cancelled = any(
-            analysis.bn_is_cancelled.get()
-            for analysis in analyses
-        )
-        if is_cancelled:
+        if tracker.num_cancelled > 0:
             return self.Status.CANCELLED
 
-        is_finished = all(
-            analysis.bn_is_done.get() and not analysis.bn_is_cancelled.get()
-            for analysis in analyses
-        )
-        if is_finished:
+        if tracker.num_finished == len(tracker):
             return self.Status.FINISHED
 
         return self.Status.ANALYSING
 
     @GObject.Property
     def time_start(self) -> Optional[float]:
-        analyses = self._analyses
-        if not analyses: return None
-
-        time_start = min(
-            analysis.bn_time_start.get()
-            for analysis in analyses
-        )
-
-        return time_start
+        return self._tracker.time_start
 
     @GObject.Property
     def est_complete(self) -> Optional[float]:
-        analyses = self._analyses
-        if not analyses: return None
-
         if self.status is not self.Status.ANALYSING: return None
 
-        time_est_complete = max(
-            analysis.bn_time_est_complete.get()
-            for analysis in analyses
-        )
-
-        return time_est_complete
+        return self._tracker.time_est_complete
 
     @GObject.Property(type=float)
     def fraction(self) -> float:
-        analyses = self._analyses
-        if not analyses: return 1.0
-
-        num_completed = len([
-            analysis
-            for analysis in analyses
-            if analysis.bn_is_done.get()
-        ])
-
-        completed_fraction = num_completed/len(analyses)
+        tracker = self._tracker
+        if not tracker: return 1.0
 
-        return completed_fraction
+        return tracker.num_done/len(tracker)
@@ -28,22 +28,26 @@
 
 
 import asyncio
-from typing import Sequence
+from typing import Optional, Sequence
 
 from gi.repository import GObject
 from injector import Binder, Module, inject, singleton
 import numpy as np
 
+from opendrop.app.common.analysis_saver.export_job import ExportJob
+from opendrop.app.common.analysis_saver.live_export import SaveRecord
 from opendrop.app.common.services.acquisition import (
     AcquirerType,
     ImageAcquisitionService,
 )
 from opendrop.app.conan.analysis import (
     ConanAnalysis,
+    ContactAngleBatchCalculator,
     ContactAngleCalculator,
     ContactAngleCalculatorParams,
     FeatureExtractor,
     FeatureExtractorParams,
+    FeatureExtractorPool,
 )
 from opendrop.app.conan.analysis_saver import ConanAnalysisSaverOptions
 from opendrop.app.conan.analysis_saver.save_functions import save_drops
@@ -55,7 +59,9 @@ class ConanSessionModule(Module):
     def configure(self, binder: Binder):
         binder.bind(ImageAcquisitionService, to=ImageAcquisitionService, scope=singleton)
         binder.bind(FeatureExtractorParams, to=FeatureExtractorParams, scope=singleton)
+        binder.bind(FeatureExtractorPool, to=FeatureExtractorPool, scope=singleton)
         binder.bind(ContactAngleCalculatorParams, to=ContactAngleCalculatorParams, scope=singleton)
+        binder.bind(ContactAngleBatchCalculator, to=ContactAngleBatchCalculator, scope=singleton)
 
         binder.bind(ConanSession, to=ConanSession, scope=singleton)
 
@@ -66,15 +72,21 @@ class ConanSession(GObject.Object):
             self,
             image_acquisition: ImageAcquisitionService,
             feature_extractor_params: FeatureExtractorParams,
+            feature_extractor_pool: FeatureExtractorPool,
             conancalc_params: ContactAngleCalculatorParams,
+            conancalc_batch: ContactAngleBatchCalculator,
     ) -> None:
         self._analyses = ()  # type: Sequence[ConanAnalysis]
         self._analyses_saved = False
+        self._save_job = None  # type: Optional[ExportJob]
+        self._save_record = SaveRecord()
 
         self.image_acquisition = image_acquisition
         self.image_acquisition.use_acquirer_type(AcquirerType.LOCAL_STORAGE)
         self._feature_extractor_params = feature_extractor_params
+        self._feature_extractor_pool = feature_extractor_pool
         self._conancalc_params = conancalc_params
+        self._conancalc_batch = conancalc_batch
 
         super().__init__()
 
@@ -87,6 +99,10 @@ class ConanSession(GObject.Object):
         return self._analyses_saved
 
     def safe_to_discard(self) -> bool:
+        if self._save_job is not None and not self._save_job.bn_is_done.get():
+            # Discarding now would leave a partially written save.
+            return False
+
         if self._analyses_saved:
             return True
 
@@ -126,6 +142,8 @@ class ConanSession(GObject.Object):
 
     def clear_analyses(self) -> None:
         self.cancel_analyses()
+        self._cancel_save()
+        self._save_record.clear()
         self._analyses = ()
         self._analyses_saved = True
         self.notify('analyses')
@@ -133,9 +151,49 @@ class ConanSession(GObject.Object):
 
     def save_analyses(self, options: ConanAnalysisSaverOptions) -> None:
         if not self._analyses: return
-        save_drops(self._analyses, options)
-        self._analyses_saved = True
-        self.notify('analyses_saved')
+        self._cancel_save()
+
+        job = save_drops(self._analyses, options, self._save_record)
+        job.bn_status.on_changed.connect(lambda: self._hdl_save_job_status_changed(job), weak_ref=False)
+        self._save_job = job
+        self.notify('save-job')
+
+    def _hdl_save_job_status_changed(self, job: ExportJob) -> None:
+        if job is not self._save_job: return
+
+        status = job.bn_status.get()
+        if status is ExportJob.Status.FINISHED:
+            self._analyses_saved = True
+            self.notify('analyses_saved')
+        elif status.is_terminal:
+            # Don't know what made it to disk, so the next save has to start from scratch.
+            self._save_record.clear()
+
+        if status is ExportJob.Status.FAILED:
+            asyncio.get_event_loop().call_exception_handler({
+                'message': 'Saving analyses failed',
+                'exception': job.exception,
+            })
+            self.emit('save-failed', str(job.exception))
+
+    @GObject.Property(flags=GObject.ParamFlags.READABLE | GObject.ParamFlags.EXPLICIT_NOTIFY)
+    def save_job(self) -> Optional[ExportJob]:
+        return self._save_job
+
+    @GObject.Signal(arg_types=(str,))
+    def save_failed(self, message: str) -> None:
+        pass
+
+    def cancel_save(self) -> None:
+        """Stop the save in progress, drops that have already been written are left on disk."""
+        if self._save_job is None: return
+        self._save_job.cancel()
+
+    def _cancel_save(self) -> None:
+        if self._save_job is None: return
+        self._save_job.cancel()
+        self._save_job = None
+        self.notify('save-job')
 
     def create_save_options(self) -> ConanAnalysisSaverOptions:
         return ConanAnalysisSaverOptions()
@@ -144,6 +202,7 @@ class ConanSession(GObject.Object):
         return FeatureExtractor(
             image=image,
             params=self._feature_extractor_params,
+            pool=self._feature_extractor_pool,
             loop=asyncio.get_event_loop(),
         )
 
@@ -151,8 +210,15 @@ class ConanSession(GObject.Object):
         return ContactAngleCalculator(
             features=extracted_features,
             params=self._conancalc_params,
+            batch=self._conancalc_batch,
         )
 
+    async def wait_until_features_extracted(self) -> None:
+        """Wait until feature extraction has finished for every analysis (and the preview)."""
+        await self._feature_extractor_pool.wait_until_not_busy()
+
     def quit(self) -> None:
         self.clear_analyses()
         self.image_acquisition.destroy()
+        self._feature_extractor_pool.shutdown()
+        self._conancalc_batch.shutdown()
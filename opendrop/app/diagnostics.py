@@ -0,0 +1,168 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+"""Event loop diagnostics, for finding what stalls the user interface.
+
+Set the OPENDROP_DIAGNOSTICS environment variable to enable them. Callbacks and GLib sources that block the event loop
+for longer than OPENDROP_SLOW_CALLBACK_MS milliseconds (50 by default) are logged as they happen, and a summary can be
+viewed with Ctrl+Shift+D. When OpenDrop exits, the summary is written to the file named by OPENDROP_DIAGNOSTICS, or to
+stderr if it's set to '1'."""
+
+import os
+import sys
+from typing import Optional
+
+from gi.repository import GLib, Gtk
+
+from opendrop.vendor import aioglib
+from opendrop.widgets.error_dialog import ErrorDialog
+
+DEFAULT_THRESHOLD_MS = 50.0
+
+
+class Diagnostics:
+    def __init__(self, loop: aioglib.GLibEventLoop, threshold: float, out_path: Optional[str] = None) -> None:
+        self.monitor = aioglib.LoopMonitor(loop, threshold=threshold)
+        self._out_path = out_path
+        self._window = None  # type: Optional[DiagnosticsWindow]
+
+    @classmethod
+    def from_environ(cls, loop: aioglib.GLibEventLoop) -> Optional['Diagnostics']:
+        """Return diagnostics configured by the environment, or None if they're not enabled."""
+        out_path = os.environ.get('OPENDROP_DIAGNOSTICS')
+        if not out_path:
+            return None
+
+        threshold_ms = DEFAULT_THRESHOLD_MS
+        threshold_env = os.environ.get('OPENDROP_SLOW_CALLBACK_MS')
+        if threshold_env:
+            threshold_ms = float(threshold_env)
+
+        return cls(loop, threshold_ms/1000, out_path if out_path != '1' else None)
+
+    def start(self) -> None:
+        self.monitor.start()
+
+    def stop(self) -> None:
+        self.monitor.stop()
+
+        if self._window is not None:
+            self._window.destroy()
+
+        if self._out_path is None:
+            sys.stderr.write(self.monitor.summary())
+            return
+
+        try:
+            self.monitor.dump(self._out_path)
+        except OSError as e:
+            sys.stderr.write("Failed to write diagnostics to '{}': {}\n".format(self._out_path, e))
+
+    def show_window(self) -> None:
+        if self._window is None:
+            self._window = DiagnosticsWindow(self.monitor)
+            self._window.connect('destroy', self._hdl_window_destroy)
+
+        self._window.present()
+
+    def _hdl_window_destroy(self, window: Gtk.Window) -> None:
+        self._window = None
+
+
+class DiagnosticsWindow(Gtk.Window):
+    REFRESH_INTERVAL = 1
+
+    def __init__(self, monitor: aioglib.LoopMonitor) -> None:
+        super().__init__(title='Event loop diagnostics', default_width=900, default_height=500)
+
+        self._monitor = monitor
+
+        body = Gtk.Grid(row_spacing=5, margin=10)
+        self.add(body)
+
+        scrolled_window = Gtk.ScrolledWindow(hexpand=True, vexpand=True, shadow_type=Gtk.ShadowType.IN)
+        body.attach(scrolled_window, 0, 0, 1, 1)
+
+        self._text_view = Gtk.TextView(editable=False, cursor_visible=False, monospace=True)
+        scrolled_window.add(self._text_view)
+
+        button_box = Gtk.ButtonBox(layout_style=Gtk.ButtonBoxStyle.END, spacing=5)
+        body.attach(button_box, 0, 1, 1, 1)
+
+        reset_button = Gtk.Button(label='Reset')
+        reset_button.connect('clicked', self._hdl_reset_button_clicked)
+        button_box.add(reset_button)
+
+        save_button = Gtk.Button(label='Save…')
+        save_button.connect('clicked', self._hdl_save_button_clicked)
+        button_box.add(save_button)
+
+        self.show_all()
+
+        self._refresh()
+        self._refresh_timer = GLib.timeout_add_seconds(self.REFRESH_INTERVAL, self._refresh)
+        self.connect('destroy', self._hdl_destroy)
+
+    def _refresh(self) -> bool:
+        self._text_view.get_buffer().set_text(self._monitor.summary())
+        return GLib.SOURCE_CONTINUE
+
+    def _hdl_reset_button_clicked(self, button: Gtk.Button) -> None:
+        self._monitor.reset()
+        self._refresh()
+
+    def _hdl_save_button_clicked(self, button: Gtk.Button) -> None:
+        dialog = Gtk.FileChooserNative(
+            title='Save diagnostics',
+            transient_for=self,
+            action=Gtk.FileChooserAction.SAVE,
+            do_overwrite_confirmation=True,
+        )
+        dialog.set_current_name('opendrop-diagnostics.txt')
+
+        try:
+            if dialog.run() != Gtk.ResponseType.ACCEPT:
+                return
+            path = dialog.get_filename()
+        finally:
+            dialog.destroy()
+
+        try:
+            self._monitor.dump(path)
+        except OSError as e:
+            error_dialog = ErrorDialog(
+                text='Failed to save diagnostics',
+                secondary_text=str(e),
+                transient_for=self,
+            )
+            error_dialog.run()
+            error_dialog.destroy()
+
+    def _hdl_destroy(self, window: Gtk.Window) -> None:
+        GLib.source_remove(self._refresh_timer)
@@ -119,6 +119,14 @@ class IFTSaveDialogView(View['IFTSaveDialogPresenter', Gtk.Window]):
         save_dir_name_err_lbl.get_style_context().add_class('error-text')
         save_location_content.attach_next_to(save_dir_name_err_lbl, save_dir_name_inp, Gtk.PositionType.RIGHT, 1, 1)
 
+        data_frame = Gtk.Frame(label='Data')
+        content.add(data_frame)
+        data_content = Gtk.Grid(margin=10, column_spacing=10, row_spacing=5)
+        data_frame.add(data_content)
+
+        save_archive_inp = Gtk.CheckButton(label='Also save all results in a single archive file (results.npz)')
+        data_content.attach(save_archive_inp, 0, 0, 1, 1)
+
         figures_frame = Gtk.Frame(label='Figures')
         content.add(figures_frame)
         figures_content = Gtk.Grid(margin=10, column_spacing=10, row_spacing=5)
@@ -182,6 +190,7 @@ class IFTSaveDialogView(View['IFTSaveDialogPresenter', Gtk.Window]):
 
         self.bn_save_dir_parent = AccessorBindable(self._get_save_dir_parent, self._set_save_dir_parent)
         self.bn_save_dir_name = GObjectPropertyBindable(save_dir_name_inp, 'text')
+        self.bn_save_archive = GObjectPropertyBindable(save_archive_inp, 'active')
 
         self._confirm_overwrite_dialog = None
         self._file_exists_info_dialog = None
@@ -296,6 +305,9 @@ class IFTSaveDialogPresenter(Presenter['IFTSaveDialogView']):
             self._model.bn_save_dir_name.bind(
                 self.view.bn_save_dir_name
             ),
+            self._model.bn_save_archive.bind(
+                self.view.bn_save_archive
+            ),
         ])
 
     def ok(self, confirm_overwrite: bool = False) -> None:
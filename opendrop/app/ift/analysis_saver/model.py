@@ -40,6 +40,9 @@ class IFTAnalysisSaverOptions:
         self.bn_save_dir_parent = VariableBindable(None)  # type: Bindable[Optional[Path]]
         self.bn_save_dir_name = VariableBindable('')
 
+        # Also save all results in a single file archive (see opendrop.utility.resultsarchive).
+        self.bn_save_archive = VariableBindable(False)
+
         self.drop_residuals_figure_opts = FigureOptions(
             should_save=True,
             dpi=300,
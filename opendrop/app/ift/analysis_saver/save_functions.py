@@ -28,42 +28,203 @@
 
 
 import configparser
-import csv
+import functools
+import itertools
 import math
+import shutil
 from collections import OrderedDict
 from pathlib import Path
-from typing import Sequence, Tuple, Iterable
+from typing import Sequence, Tuple, Iterable, Iterator, Callable, Any, Optional, Mapping, Hashable
 
 import cv2
 import numpy as np
 
+from opendrop.analysis.export import write_ift_archive, write_ift_timeline
+from opendrop.app.common.analysis_saver.export_job import ExportJob
+from opendrop.app.common.analysis_saver.live_export import LiveExport, SaveRecord
 from opendrop.app.common.analysis_saver.misc import simple_grapher
 from opendrop.app.ift.services.analysis import PendantAnalysisJob
 from opendrop.utility.misc import clear_directory_contents
 from .model import IFTAnalysisSaverOptions
 
 
-def save_drops(drops: Iterable[PendantAnalysisJob], options: IFTAnalysisSaverOptions) -> None:
+class DropSnapshot:
+    """The values of a PendantAnalysisJob that get saved, copied out of its bindables so that the drop can be saved
+    on another thread or process."""
+
+    def __init__(self, drop: PendantAnalysisJob, *, images: bool = True, profiles: bool = True) -> None:
+        self.is_image_replicated = drop.is_image_replicated
+        self.image_timestamp = drop.bn_image_timestamp.get()
+        self.interfacial_tension = drop.bn_interfacial_tension.get()
+        self.volume = drop.bn_volume.get()
+        self.surface_area = drop.bn_surface_area.get()
+        self.apex_radius = drop.bn_apex_radius.get()
+        self.worthington = drop.bn_worthington.get()
+        self.bond_number = drop.bn_bond_number.get()
+        self.rotation = drop.bn_rotation.get()
+        self.apex_coords_px = drop.bn_apex_coords_px.get()
+        self.needle_width_px = drop.bn_needle_width_px.get()
+        self.drop_region = drop.bn_drop_region.get()
+        self.needle_region = drop.bn_needle_region.get()
+
+        self.image = drop.bn_image.get() if images else None
+
+        if profiles:
+            self.drop_profile_extract = drop.bn_drop_profile_extract.get()
+            self.needle_profile_extract = drop.bn_needle_profile_extract.get()
+            self.drop_profile_fit = drop.bn_drop_profile_fit.get()
+            self.residuals = drop.bn_residuals.get()
+        else:
+            self.drop_profile_extract = None
+            self.needle_profile_extract = None
+            self.drop_profile_fit = None
+            self.residuals = None
+
+
+_FigureSettings = Optional[Tuple[Tuple[float, float], int]]
+
+
+def _figure_settings(figure_opts) -> _FigureSettings:
+    if not figure_opts.bn_should_save.get():
+        return None
+
+    return figure_opts.size, figure_opts.bn_dpi.get()
+
+
+def save_drops(
+        drops: Iterable[PendantAnalysisJob],
+        options: IFTAnalysisSaverOptions,
+        parameters: Optional[Mapping[str, Any]] = None,
+        record: Optional[SaveRecord] = None,
+) -> ExportJob:
+    """Start saving `drops` in the background, return the job doing the saving. `parameters` are the analysis
+    parameters recorded in the results archive, if one is saved.
+
+    If `record` remembers a previous save to the same place with the same options, only the drops that have changed
+    since are written again. Drops that are still being analysed are saved as they finish (the job finishes when the
+    last one has been saved)."""
     drops = list(drops)
+    record = record if record is not None else SaveRecord()
 
     full_dir = options.save_root_dir
-    assert full_dir.is_dir() or not full_dir.exists()
-    full_dir.mkdir(parents=True, exist_ok=True)
-    clear_directory_contents(full_dir)
+    if not record.reuse(full_dir, _options_key(options, len(drops))):
+        assert full_dir.is_dir() or not full_dir.exists()
+        full_dir.mkdir(parents=True, exist_ok=True)
+        clear_directory_contents(full_dir)
+
+    finished = [i for i, drop in enumerate(drops) if drop.bn_is_done.get()]
+    num_changed = sum(record.has_changed(i, DropSnapshot(drops[i], images=False)) for i in finished)
+    num_unfinished = len(drops) - len(finished)
+
+    # One task for each drop to save, plus one for the timeline and figures, and maybe one for the archive.
+    num_tasks = num_changed + num_unfinished + 1 + options.bn_save_archive.get()
+
+    if num_unfinished == 0:
+        return ExportJob(
+            tasks=itertools.chain(
+                _save_individual_tasks(drops, finished, options, record),
+                _save_summary_tasks(drops, options, parameters),
+            ),
+            num_tasks=num_tasks,
+        )
+
+    # Rows are appended to the timeline as drops finish, it's rewritten in order at the end.
+    timeline_path = full_dir/'timeline.csv'
+    if timeline_path.exists():
+        timeline_path.unlink()
+
+    def save(indices: Sequence[int]) -> Iterator[Callable[[], Any]]:
+        if len(drops) > 1:
+            with timeline_path.open('a', newline='') as out_file:
+                write_ift_timeline(
+                    [DropSnapshot(drops[i], images=False, profiles=False) for i in indices],
+                    out_file,
+                    header=out_file.tell() == 0,
+                )
+
+        return _save_individual_tasks(drops, indices, options, record)
+
+    job = ExportJob(tasks=(), num_tasks=num_tasks, keep_open=True)
+    LiveExport(job, drops, save=save, finish=lambda: _save_summary_tasks(drops, options, parameters))
+
+    return job
+
+
+def _options_key(options: IFTAnalysisSaverOptions, num_drops: int) -> Hashable:
+    return (
+        options.bn_save_dir_name.get(),
+        num_drops,
+        _figure_settings(options.drop_residuals_figure_opts),
+        _figure_settings(options.ift_figure_opts),
+        _figure_settings(options.volume_figure_opts),
+        _figure_settings(options.surface_area_figure_opts),
+        options.bn_save_archive.get(),
+    )
+
+
+def _save_individual_tasks(
+        drops: Sequence[PendantAnalysisJob],
+        indices: Iterable[int],
+        options: IFTAnalysisSaverOptions,
+        record: SaveRecord,
+) -> Iterator[Callable[[], Any]]:
+    full_dir = options.save_root_dir
 
     padding = len(str(len(drops)))
     dir_name = options.bn_save_dir_name.get()
-    for i, drop in enumerate(drops):
+    drop_residuals_figure = _figure_settings(options.drop_residuals_figure_opts)
+    for i in indices:
+        drop = drops[i]
+        if not record.update(i, DropSnapshot(drop, images=False)):
+            # Already saved.
+            continue
+
         drop_dir_name = dir_name + '{n:0>{padding}}'.format(n=(i+1), padding=padding)  # i+1 for 1-based indexing.
-        _save_individual(drop, drop_dir_name, options)
+        yield functools.partial(
+            _save_individual,
+            DropSnapshot(drop),
+            full_dir/drop_dir_name,
+            drop_residuals_figure,
+        )
+
+
+def _save_summary_tasks(
+        drops: Sequence[PendantAnalysisJob],
+        options: IFTAnalysisSaverOptions,
+        parameters: Optional[Mapping[str, Any]],
+) -> Iterator[Callable[[], Any]]:
+    full_dir = options.save_root_dir
+
+    yield functools.partial(
+        _save_summary,
+        [DropSnapshot(drop, images=False, profiles=False) for drop in drops],
+        full_dir,
+        _figure_settings(options.ift_figure_opts),
+        _figure_settings(options.volume_figure_opts),
+        _figure_settings(options.surface_area_figure_opts),
+    )
+
+    if options.bn_save_archive.get():
+        yield functools.partial(
+            write_ift_archive,
+            [DropSnapshot(drop, images=False) for drop in drops],
+            full_dir/'results.npz',
+            parameters,
+        )
 
+
+def _save_summary(
+        drops: Sequence[DropSnapshot],
+        full_dir: Path,
+        ift_figure: _FigureSettings,
+        volume_figure: _FigureSettings,
+        surface_area_figure: _FigureSettings,
+) -> None:
     if len(drops) <= 1:
         return
 
-    figure_opts = options.ift_figure_opts
-    if figure_opts.bn_should_save.get():
-        fig_size = figure_opts.size
-        dpi = figure_opts.bn_dpi.get()
+    if ift_figure is not None:
+        fig_size, dpi = ift_figure
         with (full_dir/'ift_plot.png').open('wb') as out_file:
             _save_ift_figure(
                 drops=drops,
@@ -71,10 +232,8 @@ def save_drops(drops: Iterable[PendantAnalysisJob], options: IFTAnalysisSaverOpt
                 fig_size=fig_size,
                 dpi=dpi)
 
-    figure_opts = options.volume_figure_opts
-    if figure_opts.bn_should_save.get():
-        fig_size = figure_opts.size
-        dpi = figure_opts.bn_dpi.get()
+    if volume_figure is not None:
+        fig_size, dpi = volume_figure
         with (full_dir/'volume_plot.png').open('wb') as out_file:
             _save_volume_figure(
                 drops=drops,
@@ -82,10 +241,8 @@ def save_drops(drops: Iterable[PendantAnalysisJob], options: IFTAnalysisSaverOpt
                 fig_size=fig_size,
                 dpi=dpi)
 
-    figure_opts = options.surface_area_figure_opts
-    if figure_opts.bn_should_save.get():
-        fig_size = figure_opts.size
-        dpi = figure_opts.bn_dpi.get()
+    if surface_area_figure is not None:
+        fig_size, dpi = surface_area_figure
         with (full_dir/'surface_area_plot.png').open('wb') as out_file:
             _save_surface_area_figure(
                 drops=drops,
@@ -94,11 +251,14 @@ def save_drops(drops: Iterable[PendantAnalysisJob], options: IFTAnalysisSaverOpt
                 dpi=dpi)
 
     with (full_dir/'timeline.csv').open('w', newline='') as out_file:
-        _save_timeline_data(drops, out_file)
+        write_ift_timeline(drops, out_file)
+
 
+def _save_individual(drop: DropSnapshot, full_dir: Path, drop_residuals_figure: _FigureSettings) -> None:
+    if full_dir.exists():
+        # Replace an out of date save of this drop.
+        shutil.rmtree(str(full_dir))
 
-def _save_individual(drop: PendantAnalysisJob, drop_dir_name: str, options: IFTAnalysisSaverOptions) -> None:
-    full_dir = options.save_root_dir/drop_dir_name
     full_dir.mkdir(parents=True)
 
     _save_drop_image(drop, out_file_path=full_dir / 'image_original.png')
@@ -116,10 +276,8 @@ def _save_individual(drop: PendantAnalysisJob, drop_dir_name: str, options: IFTA
     with (full_dir/'profile_fit_residuals.csv').open('wb') as out_file:
         _save_drop_contour_fit_residuals(drop, out_file=out_file)
 
-    drop_residuals_figure_opts = options.drop_residuals_figure_opts
-    if drop_residuals_figure_opts.bn_should_save.get():
-        fig_size = drop_residuals_figure_opts.size
-        dpi = drop_residuals_figure_opts.bn_dpi.get()
+    if drop_residuals_figure is not None:
+        fig_size, dpi = drop_residuals_figure
         with (full_dir/'profile_fit_residuals_plot.png').open('wb') as out_file:
             _save_drop_contour_fit_residuals_figure(
                 drop=drop,
@@ -128,27 +286,27 @@ def _save_individual(drop: PendantAnalysisJob, drop_dir_name: str, options: IFTA
                 dpi=dpi)
 
 
-def _save_drop_image(drop: PendantAnalysisJob, out_file_path: Path) -> None:
+def _save_drop_image(drop: DropSnapshot, out_file_path: Path) -> None:
     if drop.is_image_replicated:
         # A copy of the image already exists somewhere, we don't need to save it again.
         return
 
-    image = drop.bn_image.get()
+    image = drop.image
     if image is None:
         return
 
     cv2.imwrite(str(out_file_path), cv2.cvtColor(image, cv2.COLOR_RGB2BGR))
 
 
-def _save_drop_image_annotated(drop: PendantAnalysisJob, out_file_path: Path) -> None:
-    image = drop.bn_image.get()
+def _save_drop_image_annotated(drop: DropSnapshot, out_file_path: Path) -> None:
+    image = drop.image
     if image is None:
         return
 
     # Draw on a copy
     image = image.copy()
 
-    needle_profile_extract = drop.bn_needle_profile_extract.get()
+    needle_profile_extract = drop.needle_profile_extract
     if needle_profile_extract is not None:
         # Draw extracted needle edges
         image = cv2.polylines(
@@ -159,7 +317,7 @@ def _save_drop_image_annotated(drop: PendantAnalysisJob, out_file_path: Path) ->
             thickness=1,
             lineType=cv2.LINE_AA)
 
-    drop_profile_extract = drop.bn_drop_profile_extract.get()
+    drop_profile_extract = drop.drop_profile_extract
     if drop_profile_extract is not None:
         # Draw extracted drop profile
         image = cv2.polylines(
@@ -171,7 +329,7 @@ def _save_drop_image_annotated(drop: PendantAnalysisJob, out_file_path: Path) ->
             lineType=cv2.LINE_AA)
 
     # Draw fitted drop profile
-    drop_contour_fit = drop.bn_drop_profile_fit.get()
+    drop_contour_fit = drop.drop_profile_fit
     if drop_contour_fit is not None:
         drop_contour_fit = drop_contour_fit.astype(int)
         image = cv2.polylines(
@@ -182,7 +340,7 @@ def _save_drop_image_annotated(drop: PendantAnalysisJob, out_file_path: Path) ->
             thickness=1,
             lineType=cv2.LINE_AA)
 
-    needle_region = drop.bn_needle_region.get()
+    needle_region = drop.needle_region
     if needle_region is not None:
         # Draw needle region
         image = cv2.rectangle(
@@ -192,7 +350,7 @@ def _save_drop_image_annotated(drop: PendantAnalysisJob, out_file_path: Path) ->
             color=(13, 26, 255),
             thickness=1)
 
-    drop_region = drop.bn_drop_region.get()
+    drop_region = drop.drop_region
     if drop_region is not None:
         # Draw drop region
         image = cv2.rectangle(
@@ -206,60 +364,60 @@ def _save_drop_image_annotated(drop: PendantAnalysisJob, out_file_path: Path) ->
     cv2.imwrite(str(out_file_path), cv2.cvtColor(image, cv2.COLOR_RGB2BGR))
 
 
-def _save_drop_params(drop: PendantAnalysisJob, out_file) -> None:
+def _save_drop_params(drop: DropSnapshot, out_file) -> None:
     root = configparser.ConfigParser(allow_no_value=True)
     root.read_dict(OrderedDict((
         ('Physical', OrderedDict((
             ('; all quantities are in SI units', None),
-            ('timestamp', format(drop.bn_image_timestamp.get(), '.3g')),
-            ('interfacial_tension', format(drop.bn_interfacial_tension.get(), '.3g')),
-            ('volume', format(drop.bn_volume.get(), '.3g')),
-            ('surface_area', format(drop.bn_surface_area.get(), '.3g')),
-            ('apex_radius', format(drop.bn_apex_radius.get(), '.3g')),
-            ('worthington', format(drop.bn_worthington.get(), '.3g')),
-            ('bond_number', format(drop.bn_bond_number.get(), '.3g')),
+            ('timestamp', format(drop.image_timestamp, '.3g')),
+            ('interfacial_tension', format(drop.interfacial_tension, '.3g')),
+            ('volume', format(drop.volume, '.3g')),
+            ('surface_area', format(drop.surface_area, '.3g')),
+            ('apex_radius', format(drop.apex_radius, '.3g')),
+            ('worthington', format(drop.worthington, '.3g')),
+            ('bond_number', format(drop.bond_number, '.3g')),
         ))),
         ('Image', OrderedDict((
             ('; regions are defined by (left, top, right, bottom) tuples', None),
-            ('drop_region', tuple(drop.bn_drop_region.get())),
-            ('needle_region', tuple(drop.bn_needle_region.get())),
-            ('apex_coordinates', '({0.x:.1f}, {0.y:.1f})'.format(drop.bn_apex_coords_px.get())),
+            ('drop_region', tuple(drop.drop_region)),
+            ('needle_region', tuple(drop.needle_region)),
+            ('apex_coordinates', '({0.x:.1f}, {0.y:.1f})'.format(drop.apex_coords_px)),
             ('; needle width in pixels', None),
-            ('needle_width', format(drop.bn_needle_width_px.get(), '.3g')),
+            ('needle_width', format(drop.needle_width_px, '.3g')),
             ('; angle is in degrees (positive is counter-clockwise)', None),
-            ('image_angle', format(math.degrees(drop.bn_rotation.get()), '.3g')),
+            ('image_angle', format(math.degrees(drop.rotation), '.3g')),
         ))),
     )))
 
     root.write(out_file)
 
 
-def _save_drop_contour(drop: PendantAnalysisJob, out_file) -> None:
-    drop_profile_extract = drop.bn_drop_profile_extract.get()
+def _save_drop_contour(drop: DropSnapshot, out_file) -> None:
+    drop_profile_extract = drop.drop_profile_extract
     if drop_profile_extract is None:
         return
 
     np.savetxt(out_file, drop_profile_extract, fmt='%.1f,%.1f')
 
 
-def _save_drop_contour_fit(drop: PendantAnalysisJob, out_file) -> None:
-    drop_contour_fit = drop.bn_drop_profile_fit.get()
+def _save_drop_contour_fit(drop: DropSnapshot, out_file) -> None:
+    drop_contour_fit = drop.drop_profile_fit
     if drop_contour_fit is None:
         return
 
     np.savetxt(out_file, drop_contour_fit, fmt='%.1f,%.1f')
 
 
-def _save_drop_contour_fit_residuals(drop: PendantAnalysisJob, out_file) -> None:
-    residuals = drop.bn_residuals.get()
+def _save_drop_contour_fit_residuals(drop: DropSnapshot, out_file) -> None:
+    residuals = drop.residuals
     if residuals is None:
         return
 
     np.savetxt(out_file, residuals, fmt='%g,%g')
 
 
-def _save_drop_contour_fit_residuals_figure(drop: PendantAnalysisJob, out_file, fig_size: Tuple[float, float], dpi: int) -> None:
-    residuals = drop.bn_residuals.get()
+def _save_drop_contour_fit_residuals_figure(drop: DropSnapshot, out_file, fig_size: Tuple[float, float], dpi: int) -> None:
+    residuals = drop.residuals
     if residuals is None:
         return
 
@@ -277,19 +435,19 @@ def _save_drop_contour_fit_residuals_figure(drop: PendantAnalysisJob, out_file,
     fig.savefig(out_file)
 
 
-def _save_ift_figure(drops: Sequence[PendantAnalysisJob], out_file, fig_size: Tuple[float, float], dpi: int) -> None:
+def _save_ift_figure(drops: Sequence[DropSnapshot], out_file, fig_size: Tuple[float, float], dpi: int) -> None:
     drops = [
         drop
         for drop in drops
-        if math.isfinite(drop.bn_image_timestamp.get()) and
-           math.isfinite(drop.bn_interfacial_tension.get())
+        if math.isfinite(drop.image_timestamp) and
+           math.isfinite(drop.interfacial_tension)
     ]
 
-    start_time = min(drop.bn_image_timestamp.get() for drop in drops)
+    start_time = min(drop.image_timestamp for drop in drops)
     data = (
         (
-            drop.bn_image_timestamp.get() - start_time,
-            drop.bn_interfacial_tension.get() * 1e3
+            drop.image_timestamp - start_time,
+            drop.interfacial_tension * 1e3
         )
         for drop in drops
     )
@@ -307,19 +465,19 @@ def _save_ift_figure(drops: Sequence[PendantAnalysisJob], out_file, fig_size: Tu
     fig.savefig(out_file)
 
 
-def _save_volume_figure(drops: Sequence[PendantAnalysisJob], out_file, fig_size: Tuple[float, float], dpi: int) -> None:
+def _save_volume_figure(drops: Sequence[DropSnapshot], out_file, fig_size: Tuple[float, float], dpi: int) -> None:
     drops = [
         drop
         for drop in drops
-        if math.isfinite(drop.bn_image_timestamp.get()) and
-           math.isfinite(drop.bn_volume.get())
+        if math.isfinite(drop.image_timestamp) and
+           math.isfinite(drop.volume)
     ]
 
-    start_time = min(drop.bn_image_timestamp.get() for drop in drops)
+    start_time = min(drop.image_timestamp for drop in drops)
     data = (
         (
-            drop.bn_image_timestamp.get() - start_time,
-            drop.bn_volume.get() * 1e9
+            drop.image_timestamp - start_time,
+            drop.volume * 1e9
         )
         for drop in drops
     )
@@ -337,19 +495,19 @@ def _save_volume_figure(drops: Sequence[PendantAnalysisJob], out_file, fig_size:
     fig.savefig(out_file)
 
 
-def _save_surface_area_figure(drops: Sequence[PendantAnalysisJob], out_file, fig_size: Tuple[float, float], dpi: int) -> None:
+def _save_surface_area_figure(drops: Sequence[DropSnapshot], out_file, fig_size: Tuple[float, float], dpi: int) -> None:
     drops = [
         drop
         for drop in drops
-        if math.isfinite(drop.bn_image_timestamp.get()) and
-           math.isfinite(drop.bn_surface_area.get())
+        if math.isfinite(drop.image_timestamp) and
+           math.isfinite(drop.surface_area)
     ]
 
-    start_time = min(drop.bn_image_timestamp.get() for drop in drops)
+    start_time = min(drop.image_timestamp for drop in drops)
     data = (
         (
-            drop.bn_image_timestamp.get() - start_time,
-            drop.bn_surface_area.get() * 1e6
+            drop.image_timestamp - start_time,
+            drop.surface_area * 1e6
         )
         for drop in drops
     )
@@ -366,35 +524,3 @@ def _save_surface_area_figure(drops: Sequence[PendantAnalysisJob], out_file, fig
     )
 
     fig.savefig(out_file)
-
-
-def _save_timeline_data(drops: Sequence[PendantAnalysisJob], out_file) -> None:
-    writer = csv.writer(out_file)
-    writer.writerow([
-        'Time (s)',
-        'IFT (N/m)',
-        'Volume (m3)',
-        'Surface area (m2)',
-        'Apex radius (m)',
-        'Worthington',
-        'Bond number',
-        'Image angle (degrees)',
-        'Apex x-coordinate (px)',
-        'Apex y-coordinate (px)',
-        'Needle width (px)',
-    ])
-
-    for drop in drops:
-        writer.writerow([
-            format(drop.bn_image_timestamp.get(), '.1f'),
-            format(drop.bn_interfacial_tension.get(), '.3g'),
-            format(drop.bn_volume.get(), '.3g'),
-            format(drop.bn_surface_area.get(), '.3g'),
-            format(drop.bn_apex_radius.get(), '.3g'),
-            format(drop.bn_worthington.get(), '.3g'),
-            format(drop.bn_bond_number.get(), '.3g'),
-            format(math.degrees(drop.bn_rotation.get()), '.3g'),
-            format(drop.bn_apex_coords_px.get()[0], '.1f'),
-            format(drop.bn_apex_coords_px.get()[1], '.1f'),
-            format(drop.bn_needle_width_px.get(), '.1f'),
-        ])
@@ -32,6 +32,7 @@ from injector import inject
 
 from opendrop.app.common.footer.analysis import AnalysisFooterStatus
 from opendrop.appfw import Presenter, TemplateChild, component
+from opendrop.widgets.error_dialog import ErrorDialog
 from opendrop.widgets.yes_no_dialog import YesNoDialog
 
 from .analysis_saver import ift_save_dialog_cs
@@ -79,6 +80,47 @@ class IFTExperimentPresenter(Presenter[Gtk.Assistant]):
             'est-complete', self.analysis_footer, 'time-complete', GObject.BindingFlags.SYNC_CREATE
         )
 
+        self._save_job_conns = []
+        self.session.connect('notify::save-job', self._hdl_session_save_job_changed)
+        self.session.connect('save-failed', self._hdl_session_save_failed)
+        self._hdl_session_save_job_changed()
+
+    def _hdl_session_save_job_changed(self, *_) -> None:
+        for conn in self._save_job_conns:
+            conn.disconnect()
+        self._save_job_conns.clear()
+
+        job = self.session.save_job
+        if job is None:
+            self.analysis_footer.props.save_active = False
+            return
+
+        def update_footer() -> None:
+            self.analysis_footer.props.save_active = not job.bn_is_done.get()
+            self.analysis_footer.props.save_progress = job.bn_progress.get()
+
+        self._save_job_conns.extend([
+            job.bn_progress.on_changed.connect(update_footer, weak_ref=False),
+            job.bn_is_done.on_changed.connect(update_footer, weak_ref=False),
+        ])
+        update_footer()
+
+    def _hdl_session_save_failed(self, session: GObject.Object, message: str) -> None:
+        error_dialog = ErrorDialog(
+            message_format='Failed to save analyses',
+            secondary_text=message,
+            parent=self.host,
+        )
+
+        def hdl_response(dialog: Gtk.Window, *_) -> None:
+            dialog.destroy()
+
+        error_dialog.connect('response', hdl_response)
+        error_dialog.show()
+
+    def cancel_save(self, *_) -> None:
+        self.session.cancel_save()
+
     def prepare(self, *_) -> None:
         # Update footer to show current page's action widgets.
         cur_page = self.host.get_current_page()
@@ -28,6 +28,7 @@
 
 
 import asyncio
+import functools
 import operator
 from typing import Optional, Hashable, Tuple
 
@@ -38,9 +39,11 @@ from opendrop.app.common.image_processing.plugins.preview.model import (
     AcquirerController,
     ImageSequenceAcquirerController,
     CameraAcquirerController)
-from opendrop.app.ift.services.edges import PendantEdgeDetection, PendantEdgeDetectionParamsFactory, PendantEdgeDetectionService
+from opendrop.app.ift.services.edges import PendantEdgeDetection, PendantEdgeDetectionParams, \
+    PendantEdgeDetectionParamsFactory, PendantEdgeDetectionService
 from opendrop.utility.bindable import VariableBindable, AccessorBindable
 from opendrop.utility.bindable.typing import Bindable
+from opendrop.utility.lrucache import LRUCache
 
 
 class IFTPreviewPluginModel:
@@ -129,6 +132,12 @@ class IFTPreviewPluginModel:
 
 
 class IFTImageSequenceAcquirerController(ImageSequenceAcquirerController):
+    # Budget for cached edge detection results, in bytes of edge map.
+    EDGE_DETECTION_CACHE_SIZE = 256 * 1024**2
+
+    # Number of frames either side of the showing frame to detect edges for in advance.
+    PREFETCH_RADIUS = 1
+
     def __init__(
             self, *,
             acquirer: ImageSequenceAcquirer,
@@ -147,8 +156,13 @@ class IFTImageSequenceAcquirerController(ImageSequenceAcquirerController):
 
         self.__destroyed = False
 
-        self._extracted_features = {}
-        self._images = {}
+        # Edge detection futures keyed by (image id, edge detection params). Results for previous parameters are kept
+        # so that returning to an earlier setting doesn't need to run edge detection again.
+        self._extracted_features = LRUCache(
+            max_size=self.EDGE_DETECTION_CACHE_SIZE,
+            on_evict=lambda _, fut: fut.cancel(),
+        )  # type: LRUCache[Tuple[Hashable, PendantEdgeDetectionParams], asyncio.Future]
+
         self._current_image = None
         self._current_preview = None
 
@@ -160,42 +174,85 @@ class IFTImageSequenceAcquirerController(ImageSequenceAcquirerController):
         self._edge_det_params_changed_id = edge_det_params.connect('changed', self._edge_det_params_changed)
 
     def _edge_det_params_changed(self, *_) -> None:
-        for fut in self._extracted_features.values():
-            fut.cancel()
+        # Jobs for stale parameters that haven't finished yet are only holding up the pool, finished results are kept.
+        for key in self._extracted_features.keys():
+            fut = self._extracted_features.peek(key)
+            if not fut.done():
+                self._extracted_features.discard(key)
+                fut.cancel()
 
-        self._extracted_features = {}
         self._queue_update_preview()
 
-    def _on_image_registered(self, image_id: Hashable, image: np.ndarray) -> None:
-        self._images[image_id] = image
-
     def _on_image_deregistered(self, image_id: Hashable) -> None:
-        del self._images[image_id]
-        del self._extracted_features[image_id]
+        for key in self._extracted_features.keys():
+            if key[0] != image_id:
+                continue
+
+            fut = self._extracted_features.discard(key)
+            fut.cancel()
 
     def _on_image_changed(self, image_id: Hashable) -> None:
         self._current_image = image_id
         self._queue_update_preview()
 
+    def _get_extracted_features(self, image_id: Hashable, params: PendantEdgeDetectionParams) -> asyncio.Future:
+        key = (image_id, params)
+
+        fut = self._extracted_features.get(key)
+        if fut is not None and not fut.cancelled():
+            return fut
+
+        image = self._get_image(image_id)
+
+        fut = self._edge_det_service.detect(image, params, coalesce_key=(id(self), image_id))
+        fut.add_done_callback(functools.partial(self._hdl_extracted_features_done, key))
+
+        # Edge maps are one byte per pixel.
+        self._extracted_features.put(key, fut, size=image.shape[0] * image.shape[1])
+
+        return fut
+
+    def _hdl_extracted_features_done(self, key: Tuple[Hashable, PendantEdgeDetectionParams], fut: asyncio.Future) \
+            -> None:
+        if self.__destroyed or fut.cancelled(): return
+
+        image_id, params = key
+        if image_id != self._current_image or params != self._edge_det_params.create():
+            return
+
+        self._queue_update_preview()
+
+    def _prefetch_neighbours(self, params: PendantEdgeDetectionParams) -> None:
+        showing_index = self.bn_showing_image_index.get()
+        if showing_index is None:
+            return
+
+        image_keys = self._image_keys
+
+        for offset in range(1, self.PREFETCH_RADIUS + 1):
+            for index in (showing_index + offset, showing_index - offset):
+                if not 0 <= index < len(image_keys):
+                    continue
+
+                self._get_extracted_features(image_keys[index], params)
+
     def _queue_update_preview(self, *_) -> None:
         if self.__destroyed: return
 
         image_id = self._current_image
-        image = self._images[self._current_image]
-
-        if image_id not in self._extracted_features:
-            fut = self._edge_det_service.detect(image, self._edge_det_params.create())
-            self._extracted_features[image_id] = fut
-            fut.add_done_callback(self._queue_update_preview)
+        if image_id is None:
+            return
 
-        fut = self._extracted_features[image_id]
-        if not fut.done() and self._current_preview is self._current_image:
+        fut = self._get_extracted_features(image_id, self._edge_det_params.create())
+        if not fut.done() and self._current_preview == self._current_image:
+            # Keep showing the previous result for this image until the new one is ready.
             return
 
         if not fut.done():
             extracted_features = None
         else:
             extracted_features = fut.result()
+            self._prefetch_neighbours(self._edge_det_params.create())
 
         self._update_preview(extracted_features)
 
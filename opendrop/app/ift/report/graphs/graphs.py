@@ -29,7 +29,7 @@
 
 from typing import Iterable, Sequence, Tuple
 
-from gi.repository import Gtk, GObject
+from gi.repository import Gtk, GLib, GObject
 from injector import inject
 from matplotlib import ticker
 from matplotlib.backends.backend_gtk3cairo import FigureCanvasGTK3Cairo as FigureCanvas
@@ -37,6 +37,7 @@ from matplotlib.figure import Figure
 
 from opendrop.app.ift.services.analysis import PendantAnalysisJob
 from opendrop.appfw import Presenter, TemplateChild, component, install
+from opendrop.utility.decimate import DecimatedLine
 
 from .services.graphs import IFTReportGraphsService
 
@@ -48,7 +49,11 @@ class IFTReportGraphsPresenter(Presenter[Gtk.Stack]):
     no_data_label = TemplateChild('no_data_label')
     figure_container = TemplateChild('figure_container')  # type: TemplateChild[Gtk.Container]
 
+    # Minimum time between redraws (in milliseconds), since data can change many times a second during an analysis.
+    REDRAW_INTERVAL = 250
+
     _analyses = ()
+    _redraw_timer = None
 
     @inject
     def __init__(self, graphs_service: IFTReportGraphsService) -> None:
@@ -83,15 +88,18 @@ class IFTReportGraphsPresenter(Presenter[Gtk.Stack]):
         for lbl in (*self.ift_axes.get_xticklabels(), *volume_axes.get_xticklabels()):
             lbl.set_visible(False)
 
-        self.ift_line = self.ift_axes.plot([], marker='o', color='red')[0]
-        self.volume_line = volume_axes.plot([], marker='o', color='blue')[0]
-        self.surface_area_line = surface_area_axes.plot([], marker='o', color='green')[0]
+        # Series can have hundreds of thousands of points, only draw as many as can be seen.
+        self.ift_line = DecimatedLine(self.ift_axes.plot([], marker='o', color='red')[0])
+        self.volume_line = DecimatedLine(volume_axes.plot([], marker='o', color='blue')[0])
+        self.surface_area_line = DecimatedLine(surface_area_axes.plot([], marker='o', color='green')[0])
 
-        self.graphs_service.connect('notify::ift', self.hdl_model_data_changed)
-        self.graphs_service.connect('notify::volume', self.hdl_model_data_changed)
-        self.graphs_service.connect('notify::surface-area', self.hdl_model_data_changed)
+        self._graphs_service_handler_ids = [
+            self.graphs_service.connect('notify::ift', self.hdl_model_data_changed),
+            self.graphs_service.connect('notify::volume', self.hdl_model_data_changed),
+            self.graphs_service.connect('notify::surface-area', self.hdl_model_data_changed),
+        ]
 
-        self.hdl_model_data_changed()
+        self.update_data()
 
     def hdl_canvas_map(self, *_) -> None:
         self.figure_canvas.draw_idle()
@@ -107,6 +115,18 @@ class IFTReportGraphsPresenter(Presenter[Gtk.Stack]):
         self.graphs_service.set_analyses(analyses)
 
     def hdl_model_data_changed(self, *args) -> None:
+        if self._redraw_timer is not None:
+            # Already scheduled.
+            return
+
+        self._redraw_timer = GLib.timeout_add(self.REDRAW_INTERVAL, self._redraw_timer_timeout)
+
+    def _redraw_timer_timeout(self) -> bool:
+        self._redraw_timer = None
+        self.update_data()
+        return GLib.SOURCE_REMOVE
+
+    def update_data(self) -> None:
         ift_data = self.graphs_service.ift
         volume_data = self.graphs_service.volume
         surface_area_data = self.graphs_service.surface_area
@@ -171,19 +191,31 @@ class IFTReportGraphsPresenter(Presenter[Gtk.Stack]):
         self.figure_canvas.draw_idle()
 
     def update_xlim(self) -> None:
-        all_xdata = (
-            *self.ift_line.get_xdata(),
-            *self.volume_line.get_xdata(),
-            *self.surface_area_line.get_xdata(),
-        )
-
-        if len(all_xdata) <= 1:
+        all_xdata = [
+            xdata for xdata in (
+                self.ift_line.get_xdata(),
+                self.volume_line.get_xdata(),
+                self.surface_area_line.get_xdata(),
+            )
+            if len(xdata) > 0
+        ]
+
+        if sum(map(len, all_xdata)) <= 1:
             return
 
-        xmin = min(all_xdata)
-        xmax = max(all_xdata)
+        # Data is in ascending order.
+        xmin = min(xdata[0] for xdata in all_xdata)
+        xmax = max(xdata[-1] for xdata in all_xdata)
 
         if xmin == xmax:
             return
 
         self.ift_axes.set_xlim(xmin, xmax)
+
+    def destroy(self, *_) -> None:
+        if self._redraw_timer is not None:
+            GLib.source_remove(self._redraw_timer)
+            self._redraw_timer = None
+
+        for handler_id in self._graphs_service_handler_ids:
+            self.graphs_service.disconnect(handler_id)
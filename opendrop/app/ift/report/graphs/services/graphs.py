@@ -27,12 +27,12 @@
 # with this software.  If not, see <https://www.gnu.org/licenses/>.
 
 
-import math
-from typing import Iterable, Sequence, Tuple
+from typing import Iterable, MutableMapping, Sequence, Tuple
 
 from gi.repository import GObject
 
 from opendrop.app.ift.services.analysis import PendantAnalysisJob
+from opendrop.utility.timeseries import TimeSeries
 
 
 class IFTReportGraphsService(GObject.Object):
@@ -43,19 +43,25 @@ class IFTReportGraphsService(GObject.Object):
             self._cleanup_tasks = []
 
             event_connections = [
+                self.analysis.bn_image_timestamp.on_changed.connect(
+                    self._hdl_analysis_data_changed
+                ),
                 self.analysis.bn_interfacial_tension.on_changed.connect(
-                    owner._tracked_analysis_data_changed
+                    self._hdl_analysis_data_changed
                 ),
                 self.analysis.bn_volume.on_changed.connect(
-                    owner._tracked_analysis_data_changed
+                    self._hdl_analysis_data_changed
                 ),
                 self.analysis.bn_surface_area.on_changed.connect(
-                    owner._tracked_analysis_data_changed
+                    self._hdl_analysis_data_changed
                 ),
             ]
 
             self._cleanup_tasks.extend(conn.disconnect for conn in event_connections)
 
+        def _hdl_analysis_data_changed(self) -> None:
+            self._owner._tracked_analysis_data_changed(self.analysis)
+
         def destroy(self) -> None:
             for f in self._cleanup_tasks:
                 f()
@@ -63,92 +69,61 @@ class IFTReportGraphsService(GObject.Object):
     def __init__(self) -> None:
         super().__init__()
         self._analyses = ()
-        self._watchers = []
+        self._watchers = {}  # type: MutableMapping[PendantAnalysisJob, IFTReportGraphsService._AnalysisWatcher]
 
-        self._ift = ((), ())  # type: Tuple[Sequence[float], Sequence[float]]
-        self._volume = ((), ())  # type: Tuple[Sequence[float], Sequence[float]]
-        self._surface_area = ((), ())  # type: Tuple[Sequence[float], Sequence[float]]
+        self._ift = TimeSeries()  # type: TimeSeries[PendantAnalysisJob]
+        self._volume = TimeSeries()  # type: TimeSeries[PendantAnalysisJob]
+        self._surface_area = TimeSeries()  # type: TimeSeries[PendantAnalysisJob]
 
     def set_analyses(self, analyses: Iterable[PendantAnalysisJob]) -> None:
         self._analyses = tuple(analyses)
         self._analyses_changed()
 
     def _analyses_changed(self) -> None:
-        analyses = self._analyses
-        watching = [watcher.analysis for watcher in self._watchers]
-
-        to_watch = set(analyses) - set(watching)
-        for analysis in to_watch:
-            self._watchers.append(self._AnalysisWatcher(analysis, self))
-
-        to_unwatch = set(watching) - set(analyses)
-        for analysis in to_unwatch:
-            for watcher in tuple(self._watchers):
-                if watcher.analysis == analysis:
-                    self._watchers.remove(watcher)
-                    watcher.destroy()
-
-        self._tracked_analysis_data_changed()
-
-    def _tracked_analysis_data_changed(self) -> None:
-        ift_data = []
-        vol_data = []
-        sur_data = []
-
-        analyses = self._analyses
-
-        for analysis in analyses:
-            timestamp = analysis.bn_image_timestamp.get()
-            if timestamp is None or not math.isfinite(timestamp):
-                continue
-
-            ift_value = analysis.bn_interfacial_tension.get()
-            vol_value = analysis.bn_volume.get()
-            sur_value = analysis.bn_surface_area.get()
+        analyses = set(self._analyses)
+        watching = set(self._watchers)
 
-            if ift_value is not None and math.isfinite(ift_value):
-                ift_data.append((timestamp, ift_value))
+        for analysis in watching - analyses:
+            self._watchers.pop(analysis).destroy()
+            self._ift.discard(analysis)
+            self._volume.discard(analysis)
+            self._surface_area.discard(analysis)
 
-            if vol_value is not None and math.isfinite(vol_value):
-                vol_data.append((timestamp, vol_value))
+        for analysis in analyses - watching:
+            self._watchers[analysis] = self._AnalysisWatcher(analysis, self)
+            self._update_series(analysis)
 
-            if sur_value is not None and math.isfinite(sur_value):
-                sur_data.append((timestamp, sur_value))
-
-        # Sort in ascending order of timestamp
-        ift_data = sorted(ift_data, key=lambda x: x[0])
-        vol_data = sorted(vol_data, key=lambda x: x[0])
-        sur_data = sorted(sur_data, key=lambda x: x[0])
-
-        ift_data = tuple(zip(*ift_data))
-        vol_data = tuple(zip(*vol_data))
-        sur_data = tuple(zip(*sur_data))
-
-        if len(ift_data) == 0:
-            ift_data = (tuple(), tuple())
+        self.notify('ift')
+        self.notify('volume')
+        self.notify('surface-area')
 
-        if len(vol_data) == 0:
-            vol_data = (tuple(), tuple())
+    def _tracked_analysis_data_changed(self, analysis: PendantAnalysisJob) -> None:
+        ift_changed, volume_changed, surface_area_changed = self._update_series(analysis)
 
-        if len(sur_data) == 0:
-            sur_data = (tuple(), tuple())
+        if ift_changed:
+            self.notify('ift')
+        if volume_changed:
+            self.notify('volume')
+        if surface_area_changed:
+            self.notify('surface-area')
 
-        self._ift = ift_data
-        self._volume = vol_data
-        self._surface_area = sur_data
+    def _update_series(self, analysis: PendantAnalysisJob) -> Tuple[bool, bool, bool]:
+        timestamp = analysis.bn_image_timestamp.get()
 
-        self.notify('ift')
-        self.notify('volume')
-        self.notify('surface-area')
+        return (
+            self._ift.set(analysis, timestamp, analysis.bn_interfacial_tension.get()),
+            self._volume.set(analysis, timestamp, analysis.bn_volume.get()),
+            self._surface_area.set(analysis, timestamp, analysis.bn_surface_area.get()),
+        )
 
     @GObject.Property
     def ift(self) -> Tuple[Sequence[float], Sequence[float]]:
-        return self._ift
+        return self._ift.data()
 
     @GObject.Property
     def volume(self) -> Tuple[Sequence[float], Sequence[float]]:
-        return self._volume
+        return self._volume.data()
 
     @GObject.Property
     def surface_area(self) -> Tuple[Sequence[float], Sequence[float]]:
-        return self._surface_area
+        return self._surface_area.data()
@@ -28,16 +28,14 @@
 
 
 from enum import IntEnum
-from typing import Any, Optional, Sequence, cast
+from typing import Any, Optional, Sequence
 
 from gi.repository import Gtk, GObject
 from gi.repository import GLib
 
 from opendrop.app.ift.services.analysis import PendantAnalysisJob
 from opendrop.appfw import Presenter, TemplateChild, component, install
-
-
-COLUMN_TYPES = (object, int, str, str, str, str, str, str)
+from opendrop.widgets.lazy_list_model import LazyListModel
 
 
 class Column(IntEnum):
@@ -65,10 +63,24 @@ class IFTReportOverviewMasterPresenter(Presenter[Gtk.ScrolledWindow]):
     view_ready = False
 
     def __init__(self) -> None:
-        self.model = Gtk.ListStore(*COLUMN_TYPES)
-        self.row_bindings = []
+        # Cells are only formatted when the tree view draws their row.
+        self.model = LazyListModel(columns=[
+            (object, lambda analysis: analysis.bn_status.get()),
+            (int, lambda analysis: self.spinner_pulse),
+            (str, lambda analysis: f'{analysis.bn_image_timestamp.get():.1f}'),
+            (str, lambda analysis: f'{1e3 * analysis.bn_interfacial_tension.get():.3g}'),
+            (str, lambda analysis: f'{1e9 * analysis.bn_volume.get():.3g}'),
+            (str, lambda analysis: f'{1e6 * analysis.bn_surface_area.get():.3g}'),
+            (str, lambda analysis: f'{analysis.bn_bond_number.get():.3g}'),
+            (str, lambda analysis: f'{analysis.bn_worthington.get():.3g}'),
+        ])
+        self.analysis_connections = {}
         self.ignore_tree_selection_changes = False
 
+        self.spinner_pulse = 0
+        self.spinner_animation_timer = None
+        self.fitting = set()
+
     def after_view_init(self) -> None:
         self.tree_view.set_model(self.model)
 
@@ -118,6 +130,14 @@ class IFTReportOverviewMasterPresenter(Presenter[Gtk.ScrolledWindow]):
             text=Column.WORTHINGTON
         ))
 
+        # With fixed size columns and rows, the tree view doesn't need to measure every row up front, so only the
+        # visible rows are ever formatted.
+        for column in self.tree_view.get_columns():
+            column.set_sizing(Gtk.TreeViewColumnSizing.FIXED)
+            column.set_fixed_width(90)
+            column.set_resizable(True)
+        self.tree_view.set_fixed_height_mode(True)
+
         self.view_ready = True
 
         self.analyses_changed()
@@ -175,16 +195,7 @@ class IFTReportOverviewMasterPresenter(Presenter[Gtk.ScrolledWindow]):
         if tree_iter is None:
             return None
 
-        row = Gtk.TreeRowReference(
-            model=self.model,
-            path=self.model.get_path(tree_iter)
-        )
-
-        for p in self.row_bindings:
-            if p.row.get_path() == row.get_path():
-                return p.analysis
-        else:
-            raise RuntimeError
+        return self.model.get_item(tree_iter)
 
     @selection.setter
     def selection(self, analysis: Optional[PendantAnalysisJob]) -> None:
@@ -197,13 +208,11 @@ class IFTReportOverviewMasterPresenter(Presenter[Gtk.ScrolledWindow]):
         self.ignore_tree_selection_changes = True
         try:
             if analysis is not None:
-                for binding in self.row_bindings:
-                    if binding.analysis == analysis:
-                        break
-                else:
+                tree_iter = self.model.get_iter_of(analysis)
+                if tree_iter is None:
                     raise ValueError
 
-                self.tree_selection.select_path(binding.row.get_path())
+                self.tree_selection.select_iter(tree_iter)
             else:
                 self.tree_selection.unselect_all()
         finally:
@@ -222,131 +231,80 @@ class IFTReportOverviewMasterPresenter(Presenter[Gtk.ScrolledWindow]):
 
     def analyses_changed(self) -> None:
         analyses = self.analyses
-        bound = [p.analysis for p in self.row_bindings]
+        connected = self.analysis_connections.keys()
+
+        for analysis in connected - set(analyses):
+            self.unbind_analysis(analysis)
 
         for analysis in analyses:
-            if analysis in bound: continue
+            if analysis in connected: continue
             self.bind_analysis(analysis)
 
-        for analysis in bound:
-            if analysis in analyses: continue
-            self.unbind_analysis(analysis)
+        selection = self.selection
+        selection_index = self.model.index_of(selection) if selection is not None else None
 
-    def bind_analysis(self, analysis: PendantAnalysisJob) -> None:
-        row = self.new_model_row()
+        self.model.set_items(analyses)
+        self.host.queue_resize()
 
-        new_binding = RowBinding(analysis, row)
-        self.row_bindings.append(new_binding)
+        if selection is not None and self.model.index_of(selection) is None:
+            # Selected analysis was removed, select its neighbour instead.
+            if analyses:
+                self.selection = analyses[min(selection_index, len(analyses) - 1)]
+            else:
+                self.selection = None
+        elif self.selection is None and analyses:
+            self.selection = analyses[0]
 
-        if self.selection is None:
-            self.selection = analysis
+    def bind_analysis(self, analysis: PendantAnalysisJob) -> None:
+        self.analysis_connections[analysis] = analysis.bn_status.on_changed.connect(
+            lambda: self.analysis_status_changed(analysis),
+            weak_ref=False,
+        )
+        self.analysis_status_changed(analysis)
 
     def unbind_analysis(self, analysis: PendantAnalysisJob) -> None:
-        for binding in self.row_bindings:
-            if binding.analysis == analysis:
-                break
+        self.analysis_connections.pop(analysis).disconnect()
+        self.fitting.discard(analysis)
+
+    def analysis_status_changed(self, analysis: PendantAnalysisJob) -> None:
+        if analysis.bn_status.get() is PendantAnalysisJob.Status.FITTING:
+            self.fitting.add(analysis)
+            if self.spinner_animation_timer is None:
+                self.spinner_animation_timer = GLib.timeout_add(
+                    interval=750//12,
+                    function=self.spinner_animation_step
+                )
         else:
-            raise ValueError("analysis not added to this model")
+            self.fitting.discard(analysis)
 
-        if self.selection == analysis:
-            if len(self.row_bindings) == 1:
-                self.selection = None
-            else:
-                index = self.row_bindings.index(binding)
-                if index + 1 < len(self.row_bindings):
-                    next_index = index + 1
-                else:
-                    next_index = index - 1
-                self.selection = self.row_bindings[next_index].analysis
-
-        self.row_bindings.remove(binding)
-        binding.unbind()
-
-        self.remove_model_row(binding.row)
-
-    def new_model_row(self) -> Gtk.TreeRowReference:
-        tree_iter = self.model.append((None,) * len(Column))
-        row = Gtk.TreeRowReference(
-            model=self.model,
-            path=self.model.get_path(tree_iter)
-        )
+        self.model.row_changed_later(analysis)
 
-        self.host.queue_resize()
-        self.tree_view.queue_resize()
-        self.tree_view.queue_allocate()
+    def spinner_animation_step(self) -> bool:
+        if not self.fitting:
+            self.spinner_animation_timer = None
+            return GLib.SOURCE_REMOVE
+
+        self.spinner_pulse += 1
+        self.spinner_pulse %= 12
 
-        return row
+        for analysis in self.fitting:
+            self.model.row_changed_later(analysis)
 
-    def remove_model_row(self, row: Gtk.TreeRowReference) -> None:
-        tree_iter = self.model.get_iter(row.get_path())
-        self.model.remove(tree_iter)
+        return GLib.SOURCE_CONTINUE
 
     def tree_selection_changed(self, tree_selection: Gtk.TreeSelection) -> None:
         if self.ignore_tree_selection_changes:
             return
         self.notify('selection')
 
+    def destroy(self, *_) -> None:
+        for connection in self.analysis_connections.values():
+            connection.disconnect()
+        self.analysis_connections.clear()
+        self.fitting.clear()
 
-class RowBinding:
-    def __init__(self, analysis: PendantAnalysisJob, row: Gtk.TreeRowReference) -> None:
-        self.analysis = analysis
-        self.row = row
-
-        self._spinner_pulse = 0
-        self._spinner_animation_timer = None
-
-        self._analysis_status_changed_connection = \
-            analysis.bn_status.on_changed.connect(
-                self._update_row
-            )
-
-        self._update_row()
-
-    def _update_row(self) -> None:
-        status = self.analysis.bn_status.get()
-        timestamp = self.analysis.bn_image_timestamp.get()
-        ift = 1e3 * self.analysis.bn_interfacial_tension.get()
-        volume = 1e9 * self.analysis.bn_volume.get()
-        surface_area = 1e6 * self.analysis.bn_surface_area.get()
-        bond = self.analysis.bn_bond_number.get()
-        worthington = self.analysis.bn_worthington.get()
-        
-        data = {
-            Column.STATUS: status,
-            Column.TIMESTAMP: f'{timestamp:.1f}',
-            Column.IFT: f'{ift:.3g}',
-            Column.VOLUME: f'{volume:.3g}',
-            Column.SURFACE_AREA: f'{surface_area:.3g}',
-            Column.BOND: f'{bond:.3g}',
-            Column.WORTHINGTON: f'{worthington:.3g}',
-        }
-
-        self._model.set(self._iter, list(data.keys()), list(data.values()))
-
-        if status is PendantAnalysisJob.Status.FITTING and self._spinner_animation_timer is None:
-            self._spinner_animation_timer = GLib.timeout_add(
-                interval=750//12,
-                function=self._spinner_animation_step
-            )
-
-    def _spinner_animation_step(self) -> bool:
-        status = self.analysis.bn_status.get()
-        if status is PendantAnalysisJob.Status.FITTING:
-            self._spinner_pulse += 1
-            self._spinner_pulse %= 12
-            self._model.set(self._iter, Column.SPINNER_PULSE, self._spinner_pulse)
-            return GLib.SOURCE_CONTINUE
-        else:
-            self._spinner_animation_timer = None
-            return GLib.SOURCE_REMOVE
-
-    @property
-    def _iter(self) -> Gtk.TreeIter:
-        return self._model.get_iter(self.row.get_path())
-
-    @property
-    def _model(self) -> Gtk.ListStore:
-        return cast(Gtk.ListStore, self.row.get_model())
+        if self.spinner_animation_timer is not None:
+            GLib.source_remove(self.spinner_animation_timer)
+            self.spinner_animation_timer = None
 
-    def unbind(self) -> None:
-        self._analysis_status_changed_connection.disconnect()
+        self.model.destroy()
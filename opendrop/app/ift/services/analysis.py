@@ -30,7 +30,6 @@
 import asyncio
 import math
 from opendrop.processing.ift.young_laplace.equation import YoungLaplaceSolution
-from opendrop.processing.ift.needle_width import calculate_width_from_needle_profile
 import time
 from asyncio import Future
 from enum import Enum
@@ -39,12 +38,14 @@ from injector import inject
 
 import numpy as np
 
+from opendrop.analysis.cache import default_cache
+from opendrop.analysis.ift import pendant_needle_width
 from opendrop.app.ift.services.younglaplace import YoungLaplaceFitService
 from opendrop.app.common.services.acquisition import InputImage
 from opendrop.app.ift.services.edges import PendantEdgeDetectionParamsFactory, PendantEdgeDetectionService
 from opendrop.app.ift.services.quantities import PendantDerivedPropertiesService, PendantPhysicalParamsFactory
 
-from opendrop.utility.bindable import AccessorBindable, VariableBindable
+from opendrop.utility.bindable import AccessorBindable, VariableBindable, batch
 from opendrop.utility.geometry import Vector2
 
 
@@ -187,7 +188,7 @@ class PendantAnalysisJob:
         self.bn_drop_region.set(edge_det_params.drop_region)
         self.bn_needle_region.set(edge_det_params.needle_region)
 
-        self._extracted_features = self._edge_det_service.detect(image, edge_det_params)
+        self._extracted_features = self._edge_det_service.detect(image, edge_det_params, cached=True)
         self._extracted_features.add_done_callback(self._edge_det_done)
 
         self.bn_image.poke()
@@ -205,9 +206,14 @@ class PendantAnalysisJob:
         except Exception as e:
             raise e
 
-        self.bn_drop_profile_extract.set(features.drop_edge)
-        self.bn_needle_profile_extract.set((features.needle_left_edge, features.needle_right_edge))
-        self.bn_needle_width_px.set(calculate_width_from_needle_profile((features.needle_left_edge, features.needle_right_edge)))
+        with batch():
+            self.bn_drop_profile_extract.set(features.drop_edge)
+            self.bn_needle_profile_extract.set((features.needle_left_edge, features.needle_right_edge))
+            self.bn_needle_width_px.set(pendant_needle_width(
+                features.needle_left_edge,
+                features.needle_right_edge,
+                default_cache(),
+            ))
 
         self._young_laplace_fit = self._ylfit_service.fit(features.drop_edge)
         self._young_laplace_fit.add_done_callback(self._young_laplace_fit_done)
@@ -227,24 +233,26 @@ class PendantAnalysisJob:
 
         derived = self._derived_service.derive(ylfit.bond, ylfit.arc_length, ylfit.radius * pixel_size)
 
-        self.bn_bond_number.set(ylfit.bond)
-        self.bn_apex_coords_px.set(ylfit.apex)
-        self.bn_apex_radius_px.set(ylfit.radius)
-        self.bn_rotation.set(ylfit.rotation)
+        # Listeners only need to hear about the fit once it's all been set.
+        with batch():
+            self.bn_bond_number.set(ylfit.bond)
+            self.bn_apex_coords_px.set(ylfit.apex)
+            self.bn_apex_radius_px.set(ylfit.radius)
+            self.bn_rotation.set(ylfit.rotation)
 
-        self.bn_drop_profile_fit.set(None)
-        self.bn_residuals.set(ylfit.residuals)
-        self.bn_drop_profile_fit.set(ylfit.fitted_profile)
+            self.bn_drop_profile_fit.set(None)
+            self.bn_residuals.set(ylfit.residuals)
+            self.bn_drop_profile_fit.set(ylfit.fitted_profile)
 
-        self.bn_interfacial_tension.set(derived.interfacial_tension)
-        self.bn_volume.set(derived.volume)
-        self.bn_surface_area.set(derived.surface_area)
+            self.bn_interfacial_tension.set(derived.interfacial_tension)
+            self.bn_volume.set(derived.volume)
+            self.bn_surface_area.set(derived.surface_area)
 
-        self.bn_apex_radius.set(ylfit.radius * pixel_size)
+            self.bn_apex_radius.set(ylfit.radius * pixel_size)
 
-        self.bn_worthington.set(derived.worthington)
+            self.bn_worthington.set(derived.worthington)
 
-        self.bn_status.set(self.Status.FINISHED)
+            self.bn_status.set(self.Status.FINISHED)
 
     def cancel(self) -> None:
         if self.bn_status.get().is_terminal:
@@ -32,44 +32,15 @@ from concurrent.futures.process import ProcessPoolExecutor
 
 from injector import inject
 from opendrop.utility.geometry import Rect2
-from typing import Optional
+from opendrop.utility.jobchannel import CoalescingJobChannel
+from typing import Hashable, Optional
 
 from gi.repository import GObject
 
 import numpy as np
 
-from opendrop.processing.ift import (
-    apply_edge_detection,
-    extract_drop_profile,
-    extract_needle_profile,
-)
-
-
-def pendant_edge_detect(image: np.ndarray, params: 'PendantEdgeDetectionParams') -> 'PendantEdgeDetection':
-    edge_map = apply_edge_detection(image, canny_min=params.canny_min, canny_max=params.canny_max)
-
-    drop_region = params.drop_region
-    if drop_region is not None:
-        cropped = edge_map[drop_region.y0:drop_region.y1, drop_region.x0:drop_region.x1]
-        drop_edge = extract_drop_profile(cropped)
-        drop_edge += drop_region.position
-    else:
-        drop_edge = np.empty((0, 2))
-
-    needle_region = params.needle_region
-    if needle_region is not None:
-        cropped = edge_map[needle_region.y0:needle_region.y1, needle_region.x0:needle_region.x1]
-        needle_edges = extract_needle_profile(cropped)
-        needle_edges = tuple(s + needle_region.position for s in needle_edges)
-    else:
-        needle_edges = np.empty((0, 2)), np.empty((0, 2))
-
-    return PendantEdgeDetection(
-        edge_map=edge_map,
-        drop_edge=drop_edge,
-        needle_left_edge=needle_edges[0],
-        needle_right_edge=needle_edges[1],
-    )
+from opendrop.analysis.cache import default_cache
+from opendrop.analysis.ift import PendantEdgeDetection, PendantEdgeDetectionParams, pendant_edge_detect
 
 
 class PendantEdgeDetectionParamsFactory(GObject.Object):
@@ -78,7 +49,7 @@ class PendantEdgeDetectionParamsFactory(GObject.Object):
     _needle_region: Optional[Rect2[int]] = None
     _drop_region: Optional[Rect2[int]] = None
 
-    def create(self) -> 'PendantEdgeDetectionParams':
+    def create(self) -> PendantEdgeDetectionParams:
         return PendantEdgeDetectionParams(
             canny_min=self._canny_min,
             canny_max=self._canny_max,
@@ -127,59 +98,41 @@ class PendantEdgeDetectionParamsFactory(GObject.Object):
         self.changed.emit()
 
 
-class PendantEdgeDetectionParams:
-    """Plain Old Data structure"""
-
-    canny_min: int
-    canny_max: int
-    needle_region: Optional[Rect2[int]]
-    drop_region: Optional[Rect2[int]]
-
-    def __init__(
-            self,
-            canny_min: int,
-            canny_max: int,
-            needle_region: Optional[Rect2[int]],
-            drop_region: Optional[Rect2[int]],
-    ) -> None:
-        self.canny_min = canny_min
-        self.canny_max = canny_max
-        self.needle_region = needle_region
-        self.drop_region = drop_region
-
-
 class PendantEdgeDetectionService:
     @inject
     def __init__(self, default_params_factory: PendantEdgeDetectionParamsFactory) -> None:
         self._executor = ProcessPoolExecutor()
+        self._interactive_jobs = CoalescingJobChannel(self._executor)
+        self._cache = default_cache()
         self._default_params_factory = default_params_factory
 
-    def detect(self, image: np.ndarray, params: Optional[PendantEdgeDetectionParams] = None) -> asyncio.Future:
+    def detect(
+            self,
+            image: np.ndarray,
+            params: Optional[PendantEdgeDetectionParams] = None,
+            *,
+            coalesce_key: Optional[Hashable] = None,
+            cached: bool = False
+    ) -> asyncio.Future:
+        """Run edge detection on `image` in a worker process.
+
+        If `coalesce_key` is given, the job supersedes any earlier job submitted with the same key: the earlier
+        job's future is cancelled, and it is either never run or its result is discarded. Use this for interactive
+        requests where only the latest result matters.
+
+        If `cached` is true, the result is looked up in (or saved to) the analysis cache. Detections loaded from the
+        cache have no edge map, so don't use this for previews."""
         if params is None:
             params = self._default_params_factory.create()
 
-        cfut = self._executor.submit(pendant_edge_detect, image, params)
+        cache = self._cache if cached else None
+
+        if coalesce_key is not None:
+            return self._interactive_jobs.submit(coalesce_key, pendant_edge_detect, image, params, cache)
+
+        cfut = self._executor.submit(pendant_edge_detect, image, params, cache)
         fut = asyncio.wrap_future(cfut, loop=asyncio.get_event_loop())
         return fut
 
     def destroy(self) -> None:
         self._executor.shutdown()
-
-
-class PendantEdgeDetection:
-    edge_map: np.ndarray
-    drop_edge: np.ndarray
-    needle_left_edge: np.ndarray
-    needle_right_edge: np.ndarray
-
-    def __init__(
-            self,
-            edge_map: np.ndarray,
-            drop_edge: np.ndarray,
-            needle_left_edge: np.ndarray,
-            needle_right_edge: np.ndarray,
-    ) -> None:
-        self.edge_map = edge_map
-        self.drop_edge = drop_edge
-        self.needle_left_edge = needle_left_edge
-        self.needle_right_edge = needle_right_edge
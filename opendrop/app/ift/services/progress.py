@@ -1,9 +1,10 @@
 from enum import Enum
-from typing import Iterable, Optional
+from typing import Iterable, MutableMapping, Optional
 
 from gi.repository import GObject
 
 from opendrop.app.ift.services.analysis import PendantAnalysisJob
+from opendrop.utility.progresstracker import ProgressTracker
 
 
 class IFTAnalysisProgressHelper(GObject.Object):
@@ -13,23 +14,25 @@ class IFTAnalysisProgressHelper(GObject.Object):
         CANCELLED = 2
 
     class _AnalysisWatcher:
-        def __init__(self, analysis: PendantAnalysisJob, owner: 'IFTReportProgressService') -> None:
+        def __init__(self, analysis: PendantAnalysisJob, owner: 'IFTAnalysisProgressHelper') -> None:
             self.analysis = analysis
             self.owner = owner
             self._cleanup_tasks = []
 
             event_connections = [
                 self.analysis.bn_status.on_changed.connect(
-                    lambda: (owner.notify('status'), owner.notify('est-complete')), weak_ref=False,
+                    lambda: owner._hdl_analysis_changed(analysis, 'status', 'fraction', 'est-complete'),
+                    weak_ref=False,
                 ),
                 self.analysis.bn_is_done.on_changed.connect(
-                    lambda: owner.notify('fraction'), weak_ref=False,
+                    lambda: owner._hdl_analysis_changed(analysis, 'status', 'fraction', 'est-complete'),
+                    weak_ref=False,
                 ),
                 self.analysis.bn_time_start.on_changed.connect(
-                    lambda: owner.notify('time-start'), weak_ref=False,
+                    lambda: owner._hdl_analysis_changed(analysis, 'time-start'), weak_ref=False,
                 ),
                 self.analysis.bn_time_est_complete.on_changed.connect(
-                    lambda: owner.notify('est-complete'), weak_ref=False,
+                    lambda: owner._hdl_analysis_changed(analysis, 'est-complete'), weak_ref=False,
                 ),
             ]
 
@@ -41,7 +44,8 @@ class IFTAnalysisProgressHelper(GObject.Object):
 
     def __init__(self) -> None:
         self._analyses = ()
-        self._watchers = []
+        self._watchers = {}  # type: MutableMapping[PendantAnalysisJob, 'IFTAnalysisProgressHelper._AnalysisWatcher']
+        self._tracker = ProgressTracker()  # type: ProgressTracker[PendantAnalysisJob]
         super().__init__()
 
     def _set_analyses(self, analyses: Iterable[PendantAnalysisJob]) -> None:
@@ -51,82 +55,61 @@ class IFTAnalysisProgressHelper(GObject.Object):
     analyses = GObject.Property(setter=_set_analyses, flags=GObject.ParamFlags.WRITABLE)
 
     def _update_watchers(self) -> None:
-        analyses = self._analyses
-        watching = [watcher.analysis for watcher in self._watchers]
+        analyses = set(self._analyses)
+        watching = self._watchers.keys()
 
-        to_watch = set(analyses) - set(watching)
-        for analysis in to_watch:
-            self._watchers.append(self._AnalysisWatcher(analysis, self))
+        for analysis in analyses - watching:
+            self._watchers[analysis] = self._AnalysisWatcher(analysis, self)
+            self._track(analysis)
 
-        to_unwatch = set(watching) - set(analyses)
-        for analysis in to_unwatch:
-            for w in tuple(self._watchers):
-                if w.analysis == analysis:
-                    self._watchers.remove(w)
-                    w.destroy()
+        for analysis in watching - analyses:
+            self._watchers.pop(analysis).destroy()
+            self._tracker.discard(analysis)
 
         self.notify('status')
         self.notify('fraction')
         self.notify('time-start')
         self.notify('est-complete')
 
+    def _hdl_analysis_changed(self, analysis: PendantAnalysisJob, *props: str) -> None:
+        self._track(analysis)
+        for prop in props:
+            self.notify(prop)
+
+    def _track(self, analysis: PendantAnalysisJob) -> None:
+        self._tracker.update(
+            analysis,
+            is_done=analysis.bn_is_done.get(),
+            is_cancelled=analysis.bn_is_cancelled.get(),
+            time_start=analysis.bn_time_start.get(),
+            time_est_complete=analysis.bn_time_est_complete.get(),
+        )
+
     @GObject.Property
     def status(self) -> Status:
-        analyses = self._analyses
+        tracker = self._tracker
 
-        is_cancelled = any(
-            analysis.bn_is_cancelled.get()
-            for analysis in analyses
-        )
-        if is_cancelled:
+        if tracker.num_cancelled > 0:
             return self.Status.CANCELLED
 
-        is_finished = all(
-            analysis.bn_is_done.get() and not analysis.bn_is_cancelled.get()
-            for analysis in analyses
-        )
-        if is_finished:
+        if tracker.num_finished == len(tracker):
             return self.Status.FINISHED
 
         return self.Status.ANALYSING
 
     @GObject.Property
     def time_start(self) -> Optional[float]:
-        analyses = self._analyses
-        if not analyses: return None
-
-        time_start = min(
-            analysis.bn_time_start.get()
-            for analysis in analyses
-        )
-
-        return time_start
+        return self._tracker.time_start
 
     @GObject.Property
     def est_complete(self) -> Optional[float]:
-        analyses = self._analyses
-        if not analyses: return None
-
         if self.status is not self.Status.ANALYSING: return None
 
-        time_est_complete = max(
-            analysis.bn_time_est_complete.get()
-            for analysis in analyses
-        )
-
-        return time_est_complete
+        return self._tracker.time_est_complete
 
     @GObject.Property(type=float)
     def fraction(self) -> float:
-        analyses = self._analyses
-        if not analyses: return 1.0
-
-        num_completed = len([
-            analysis
-            for analysis in analyses
-            if analysis.bn_is_done.get()
-        ])
-
-        completed_fraction = num_completed/len(analyses)
+        tracker = self._tracker
+        if not tracker: return 1.0
 
-        return completed_fraction
+        return tracker.num_done/len(tracker)
@@ -33,39 +33,7 @@ from typing import Optional
 from gi.repository import GObject
 from injector import inject
 
-from opendrop.processing.ift import calculate_ift, calculate_volsur, calculate_worthington
-
-
-class PendantPhysicalParams:
-    """Variables are in SI units."""
-
-    def __init__(
-            self,
-            drop_density: float,
-            continuous_density: float,
-            needle_diameter: float,
-            gravity: float
-    ) -> None:
-        self.drop_density = drop_density
-        self.continuous_density = continuous_density
-        self.needle_diameter = needle_diameter
-        self.gravity = gravity
-
-
-class PendantDerivedProperties:
-    """Variables are in SI units."""
-
-    def __init__(
-            self,
-            interfacial_tension: float,
-            volume: float,
-            surface_area: float,
-            worthington: float,
-    ) -> None:
-        self.interfacial_tension = interfacial_tension
-        self.volume = volume
-        self.surface_area = surface_area
-        self.worthington = worthington
+from opendrop.analysis.ift import PendantDerivedProperties, PendantPhysicalParams, pendant_derive_properties
 
 
 class PendantPhysicalParamsFactory(GObject.GObject):
@@ -123,57 +91,6 @@ class PendantPhysicalParamsFactory(GObject.GObject):
         self.changed.emit()
 
 
-def pendant_derive_properties(
-        bond: float,
-        arc_length: float,
-        radius: float,
-        params: PendantPhysicalParams
-) -> PendantDerivedProperties:
-    drop_density = params.drop_density
-    continuous_density = params.continuous_density
-    needle_diameter = params.needle_diameter
-    gravity = params.gravity
-
-    if not math.isfinite(drop_density) \
-            or not math.isfinite(continuous_density) \
-            or not math.isfinite(needle_diameter) \
-            or not math.isfinite(gravity):
-        return PendantDerivedProperties(
-            interfacial_tension=math.nan,
-            volume=math.nan,
-            surface_area=math.nan,
-            worthington=math.nan,
-        )
-
-    interfacial_tension = calculate_ift(
-        inner_density=drop_density,
-        outer_density=continuous_density,
-        bond_number=bond,
-        apex_radius=radius,
-        gravity=gravity,
-    )
-
-    volume, surface_area = calculate_volsur(bond, arc_length)
-    volume *= radius**3
-    surface_area *= radius**2
-
-    worthington = calculate_worthington(
-        inner_density=drop_density,
-        outer_density=continuous_density,
-        gravity=gravity,
-        ift=interfacial_tension,
-        volume=volume,
-        needle_width=needle_diameter,
-    )
-
-    return PendantDerivedProperties(
-        interfacial_tension=interfacial_tension,
-        volume=volume,
-        surface_area=surface_area,
-        worthington=worthington,
-    )
-
-
 class PendantDerivedPropertiesService:
     @inject
     def __init__(self, default_params_factory: PendantPhysicalParamsFactory) -> None:
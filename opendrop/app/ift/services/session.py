@@ -27,11 +27,14 @@
 # with this software.  If not, see <https://www.gnu.org/licenses/>.
 
 
-from typing import Sequence
+import asyncio
+from typing import Any, Mapping, Optional, Sequence
 
 from gi.repository import GObject
 from injector import Binder, Module, inject, singleton
 
+from opendrop.app.common.analysis_saver.export_job import ExportJob
+from opendrop.app.common.analysis_saver.live_export import SaveRecord
 from opendrop.app.common.services.acquisition import AcquirerType, ImageAcquisitionService
 from opendrop.app.ift.analysis_saver import IFTAnalysisSaverOptions
 from opendrop.app.ift.analysis_saver.save_functions import save_drops
@@ -63,15 +66,22 @@ class IFTSession(GObject.Object):
     def __init__(
             self,
             image_acquisition: ImageAcquisitionService,
+            edge_det_params_factory: PendantEdgeDetectionParamsFactory,
+            phys_params_factory: PendantPhysicalParamsFactory,
             edge_det_service: PendantEdgeDetectionService,
             ylfit_service: YoungLaplaceFitService,
             analysis_service: PendantAnalysisService,
     ) -> None:
         self._analyses = ()
         self._analyses_saved = False
+        self._save_job = None  # type: Optional[ExportJob]
+        self._save_record = SaveRecord()
 
         self._image_acquisition = image_acquisition
 
+        self._edge_det_params_factory = edge_det_params_factory
+        self._phys_params_factory = phys_params_factory
+
         self._edge_det_service = edge_det_service
         self._ylfit_service = ylfit_service
 
@@ -90,6 +100,10 @@ class IFTSession(GObject.Object):
         return self._analyses_saved
 
     def safe_to_discard(self) -> bool:
+        if self._save_job is not None and not self._save_job.bn_is_done.get():
+            # Discarding now would leave a partially written save.
+            return False
+
         if self._analyses_saved:
             return True
 
@@ -123,6 +137,8 @@ class IFTSession(GObject.Object):
 
     def clear_analyses(self) -> None:
         self.cancel_analyses()
+        self._cancel_save()
+        self._save_record.clear()
         self._analyses = ()
         self._analyses_saved = True
         self.notify('analyses')
@@ -130,9 +146,62 @@ class IFTSession(GObject.Object):
 
     def save_analyses(self, options: IFTAnalysisSaverOptions) -> None:
         if not self._analyses: return
-        save_drops(self._analyses, options)
-        self._analyses_saved = True
-        self.notify('analyses_saved')
+        self._cancel_save()
+
+        job = save_drops(self._analyses, options, self._get_analysis_parameters(), self._save_record)
+        job.bn_status.on_changed.connect(lambda: self._hdl_save_job_status_changed(job), weak_ref=False)
+        self._save_job = job
+        self.notify('save-job')
+
+    def _get_analysis_parameters(self) -> Mapping[str, Any]:
+        edge_det_params = self._edge_det_params_factory.create()
+        phys_params = self._phys_params_factory.create()
+
+        return {
+            'canny_min': edge_det_params.canny_min,
+            'canny_max': edge_det_params.canny_max,
+            'drop_density': phys_params.drop_density,
+            'continuous_density': phys_params.continuous_density,
+            'needle_diameter': phys_params.needle_diameter,
+            'gravity': phys_params.gravity,
+        }
+
+    def _hdl_save_job_status_changed(self, job: ExportJob) -> None:
+        if job is not self._save_job: return
+
+        status = job.bn_status.get()
+        if status is ExportJob.Status.FINISHED:
+            self._analyses_saved = True
+            self.notify('analyses_saved')
+        elif status.is_terminal:
+            # Don't know what made it to disk, so the next save has to start from scratch.
+            self._save_record.clear()
+
+        if status is ExportJob.Status.FAILED:
+            asyncio.get_event_loop().call_exception_handler({
+                'message': 'Saving analyses failed',
+                'exception': job.exception,
+            })
+            self.emit('save-failed', str(job.exception))
+
+    @GObject.Property(flags=GObject.ParamFlags.READABLE | GObject.ParamFlags.EXPLICIT_NOTIFY)
+    def save_job(self) -> Optional[ExportJob]:
+        return self._save_job
+
+    @GObject.Signal(arg_types=(str,))
+    def save_failed(self, message: str) -> None:
+        pass
+
+    def cancel_save(self) -> None:
+        """Stop the save in progress, drops that have already been written are left on disk."""
+        if self._save_job is None: return
+        self._save_job.cancel()
+
+    def _cancel_save(self) -> None:
+        if self._save_job is None: return
+        self._save_job.cancel()
+        self._save_job = None
+        self.notify('save-job')
 
     def create_save_options(self) -> IFTAnalysisSaverOptions:
         return IFTAnalysisSaverOptions()
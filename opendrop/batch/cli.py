@@ -0,0 +1,426 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+"""Headless batch analysis, run with `python -m opendrop batch {ift,conan} ...`.
+
+Frames can be sent to workers on other machines, started with `python -m opendrop batch worker`, with `--worker`.
+Workers and the scheduler authenticate each other with the shared secret in the OPENDROP_WORKER_KEY environment
+variable. Only use workers on trusted networks, traffic is not encrypted.
+
+Parameters can be given in an INI config file and/or on the command line (which takes precedence), e.g.
+
+    [ift]
+    ; regions are (left, top, right, bottom) in pixels
+    drop_region = 120, 80, 520, 600
+    needle_region = 250, 0, 390, 70
+    canny_min = 30
+    canny_max = 60
+    ; physical constants are in SI units
+    drop_density = 1000
+    continuous_density = 0
+    needle_diameter = 0.0007176
+    gravity = 9.80035
+
+    [conan]
+    drop_region = 50, 100, 600, 400
+    ; surface line is (x0, y0, x1, y1) in pixels
+    surface_line = 0, 380, 640, 382
+    threshold = 30
+"""
+
+import argparse
+import configparser
+import math
+import os
+import sys
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Mapping, MutableSequence, Optional, Sequence
+
+from opendrop.analysis.cache import DEFAULT_MAX_SIZE, default_cache
+from opendrop.analysis.conan import ConanAnalysisResult, ConanParams
+from opendrop.analysis.export import write_conan_timeline, write_ift_archive, write_ift_timeline
+from opendrop.analysis.ift import PendantAnalysisResult, PendantEdgeDetectionParams, PendantPhysicalParams
+from opendrop.analysis.pipeline import conan_pipeline, ift_pipeline
+from opendrop.utility.diskcache import DiskCache
+from opendrop.utility.geometry import Line2, Rect2
+from opendrop.utility.remote import DEFAULT_PORT, HANDSHAKE_TIMEOUT, RemoteExecutor, WorkerServer, parse_address
+from .inputs import Frame, count_frames, expand_inputs, iter_frames
+from .runner import Stats, run
+
+
+def main(argv: Sequence[str]) -> int:
+    parser = _make_parser()
+    args = parser.parse_args(argv)
+
+    if args.analysis == 'worker':
+        return _run_worker(args, parser)
+
+    try:
+        config = _read_config(args.config, args.analysis)
+        paths = expand_inputs(args.inputs)
+    except (OSError, ValueError, configparser.Error) as e:
+        parser.error(str(e))
+
+    args.output.mkdir(parents=True, exist_ok=True)
+
+    try:
+        if args.analysis == 'ift':
+            return _run_ift(args, config, paths)
+        else:
+            return _run_conan(args, config, paths)
+    except ValueError as e:
+        parser.error(str(e))
+    except KeyboardInterrupt:
+        sys.stderr.write('\nInterrupted, results so far have been saved.\n')
+        return 130
+
+
+def _make_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='python -m opendrop batch',
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    subparsers = parser.add_subparsers(dest='analysis', metavar='{ift,conan,worker}')
+    subparsers.required = True
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        'inputs', nargs='+', metavar='INPUT',
+        help="image files, videos or image stacks ('.tif', '.tiff' or '.npy'), glob patterns are expanded",
+    )
+    common.add_argument('-o', '--output', type=Path, required=True, help='directory to save results to')
+    common.add_argument('-c', '--config', type=Path, help='INI file of analysis parameters')
+    common.add_argument(
+        '--frame-interval', type=float, metavar='SECONDS',
+        help='time between frames, defaults to the frame rate of videos and 1 s for images and stacks',
+    )
+    common.add_argument(
+        '-j', '--jobs', type=int, metavar='N',
+        help='number of local worker processes, defaults to the number of CPUs, or none if --worker is given',
+    )
+    common.add_argument(
+        '-w', '--worker', action='append', type=parse_address, metavar='HOST[:PORT]',
+        help="send frames to a remote worker started with 'batch worker', can be given more than once",
+    )
+    common.add_argument('-q', '--quiet', action='store_true', help="don't print progress")
+    common.add_argument('--drop-region', type=_rect, metavar='LEFT,TOP,RIGHT,BOTTOM')
+
+    ift = subparsers.add_parser(
+        'ift', parents=[common],
+        help='interfacial tension of pendant drops',
+        description='Interfacial tension analysis of pendant drops.',
+    )
+    ift.add_argument('--needle-region', type=_rect, metavar='LEFT,TOP,RIGHT,BOTTOM')
+    ift.add_argument('--canny-min', type=int)
+    ift.add_argument('--canny-max', type=int)
+    ift.add_argument('--drop-density', type=float, metavar='KG/M3')
+    ift.add_argument('--continuous-density', type=float, metavar='KG/M3')
+    ift.add_argument('--needle-diameter', type=float, metavar='M')
+    ift.add_argument('--gravity', type=float, metavar='M/S2')
+    ift.add_argument('--no-archive', action='store_true', help="don't save a 'results.npz' archive")
+    ift.add_argument('--cache-dir', type=Path, help='directory to cache results of analysis stages in')
+    ift.add_argument('--cache-size', type=float, metavar='MB', help='size limit of the cache')
+    ift.add_argument('--no-cache', action='store_true', help="don't look up or save results in the cache")
+
+    conan = subparsers.add_parser(
+        'conan', parents=[common],
+        help='contact angles of sessile drops',
+        description='Contact angle analysis of sessile drops.',
+    )
+    conan.add_argument('--surface-line', type=_line, metavar='X0,Y0,X1,Y1')
+    conan.add_argument('--threshold', type=int)
+
+    worker = subparsers.add_parser(
+        'worker',
+        help='serve frames sent by --worker from other machines',
+        description='Analyse frames sent by batch analyses run with --worker on other machines.',
+    )
+    worker.add_argument(
+        '--listen', type=parse_address, default=('0.0.0.0', DEFAULT_PORT), metavar='HOST[:PORT]',
+        help='address to listen on, defaults to port {} on all interfaces'.format(DEFAULT_PORT),
+    )
+    worker.add_argument(
+        '-j', '--jobs', type=int, metavar='N',
+        help='number of worker processes, defaults to the number of CPUs',
+    )
+
+    return parser
+
+
+def _run_ift(args: argparse.Namespace, config: Mapping[str, str], paths: Sequence[Path]) -> int:
+    edge_params = PendantEdgeDetectionParams(
+        canny_min=_get(args, config, 'canny_min', int, 30),
+        canny_max=_get(args, config, 'canny_max', int, 60),
+        needle_region=_get(args, config, 'needle_region', _rect, None),
+        drop_region=_get(args, config, 'drop_region', _rect, None),
+    )
+    phys_params = PendantPhysicalParams(
+        drop_density=_get(args, config, 'drop_density', float, math.nan),
+        continuous_density=_get(args, config, 'continuous_density', float, math.nan),
+        needle_diameter=_get(args, config, 'needle_diameter', float, math.nan),
+        gravity=_get(args, config, 'gravity', float, math.nan),
+    )
+
+    if edge_params.drop_region is None:
+        raise ValueError('A drop region is required')
+    if edge_params.needle_region is None:
+        raise ValueError('A needle region is required')
+
+    parameters = {
+        'canny_min': edge_params.canny_min,
+        'canny_max': edge_params.canny_max,
+        'drop_density': phys_params.drop_density,
+        'continuous_density': phys_params.continuous_density,
+        'needle_diameter': phys_params.needle_diameter,
+        'gravity': phys_params.gravity,
+    }
+
+    results = []  # type: MutableSequence[PendantAnalysisResult]
+    executor = _remote_executor(args)
+    stats = Stats(count_frames(paths), jobs=_jobs(args, executor), progress=not args.quiet)
+
+    with (args.output/'timeline.csv').open('w', newline='') as timeline_file:
+        write_ift_timeline((), timeline_file)
+
+        def handle_result(result: PendantAnalysisResult) -> None:
+            write_ift_timeline([result], timeline_file, header=False)
+            timeline_file.flush()
+
+            if not args.no_archive:
+                results.append(result)
+
+        try:
+            run(
+                ift_pipeline(
+                    edge_params,
+                    phys_params,
+                    # The cache is local to this machine.
+                    _cache(args) if executor is None else None,
+                    jobs=stats.jobs,
+                    raise_errors=False,
+                    executor=executor,
+                ),
+                _frames(paths, args, executor),
+                handle_result,
+                stats,
+            )
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False)
+            if not args.no_archive:
+                write_ift_archive(results, args.output/'results.npz', parameters)
+            stats.print_summary()
+
+    return 0 if stats.num_failed == 0 else 1
+
+
+def _run_conan(args: argparse.Namespace, config: Mapping[str, str], paths: Sequence[Path]) -> int:
+    params = ConanParams(
+        thresh=_get(args, config, 'threshold', int, 30),
+        drop_region=_get(args, config, 'drop_region', _rect, None),
+        surface_line=_get(args, config, 'surface_line', _line, None),
+    )
+
+    if params.drop_region is None:
+        raise ValueError('A drop region is required')
+    if params.surface_line is None:
+        raise ValueError('A surface line is required')
+
+    executor = _remote_executor(args)
+    stats = Stats(count_frames(paths), jobs=_jobs(args, executor), progress=not args.quiet)
+
+    with (args.output/'timeline.csv').open('w', newline='') as timeline_file:
+        write_conan_timeline((), timeline_file)
+
+        def handle_result(result: ConanAnalysisResult) -> None:
+            write_conan_timeline([result], timeline_file, header=False)
+            timeline_file.flush()
+
+        try:
+            run(
+                conan_pipeline(params, jobs=stats.jobs, raise_errors=False, executor=executor),
+                _frames(paths, args, executor),
+                handle_result,
+                stats,
+            )
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False)
+            stats.print_summary()
+
+    return 0 if stats.num_failed == 0 else 1
+
+
+def _read_config(path: Optional[Path], section: str) -> Mapping[str, str]:
+    if path is None:
+        return {}
+
+    config = configparser.ConfigParser(inline_comment_prefixes=(';',))
+    with path.open() as in_file:
+        config.read_file(in_file)
+
+    if not config.has_section(section):
+        return {}
+
+    return config[section]
+
+
+def _get(args: argparse.Namespace, config: Mapping[str, str], name: str, parse, default: Any) -> Any:
+    value = getattr(args, name, None)
+    if value is not None:
+        return value
+
+    if name in config:
+        try:
+            return parse(config[name])
+        except (TypeError, ValueError, argparse.ArgumentTypeError):
+            raise ValueError("Invalid value for '{}' in config: {!r}".format(name, config[name]))
+
+    return default
+
+
+def _run_worker(args: argparse.Namespace, parser: argparse.ArgumentParser) -> int:
+    try:
+        server = WorkerServer(args.listen, _authkey(), jobs=args.jobs, on_message=_print_message)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    _print_message('Listening on {}:{} with {} worker processes'.format(*server.address, server.jobs))
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+
+    return 0
+
+
+def _remote_executor(args: argparse.Namespace) -> Optional[RemoteExecutor]:
+    if not args.worker:
+        return None
+
+    executor = RemoteExecutor(args.worker, _authkey(), local_jobs=args.jobs or 0, on_message=_print_message)
+
+    num_connected = executor.wait_for_workers(timeout=HANDSHAKE_TIMEOUT)
+    if num_connected == 0:
+        _print_message('No workers could be reached, analysing frames locally until one is')
+
+    return executor
+
+
+def _authkey() -> bytes:
+    key = os.environ.get('OPENDROP_WORKER_KEY')
+    if not key:
+        raise ValueError('Set OPENDROP_WORKER_KEY to a secret shared by the workers and the machine sending frames')
+
+    return key.encode()
+
+
+def _frames(paths: Sequence[Path], args: argparse.Namespace, executor: Optional[RemoteExecutor]) -> Iterable[Frame]:
+    frames = iter_frames(paths, args.frame_interval)
+    if executor is None:
+        return frames
+
+    return _read_ahead(frames)
+
+
+def _read_ahead(frames: Iterable[Frame]) -> Iterator[Frame]:
+    # Remote workers can't read files on this machine, so send the pixels along with each frame.
+    for frame in frames:
+        try:
+            frame.image = frame.read()
+        except Exception:
+            # Leave the worker to fail to read it, so it's reported like any other failed frame.
+            pass
+
+        yield frame
+
+
+def _print_message(message: str) -> None:
+    sys.stderr.write(message + '\n')
+    sys.stderr.flush()
+
+
+def _jobs(args: argparse.Namespace, executor: Optional[RemoteExecutor] = None) -> int:
+    if executor is not None:
+        return max(executor.capacity, 1)
+
+    return args.jobs or os.cpu_count() or 1
+
+
+def _cache(args: argparse.Namespace) -> Optional[DiskCache]:
+    if args.no_cache:
+        return None
+
+    cache = default_cache()
+    if args.cache_dir is None and args.cache_size is None:
+        return cache
+
+    directory = args.cache_dir
+    if directory is None:
+        if cache is None:
+            # Caching is disabled by the environment.
+            return None
+        directory = cache.directory
+
+    if args.cache_size is not None:
+        max_size = int(args.cache_size * 2**20)
+    elif cache is not None:
+        max_size = cache.max_size
+    else:
+        max_size = DEFAULT_MAX_SIZE
+
+    return DiskCache(directory, max_size)
+
+
+def _numbers(text: str, count: int) -> Sequence[float]:
+    values = [float(x) for x in text.strip().strip('()').split(',')]
+    if len(values) != count:
+        raise argparse.ArgumentTypeError('expected {} comma separated numbers, got {!r}'.format(count, text))
+
+    return values
+
+
+def _rect(text: str) -> Rect2[int]:
+    try:
+        return Rect2(*map(int, map(round, _numbers(text, 4))))
+    except ValueError:
+        raise argparse.ArgumentTypeError('expected LEFT,TOP,RIGHT,BOTTOM, got {!r}'.format(text))
+
+
+def _line(text: str) -> Line2:
+    try:
+        x0, y0, x1, y1 = _numbers(text, 4)
+    except ValueError:
+        raise argparse.ArgumentTypeError('expected X0,Y0,X1,Y1, got {!r}'.format(text))
+
+    return Line2((x0, y0), (x1, y1))
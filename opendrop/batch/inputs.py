@@ -0,0 +1,193 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import functools
+import glob
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence
+
+import cv2
+import numpy as np
+
+from opendrop.utility.mmstack import ImageStack
+
+VIDEO_EXTENSIONS = ('.avi', '.mp4', '.m4v', '.mov', '.mkv', '.wmv', '.mpg', '.mpeg')
+STACK_EXTENSIONS = ('.tif', '.tiff', '.npy')
+
+
+class Frame:
+    """A frame to be analysed. Frames of image files and stacks only hold where to find the frame, so that workers read
+    the pixels themselves instead of having them sent over. Video frames have to be decoded in order, so those are read
+    up front and carry their `image`."""
+
+    __slots__ = ('number', 'path', 'index', 'timestamp', 'image')
+
+    def __init__(
+            self,
+            number: int,
+            path: Path,
+            index: Optional[int],
+            timestamp: float,
+            image: Optional[np.ndarray] = None,
+    ) -> None:
+        self.number = number
+        self.path = path
+        self.index = index
+        self.timestamp = timestamp
+        self.image = image
+
+    @property
+    def name(self) -> str:
+        if self.index is None:
+            return str(self.path)
+
+        return '{}[{}]'.format(self.path, self.index)
+
+    def read(self) -> np.ndarray:
+        """Return the RGB image of this frame."""
+        if self.image is not None:
+            return self.image
+
+        if self.index is not None:
+            return _open_stack(self.path).get_rgb8(self.index)
+
+        image = cv2.imread(str(self.path))
+        if image is None:
+            raise ValueError(
+                "Failed to load image from path '{}'"
+                .format(self.path)
+            )
+
+        # OpenCV loads images in BGR mode, but the processing functions expect RGB.
+        return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
+
+def expand_inputs(patterns: Sequence[str]) -> List[Path]:
+    """Expand the glob `patterns` into a list of files. The matches of each pattern are sorted in lexicographic order,
+    directories are ignored."""
+    paths = []
+
+    for pattern in patterns:
+        matches = sorted(Path(p) for p in glob.glob(pattern, recursive=True))
+        matches = [p for p in matches if not p.is_dir()]
+        if not matches:
+            raise ValueError("No files match '{}'".format(pattern))
+
+        paths.extend(matches)
+
+    return paths
+
+
+def count_frames(paths: Sequence[Path]) -> int:
+    """Return the number of frames in `paths`. The frame counts of videos are only estimates."""
+    total = 0
+
+    for path in paths:
+        kind = _kind(path)
+        if kind == 'video':
+            cap = cv2.VideoCapture(str(path))
+            try:
+                total += max(int(cap.get(cv2.CAP_PROP_FRAME_COUNT)), 0)
+            finally:
+                cap.release()
+        elif kind == 'stack':
+            total += len(_open_stack(path))
+        else:
+            total += 1
+
+    return total
+
+
+def iter_frames(paths: Sequence[Path], frame_interval: Optional[float] = None) -> Iterator[Frame]:
+    """Yield every frame of `paths` in order. Timestamps count up from zero across all inputs, by `frame_interval`
+    seconds per frame, or if not given, by the frame rate of videos and one second per frame of anything else."""
+    number = 0
+    timestamp = 0.0
+
+    for path in paths:
+        kind = _kind(path)
+
+        if kind == 'video':
+            cap = cv2.VideoCapture(str(path))
+            if not cap.isOpened():
+                raise ValueError("Failed to open video '{}'".format(path))
+
+            fps = cap.get(cv2.CAP_PROP_FPS)
+            interval = frame_interval if frame_interval is not None else 1/fps if fps > 0 else 1.0
+
+            try:
+                index = 0
+                while True:
+                    ok, image = cap.read()
+                    if not ok:
+                        break
+
+                    yield Frame(number, path, index, timestamp, cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+                    number += 1
+                    index += 1
+                    timestamp += interval
+            finally:
+                cap.release()
+        elif kind == 'stack':
+            interval = frame_interval if frame_interval is not None else 1.0
+            for index in range(len(_open_stack(path))):
+                yield Frame(number, path, index, timestamp)
+                number += 1
+                timestamp += interval
+        else:
+            interval = frame_interval if frame_interval is not None else 1.0
+            yield Frame(number, path, None, timestamp)
+            number += 1
+            timestamp += interval
+
+
+def _kind(path: Path) -> str:
+    suffix = path.suffix.lower()
+
+    if suffix in VIDEO_EXTENSIONS:
+        return 'video'
+
+    if suffix in STACK_EXTENSIONS:
+        # Single page or compressed TIFF files are read as plain images.
+        try:
+            stack = _open_stack(path)
+        except ValueError:
+            return 'image'
+
+        if suffix == '.npy' or len(stack) > 1:
+            return 'stack'
+
+    return 'image'
+
+
+# Stacks are memory-mapped, so keeping a few open is cheap, and saves every worker process from re-reading the
+# headers of a stack for each of its frames.
+@functools.lru_cache(maxsize=8)
+def _open_stack(path: Path) -> ImageStack:
+    return ImageStack.open(path)
@@ -0,0 +1,118 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import math
+import sys
+import time
+from typing import Any, Callable, Iterable, Optional, TextIO
+
+from opendrop.analysis.pipeline import Pipeline
+from .inputs import Frame
+
+
+class Stats:
+    """Counts frames as they are analysed and reports throughput."""
+
+    PROGRESS_INTERVAL = 1.0
+
+    def __init__(self, total: int, jobs: int, out: Optional[TextIO] = None, progress: bool = True) -> None:
+        self.total = total
+        self.jobs = jobs
+        self.num_done = 0
+        self.num_failed = 0
+        self.worker_time = 0.0
+
+        # Look up stderr when called rather than at import, in case it has been redirected since.
+        self._out = out if out is not None else sys.stderr
+        self._progress = progress
+        self._time_start = time.monotonic()
+        self._last_progress = -math.inf
+
+    @property
+    def time_elapsed(self) -> float:
+        return time.monotonic() - self._time_start
+
+    def add(self, worker_time: float, failed: bool) -> None:
+        self.num_done += 1
+        self.num_failed += failed
+        self.worker_time += worker_time
+
+        now = time.monotonic()
+        if self._progress and now - self._last_progress >= self.PROGRESS_INTERVAL:
+            self._last_progress = now
+            self._print_progress()
+
+    def _print_progress(self) -> None:
+        elapsed = self.time_elapsed
+        rate = self.num_done/elapsed if elapsed > 0 else math.nan
+
+        self._out.write(
+            '\r{done}/{total} frames, {rate:.1f} frames/s, {failed} failed'
+            .format(done=self.num_done, total=self.total or '?', rate=rate, failed=self.num_failed)
+        )
+        self._out.flush()
+
+    def print_summary(self) -> None:
+        elapsed = self.time_elapsed
+
+        if self._progress:
+            self._print_progress()
+            self._out.write('\n')
+
+        self._out.write(
+            'Analysed {done} frames ({failed} failed) in {elapsed:.1f} s\n'
+            .format(done=self.num_done, failed=self.num_failed, elapsed=elapsed)
+        )
+
+        if self.num_done == 0 or elapsed <= 0:
+            return
+
+        self._out.write(
+            '  Throughput: {rate:.2f} frames/s with {jobs} worker(s)\n'
+            '  Mean time per frame: {per_frame:.0f} ms, parallel efficiency {efficiency:.0%}\n'
+            .format(
+                rate=self.num_done/elapsed,
+                jobs=self.jobs,
+                per_frame=self.worker_time/self.num_done * 1e3,
+                efficiency=self.worker_time/(elapsed * self.jobs),
+            )
+        )
+
+
+def run(pipeline: Pipeline, frames: Iterable[Frame], handle_result: Callable[[Any], None], stats: Stats) -> None:
+    """Analyse `frames` with `pipeline` and pass the results to `handle_result()`. Frames that fail are reported and
+    skipped."""
+    for result in pipeline.run(frames):
+        stats.add(result.worker_time, failed=result.error is not None)
+
+        if result.error is not None:
+            sys.stderr.write("\nFailed to analyse '{}': {}\n".format(result.frame.name, result.error))
+            continue
+
+        handle_result(result.value)
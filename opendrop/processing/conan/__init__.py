@@ -27,5 +27,5 @@
 # with this software.  If not, see <https://www.gnu.org/licenses/>.
 
 
-from .contact_angle import ContactAngle
+from .contact_angle import ContactAngle, calculate_contact_angles
 from .extract import apply_foreground_detection, extract_drop_profile
@@ -28,7 +28,7 @@
 
 
 import math
-from typing import Sequence, Tuple
+from typing import List, Sequence, Tuple
 
 import cv2
 import numpy as np
@@ -49,39 +49,38 @@ class ContactAngle:
         self._drop_profile = drop_profile
         self._surface = surface
 
-        self.left_tangent, self.left_angle, self.left_point \
-            = (np.poly1d((math.nan, math.nan)), math.nan, Vector2(math.nan, math.nan))
+        rot_mtx = _surface_rotation(surface)
+        self._calculate(_to_surface_coords(drop_profile, surface, rot_mtx), rot_mtx)
 
-        self.right_tangent, self.right_angle, self.right_point \
-            = (np.poly1d((math.nan, math.nan)), math.nan, Vector2(math.nan, math.nan))
-
-        self._calculate()
+    @classmethod
+    def _from_surface_coords(cls, drop_profile: np.ndarray, surface: np.poly1d, rot_mtx: np.ndarray,
+                             surface_drop_profile: np.ndarray) -> 'ContactAngle':
+        self = cls.__new__(cls)
+        self._drop_profile = drop_profile
+        self._surface = surface
+        self._calculate(surface_drop_profile, rot_mtx)
+        return self
 
-    def _calculate(self) -> None:
-        drop_profile = np.copy(self._drop_profile)
+    def _calculate(self, drop_profile: np.ndarray, rot_mtx: np.ndarray) -> None:
+        """Calculate contact angles given the drop profile in coordinates where the surface line is y=0."""
         surface = self._surface
 
-        surface_angle = math.atan(surface.c[0]) if len(surface.c) > 1 else 0
-
-        rot_mtx = np.array([[math.cos(surface_angle), -math.sin(surface_angle)],
-                            [math.sin(surface_angle),  math.cos(surface_angle)]])
-
-        # Transform drop profile to coordinates where surface line is y=0
-        drop_profile = drop_profile.astype(float)
-        drop_profile[:, 1] -= surface.c[-1]
+        # Ignore points below the surface
+        drop_profile = drop_profile[drop_profile[:, 1] >= 0]
 
-        drop_profile = (rot_mtx.T @ drop_profile.T).T
-        drop_profile = drop_profile.astype(int)
+        # Both sides are measured along the same contour, so share its cumulative arc length.
+        arclength = _cumulative_arclength(drop_profile)
 
         self._right_segment, self.right_tangent, self.right_angle, self.right_point \
-            = self._calculate_right_params(drop_profile)
+            = self._calculate_right_params(drop_profile, arclength)
 
-        # Mirror the contour left-to-right
-        drop_profile = np.flipud(drop_profile)
-        drop_profile[:, 0] *= -1
+        # Mirror the contour left-to-right, the arc length from the other end of the contour is then just the total
+        # length minus the original arc length, reversed.
+        mirrored_drop_profile = drop_profile[::-1] * [-1, 1]
+        mirrored_arclength = arclength[-1] - arclength[::-1] if len(arclength) else arclength
 
         self._left_segment, self.left_tangent, self.left_angle, self.left_point \
-            = self._calculate_right_params(drop_profile)
+            = self._calculate_right_params(mirrored_drop_profile, mirrored_arclength)
 
         # Mirror back tangent and contact point.
         self.left_tangent = np.poly1d(self.left_tangent.coefficients * [-1, 1])
@@ -89,13 +88,8 @@ class ContactAngle:
         self._left_segment = self._left_segment * [-1, 1]
 
         # Transform back to given coordinates.
-        self._left_segment = (rot_mtx @ self._left_segment.T).T
-        self._left_segment[:, 1] += surface.c[-1]
-        self._left_segment = self._left_segment.astype(int)
-
-        self._right_segment = (rot_mtx @ self._right_segment.T).T
-        self._right_segment[:, 1] += surface.c[-1]
-        self._right_segment = self._right_segment.astype(int)
+        self._left_segment = _from_surface_coords(self._left_segment, surface, rot_mtx).astype(int)
+        self._right_segment = _from_surface_coords(self._right_segment, surface, rot_mtx).astype(int)
 
         self.left_tangent = _transform_line(self.left_tangent, rot_mtx)
         self.left_tangent += surface.c[-1]
@@ -107,9 +101,10 @@ class ContactAngle:
         self.right_point = Vector2(*(rot_mtx @ self.right_point))
         self.right_point += (0, surface.c[-1])
 
-    def _calculate_right_params(self, drop_profile: np.ndarray) -> Tuple[np.ndarray, np.poly1d, float, Vector2[float]]:
+    def _calculate_right_params(self, drop_profile: np.ndarray, arclength: np.ndarray) \
+            -> Tuple[np.ndarray, np.poly1d, float, Vector2[float]]:
         try:
-            right_segment, right_tangent = self._calculate_right_contact_tangent(drop_profile)
+            right_segment, right_tangent = self._calculate_right_contact_tangent(drop_profile, arclength)
         except self.NotEnoughDropPoints:
             return (np.empty((0, 2)), np.poly1d((math.nan, math.nan)), math.nan, Vector2(math.nan, math.nan))
 
@@ -120,21 +115,20 @@ class ContactAngle:
             self._calculate_right_contact_point(right_tangent)
         )
 
-    def _calculate_right_contact_tangent(self, drop_profile: np.ndarray) -> Tuple[np.ndarray, np.poly1d]:
-        # Ignore points below the surface
-        drop_profile = drop_profile[drop_profile[:, 1] >= 0]
+    def _calculate_right_contact_tangent(self, drop_profile: np.ndarray, arclength: np.ndarray) \
+            -> Tuple[np.ndarray, np.poly1d]:
         if len(drop_profile) == 0:
             raise self.NotEnoughDropPoints('Insufficient drop profile points')
 
-        drop_contour_length = cv2.arcLength(drop_profile, closed=False)
+        drop_contour_length = arclength[-1]
 
         # Extract two halves of the contour.
-        half_mask = _subarc_of_curve_mask(drop_profile, length=0.5 * drop_contour_length)
-        half0 = drop_profile[half_mask]
-        half1 = drop_profile[~half_mask]
+        half_end = _subarc_end(arclength, length=0.5 * drop_contour_length)
+        half0 = drop_profile[:half_end]
+        half1 = drop_profile[half_end:]
 
         # And pick the half with the most right points.
-        if np.average(half0, axis=0)[0] > np.average(half1, axis=0)[0]:
+        if len(half1) == 0 or np.average(half0, axis=0)[0] > np.average(half1, axis=0)[0]:
             half = half0
         else:
             half = half1
@@ -144,7 +138,10 @@ class ContactAngle:
         half = half[np.argsort(half[:, 1])]
 
         # Extract a fraction of the first few points to approximate the tangent.
-        right_segment = half[_subarc_of_curve_mask(half, length=self._SAMPLE_FRACTION * drop_contour_length)]
+        right_segment = half[:_subarc_end(
+            _cumulative_arclength(half),
+            length=self._SAMPLE_FRACTION * drop_contour_length,
+        )]
 
         # Fit a polynomial (of degree 1) to the first few points.
         right_fit = np.poly1d(np.polyfit(*right_segment.T, deg=1))
@@ -168,27 +165,65 @@ class ContactAngle:
         return Vector2(roots[0], right_contact_tangent(roots[0]))
 
 
+def calculate_contact_angles(drop_profiles: Sequence[np.ndarray], surface: np.poly1d) -> List[ContactAngle]:
+    """Calculate the contact angles of many drop profiles (e.g. the frames of a video) on the same surface. The profiles
+    are transformed into surface coordinates together, in one operation."""
+    if len(drop_profiles) == 0:
+        return []
+
+    rot_mtx = _surface_rotation(surface)
+
+    split_indices = np.cumsum([len(drop_profile) for drop_profile in drop_profiles])[:-1]
+    surface_drop_profiles = np.split(
+        _to_surface_coords(np.concatenate(drop_profiles), surface, rot_mtx),
+        split_indices,
+    )
+
+    return [
+        ContactAngle._from_surface_coords(drop_profile, surface, rot_mtx, surface_drop_profile)
+        for drop_profile, surface_drop_profile in zip(drop_profiles, surface_drop_profiles)
+    ]
+
+
 # Helper functions
 
-def _subarc_of_curve_mask(curve: np.ndarray, length: float) -> np.ndarray:
-    mask = np.zeros(len(curve), dtype=bool)
-    if len(curve) == 0:
-        return mask
-    elif len(curve) == 1:
-        mask[0] = True
-        return mask
+def _surface_rotation(surface: np.poly1d) -> np.ndarray:
+    surface_angle = math.atan(surface.c[0]) if len(surface.c) > 1 else 0
+
+    return np.array([[math.cos(surface_angle), -math.sin(surface_angle)],
+                     [math.sin(surface_angle),  math.cos(surface_angle)]])
+
+
+def _to_surface_coords(points: np.ndarray, surface: np.poly1d, rot_mtx: np.ndarray) -> np.ndarray:
+    """Transform `points` to (integer) coordinates where the surface line is y=0."""
+    points = points - [0, surface.c[-1]]
+
+    # Row vectors, so this applies the inverse rotation (rot_mtx.T) to each point.
+    return (points @ rot_mtx).astype(int)
+
+
+def _from_surface_coords(points: np.ndarray, surface: np.poly1d, rot_mtx: np.ndarray) -> np.ndarray:
+    return points @ rot_mtx.T + [0, surface.c[-1]]
+
+
+def _cumulative_arclength(curve: np.ndarray) -> np.ndarray:
+    """Return the length of the curve from its first point to each of its points."""
+    arclength = np.zeros(len(curve))
+    if len(curve) > 1:
+        np.cumsum(np.hypot(*np.diff(curve, axis=0).T), out=arclength[1:])
 
-    idx = [0, 1]
+    return arclength
 
-    while cv2.arcLength(curve[idx], closed=False) < length:
-        if len(idx) >= len(curve):
-            break
 
-        idx.append(len(idx))
+def _subarc_end(arclength: np.ndarray, length: float) -> int:
+    """Return the number of points, from the start of a curve with cumulative arc length `arclength`, in the shortest
+    sub-arc (of at least two points) that is at least `length` long, or all points if the curve is too short."""
+    if len(arclength) <= 1:
+        return len(arclength)
 
-    mask[idx] = True
+    end = int(np.searchsorted(arclength, length, side='left'))
 
-    return mask
+    return min(max(end, 1) + 1, len(arclength))
 
 
 def _get_tangent(poly: np.poly1d, x: float) -> np.poly1d:
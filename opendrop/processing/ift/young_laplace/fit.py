@@ -221,10 +221,12 @@ class YoungLaplaceFit:
         # [Initial guess for left side, Initial guess for right side]
         s_initial_guess = [-0.05 * max(self._profile_size, 4), 0.05 * max(self._profile_size, 4)]
         for i, (r, z) in enumerate(src_profile_rz):
+            # `r` is a numpy scalar, so `r > 0` can't be used as a list index directly.
+            side = int(r > 0)
             s, (e_r, e_z), steps_exceeded = \
                 self._profile.closest(
                     p=(r, z),
-                    s_0=s_initial_guess[r > 0],
+                    s_0=s_initial_guess[side],
                     max_steps=tolerances.MAXIMUM_ARCLENGTH_STEPS,
                     tol=tolerances.ARCLENGTH_TOL,
                 )
@@ -238,7 +240,7 @@ class YoungLaplaceFit:
             minimum_arclengths[i] = s, e_r, e_z
 
             # Set initial guess of next point to result of current point
-            s_initial_guess[r > 0] = s
+            s_initial_guess[side] = s
 
         J = self._calculate_jacobian_row(*minimum_arclengths.T)
         residuals = np.stack(
@@ -1,3 +1,5 @@
+from opendrop.utility.events import batch
+
 from .apply import apply
 from .bindable import VariableBindable, AccessorBindable
 from .tsbindablecollection import thread_safe_bindable_collection
@@ -0,0 +1,126 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+"""Shape preserving downsampling of long series for plotting."""
+
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+# Points kept per bucket (first, min, max, last).
+_POINTS_PER_BUCKET = 4
+
+
+def decimate(
+        x: Sequence[float],
+        y: Sequence[float],
+        num_buckets: int,
+        x_range: Optional[Tuple[float, float]] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Downsample the series (`x`, `y`), where `x` is in ascending order, for drawing at a resolution of `num_buckets`
+    (e.g. the width in pixels of the plot). The x-range, `x_range` if given or else the range of `x`, is split into
+    `num_buckets` equal width buckets, and only the first, last, minimum and maximum points of each bucket are kept. A
+    line through the decimated points covers the same pixels as a line through all the points.
+
+    Returns the series unchanged if it is already small enough."""
+    x = np.asarray(x)
+    y = np.asarray(y)
+
+    n = len(x)
+    if num_buckets < 1 or n <= _POINTS_PER_BUCKET * num_buckets:
+        return x, y
+
+    if x_range is None:
+        x_range = (x[0], x[-1])
+    x_min, x_max = x_range
+    if not x_max > x_min:
+        return x, y
+
+    bucket = np.floor((x - x_min) * (num_buckets / (x_max - x_min))).astype(int)
+    np.clip(bucket, -1, num_buckets, out=bucket)
+
+    starts = np.flatnonzero(np.concatenate(([True], bucket[1:] != bucket[:-1])))
+    ends = np.concatenate((starts[1:], [n])) - 1
+
+    # Since x is sorted, the points of each bucket are contiguous, and sorting by bucket then y gives the indices of
+    # the minimum and maximum points of each bucket at the bucket's start and end positions.
+    by_y = np.lexsort((y, bucket))
+
+    keep = np.unique(np.concatenate((starts, ends, by_y[starts], by_y[ends])))
+
+    return x[keep], y[keep]
+
+
+class DecimatedLine:
+    """Wraps a matplotlib Line2D, and draws a decimated version of the data given to set_data(). The decimation is
+    recomputed for the visible x-range whenever the axes' x-limits or size change, so zooming in shows more detail."""
+
+    def __init__(self, line) -> None:
+        self._line = line
+        self._x = np.empty(0)
+        self._y = np.empty(0)
+
+        self.axes.callbacks.connect('xlim_changed', self._hdl_xlim_changed)
+        self._line.figure.canvas.mpl_connect('resize_event', self._hdl_canvas_resize)
+
+    @property
+    def axes(self):
+        return self._line.axes
+
+    def set_data(self, data: Tuple[Sequence[float], Sequence[float]]) -> None:
+        x, y = data
+        self._x = np.asarray(x, dtype=float)
+        self._y = np.asarray(y, dtype=float)
+        self.update()
+
+    def get_xdata(self) -> np.ndarray:
+        return self._x
+
+    def get_ydata(self) -> np.ndarray:
+        return self._y
+
+    def _hdl_xlim_changed(self, axes) -> None:
+        self.update()
+
+    def _hdl_canvas_resize(self, event) -> None:
+        self.update()
+
+    def update(self) -> None:
+        """Recompute the decimated data."""
+        x, y = self._x, self._y
+
+        x_min, x_max = sorted(self.axes.get_xlim())
+        num_buckets = int(self.axes.bbox.width)
+
+        # Keep one point either side of the visible range, so lines run off the edges of the axes.
+        start = max(int(np.searchsorted(x, x_min, side='left')) - 1, 0)
+        stop = int(np.searchsorted(x, x_max, side='right')) + 1
+        x, y = x[start:stop], y[start:stop]
+
+        self._line.set_data(*decimate(x, y, num_buckets, x_range=(x_min, x_max)))
@@ -0,0 +1,236 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import ctypes
+import ctypes.util
+import fnmatch
+import os
+import select
+import struct
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Callable, MutableMapping, Optional, Set, Tuple, Union
+
+
+class DirectoryWatcher:
+    """Watch a directory for new files and invoke `on_file_ready` with the path of each file once it has been fully
+    written. Files that already exist when the watcher is started are ignored.
+
+    On Linux, inotify is used to be notified as soon as a writer closes a file (or moves a file into the directory).
+    Elsewhere, or if inotify is unavailable, the directory is polled every `poll_interval` seconds and a file is
+    considered fully written once its size and modification time are unchanged between two consecutive polls.
+
+    Note: `on_file_ready` is invoked on the watcher thread, not the thread that started the watcher.
+    """
+
+    def __init__(
+            self,
+            path: Union[Path, str],
+            on_file_ready: Callable[[Path], Any],
+            *,
+            pattern: str = '*',
+            poll_interval: float = 0.5,
+            use_inotify: bool = True
+    ) -> None:
+        self._path = Path(path)
+        self._on_file_ready = on_file_ready
+        self._pattern = pattern
+        self._poll_interval = poll_interval
+        self._use_inotify = use_inotify and _Inotify.is_available()
+
+        self._stopping = threading.Event()
+        self._thread = None  # type: Optional[threading.Thread]
+
+        # Names of files which have been reported or which existed before the watcher started.
+        self._seen = set()  # type: Set[str]
+
+    @property
+    def uses_inotify(self) -> bool:
+        return self._use_inotify
+
+    def start(self) -> None:
+        if self._thread is not None:
+            raise ValueError('Watcher already started')
+
+        if not self._path.is_dir():
+            raise ValueError("'{}' is not a directory".format(self._path))
+
+        if self._use_inotify:
+            inotify = _Inotify(self._path)
+            target = lambda: self._run_inotify(inotify)
+        else:
+            target = self._run_poll
+
+        # Take a snapshot of existing files after any inotify watch has been added so no new file can be missed.
+        self._seen.update(entry.name for entry in os.scandir(str(self._path)))
+
+        self._thread = threading.Thread(target=target, daemon=True)
+        self._thread.start()
+
+    def stop(self, *, block: bool = True) -> None:
+        """Stop watching. If `block` is true and this is called from a thread other than the watcher thread, block
+        until the watcher thread has exited. Otherwise, the watcher thread exits on its own within `poll_interval`
+        seconds and no new files are reported after this returns (a file being reported concurrently may still have
+        its `on_file_ready` call complete)."""
+        self._stopping.set()
+
+        if not block:
+            return
+
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def _run_inotify(self, inotify: '_Inotify') -> None:
+        try:
+            while not self._stopping.is_set():
+                for name in inotify.read(timeout=self._poll_interval):
+                    if self._stopping.is_set():
+                        break
+                    self._file_ready(name)
+        finally:
+            inotify.close()
+
+    def _run_poll(self) -> None:
+        # Size and modification time of candidate files from the previous poll.
+        last_stats = {}  # type: MutableMapping[str, Tuple[int, int]]
+
+        while not self._stopping.wait(self._poll_interval):
+            stats = {}  # type: MutableMapping[str, Tuple[int, int]]
+
+            try:
+                entries = list(os.scandir(str(self._path)))
+            except OSError:
+                continue
+
+            for entry in entries:
+                if entry.name in self._seen:
+                    continue
+
+                try:
+                    if not entry.is_file():
+                        continue
+                    st = entry.stat()
+                except OSError:
+                    continue
+
+                stats[entry.name] = (st.st_size, st.st_mtime_ns)
+
+            for name in sorted(stats):
+                if last_stats.get(name) == stats[name]:
+                    if self._stopping.is_set():
+                        return
+                    self._file_ready(name)
+
+            last_stats = stats
+
+    def _file_ready(self, name: str) -> None:
+        if self._stopping.is_set():
+            return
+
+        if name in self._seen:
+            return
+        self._seen.add(name)
+
+        if not fnmatch.fnmatch(name, self._pattern):
+            return
+
+        path = self._path/name
+        if not path.is_file():
+            return
+
+        self._on_file_ready(path)
+
+
+class _Inotify:
+    _IN_CLOEXEC = 0o2000000
+    _IN_NONBLOCK = 0o4000
+    _IN_CLOSE_WRITE = 0x00000008
+    _IN_MOVED_TO = 0x00000080
+
+    _EVENT_HEADER = struct.Struct('iIII')
+
+    _libc = None  # type: Optional[ctypes.CDLL]
+
+    @classmethod
+    def is_available(cls) -> bool:
+        if not sys.platform.startswith('linux'):
+            return False
+
+        if cls._libc is None:
+            try:
+                libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+                libc.inotify_init1
+                libc.inotify_add_watch
+            except (OSError, AttributeError):
+                return False
+            cls._libc = libc
+
+        return True
+
+    def __init__(self, path: Path) -> None:
+        libc = self._libc
+        assert libc is not None
+
+        self._fd = libc.inotify_init1(self._IN_NONBLOCK | self._IN_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+
+        wd = libc.inotify_add_watch(self._fd, os.fsencode(str(path)), self._IN_CLOSE_WRITE | self._IN_MOVED_TO)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(errno, os.strerror(errno))
+
+    def read(self, timeout: float) -> Tuple[str, ...]:
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return ()
+
+        try:
+            buf = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return ()
+
+        names = []
+        offset = 0
+        while offset + self._EVENT_HEADER.size <= len(buf):
+            _, _, _, name_len = self._EVENT_HEADER.unpack_from(buf, offset)
+            offset += self._EVENT_HEADER.size
+            name = buf[offset:offset + name_len].rstrip(b'\0')
+            offset += name_len
+            if name:
+                names.append(os.fsdecode(name))
+
+        return tuple(names)
+
+    def close(self) -> None:
+        os.close(self._fd)
@@ -0,0 +1,197 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import functools
+import hashlib
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+
+def cache_key(*parts: Any) -> str:
+    """Return a hex digest identifying `parts`. Arrays are hashed by their dtype, shape and contents, everything else by
+    its repr(), so only use values whose repr() is stable and distinguishes them (numbers, strings, tuples of these,
+    etc.)."""
+    h = hashlib.blake2b(digest_size=20)
+
+    for part in parts:
+        if isinstance(part, np.ndarray):
+            h.update(b'ndarray')
+            h.update(part.dtype.str.encode())
+            h.update(repr(part.shape).encode())
+            h.update(np.ascontiguousarray(part).data)
+        else:
+            h.update(repr(part).encode())
+
+        # Separate parts, so e.g. ('ab', 'c') and ('a', 'bc') don't hash the same.
+        h.update(b'\0')
+
+    return h.hexdigest()
+
+
+class DiskCache:
+    """A persistent cache of picklable values in a directory, one file per entry. When the total size of the entries
+    exceeds `max_size` bytes, the least recently used entries are deleted until it is back under
+    `LOW_WATER * max_size`.
+
+    The cache can be shared by many processes at once. Entries are written atomically, and each process counts the
+    bytes it writes on top of the total it last measured, so the size limit is only approximate. Unpickling a DiskCache
+    (e.g. in a worker process) returns the same instance for the same directory, so each process only measures the
+    cache once."""
+
+    LOW_WATER = 0.8
+
+    _SUFFIX = '.pickle'
+
+    def __init__(self, directory: Union[Path, str], max_size: int) -> None:
+        self.directory = Path(directory)
+        self.max_size = max_size
+
+        self._total_size = None  # type: Optional[int]
+
+    def __reduce__(self):
+        return _open_disk_cache, (str(self.directory), self.max_size)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the value cached for `key` and mark it as most recently used, or `default` if there isn't one."""
+        path = self._path(key)
+
+        try:
+            with path.open('rb') as in_file:
+                value = pickle.load(in_file)
+        except FileNotFoundError:
+            return default
+        except Exception:
+            # Truncated or from an incompatible version, treat it as a miss.
+            self._remove(path)
+            return default
+
+        try:
+            os.utime(str(path))
+        except OSError:
+            pass
+
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        path = self._path(key)
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+
+            fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as out_file:
+                    out_file.write(data)
+                os.replace(tmp_path, str(path))
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError:
+            # The cache is only an optimisation, don't fail if e.g. the disk is full.
+            return
+
+        if self._total_size is None:
+            self._total_size = self._measure()[0]
+        else:
+            self._total_size += len(data)
+
+        if self._total_size > self.max_size:
+            self._evict()
+
+    def clear(self) -> None:
+        for path, _, _ in self._entries():
+            self._remove(path)
+
+        self._total_size = 0
+
+    @property
+    def total_size(self) -> int:
+        """The total size of all entries in bytes, as measured now."""
+        return self._measure()[0]
+
+    def _evict(self) -> None:
+        total_size, entries = self._measure()
+
+        # Least recently used first.
+        entries.sort(key=lambda entry: entry[1])
+
+        target = self.LOW_WATER * self.max_size
+        for path, _, size in entries:
+            if total_size <= target: break
+            if self._remove(path):
+                total_size -= size
+
+        self._total_size = total_size
+
+    def _measure(self) -> Tuple[int, List[Tuple[Path, float, int]]]:
+        entries = list(self._entries())
+        return sum(size for _, _, size in entries), entries
+
+    def _entries(self) -> Iterator[Tuple[Path, float, int]]:
+        try:
+            subdirs = list(os.scandir(str(self.directory)))
+        except FileNotFoundError:
+            return
+
+        for subdir in subdirs:
+            if not subdir.is_dir(): continue
+
+            for entry in os.scandir(subdir.path):
+                if not entry.name.endswith(self._SUFFIX): continue
+
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    # Deleted by another process.
+                    continue
+
+                yield Path(entry.path), stat.st_mtime, stat.st_size
+
+    def _path(self, key: str) -> Path:
+        return self.directory/key[:2]/(key[2:] + self._SUFFIX)
+
+    @staticmethod
+    def _remove(path: Path) -> bool:
+        try:
+            path.unlink()
+        except OSError:
+            return False
+
+        return True
+
+
+@functools.lru_cache(maxsize=None)
+def _open_disk_cache(directory: str, max_size: int) -> DiskCache:
+    return DiskCache(directory, max_size)
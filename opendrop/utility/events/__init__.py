@@ -27,5 +27,5 @@
 # with this software.  If not, see <https://www.gnu.org/licenses/>.
 
 
-from .events import Event, EventConnection
+from .events import Event, EventConnection, batch
 from .exceptions import NotConnected
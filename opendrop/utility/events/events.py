@@ -28,11 +28,13 @@
 
 
 import asyncio
+import contextlib
+import threading
 import types
 import warnings
 import weakref
 from enum import Enum
-from typing import Callable, List, Optional, Any, Mapping, Tuple, Iterable, Union, Sequence
+from typing import Callable, Iterator, List, MutableMapping, Optional, Any, Mapping, Tuple, Iterable, Union, Sequence
 
 from . import exceptions
 
@@ -93,7 +95,10 @@ class EventConnection:
     def _invoke_handler(self, args: Iterable, kwargs: Mapping) -> None:
         if self.status is not EventConnection.Status.CONNECTED: return
 
-        if self.handler is None:
+        # Only resolve the (possibly weak) reference once.
+        handler = self.handler
+
+        if handler is None:
             # Handler has been garbage collected, disconnect.
             self.disconnect()
             return
@@ -101,8 +106,11 @@ class EventConnection:
         if self._opts['ignore_args']:
             args, kwargs = (), {}
 
-        self._invocation_count += 1
-        self.handler(*args, **kwargs)
+        self.__invocation_count += 1
+        if self._opts['once']:
+            self.disconnect()
+
+        handler(*args, **kwargs)
 
     @property
     def _invocation_count(self) -> int:
@@ -191,6 +199,14 @@ class Event:
         """Fire the event, handlers will be invoked with arguments `args` and keyword-arguments `kwargs`. Handlers
         can be selectively blocked by specifying their `EventConnection`s in the `block` parameter."""
         if kwargs is None: kwargs = {}
+
+        pending = getattr(_batch_state, 'pending', None)
+        if pending is not None:
+            # Inside a batch, defer until the batch ends. Firing again replaces the previous arguments.
+            pending.pop(self, None)
+            pending[self] = (args, kwargs, block)
+            return
+
         self._invoke_connections(args, kwargs, block=block)
 
     def fire(self, *args, **kwargs) -> None:
@@ -247,11 +263,21 @@ class Event:
         return len(self._connections)
 
     def _invoke_connections(self, args: Iterable, kwargs: Mapping[str, Any],
-                            block: Sequence[EventConnection] = tuple()) -> None:
+                            block: Sequence[EventConnection] = tuple(),
+                            invoked: Optional[MutableMapping[Tuple[int, int], Callable]] = None) -> None:
         for conn in self._connections:
             # Ignore if connection has disconnected, this may have occurred during execution of some handlers.
             if conn.status is not EventConnection.Status.CONNECTED: continue
             if conn in block: continue
+
+            if invoked is not None and (conn._opts['ignore_args'] or not (args or kwargs)):
+                # Skip handlers that have already been called (with no arguments) by another event in the batch.
+                handler = conn.handler
+                if handler is not None:
+                    key = _handler_key(handler)
+                    if key in invoked: continue
+                    invoked[key] = handler
+
             conn._invoke_handler(args, kwargs)
 
     def wait(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> Any:
@@ -291,3 +317,59 @@ class Event:
                     conn.disconnect()
 
         return wait_for_f()
+
+
+_batch_state = threading.local()
+
+
+@contextlib.contextmanager
+def batch() -> Iterator[None]:
+    """Defer firing events until the end of the block. Each event fired inside the block is then fired once, with the
+    arguments it was last fired with, in the order the events were last fired. A handler connected to more than one of
+    these events is only called once if it takes no arguments (e.g. a handler of several bindables' `on_changed`).
+    Useful when updating many related values, so handlers only run once after all the values have been updated.
+
+    Batches can be nested, events are only fired when the outermost batch ends. Batches are per thread, events fired
+    from other threads are not deferred. If a handler raises, the remaining events are still fired and the first
+    exception is raised afterwards (unless the block itself raised).
+
+    >>> with batch():
+    ...     bn_x.set(1)
+    ...     bn_y.set(2)
+    ...     bn_x.set(3)  # bn_x.on_changed fires once, after bn_y.on_changed.
+    """
+    if getattr(_batch_state, 'pending', None) is not None:
+        yield
+        return
+
+    pending = {}  # type: MutableMapping[Event, Tuple[Sequence[Any], Mapping[str, Any], Sequence[EventConnection]]]
+    _batch_state.pending = pending
+    body_raised = False
+    try:
+        yield
+    except BaseException:
+        body_raised = True
+        raise
+    finally:
+        _batch_state.pending = None
+
+        # Also keeps the handlers alive so their ids aren't reused while firing.
+        invoked = {}  # type: MutableMapping[Tuple[int, int], Callable]
+        errors = []  # type: List[Exception]
+
+        # Every deferred event is fired even if a handler raises, otherwise the values changed in the block would
+        # be left without their change notifications.
+        for event, (args, kwargs, block) in pending.items():
+            try:
+                event._invoke_connections(args, kwargs, block=block, invoked=invoked)
+            except Exception as exc:
+                errors.append(exc)
+
+        # An exception raised by the block itself takes precedence over handler exceptions.
+        if errors and not body_raised:
+            raise errors[0]
+
+
+def _handler_key(handler: Callable) -> Tuple[int, int]:
+    # Bound methods are created anew on each attribute access, so compare their instance and function instead.
+    return id(getattr(handler, '__self__', None)), id(getattr(handler, '__func__', handler))
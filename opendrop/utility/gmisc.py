@@ -28,14 +28,19 @@
 
 
 import ctypes
-from typing import Sequence
+from typing import Optional, Sequence
 
 import numpy as np
 from gi.repository import GdkPixbuf
 from numpy.lib import stride_tricks
 
 
-def pixbuf_from_array(image: Sequence[Sequence[Sequence[int]]]) -> GdkPixbuf.Pixbuf:
+def pixbuf_from_array(
+        image: Sequence[Sequence[Sequence[int]]],
+        pixbuf: Optional[GdkPixbuf.Pixbuf] = None
+) -> GdkPixbuf.Pixbuf:
+    """Copy `image` into a new pixbuf. If `pixbuf` is given and matches the size and format of `image`, copy into it
+    instead of allocating a new one."""
     if not isinstance(image, np.ndarray):
         image = np.array(image)
 
@@ -57,13 +62,19 @@ def pixbuf_from_array(image: Sequence[Sequence[Sequence[int]]]) -> GdkPixbuf.Pix
     # Height of the image
     height = image.shape[0]  # type: int
 
-    pixbuf = GdkPixbuf.Pixbuf.new(
-        colorspace=colorspace,
-        has_alpha=has_alpha,
-        bits_per_sample=bits_per_sample,
-        width=width,
-        height=height,
-    )
+    if pixbuf is None or not (
+            pixbuf.props.colorspace == colorspace
+            and pixbuf.props.has_alpha == has_alpha
+            and pixbuf.props.bits_per_sample == bits_per_sample
+            and pixbuf.props.width == width
+            and pixbuf.props.height == height):
+        pixbuf = GdkPixbuf.Pixbuf.new(
+            colorspace=colorspace,
+            has_alpha=has_alpha,
+            bits_per_sample=bits_per_sample,
+            width=width,
+            height=height,
+        )
 
     pixbuf_pixels_pointer = ctypes.cast(pixbuf.props.pixels, ctypes.POINTER(ctypes.c_uint8))
 
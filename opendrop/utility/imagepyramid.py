@@ -0,0 +1,103 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import math
+from typing import MutableSequence, Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+class ImagePyramid:
+    """A lazily built stack of successively halved copies of an image, used to display large images in small
+    widgets without repeatedly scaling down the full resolution frame.
+
+    Level 0 is the original image, level k is (approximately) 1/2**k the width and height of the original. Levels are
+    only computed when first requested, each from the level above it using area interpolation."""
+
+    def __init__(self, image: np.ndarray, min_size: int = 64) -> None:
+        if image.ndim not in (2, 3):
+            raise ValueError('`image` must be a 2D or 3D array, got shape {}'.format(image.shape))
+
+        self._levels = [image]  # type: MutableSequence[Optional[np.ndarray]]
+
+        height, width = image.shape[:2]
+        while min(width, height) // 2 >= min_size:
+            width //= 2
+            height //= 2
+            self._levels.append(None)
+
+    @property
+    def image(self) -> np.ndarray:
+        return self._levels[0]
+
+    @property
+    def num_levels(self) -> int:
+        return len(self._levels)
+
+    def level_for_scale(self, scale: float) -> int:
+        """Return the smallest level that still has at least one pixel per screen pixel when the original image is
+        displayed at `scale` screen pixels per image pixel."""
+        if scale <= 0:
+            return self.num_levels - 1
+
+        if scale >= 0.5:
+            return 0
+
+        level = int(math.floor(math.log2(1/scale)))
+
+        return min(level, self.num_levels - 1)
+
+    def get_level(self, level: int) -> np.ndarray:
+        if not 0 <= level < self.num_levels:
+            raise IndexError('level {} out of range, pyramid has {} levels'.format(level, self.num_levels))
+
+        image = self._levels[level]
+        if image is not None:
+            return image
+
+        parent = self.get_level(level - 1)
+        parent_height, parent_width = parent.shape[:2]
+
+        # cv2 doesn't accept arrays with zero strides (e.g. greyscale images broadcast to RGB).
+        image = cv2.resize(
+            np.ascontiguousarray(parent),
+            dsize=(parent_width//2, parent_height//2),
+            interpolation=cv2.INTER_AREA,
+        )
+        self._levels[level] = image
+
+        return image
+
+    def get_level_scale(self, level: int) -> Tuple[float, float]:
+        """Return the (x, y) size of a pixel in `level`, in original image pixels."""
+        height, width = self.image.shape[:2]
+        level_height, level_width = self.get_level(level).shape[:2]
+
+        return width/level_width, height/level_height
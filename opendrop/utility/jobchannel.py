@@ -0,0 +1,112 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import asyncio
+import functools
+import pickle
+from concurrent.futures import Executor, Future
+from typing import Any, Callable, Hashable, MutableMapping, Optional, Tuple
+
+
+def _call_and_pickle(fn: Callable[..., Any], args: Tuple) -> bytes:
+    return pickle.dumps(fn(*args), protocol=pickle.HIGHEST_PROTOCOL)
+
+
+class CoalescingJobChannel:
+    """Submit jobs to an executor so that newer requests supersede older ones with the same key.
+
+    At most one job per key is given to the executor at a time, and at most one more waits behind it. Submitting a new
+    job for a key cancels the future of the waiting job, which then never runs, and the future of the running job,
+    whose result is discarded when it finishes. Cancelling a returned future has the same effect.
+
+    Results are pickled by the worker and only unpickled if the job's future is still wanted, so an obsolete result
+    never has to be deserialised on the event loop thread.
+
+    Must only be used from the event loop thread."""
+
+    class _Slot:
+        def __init__(self) -> None:
+            self.running = None  # type: Optional[asyncio.Future]
+            self.pending = None  # type: Optional[Tuple[asyncio.Future, Callable[..., Any], Tuple]]
+
+    def __init__(self, executor: Executor, *, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        self._executor = executor
+        self._loop = loop or asyncio.get_event_loop()
+
+        self._slots = {}  # type: MutableMapping[Hashable, CoalescingJobChannel._Slot]
+
+    def submit(self, key: Hashable, fn: Callable[..., Any], *args) -> asyncio.Future:
+        fut = self._loop.create_future()
+
+        slot = self._slots.setdefault(key, self._Slot())
+
+        if slot.running is not None:
+            slot.running.cancel()
+
+        if slot.pending is not None:
+            slot.pending[0].cancel()
+
+        slot.pending = (fut, fn, args)
+        self._pump(key)
+
+        return fut
+
+    def _pump(self, key: Hashable) -> None:
+        slot = self._slots[key]
+        if slot.running is not None:
+            return
+
+        if slot.pending is None or slot.pending[0].cancelled():
+            del self._slots[key]
+            return
+
+        fut, fn, args = slot.pending
+        slot.pending = None
+
+        cfut = self._executor.submit(_call_and_pickle, fn, args)
+        slot.running = fut
+
+        cfut.add_done_callback(functools.partial(self._hdl_job_done_threadsafe, key, fut))
+
+    def _hdl_job_done_threadsafe(self, key: Hashable, fut: asyncio.Future, cfut: Future) -> None:
+        # Called on an executor thread.
+        self._loop.call_soon_threadsafe(self._hdl_job_done, key, fut, cfut)
+
+    def _hdl_job_done(self, key: Hashable, fut: asyncio.Future, cfut: Future) -> None:
+        self._slots[key].running = None
+
+        if not fut.cancelled():
+            if cfut.cancelled():
+                fut.cancel()
+            elif cfut.exception() is not None:
+                fut.set_exception(cfut.exception())
+            else:
+                fut.set_result(pickle.loads(cfut.result()))
+
+        self._pump(key)
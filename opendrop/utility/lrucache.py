@@ -0,0 +1,110 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, Iterator, MutableMapping, Optional, Tuple, TypeVar
+
+KT = TypeVar('KT', bound=Hashable)
+VT = TypeVar('VT')
+
+
+class LRUCache(Generic[KT, VT]):
+    """A least recently used cache with a size budget. Each entry is given a size when it is inserted, and the least
+    recently used entries are evicted once the total size exceeds `max_size`. The most recently inserted entry is never
+    evicted, even if it alone is larger than the budget."""
+
+    def __init__(self, max_size: float, on_evict: Optional[Callable[[KT, VT], None]] = None) -> None:
+        self._max_size = max_size
+        self._on_evict = on_evict
+
+        self._entries = OrderedDict()  # type: MutableMapping[KT, Tuple[VT, float]]
+        self._total_size = 0.0
+
+    @property
+    def total_size(self) -> float:
+        return self._total_size
+
+    def get(self, key: KT, default: Optional[VT] = None) -> Optional[VT]:
+        """Return the value for `key` and mark it as most recently used, or return `default` if `key` is not cached."""
+        try:
+            value, _ = self._entries[key]
+        except KeyError:
+            return default
+
+        self._entries.move_to_end(key)
+
+        return value
+
+    def peek(self, key: KT, default: Optional[VT] = None) -> Optional[VT]:
+        """Like get(), but doesn't affect the eviction order."""
+        try:
+            value, _ = self._entries[key]
+        except KeyError:
+            return default
+
+        return value
+
+    def put(self, key: KT, value: VT, size: float = 1) -> None:
+        self.discard(key)
+
+        self._entries[key] = (value, size)
+        self._total_size += size
+
+        while self._total_size > self._max_size and len(self._entries) > 1:
+            old_key = next(iter(self._entries))
+            old_value, old_size = self._entries.pop(old_key)
+            self._total_size -= old_size
+            if self._on_evict is not None:
+                self._on_evict(old_key, old_value)
+
+    def discard(self, key: KT) -> Optional[VT]:
+        """Remove `key` from the cache without calling `on_evict`, return the removed value or None if `key` was not
+        cached."""
+        try:
+            value, size = self._entries.pop(key)
+        except KeyError:
+            return None
+
+        self._total_size -= size
+
+        return value
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._total_size = 0.0
+
+    def keys(self) -> Iterator[KT]:
+        """Iterate over keys, from least to most recently used."""
+        return iter(tuple(self._entries.keys()))
+
+    def __contains__(self, key: KT) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,88 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+from typing import Any, Callable, Generic, Optional, Sequence, TypeVar
+
+import numpy as np
+
+T = TypeVar('T')
+
+
+class MemoizedStage(Generic[T]):
+    """One stage of a processing pipeline that remembers the result for the last inputs it was given, so calling it again
+    with the same inputs returns the cached result instead of recomputing it.
+
+    Array inputs are compared by identity (stages produce new arrays when their result changes), everything else by
+    equality. References to the last inputs are kept so their ids can't be reused."""
+
+    def __init__(self, fn: Optional[Callable[..., T]] = None) -> None:
+        self._fn = fn
+
+        self._inputs = None  # type: Optional[Sequence[Any]]
+        self._value = None  # type: Optional[T]
+
+    def __call__(self, *inputs: Any) -> T:
+        if self.matches(*inputs):
+            return self._value
+
+        assert self._fn is not None
+        value = self._fn(*inputs)
+        self.store(inputs, value)
+
+        return value
+
+    def matches(self, *inputs: Any) -> bool:
+        """Return True if `inputs` are the same as the inputs of the cached result."""
+        if self._inputs is None or len(inputs) != len(self._inputs):
+            return False
+
+        return all(map(_same_input, inputs, self._inputs))
+
+    def store(self, inputs: Sequence[Any], value: T) -> None:
+        """Cache `value` as the result for `inputs`, for stages that are computed elsewhere (e.g. in a batch)."""
+        self._inputs = tuple(inputs)
+        self._value = value
+
+    @property
+    def value(self) -> Optional[T]:
+        return self._value
+
+    def clear(self) -> None:
+        self._inputs = None
+        self._value = None
+
+
+def _same_input(x: Any, y: Any) -> bool:
+    if x is y:
+        return True
+
+    if isinstance(x, np.ndarray) or isinstance(y, np.ndarray):
+        return False
+
+    return bool(x == y)
@@ -0,0 +1,310 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import struct
+import weakref
+from pathlib import Path
+from typing import Sequence, Tuple, Union, MutableMapping, Optional
+
+import numpy as np
+from numpy.lib import stride_tricks
+
+
+class ImageStack(Sequence[np.ndarray]):
+    """A read-only, memory-mapped stack of frames loaded from a multi-page TIFF or '.npy' file. Frames are returned
+    as views into the mapped file, so no frame data is read until it is accessed and the stack is never held resident
+    in memory as a whole.
+    """
+
+    def __init__(self, frames: Sequence[np.ndarray], bit_depth: int) -> None:
+        self._frames = frames
+        self.bit_depth = bit_depth
+
+        # Cache of converted frames, keyed by frame index. Only weak references are kept so that converted frames
+        # are released once they are no longer in use, but are not needlessly recreated while they are.
+        self._rgb8_cache = weakref.WeakValueDictionary()  # type: MutableMapping[int, np.ndarray]
+
+    @classmethod
+    def open(cls, path: Union[Path, str]) -> 'ImageStack':
+        path = Path(path)
+
+        if path.suffix.lower() == '.npy':
+            return cls._open_npy(path)
+        elif path.suffix.lower() in ('.tif', '.tiff'):
+            return cls._open_tiff(path)
+        else:
+            raise ValueError(
+                "Unsupported image stack file '{}', expected a '.tif', '.tiff' or '.npy' file"
+                .format(path)
+            )
+
+    @classmethod
+    def _open_npy(cls, path: Path) -> 'ImageStack':
+        data = np.asarray(np.load(str(path), mmap_mode='r'))
+
+        if data.ndim == 2 or (data.ndim == 3 and data.shape[-1] in (3, 4)):
+            # A single frame.
+            data = data[np.newaxis]
+
+        if data.ndim not in (3, 4) or (data.ndim == 4 and data.shape[-1] not in (3, 4)):
+            raise ValueError(
+                "Stack in '{}' has unsupported shape {}, expected (frames, height, width[, channels])"
+                .format(path, data.shape)
+            )
+
+        if data.dtype not in (np.uint8, np.uint16):
+            raise ValueError(
+                "Stack in '{}' has unsupported dtype '{}', expected uint8 or uint16"
+                .format(path, data.dtype)
+            )
+
+        return cls(data, bit_depth=8*data.dtype.itemsize)
+
+    @classmethod
+    def _open_tiff(cls, path: Path) -> 'ImageStack':
+        mm = np.memmap(str(path), dtype=np.uint8, mode='r')
+
+        pages = _read_tiff_pages(mm)
+        if not pages:
+            raise ValueError("No images found in '{}'".format(path))
+
+        frames = []
+        bit_depth = pages[0].max_sample_bits
+        for page in pages:
+            if page.shape != pages[0].shape or page.dtype != pages[0].dtype:
+                raise ValueError(
+                    "Pages of '{}' do not all have the same size and pixel format"
+                    .format(path)
+                )
+
+            frame = np.asarray(mm[page.offset:page.offset + page.nbytes]).view(page.dtype).reshape(page.shape)
+            frames.append(frame)
+
+        return cls(frames, bit_depth=bit_depth)
+
+    @property
+    def frame_size(self) -> Tuple[int, int]:
+        """Width and height of each frame."""
+        return self._frames[0].shape[1::-1]
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._frames[i] for i in range(len(self))[index]]
+
+        return self._frames[index]
+
+    def rgb8_frames(self, start: int = 0, stop: Optional[int] = None, step: int = 1) -> Sequence[np.ndarray]:
+        """Return a lazy sequence of the frames in `range(start, stop, step)`, as 8-bit RGB images."""
+        return _RGB8FrameSequence(self, range(len(self))[start:stop:step])
+
+    def get_rgb8(self, index: int) -> np.ndarray:
+        """Return frame `index` as an 8-bit RGB image. 8-bit frames are returned as views of the mapped data without
+        copying, higher bit depth frames are scaled down on access."""
+        index = range(len(self))[index]
+
+        image = self._rgb8_cache.get(index)
+        if image is None:
+            image = frame_to_rgb8(self._frames[index], self.bit_depth)
+            self._rgb8_cache[index] = image
+
+        return image
+
+
+class _RGB8FrameSequence(Sequence[np.ndarray]):
+    def __init__(self, stack: ImageStack, indices: range) -> None:
+        self.stack = stack
+        self.indices = indices
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return _RGB8FrameSequence(self.stack, self.indices[index])
+
+        return self.stack.get_rgb8(self.indices[index])
+
+
+def frame_to_rgb8(frame: np.ndarray, bit_depth: int = 8) -> np.ndarray:
+    """Convert a single channel or RGB(A) frame to an 8-bit RGB image. If no rescaling is needed, the result is a
+    read-only view of `frame`."""
+    if frame.ndim == 3 and frame.shape[-1] == 4:
+        frame = frame[..., :3]
+
+    if frame.dtype != np.uint8 or bit_depth != 8:
+        frame = np.minimum(frame >> max(bit_depth - 8, 0), 255).astype(np.uint8)
+
+    if frame.ndim == 2:
+        # Repeat the single channel three times without copying any data.
+        frame = stride_tricks.as_strided(
+            frame,
+            shape=(*frame.shape, 3),
+            strides=(*frame.strides, 0),
+            writeable=False,
+        )
+    elif not (frame.ndim == 3 and frame.shape[-1] == 3):
+        raise ValueError("'frame' must be grayscale or rgb")
+
+    return frame
+
+
+class _TIFFPage:
+    def __init__(self, offset: int, shape: Tuple[int, ...], dtype: np.dtype, max_sample_bits: int) -> None:
+        self.offset = offset
+        self.shape = shape
+        self.dtype = dtype
+        self.max_sample_bits = max_sample_bits
+
+    @property
+    def nbytes(self) -> int:
+        return int(np.prod(self.shape)) * self.dtype.itemsize
+
+
+# TIFF tags used.
+_IMAGE_WIDTH = 256
+_IMAGE_LENGTH = 257
+_BITS_PER_SAMPLE = 258
+_COMPRESSION = 259
+_STRIP_OFFSETS = 273
+_SAMPLES_PER_PIXEL = 277
+_STRIP_BYTE_COUNTS = 279
+_MAX_SAMPLE_VALUE = 281
+_PLANAR_CONFIGURATION = 284
+_TILE_WIDTH = 322
+_SAMPLE_FORMAT = 339
+
+# Struct format codes of TIFF field types, indexed by type number.
+_TIFF_TYPES = {1: 'B', 2: 's', 3: 'H', 4: 'I', 6: 'b', 7: 's', 8: 'h', 9: 'i', 16: 'Q', 17: 'q'}
+
+
+def _read_tiff_pages(data: np.ndarray) -> Sequence[_TIFFPage]:
+    """Parse the image file directories of a (Big)TIFF file and return the location and layout of each page. Only
+    uncompressed pages stored in contiguous strips can be mapped, a ValueError is raised for anything else."""
+    buf = memoryview(data)
+
+    byte_order = bytes(buf[:2])
+    if byte_order == b'II':
+        bo = '<'
+    elif byte_order == b'MM':
+        bo = '>'
+    else:
+        raise ValueError('Not a TIFF file')
+
+    magic, = struct.unpack_from(bo + 'H', buf, 2)
+    if magic == 42:
+        count_fmt, entry_fmt, offset_fmt, inline_size = 'H', 'HHII', 'I', 4
+        ifd_offset, = struct.unpack_from(bo + 'I', buf, 4)
+    elif magic == 43:
+        count_fmt, entry_fmt, offset_fmt, inline_size = 'Q', 'HHQQ', 'Q', 8
+        ifd_offset, = struct.unpack_from(bo + 'Q', buf, 8)
+    else:
+        raise ValueError('Not a TIFF file')
+
+    entry_size = struct.calcsize(bo + entry_fmt)
+    pages = []
+
+    while ifd_offset != 0:
+        num_entries, = struct.unpack_from(bo + count_fmt, buf, ifd_offset)
+        entries_offset = ifd_offset + struct.calcsize(bo + count_fmt)
+
+        tags = {}
+        for i in range(num_entries):
+            tag, typ, count, value = struct.unpack_from(bo + entry_fmt, buf, entries_offset + i*entry_size)
+            if typ not in _TIFF_TYPES or typ in (2, 7):
+                continue
+
+            item_fmt = _TIFF_TYPES[typ]
+            size = count * struct.calcsize(item_fmt)
+            if size <= inline_size:
+                value_offset = entries_offset + i*entry_size + entry_size - inline_size
+            else:
+                value_offset = value
+
+            tags[tag] = struct.unpack_from('{}{}{}'.format(bo, count, item_fmt), buf, value_offset)
+
+        pages.append(_tiff_page_from_tags(tags, bo))
+
+        ifd_offset, = struct.unpack_from(bo + offset_fmt, buf, entries_offset + num_entries*entry_size)
+
+    return pages
+
+
+def _tiff_page_from_tags(tags: MutableMapping[int, Tuple[int, ...]], bo: str) -> _TIFFPage:
+    if _TILE_WIDTH in tags:
+        raise ValueError('Tiled TIFF images can not be memory-mapped')
+
+    if tags.get(_COMPRESSION, (1,))[0] != 1:
+        raise ValueError('Compressed TIFF images can not be memory-mapped')
+
+    samples_per_pixel = tags.get(_SAMPLES_PER_PIXEL, (1,))[0]
+    if samples_per_pixel > 1 and tags.get(_PLANAR_CONFIGURATION, (1,))[0] != 1:
+        raise ValueError('Planar TIFF images are not supported')
+
+    bits_per_sample = set(tags.get(_BITS_PER_SAMPLE, (1,)))
+    if len(bits_per_sample) != 1 or not bits_per_sample <= {8, 16}:
+        raise ValueError('Only 8 and 16-bit TIFF images are supported')
+    bits_per_sample, = bits_per_sample
+
+    if tags.get(_SAMPLE_FORMAT, (1,))[0] != 1:
+        raise ValueError('Only unsigned integer TIFF images are supported')
+
+    width = tags[_IMAGE_WIDTH][0]
+    height = tags[_IMAGE_LENGTH][0]
+
+    if samples_per_pixel == 1:
+        shape = (height, width)
+    else:
+        shape = (height, width, samples_per_pixel)
+
+    dtype = np.dtype('{}u{}'.format(bo, bits_per_sample//8))
+
+    strip_offsets = tags[_STRIP_OFFSETS]
+    strip_byte_counts = tags[_STRIP_BYTE_COUNTS]
+    for offset, byte_count, next_offset in zip(strip_offsets, strip_byte_counts, strip_offsets[1:]):
+        if offset + byte_count != next_offset:
+            raise ValueError('TIFF images with non-contiguous strips can not be memory-mapped')
+
+    page = _TIFFPage(
+        offset=strip_offsets[0],
+        shape=shape,
+        dtype=dtype,
+        max_sample_bits=bits_per_sample,
+    )
+
+    if sum(strip_byte_counts) < page.nbytes:
+        raise ValueError('TIFF image data is truncated')
+
+    # Cameras often store 10 or 12-bit data in 16-bit samples and record the actual range in MaxSampleValue.
+    if _MAX_SAMPLE_VALUE in tags:
+        page.max_sample_bits = max(int(max(tags[_MAX_SAMPLE_VALUE])).bit_length(), 8)
+
+    return page
@@ -0,0 +1,165 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+from typing import Callable, Mapping, MutableMapping, Tuple
+
+import cv2
+import numpy as np
+
+
+class UnsupportedPixelFormat(ValueError):
+    pass
+
+
+class PixelFormatConverter:
+    """Convert raw camera buffer data, in a PFNC (GenICam Pixel Format Naming Convention) pixel format, to 8-bit RGB
+    images.
+
+    Higher bit depth formats are scaled down with integer shifts instead of floating point arithmetic, and any
+    intermediate buffers are allocated once and reused between frames of the same size. The only allocation per frame
+    is the returned image, since callers are free to hold on to it.
+    """
+
+    def __init__(self) -> None:
+        self._scratch = {}  # type: MutableMapping[Tuple[Tuple[int, ...], np.dtype], np.ndarray]
+
+    @staticmethod
+    def is_supported(data_format: str) -> bool:
+        return data_format in _CONVERSIONS
+
+    def convert(self, data_format: str, data: np.ndarray, width: int, height: int) -> np.ndarray:
+        """Return `data`, an array of shape (height, width * channels), converted to an RGB image of shape
+        (height, width, 3) and dtype uint8. `data` is only read once and may be a view of the camera buffer."""
+        try:
+            conversion = _CONVERSIONS[data_format]
+        except KeyError:
+            raise UnsupportedPixelFormat('Unsupported pixel format {}'.format(data_format))
+
+        out = np.empty((height, width, 3), dtype=np.uint8)
+        conversion(self, data, out)
+
+        return out
+
+    def _get_scratch(self, shape: Tuple[int, ...], dtype: np.dtype) -> np.ndarray:
+        key = (shape, np.dtype(dtype))
+
+        buf = self._scratch.get(key)
+        if buf is None:
+            # Only keep buffers for the current frame size around.
+            for other_key in [k for k in self._scratch if k[0] != shape]:
+                del self._scratch[other_key]
+            buf = self._scratch[key] = np.empty(shape, dtype=dtype)
+
+        return buf
+
+    def _downshift(self, data: np.ndarray, bits: int, dst: np.ndarray) -> None:
+        """Scale `data` of bit depth `bits` down to 8 bits and write the result into `dst`."""
+        shifted = self._get_scratch(data.shape, np.uint16)
+        np.right_shift(data, bits - 8, out=shifted)
+        np.copyto(dst, shifted, casting='unsafe')
+
+
+_Conversion = Callable[[PixelFormatConverter, np.ndarray, np.ndarray], None]
+
+
+def _mono(bits: int) -> _Conversion:
+    if bits == 8:
+        def conversion(converter: PixelFormatConverter, data: np.ndarray, out: np.ndarray) -> None:
+            cv2.cvtColor(data, cv2.COLOR_GRAY2RGB, dst=out)
+        return conversion
+
+    def conversion(converter: PixelFormatConverter, data: np.ndarray, out: np.ndarray) -> None:
+        gray = converter._get_scratch(data.shape, np.uint8)
+        converter._downshift(data, bits, dst=gray)
+        cv2.cvtColor(gray, cv2.COLOR_GRAY2RGB, dst=out)
+
+    return conversion
+
+
+def _rgb(bits: int, *, bgr: bool) -> _Conversion:
+    if bits == 8:
+        def conversion(converter: PixelFormatConverter, data: np.ndarray, out: np.ndarray) -> None:
+            if bgr:
+                cv2.cvtColor(data.reshape(out.shape), cv2.COLOR_BGR2RGB, dst=out)
+            else:
+                np.copyto(out, data.reshape(out.shape))
+        return conversion
+
+    def conversion(converter: PixelFormatConverter, data: np.ndarray, out: np.ndarray) -> None:
+        if bgr:
+            image = converter._get_scratch(data.shape, np.uint8)
+            converter._downshift(data, bits, dst=image)
+            cv2.cvtColor(image.reshape(out.shape), cv2.COLOR_BGR2RGB, dst=out)
+        else:
+            converter._downshift(data, bits, dst=out.reshape(data.shape))
+
+    return conversion
+
+
+def _bayer(pattern: str, bits: int) -> _Conversion:
+    # OpenCV has a different Bayer pattern naming convention.
+    code = {
+        'GR': cv2.COLOR_BayerGB2RGB,
+        'RG': cv2.COLOR_BayerBG2RGB,
+        'BG': cv2.COLOR_BayerRG2RGB,
+        'GB': cv2.COLOR_BayerGR2RGB,
+    }[pattern]
+
+    if bits == 8:
+        def conversion(converter: PixelFormatConverter, data: np.ndarray, out: np.ndarray) -> None:
+            cv2.cvtColor(data, code, dst=out)
+        return conversion
+
+    def conversion(converter: PixelFormatConverter, data: np.ndarray, out: np.ndarray) -> None:
+        raw = converter._get_scratch(data.shape, np.uint8)
+        converter._downshift(data, bits, dst=raw)
+        cv2.cvtColor(raw, code, dst=out)
+
+    return conversion
+
+
+_CONVERSIONS = {
+    'Mono8': _mono(8),
+    'Mono10': _mono(10),
+    'Mono12': _mono(12),
+    'Mono16': _mono(16),
+    'RGB8': _rgb(8, bgr=False),
+    'RGB10': _rgb(10, bgr=False),
+    'RGB12': _rgb(12, bgr=False),
+    'BGR8': _rgb(8, bgr=True),
+    'BGR10': _rgb(10, bgr=True),
+    'BGR12': _rgb(12, bgr=True),
+    **{
+        'Bayer{}{}'.format(pattern, bits): _bayer(pattern, bits)
+        for pattern in ('GR', 'RG', 'BG', 'GB')
+        for bits in (8, 10, 12)
+    },
+}  # type: Mapping[str, _Conversion]
+
+SUPPORTED_PIXEL_FORMATS = tuple(_CONVERSIONS)
@@ -0,0 +1,179 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import heapq
+import itertools
+import math
+from typing import Generic, Hashable, List, MutableMapping, Optional, Tuple, TypeVar
+
+KT = TypeVar('KT', bound=Hashable)
+
+
+class ProgressTracker(Generic[KT]):
+    """Aggregate progress of many jobs. Counters are maintained incrementally as jobs are added, updated and removed,
+    so reading the aggregate doesn't depend on the number of jobs, and updating a job costs at most O(log n)."""
+
+    def __init__(self) -> None:
+        self._jobs = {}  # type: MutableMapping[KT, Tuple[bool, bool, float, float]]
+
+        self._num_done = 0
+        self._num_cancelled = 0
+        self._num_finished = 0
+
+        self._time_start = _LazyHeap()  # type: _LazyHeap[KT]
+        self._time_est_complete = _LazyHeap()  # type: _LazyHeap[KT]
+
+    @property
+    def num_jobs(self) -> int:
+        return len(self._jobs)
+
+    @property
+    def num_done(self) -> int:
+        return self._num_done
+
+    @property
+    def num_cancelled(self) -> int:
+        return self._num_cancelled
+
+    @property
+    def num_finished(self) -> int:
+        """Number of jobs that are done and not cancelled."""
+        return self._num_finished
+
+    @property
+    def time_start(self) -> Optional[float]:
+        """Earliest start time, or None if no job has a (finite) start time."""
+        return self._time_start.peek()
+
+    @property
+    def time_est_complete(self) -> Optional[float]:
+        """Latest estimated completion time, or None if no job has a (finite) estimate."""
+        value = self._time_est_complete.peek()
+        if value is None:
+            return None
+
+        return -value
+
+    def update(
+            self,
+            key: KT,
+            *,
+            is_done: bool,
+            is_cancelled: bool,
+            time_start: float = math.nan,
+            time_est_complete: float = math.nan
+    ) -> None:
+        """Add the job `key`, or replace its previous state."""
+        self._count(key, -1)
+
+        self._jobs[key] = (is_done, is_cancelled, time_start, time_est_complete)
+        self._count(key, +1)
+
+        self._time_start.set(key, time_start)
+        self._time_est_complete.set(key, -time_est_complete)
+
+    def discard(self, key: KT) -> None:
+        self._count(key, -1)
+        self._jobs.pop(key, None)
+
+        self._time_start.discard(key)
+        self._time_est_complete.discard(key)
+
+    def clear(self) -> None:
+        self._jobs.clear()
+
+        self._num_done = 0
+        self._num_cancelled = 0
+        self._num_finished = 0
+
+        self._time_start.clear()
+        self._time_est_complete.clear()
+
+    def _count(self, key: KT, delta: int) -> None:
+        try:
+            is_done, is_cancelled, _, _ = self._jobs[key]
+        except KeyError:
+            return
+
+        self._num_done += delta * is_done
+        self._num_cancelled += delta * is_cancelled
+        self._num_finished += delta * (is_done and not is_cancelled)
+
+    def __contains__(self, key: KT) -> bool:
+        return key in self._jobs
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+
+class _LazyHeap(Generic[KT]):
+    """A min-heap of keyed values. Changing or removing a value leaves its old entry in the heap to be skipped over
+    when it reaches the top, instead of searching for it."""
+
+    def __init__(self) -> None:
+        self._heap = []  # type: List[Tuple[float, int, KT]]
+        self._current = {}  # type: MutableMapping[KT, int]
+        self._seq = itertools.count()
+
+    def set(self, key: KT, value: float) -> None:
+        if not math.isfinite(value):
+            self.discard(key)
+            return
+
+        seq = next(self._seq)
+        self._current[key] = seq
+        heapq.heappush(self._heap, (value, seq, key))
+
+        # Don't let stale entries accumulate without bound when values change often.
+        if len(self._heap) > 2*len(self._current) + 16:
+            self._compact()
+
+    def discard(self, key: KT) -> None:
+        self._current.pop(key, None)
+
+    def clear(self) -> None:
+        self._heap.clear()
+        self._current.clear()
+
+    def peek(self) -> Optional[float]:
+        heap = self._heap
+        current = self._current
+
+        while heap:
+            value, seq, key = heap[0]
+            if current.get(key) == seq:
+                return value
+            heapq.heappop(heap)
+
+        return None
+
+    def _compact(self) -> None:
+        current = self._current
+        self._heap = [entry for entry in self._heap if current.get(entry[2]) == entry[1]]
+        heapq.heapify(self._heap)
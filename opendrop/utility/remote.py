@@ -0,0 +1,825 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+"""Run jobs on worker processes on other machines, over a simple TCP protocol.
+
+Start a `WorkerServer` on each machine (e.g. with `python -m opendrop batch worker`), then submit jobs to a
+`RemoteExecutor` connected to them, e.g. by passing it to a `Pipeline`. Jobs are sent as pickles of the function and its
+arguments, so workers must run the same version of OpenDrop. Unpickling can run arbitrary code, so both sides prove
+they know a shared `authkey` before anything is unpickled, but messages are not encrypted: only run workers on trusted
+networks.
+
+Every message is a header of (type, job id, payload length) followed by the payload. After connecting, each side sends
+CHALLENGE with a random nonce and replies to the other's with RESPONSE, an HMAC of the nonce keyed with `authkey`. The
+worker then sends HELLO with the number of jobs it runs at once. The scheduler sends JOB messages, which the worker
+answers with RESULT or ERROR in whatever order the jobs finish, and the worker sends HEARTBEAT every
+`HEARTBEAT_INTERVAL` seconds. The payloads of JOB, RESULT, ERROR and HELLO are pickles, except that numpy arrays are
+sent after the pickle as raw buffers, so images are sent with no overhead and without being copied into the pickle.
+"""
+
+import collections
+import concurrent.futures
+import enum
+import functools
+import hmac
+import io
+import itertools
+import os
+import pickle
+import socket
+import struct
+import threading
+import traceback
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Deque, List, MutableMapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from opendrop.metadata import __version__
+
+PROTOCOL_VERSION = 1
+DEFAULT_PORT = 7437
+HEARTBEAT_INTERVAL = 2.0
+HANDSHAKE_TIMEOUT = 10.0
+
+Address = Tuple[str, int]
+
+_HEADER = struct.Struct('!BIQ')
+_PAYLOAD_HEADER = struct.Struct('!QI')
+_BUFFER_LENGTH = struct.Struct('!Q')
+_CHALLENGE = struct.Struct('!H32s')
+
+# Limit on the payload of messages received before the peer has authenticated.
+_MAX_HANDSHAKE_LENGTH = 1024
+
+
+class _Message(enum.IntEnum):
+    CHALLENGE = 1
+    RESPONSE = 2
+    HELLO = 3
+    JOB = 4
+    RESULT = 5
+    ERROR = 6
+    HEARTBEAT = 7
+
+
+class HandshakeError(ConnectionError):
+    """Raised when a peer fails to authenticate or is incompatible."""
+
+
+class WorkerLost(Exception):
+    """Set on the future of a job when the workers running it were lost too many times, e.g. because the job crashes
+    them."""
+
+
+def parse_address(address: Union[str, Address]) -> Address:
+    """Parse a 'HOST:PORT' (or just 'HOST', for the default port) string into a (host, port) pair."""
+    if not isinstance(address, str):
+        return address
+
+    host, sep, port = address.rpartition(':')
+    if not sep:
+        return address, DEFAULT_PORT
+
+    try:
+        return host.strip('[]'), int(port)
+    except ValueError:
+        raise ValueError("Invalid address '{}', expected HOST:PORT".format(address))
+
+
+def format_address(address: Address) -> str:
+    return '{}:{}'.format(*address)
+
+
+class WorkerServer:
+    """Accepts connections from RemoteExecutor's and runs the jobs they send on `executor`, or if not given, a pool of
+    `jobs` worker processes (by default one per CPU). Call `serve_forever()` to start serving and `shutdown()` from
+    another thread to stop.
+
+    If given, `on_message` is called with a description of each connection made or lost."""
+
+    POLL_INTERVAL = 0.5
+
+    def __init__(
+            self,
+            address: Address,
+            authkey: bytes,
+            *,
+            jobs: Optional[int] = None,
+            executor: Optional[Executor] = None,
+            heartbeat_interval: float = HEARTBEAT_INTERVAL,
+            on_message: Optional[Callable[[str], Any]] = None,
+    ) -> None:
+        self.jobs = jobs or os.cpu_count() or 1
+        self._authkey = authkey
+        self._heartbeat_interval = heartbeat_interval
+        self._on_message = on_message
+
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._executor_lock = threading.Lock()
+
+        self._sock = socket.socket(socket.AF_INET6 if ':' in address[0] else socket.AF_INET)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind(address)
+        self._sock.listen()
+        self._sock.settimeout(self.POLL_INTERVAL)
+
+        self.address = self._sock.getsockname()[:2]  # type: Address
+
+        self._closed = threading.Event()
+        self._connections = set()
+
+    def serve_forever(self) -> None:
+        try:
+            while not self._closed.is_set():
+                try:
+                    conn, peer = self._sock.accept()
+                except socket.timeout:
+                    continue
+                except OSError:
+                    if self._closed.is_set():
+                        break
+                    raise
+
+                conn.settimeout(None)
+                threading.Thread(target=self._serve_connection, args=(conn, peer), daemon=True).start()
+        finally:
+            self._sock.close()
+
+    def shutdown(self) -> None:
+        self._closed.set()
+
+        for conn in list(self._connections):
+            _close(conn)
+
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+    def _serve_connection(self, conn: socket.socket, peer: Address) -> None:
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        try:
+            conn.settimeout(HANDSHAKE_TIMEOUT)
+            _handshake(conn, self._authkey, b'worker', b'scheduler')
+            conn.settimeout(None)
+        except (OSError, HandshakeError) as e:
+            self._message('Rejected connection from {}: {}'.format(format_address(peer), e))
+            _close(conn)
+            return
+
+        self._connections.add(conn)
+        self._message('Accepted connection from {}'.format(format_address(peer)))
+
+        send_lock = threading.Lock()
+        stopping = threading.Event()
+        # Jobs in progress, by job id.
+        running = {}  # type: MutableMapping[int, Future]
+
+        def send(kind: _Message, job_id: int, parts: Sequence[Any]) -> None:
+            with send_lock:
+                _send(conn, kind, job_id, parts)
+
+        def heartbeat() -> None:
+            while not stopping.wait(self._heartbeat_interval):
+                try:
+                    send(_Message.HEARTBEAT, 0, ())
+                except OSError:
+                    break
+
+        try:
+            send(_Message.HELLO, 0, _encode({'jobs': self.jobs, 'version': __version__}))
+            threading.Thread(target=heartbeat, daemon=True).start()
+
+            while True:
+                kind, job_id, payload = _recv(conn)
+                if kind is not _Message.JOB:
+                    raise ConnectionError('Unexpected {} message'.format(kind.name))
+
+                try:
+                    fn, args, kwargs = _decode(payload)
+                    fut = self._get_executor().submit(fn, *args, **kwargs)
+                except Exception as e:
+                    if self._closed.is_set():
+                        # The executor was shut down, leave the scheduler to requeue the job.
+                        break
+                    send(_Message.ERROR, job_id, _encode_exception(e))
+                    continue
+
+                running[job_id] = fut
+                fut.add_done_callback(functools.partial(self._job_done, conn, send, running, job_id))
+        except EOFError:
+            self._message('Connection from {} closed'.format(format_address(peer)))
+        except OSError as e:
+            if not self._closed.is_set():
+                self._message('Lost connection from {}: {}'.format(format_address(peer), e or type(e).__name__))
+        finally:
+            stopping.set()
+
+            for fut in list(running.values()):
+                fut.cancel()
+
+            self._connections.discard(conn)
+            _close(conn)
+
+    def _job_done(
+            self,
+            conn: socket.socket,
+            send: Callable[[_Message, int, Sequence[Any]], None],
+            running: MutableMapping[int, Future],
+            job_id: int,
+            fut: Future,
+    ) -> None:
+        running.pop(job_id, None)
+
+        if fut.cancelled() or self._closed.is_set():
+            return
+
+        try:
+            value = fut.result()
+        except BrokenProcessPool:
+            # A job crashed the pool, start a new one and drop the connection so the scheduler can requeue the jobs
+            # that were lost. It gives up on jobs that keep crashing workers.
+            self._reset_executor()
+            _close(conn)
+            return
+        except Exception as e:
+            kind, parts = _Message.ERROR, _encode_exception(e)
+        else:
+            try:
+                kind, parts = _Message.RESULT, _encode(value)
+            except Exception as e:
+                kind, parts = _Message.ERROR, _encode_exception(e)
+
+        try:
+            send(kind, job_id, parts)
+        except OSError:
+            # The scheduler is gone.
+            pass
+
+    def _get_executor(self) -> Executor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.jobs)
+            return self._executor
+
+    def _reset_executor(self) -> None:
+        if not self._owns_executor:
+            return
+
+        with self._executor_lock:
+            executor = self._executor
+            self._executor = None
+
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def _message(self, message: str) -> None:
+        if self._on_message is not None:
+            self._on_message(message)
+
+
+class RemoteExecutor(Executor):
+    """An Executor that sends jobs to the WorkerServer's at `addresses`. Functions and arguments must be picklable and
+    importable by the workers, e.g. module level functions of OpenDrop.
+
+    Each worker is sent as many jobs as it runs at once. A worker that closes its connection or isn't heard from for
+    `heartbeat_timeout` seconds is considered lost, and the jobs it was running are put back at the front of the queue,
+    unless they have already been lost `max_attempts` times, in which case they fail with WorkerLost. Connections to
+    workers are retried every `reconnect_interval` seconds.
+
+    Jobs are also run on a local pool of `local_jobs` processes. If `fallback` is true and none of the workers could be
+    reached, jobs run on a local pool of one process per CPU instead, until a worker is connected again.
+
+    If given, `on_message` is called (on a background thread) with a description of each worker connected or lost."""
+
+    def __init__(
+            self,
+            addresses: Sequence[Union[str, Address]],
+            authkey: bytes,
+            *,
+            local_jobs: int = 0,
+            fallback: bool = True,
+            heartbeat_timeout: float = 5*HEARTBEAT_INTERVAL,
+            reconnect_interval: float = 5.0,
+            max_attempts: int = 3,
+            on_message: Optional[Callable[[str], Any]] = None,
+    ) -> None:
+        self.local_jobs = local_jobs
+        self.fallback = fallback
+        self.heartbeat_timeout = heartbeat_timeout
+        self.reconnect_interval = reconnect_interval
+        self.max_attempts = max_attempts
+
+        self._authkey = authkey
+        self._on_message = on_message
+
+        self._cond = threading.Condition()
+        self._queue = collections.deque()  # type: Deque[_Job]
+        self._unfinished = set()  # type: set
+        self._shutdown = False
+
+        self._local_executor = None  # type: Optional[ProcessPoolExecutor]
+        self._local_in_flight = 0
+        self._fallback_jobs = os.cpu_count() or 1
+
+        self._links = [_WorkerLink(self, parse_address(address)) for address in addresses]
+        self._threads = [
+            threading.Thread(target=link.run, daemon=True) for link in self._links
+        ] + [threading.Thread(target=self._run_local, daemon=True)]
+
+        for thread in self._threads:
+            thread.start()
+
+    @property
+    def capacity(self) -> int:
+        """The number of jobs that can run at once on the connected workers and locally."""
+        with self._cond:
+            return sum(link.capacity for link in self._links if link.is_connected) + self._local_capacity()
+
+    @property
+    def num_connected(self) -> int:
+        with self._cond:
+            return sum(link.is_connected for link in self._links)
+
+    def wait_for_workers(self, timeout: Optional[float] = None) -> int:
+        """Wait until a first connection has been attempted to every worker, and return the number connected."""
+        with self._cond:
+            self._cond.wait_for(lambda: all(link.attempted for link in self._links), timeout)
+            return sum(link.is_connected for link in self._links)
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        fut = Future()  # type: Future
+
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError('cannot schedule new futures after shutdown')
+
+            self._queue.append(_Job(fut, fn, args, kwargs))
+            self._unfinished.add(fut)
+            self._cond.notify_all()
+
+        fut.add_done_callback(self._job_done)
+
+        return fut
+
+    def shutdown(self, wait: bool = True) -> None:
+        if wait:
+            with self._cond:
+                unfinished = list(self._unfinished)
+            concurrent.futures.wait(unfinished)
+
+        with self._cond:
+            self._shutdown = True
+
+            for job in self._queue:
+                job.future.cancel()
+            self._queue.clear()
+
+            for link in self._links:
+                link.close()
+
+            self._cond.notify_all()
+
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+        if self._local_executor is not None:
+            self._local_executor.shutdown(wait=wait)
+
+    def _job_done(self, fut: Future) -> None:
+        with self._cond:
+            self._unfinished.discard(fut)
+
+    # Must be called with the lock held.
+    def _take_job(self) -> Optional['_Job']:
+        while self._queue:
+            job = self._queue.popleft()
+            if job.started or job.future.set_running_or_notify_cancel():
+                job.started = True
+                return job
+
+        return None
+
+    # Must be called with the lock held.
+    def _requeue(self, jobs: Sequence['_Job'], address: Address) -> None:
+        for job in reversed(jobs):
+            job.attempts += 1
+            if job.attempts >= self.max_attempts:
+                job.future.set_exception(WorkerLost(
+                    'Lost worker {} running this job ({} attempts)'.format(format_address(address), job.attempts)
+                ))
+            else:
+                self._queue.appendleft(job)
+
+        self._cond.notify_all()
+
+    # Must be called with the lock held.
+    def _local_capacity(self) -> int:
+        if self.fallback and all(link.attempted and not link.is_connected for link in self._links):
+            return max(self.local_jobs, self._fallback_jobs)
+
+        return self.local_jobs
+
+    def _run_local(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: self._shutdown or (self._queue and self._local_in_flight < self._local_capacity())
+                )
+                if self._shutdown:
+                    return
+
+                job = self._take_job()
+                if job is None:
+                    continue
+
+                self._local_in_flight += 1
+
+            if self._local_executor is None:
+                self._local_executor = ProcessPoolExecutor(max_workers=max(self.local_jobs, self._fallback_jobs))
+
+            try:
+                local_fut = self._local_executor.submit(job.fn, *job.args, **job.kwargs)
+            except Exception as e:
+                self._local_done(job, None, e)
+            else:
+                local_fut.add_done_callback(functools.partial(self._local_done, job))
+
+    def _local_done(self, job: '_Job', local_fut: Optional[Future], error: Optional[BaseException] = None) -> None:
+        with self._cond:
+            self._local_in_flight -= 1
+            self._cond.notify_all()
+
+        if local_fut is not None:
+            if local_fut.cancelled():
+                # The job's future is already running, so it can't be cancelled itself.
+                job.future.set_exception(concurrent.futures.CancelledError())
+                return
+            error = local_fut.exception()
+
+        if error is not None:
+            job.future.set_exception(error)
+        else:
+            job.future.set_result(local_fut.result())
+
+    def _message(self, message: str) -> None:
+        if self._on_message is not None:
+            self._on_message(message)
+
+    def __repr__(self) -> str:
+        return '{}({})'.format(
+            type(self).__name__,
+            ', '.join(format_address(link.address) for link in self._links),
+        )
+
+
+class _Job:
+    __slots__ = ('future', 'fn', 'args', 'kwargs', 'started', 'attempts')
+
+    def __init__(self, future: Future, fn: Callable[..., Any], args: tuple, kwargs: dict) -> None:
+        self.future = future
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.started = False
+        self.attempts = 0
+
+
+class _WorkerLink:
+    """The connection of a RemoteExecutor to one worker, reconnecting whenever it is lost. Unless noted, attributes are
+    guarded by the executor's lock."""
+
+    def __init__(self, executor: RemoteExecutor, address: Address) -> None:
+        self.address = address
+        self.capacity = 0
+        self.is_connected = False
+        # Whether a connection has been attempted yet.
+        self.attempted = False
+
+        self._executor = executor
+        self._cond = executor._cond
+        self._sock = None  # type: Optional[socket.socket]
+        self._in_flight = {}  # type: MutableMapping[int, _Job]
+        self._job_ids = itertools.count(1)
+
+    def run(self) -> None:
+        executor = self._executor
+
+        while True:
+            try:
+                sock, capacity = self._connect()
+            except Exception as e:
+                with self._cond:
+                    if executor._shutdown:
+                        return
+
+                    if not self.attempted:
+                        executor._message('Could not connect to worker {}: {}'.format(
+                            format_address(self.address), e
+                        ))
+                    self.attempted = True
+                    self._cond.notify_all()
+
+                    self._cond.wait_for(lambda: executor._shutdown, executor.reconnect_interval)
+                    if executor._shutdown:
+                        return
+
+                continue
+
+            with self._cond:
+                if executor._shutdown:
+                    _close(sock)
+                    return
+
+                self._sock = sock
+                self.capacity = capacity
+                self.is_connected = True
+                self.attempted = True
+                self._cond.notify_all()
+
+            executor._message('Connected to worker {} ({} jobs)'.format(format_address(self.address), capacity))
+
+            sender = threading.Thread(target=self._send_jobs, args=(sock,), daemon=True)
+            sender.start()
+
+            try:
+                self._receive_results(sock)
+            except (OSError, EOFError) as e:
+                with self._cond:
+                    shutdown = executor._shutdown
+                if not shutdown:
+                    executor._message('Lost worker {}: {}'.format(
+                        format_address(self.address), e or type(e).__name__
+                    ))
+            finally:
+                with self._cond:
+                    self.is_connected = False
+                    self._sock = None
+                    _close(sock)
+
+                    lost = list(self._in_flight.values())
+                    self._in_flight.clear()
+                    executor._requeue(lost, self.address)
+
+                sender.join()
+
+    def close(self) -> None:
+        """Close the connection, the caller must hold the lock."""
+        if self._sock is not None:
+            _close(self._sock)
+
+    def _connect(self) -> Tuple[socket.socket, int]:
+        sock = socket.create_connection(self.address, timeout=HANDSHAKE_TIMEOUT)
+
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            _handshake(sock, self._executor._authkey, b'scheduler', b'worker')
+
+            kind, _, payload = _recv(sock)
+            if kind is not _Message.HELLO:
+                raise HandshakeError('Expected HELLO, got {}'.format(kind.name))
+
+            hello = _decode(payload)
+            if hello['version'] != __version__:
+                raise HandshakeError(
+                    'Worker runs OpenDrop {!r}, but this is {!r}'.format(hello['version'], __version__)
+                )
+
+            sock.settimeout(self._executor.heartbeat_timeout)
+        except BaseException:
+            _close(sock)
+            raise
+
+        return sock, hello['jobs']
+
+    def _send_jobs(self, sock: socket.socket) -> None:
+        executor = self._executor
+
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: (
+                    executor._shutdown
+                    or self._sock is not sock
+                    or (executor._queue and len(self._in_flight) < self.capacity)
+                ))
+                if executor._shutdown or self._sock is not sock:
+                    return
+
+                job = executor._take_job()
+                if job is None:
+                    continue
+
+                job_id = next(self._job_ids)
+                self._in_flight[job_id] = job
+
+            try:
+                parts = _encode((job.fn, job.args, job.kwargs))
+            except Exception as e:
+                with self._cond:
+                    del self._in_flight[job_id]
+                    self._cond.notify_all()
+                job.future.set_exception(e)
+                continue
+
+            try:
+                _send(sock, _Message.JOB, job_id, parts)
+            except OSError:
+                # Wake up the receiver, which requeues the jobs in flight.
+                _close(sock)
+                return
+
+    def _receive_results(self, sock: socket.socket) -> None:
+        while True:
+            kind, job_id, payload = _recv(sock)
+            if kind is _Message.HEARTBEAT:
+                continue
+
+            if kind not in (_Message.RESULT, _Message.ERROR):
+                raise ConnectionError('Unexpected {} message'.format(kind.name))
+
+            with self._cond:
+                job = self._in_flight.pop(job_id, None)
+                self._cond.notify_all()
+
+            if job is None:
+                continue
+
+            try:
+                value = _decode(payload)
+            except Exception as e:
+                job.future.set_exception(e)
+                continue
+
+            if kind is _Message.RESULT:
+                job.future.set_result(value)
+            else:
+                job.future.set_exception(value)
+
+
+def _handshake(sock: socket.socket, authkey: bytes, role: bytes, peer_role: bytes) -> None:
+    nonce = os.urandom(32)
+    _send(sock, _Message.CHALLENGE, 0, (_CHALLENGE.pack(PROTOCOL_VERSION, nonce),))
+
+    kind, _, payload = _recv(sock, _MAX_HANDSHAKE_LENGTH)
+    if kind is not _Message.CHALLENGE or len(payload) != _CHALLENGE.size:
+        raise HandshakeError('Peer is not an OpenDrop worker or scheduler')
+
+    peer_version, peer_nonce = _CHALLENGE.unpack(payload)
+    if peer_version != PROTOCOL_VERSION:
+        raise HandshakeError('Peer uses protocol version {}, expected {}'.format(peer_version, PROTOCOL_VERSION))
+
+    # Include the role in the MAC, so a peer can't just reflect our challenge back to us.
+    _send(sock, _Message.RESPONSE, 0, (_mac(authkey, role, peer_nonce),))
+
+    kind, _, payload = _recv(sock, _MAX_HANDSHAKE_LENGTH)
+    if kind is not _Message.RESPONSE or not hmac.compare_digest(bytes(payload), _mac(authkey, peer_role, nonce)):
+        raise HandshakeError('Authentication failed, check both sides use the same key')
+
+
+def _mac(authkey: bytes, role: bytes, nonce: bytes) -> bytes:
+    return hmac.new(authkey, role + b'\0' + nonce, 'sha256').digest()
+
+
+def _send(sock: socket.socket, kind: _Message, job_id: int, parts: Sequence[Any]) -> None:
+    length = sum(part.nbytes if isinstance(part, np.ndarray) else len(part) for part in parts)
+    sock.sendall(_HEADER.pack(kind, job_id, length))
+
+    for part in parts:
+        if isinstance(part, np.ndarray):
+            part = part.reshape(-1).view(np.uint8)
+        sock.sendall(part)
+
+
+def _recv(sock: socket.socket, max_length: Optional[int] = None) -> Tuple[_Message, int, memoryview]:
+    kind, job_id, length = _HEADER.unpack(_recv_exactly(sock, _HEADER.size))
+
+    try:
+        kind = _Message(kind)
+    except ValueError:
+        raise ConnectionError('Unknown message type {}'.format(kind))
+
+    if max_length is not None and length > max_length:
+        raise ConnectionError('Message too long')
+
+    return kind, job_id, memoryview(_recv_exactly(sock, length))
+
+
+def _recv_exactly(sock: socket.socket, n: int) -> bytearray:
+    buf = bytearray(n)
+    view = memoryview(buf)
+
+    while view:
+        count = sock.recv_into(view)
+        if count == 0:
+            raise EOFError('Connection closed')
+        view = view[count:]
+
+    return buf
+
+
+class _Pickler(pickle.Pickler):
+    def __init__(self, file: io.BytesIO) -> None:
+        super().__init__(file, protocol=4)
+        self.buffers = []  # type: List[np.ndarray]
+
+    def persistent_id(self, obj: Any) -> Any:
+        if type(obj) is not np.ndarray or obj.dtype.hasobject:
+            return None
+
+        self.buffers.append(np.ascontiguousarray(obj))
+        return 'ndarray', len(self.buffers) - 1, obj.dtype.str, obj.shape
+
+
+class _Unpickler(pickle.Unpickler):
+    def __init__(self, file: io.BytesIO, buffers: Sequence[memoryview]) -> None:
+        super().__init__(file)
+        self.buffers = buffers
+
+    def persistent_load(self, pid: Any) -> Any:
+        _, index, dtype, shape = pid
+        buffer = self.buffers[index]
+
+        if len(buffer) == 0:
+            return np.empty(shape, dtype)
+
+        return np.frombuffer(buffer, dtype).reshape(shape)
+
+
+def _encode(obj: Any) -> List[Any]:
+    """Return the payload encoding `obj`, as a list of parts to send one after another."""
+    file = io.BytesIO()
+    pickler = _Pickler(file)
+    pickler.dump(obj)
+    data = file.getbuffer()
+
+    header = bytearray(_PAYLOAD_HEADER.pack(len(data), len(pickler.buffers)))
+    for buffer in pickler.buffers:
+        header += _BUFFER_LENGTH.pack(buffer.nbytes)
+
+    return [header, data, *pickler.buffers]
+
+
+def _decode(payload: memoryview) -> Any:
+    data_length, count = _PAYLOAD_HEADER.unpack_from(payload)
+    offset = _PAYLOAD_HEADER.size
+
+    lengths = []
+    for _ in range(count):
+        lengths.append(_BUFFER_LENGTH.unpack_from(payload, offset)[0])
+        offset += _BUFFER_LENGTH.size
+
+    data = payload[offset:offset + data_length]
+    offset += data_length
+
+    buffers = []
+    for length in lengths:
+        buffers.append(payload[offset:offset + length])
+        offset += length
+
+    return _Unpickler(io.BytesIO(data), buffers).load()
+
+
+def _encode_exception(e: Exception) -> List[Any]:
+    try:
+        return _encode(e)
+    except Exception:
+        # Not picklable, send a description instead.
+        return _encode(RuntimeError(''.join(traceback.format_exception_only(type(e), e)).strip()))
+
+
+def _close(sock: socket.socket) -> None:
+    try:
+        sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass
+
+    sock.close()
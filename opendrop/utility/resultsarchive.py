@@ -0,0 +1,257 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+"""A single file archive for tabular analysis results.
+
+The archive is an uncompressed zip file of .npy members (so it can also be opened with `numpy.load()`), laid out as:
+
+    metadata.json               Format information, record count and user metadata.
+    columns/<name>.npy          One value (or row) per record.
+    ragged/<name>/data.npy      Variable length arrays of every record, concatenated along the first axis.
+    ragged/<name>/offsets.npy   Record i's array is data[offsets[i]:offsets[i+1]].
+
+Since members are stored uncompressed, ResultsArchive can memory-map them directly out of the zip file, and only the
+parts of an archive that are actually accessed get read from disk.
+"""
+
+import json
+import struct
+import zipfile
+from pathlib import Path
+from typing import Any, Iterator, Mapping, MutableMapping, Optional, Sequence, Tuple, Union, overload
+
+import numpy as np
+
+FORMAT_NAME = 'opendrop-results'
+FORMAT_VERSION = 1
+
+_METADATA_NAME = 'metadata.json'
+_COLUMN_NAME = 'columns/{}.npy'
+_RAGGED_DATA_NAME = 'ragged/{}/data.npy'
+_RAGGED_OFFSETS_NAME = 'ragged/{}/offsets.npy'
+
+# Zip local file header, see section 4.3.7 of the zip file format specification.
+_LOCAL_HEADER = struct.Struct('<4s5H3L2H')
+_LOCAL_HEADER_SIGNATURE = b'PK\x03\x04'
+
+
+def write_results_archive(
+        file: Union[str, Path],
+        columns: Mapping[str, Any],
+        ragged: Optional[Mapping[str, Sequence[Optional[np.ndarray]]]] = None,
+        metadata: Optional[Mapping[str, Any]] = None,
+) -> None:
+    """Write a results archive to `file`.
+
+    Every column and ragged sequence must have one entry per record. Entries of a ragged sequence may be None, which
+    is stored as an empty array. `metadata` must be JSON serializable."""
+    ragged = ragged or {}
+
+    columns = {name: np.asarray(values) for name, values in columns.items()}
+
+    lengths = {len(values) for values in columns.values()} | {len(arrays) for arrays in ragged.values()}
+    if len(lengths) > 1:
+        raise ValueError('Columns and ragged arrays have different numbers of records')
+    num_records = lengths.pop() if lengths else 0
+
+    info = {
+        'format': FORMAT_NAME,
+        'format_version': FORMAT_VERSION,
+        'num_records': num_records,
+        'columns': list(columns.keys()),
+        'ragged': list(ragged.keys()),
+        'metadata': dict(metadata or {}),
+    }
+
+    with zipfile.ZipFile(str(file), 'w', compression=zipfile.ZIP_STORED, allowZip64=True) as zf:
+        zf.writestr(_METADATA_NAME, json.dumps(info, indent=2))
+
+        for name, values in columns.items():
+            with zf.open(_COLUMN_NAME.format(name), 'w', force_zip64=True) as out_file:
+                np.lib.format.write_array(out_file, values, allow_pickle=False)
+
+        for name, arrays in ragged.items():
+            _write_ragged(zf, name, arrays)
+
+
+def _write_ragged(zf: zipfile.ZipFile, name: str, arrays: Sequence[Optional[np.ndarray]]) -> None:
+    lengths = [0 if a is None else len(a) for a in arrays]
+    arrays = [np.asarray(a) for a in arrays if a is not None and len(a) > 0]
+
+    if arrays:
+        dtype = np.result_type(*arrays)
+        row_shape = arrays[0].shape[1:]
+        if any(a.shape[1:] != row_shape for a in arrays):
+            raise ValueError("Arrays of '{}' have different row shapes".format(name))
+    else:
+        dtype = np.dtype(float)
+        row_shape = ()
+
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+
+    # Write the data a record at a time rather than concatenating everything in memory first.
+    with zf.open(_RAGGED_DATA_NAME.format(name), 'w', force_zip64=True) as out_file:
+        np.lib.format.write_array_header_2_0(out_file, {
+            'descr': np.lib.format.dtype_to_descr(dtype),
+            'fortran_order': False,
+            'shape': (int(offsets[-1]), *row_shape),
+        })
+        for a in arrays:
+            out_file.write(np.ascontiguousarray(a, dtype=dtype).tobytes())
+
+    with zf.open(_RAGGED_OFFSETS_NAME.format(name), 'w', force_zip64=True) as out_file:
+        np.lib.format.write_array(out_file, offsets, allow_pickle=False)
+
+
+class RaggedArray(Sequence[np.ndarray]):
+    """A sequence of variable length arrays, stored concatenated in `data`, where the i'th array is
+    data[offsets[i]:offsets[i+1]]."""
+
+    def __init__(self, data: np.ndarray, offsets: np.ndarray) -> None:
+        self.data = data
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    @overload
+    def __getitem__(self, index: int) -> np.ndarray: ...
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[np.ndarray]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('RaggedArray index out of range')
+
+        return self.data[self.offsets[index]:self.offsets[index + 1]]
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        for i in range(len(self)):
+            yield self[i]
+
+
+class ResultsArchive:
+    """Read a results archive written by write_results_archive(). Arrays are memory-mapped (read-only) from the
+    archive file when first accessed."""
+
+    def __init__(self, file: Union[str, Path]) -> None:
+        self._path = Path(file)
+
+        with zipfile.ZipFile(str(self._path)) as zf:
+            self._members = {member.filename: member for member in zf.infolist()}
+            try:
+                info = json.loads(zf.read(_METADATA_NAME).decode('utf-8'))
+            except KeyError:
+                raise ValueError("'{}' is not a results archive".format(self._path)) from None
+
+        if info.get('format') != FORMAT_NAME:
+            raise ValueError("'{}' is not a results archive".format(self._path))
+
+        if info['format_version'] > FORMAT_VERSION:
+            raise ValueError(
+                "'{}' has format version {}, only versions up to {} are supported"
+                .format(self._path, info['format_version'], FORMAT_VERSION)
+            )
+
+        self.num_records = info['num_records']  # type: int
+        self.column_names = tuple(info['columns'])  # type: Tuple[str, ...]
+        self.ragged_names = tuple(info['ragged'])  # type: Tuple[str, ...]
+        self.metadata = info['metadata']  # type: Mapping[str, Any]
+
+        self._arrays = {}  # type: MutableMapping[str, np.ndarray]
+
+    def column(self, name: str) -> np.ndarray:
+        if name not in self.column_names:
+            raise KeyError(name)
+
+        return self._get_array(_COLUMN_NAME.format(name))
+
+    def ragged(self, name: str) -> RaggedArray:
+        if name not in self.ragged_names:
+            raise KeyError(name)
+
+        return RaggedArray(
+            data=self._get_array(_RAGGED_DATA_NAME.format(name)),
+            offsets=self._get_array(_RAGGED_OFFSETS_NAME.format(name)),
+        )
+
+    def _get_array(self, member_name: str) -> np.ndarray:
+        try:
+            return self._arrays[member_name]
+        except KeyError:
+            pass
+
+        array = self._map_member(self._members[member_name])
+        self._arrays[member_name] = array
+
+        return array
+
+    def _map_member(self, member: zipfile.ZipInfo) -> np.ndarray:
+        if member.compress_type != zipfile.ZIP_STORED:
+            raise ValueError("Member '{}' is compressed and can't be memory-mapped".format(member.filename))
+
+        with self._path.open('rb') as in_file:
+            # The file header in the central directory may not match the local header (e.g. the extra field), so find
+            # where the member's data starts from the local header.
+            in_file.seek(member.header_offset)
+            header = _LOCAL_HEADER.unpack(in_file.read(_LOCAL_HEADER.size))
+            if header[0] != _LOCAL_HEADER_SIGNATURE:
+                raise ValueError("Bad local header for member '{}'".format(member.filename))
+            name_len, extra_len = header[-2:]
+            in_file.seek(name_len + extra_len, 1)
+
+            version = np.lib.format.read_magic(in_file)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(in_file)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(in_file)
+
+            offset = in_file.tell()
+
+        if dtype.hasobject:
+            raise ValueError("Member '{}' contains Python objects".format(member.filename))
+
+        if 0 in shape:
+            # Can't memory-map zero bytes.
+            return np.empty(shape, dtype)
+
+        return np.memmap(
+            str(self._path),
+            dtype=dtype,
+            mode='r',
+            offset=offset,
+            shape=shape,
+            order='F' if fortran_order else 'C',
+        )
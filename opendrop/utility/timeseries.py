@@ -0,0 +1,133 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import math
+from typing import Generic, Hashable, List, MutableMapping, Tuple, TypeVar
+
+import numpy as np
+
+KT = TypeVar('KT', bound=Hashable)
+
+
+class TimeSeries(Generic[KT]):
+    """A series of (t, y) points kept in ascending order of t, where each point belongs to a key (e.g. the analysis it
+    came from), so it can later be updated or removed.
+
+    Points are stored in growable arrays, and the position of a point is found by binary search. Points usually
+    arrive in order of t, in which case they are appended at the end in amortized constant time."""
+
+    _INITIAL_CAPACITY = 64
+
+    def __init__(self) -> None:
+        self._t = np.empty(self._INITIAL_CAPACITY)
+        self._y = np.empty(self._INITIAL_CAPACITY)
+        self._keys = []  # type: List[KT]
+        self._key_t = {}  # type: MutableMapping[KT, float]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: KT) -> bool:
+        return key in self._key_t
+
+    def set(self, key: KT, t: float, y: float) -> bool:
+        """Set the point belonging to `key`. If `t` or `y` is None or not finite, the point is removed instead. Return
+        True if the series changed."""
+        if t is None or y is None or not (math.isfinite(t) and math.isfinite(y)):
+            return self.discard(key)
+
+        old_t = self._key_t.get(key)
+        if old_t == t:
+            i = self._index_of(key, t)
+            if self._y[i] == y:
+                return False
+            self._y[i] = y
+            return True
+
+        if old_t is not None:
+            self._remove(self._index_of(key, old_t))
+
+        self._insert(key, t, y)
+
+        return True
+
+    def discard(self, key: KT) -> bool:
+        """Remove the point belonging to `key`, return True if there was one."""
+        t = self._key_t.get(key)
+        if t is None:
+            return False
+
+        self._remove(self._index_of(key, t))
+
+        return True
+
+    def clear(self) -> None:
+        self._keys.clear()
+        self._key_t.clear()
+
+    def data(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return copies of the t and y values."""
+        n = len(self._keys)
+        return self._t[:n].copy(), self._y[:n].copy()
+
+    def _index_of(self, key: KT, t: float) -> int:
+        n = len(self._keys)
+        i = int(np.searchsorted(self._t[:n], t, side='left'))
+
+        # Several points may share the same t.
+        while self._keys[i] != key:
+            i += 1
+
+        return i
+
+    def _insert(self, key: KT, t: float, y: float) -> None:
+        n = len(self._keys)
+        if n == len(self._t):
+            self._t = np.concatenate((self._t, np.empty(n)))
+            self._y = np.concatenate((self._y, np.empty(n)))
+
+        if n == 0 or t >= self._t[n - 1]:
+            i = n
+        else:
+            i = int(np.searchsorted(self._t[:n], t, side='right'))
+            self._t[i + 1:n + 1] = self._t[i:n]
+            self._y[i + 1:n + 1] = self._y[i:n]
+
+        self._t[i] = t
+        self._y[i] = y
+        self._keys.insert(i, key)
+        self._key_t[key] = t
+
+    def _remove(self, i: int) -> None:
+        n = len(self._keys)
+
+        self._t[i:n - 1] = self._t[i + 1:n]
+        self._y[i:n - 1] = self._y[i + 1:n]
+        key = self._keys.pop(i)
+        del self._key_t[key]
@@ -0,0 +1,202 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+from typing import Any, Callable, Hashable, List, MutableMapping, Optional, Sequence, Set, Tuple
+
+from gi.repository import GLib, GObject, Gtk
+
+
+class LazyListModel(GObject.Object, Gtk.TreeModel):
+    """A flat Gtk.TreeModel backed by a sequence of items. Each column is given as a type and a function that computes
+    the cell value from an item, which is only called when the view asks for that cell (i.e. when the row is drawn), so
+    nothing is formatted for rows that are scrolled out of view.
+
+    Call `row_changed_later()` when an item changes, and the 'row-changed' notifications are emitted together at most
+    once every `FLUSH_INTERVAL` milliseconds."""
+
+    FLUSH_INTERVAL = 100
+
+    _COLUMN_GTYPES = {
+        object: GObject.TYPE_PYOBJECT,
+        str: GObject.TYPE_STRING,
+        int: GObject.TYPE_INT,
+        float: GObject.TYPE_DOUBLE,
+        bool: GObject.TYPE_BOOLEAN,
+    }
+
+    def __init__(self, columns: Sequence[Tuple[Any, Callable[[Hashable], Any]]]) -> None:
+        super().__init__()
+
+        self._column_types = tuple(self._COLUMN_GTYPES.get(column_type, column_type) for column_type, _ in columns)
+        self._column_getters = tuple(getter for _, getter in columns)
+
+        self._items = []  # type: List[Hashable]
+        self._indices = {}  # type: MutableMapping[Hashable, int]
+
+        self._pending = set()  # type: Set[int]
+        self._flush_timer = None  # type: Optional[int]
+
+    @property
+    def items(self) -> Sequence[Hashable]:
+        return self._items
+
+    def set_items(self, items: Sequence[Hashable]) -> None:
+        """Replace the rows of this model with `items`. Rows that are unchanged at the start of the list are kept (and
+        so remain selected)."""
+        old = self._items
+        new = tuple(items)
+
+        keep = 0
+        for a, b in zip(old, new):
+            if a != b: break
+            keep += 1
+
+        while len(old) > keep:
+            index = len(old) - 1
+            del self._indices[old.pop()]
+            self._pending.discard(index)
+            self.row_deleted(Gtk.TreePath.new_from_indices([index]))
+
+        for item in new[keep:]:
+            index = len(old)
+            old.append(item)
+            self._indices[item] = index
+            self.row_inserted(Gtk.TreePath.new_from_indices([index]), self._new_iter(index))
+
+    def index_of(self, item: Hashable) -> Optional[int]:
+        return self._indices.get(item)
+
+    def get_item(self, tree_iter: Gtk.TreeIter) -> Hashable:
+        return self._items[self._index(tree_iter)]
+
+    def get_iter_of(self, item: Hashable) -> Optional[Gtk.TreeIter]:
+        index = self._indices.get(item)
+        if index is None:
+            return None
+
+        return self._new_iter(index)
+
+    def row_changed_later(self, item: Hashable) -> None:
+        index = self._indices.get(item)
+        if index is None: return
+
+        self._pending.add(index)
+
+        if self._flush_timer is None:
+            self._flush_timer = GLib.timeout_add(self.FLUSH_INTERVAL, self._flush)
+
+    def _flush(self) -> bool:
+        self._flush_timer = None
+
+        pending = sorted(self._pending)
+        self._pending.clear()
+
+        for index in pending:
+            self.row_changed(Gtk.TreePath.new_from_indices([index]), self._new_iter(index))
+
+        return GLib.SOURCE_REMOVE
+
+    def destroy(self) -> None:
+        if self._flush_timer is not None:
+            GLib.source_remove(self._flush_timer)
+            self._flush_timer = None
+
+        self._pending.clear()
+
+    def _new_iter(self, index: int) -> Gtk.TreeIter:
+        tree_iter = Gtk.TreeIter()
+        tree_iter.user_data = index
+        return tree_iter
+
+    def _index(self, tree_iter: Gtk.TreeIter) -> int:
+        # A user_data of 0 comes back as None.
+        return tree_iter.user_data or 0
+
+    def do_get_flags(self) -> Gtk.TreeModelFlags:
+        return Gtk.TreeModelFlags.LIST_ONLY
+
+    def do_get_n_columns(self) -> int:
+        return len(self._column_types)
+
+    def do_get_column_type(self, column: int) -> GObject.GType:
+        return self._column_types[column]
+
+    def do_get_iter(self, path: Gtk.TreePath) -> Tuple[bool, Optional[Gtk.TreeIter]]:
+        index = path.get_indices()[0]
+        if not 0 <= index < len(self._items):
+            return False, None
+
+        return True, self._new_iter(index)
+
+    def do_get_path(self, tree_iter: Gtk.TreeIter) -> Gtk.TreePath:
+        return Gtk.TreePath.new_from_indices([self._index(tree_iter)])
+
+    def do_get_value(self, tree_iter: Gtk.TreeIter, column: int) -> Any:
+        item = self._items[self._index(tree_iter)]
+        return self._column_getters[column](item)
+
+    def do_iter_next(self, tree_iter: Gtk.TreeIter) -> bool:
+        index = self._index(tree_iter) + 1
+        if index >= len(self._items):
+            return False
+
+        tree_iter.user_data = index
+        return True
+
+    def do_iter_previous(self, tree_iter: Gtk.TreeIter) -> bool:
+        index = self._index(tree_iter) - 1
+        if index < 0:
+            return False
+
+        tree_iter.user_data = index
+        return True
+
+    def do_iter_children(self, parent: Optional[Gtk.TreeIter]) -> Tuple[bool, Optional[Gtk.TreeIter]]:
+        if parent is not None or not self._items:
+            return False, None
+
+        return True, self._new_iter(0)
+
+    def do_iter_has_child(self, tree_iter: Gtk.TreeIter) -> bool:
+        return False
+
+    def do_iter_n_children(self, tree_iter: Optional[Gtk.TreeIter]) -> int:
+        if tree_iter is not None:
+            return 0
+
+        return len(self._items)
+
+    def do_iter_nth_child(self, parent: Optional[Gtk.TreeIter], n: int) -> Tuple[bool, Optional[Gtk.TreeIter]]:
+        if parent is not None or not 0 <= n < len(self._items):
+            return False, None
+
+        return True, self._new_iter(n)
+
+    def do_iter_parent(self, child: Gtk.TreeIter) -> Tuple[bool, Optional[Gtk.TreeIter]]:
+        return False, None
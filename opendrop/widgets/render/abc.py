@@ -33,6 +33,7 @@ from typing import Optional
 import cairo
 from gi.repository import GObject
 
+from opendrop.utility.geometry import Rect2
 from . import protocol
 from .render import Render
 
@@ -50,6 +51,18 @@ class RenderObject(GObject.Object, protocol.RenderObject):
     def _do_draw(self, cr: cairo.Context) -> None:
         pass
 
+    def get_bounds(self) -> Optional[Rect2[float]]:
+        """Return the area of the parent widget that this object draws in, or None if it may draw anywhere. When the
+        object requests a redraw, only this area (before and after the change) is redrawn. An object that draws
+        nothing can return an empty rectangle."""
+        return None
+
+    def _widget_bounds_from_canvas(self, extents: Rect2[float], padding: float = 0) -> Rect2[float]:
+        pt0 = self._parent._widget_coord_from_canvas(extents.pt0)
+        pt1 = self._parent._widget_coord_from_canvas(extents.pt1)
+
+        return Rect2(pt0 - (padding, padding), pt1 + (padding, padding))
+
     def set_parent(self, parent: Render) -> None:
         assert self._parent is None
         self._parent = parent
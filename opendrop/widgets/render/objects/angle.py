@@ -33,7 +33,7 @@ from typing import Tuple, Optional
 import cairo
 from gi.repository import GObject
 
-from opendrop.utility.geometry import Vector2
+from opendrop.utility.geometry import Rect2, Vector2
 from opendrop.widgets.render import abc
 
 
@@ -111,6 +111,23 @@ class Angle(abc.RenderObject):
 
         cr.show_text(angle_text)
 
+    def get_bounds(self) -> Optional[Rect2[float]]:
+        vertex_pos = self._vertex_pos
+        if vertex_pos is None:
+            return Rect2(0, 0, 0, 0)
+
+        vertex_pos = self._parent._widget_coord_from_canvas(vertex_pos)
+
+        # Text is centred on the text radius, allow a few characters either side of it.
+        radius = max(
+            self._angle_radius,
+            self._start_marker_radius,
+            self._end_marker_radius,
+            self._text_radius + 3*self._text_font_size,
+        ) + self._stroke_width
+
+        return Rect2(vertex_pos - (radius, radius), vertex_pos + (radius, radius))
+
     def _append_hand_path(self, cr: cairo.Context, pos: Vector2[float], angle: float, radius: float) -> None:
         if radius == 0:
             return
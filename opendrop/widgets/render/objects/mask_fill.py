@@ -27,49 +27,83 @@
 # with this software.  If not, see <https://www.gnu.org/licenses/>.
 
 
-from typing import Tuple, Optional
+from typing import MutableMapping, Optional, Tuple
 
 import cairo
 import numpy as np
 from gi.repository import GObject
 
 from opendrop.utility.cairomisc import cairo_saved
+from opendrop.utility.geometry import Rect2
+from opendrop.utility.imagepyramid import ImagePyramid
 from .. import abc
 
 
 class MaskFill(abc.RenderObject):
+    """Fill the non-zero pixels of a mask over the canvas with a solid colour.
+
+    Like `PixbufFill`, the mask is drawn from the level of an `ImagePyramid` that matches the current display scale.
+    The Cairo surface of each level is kept until the mask changes, so repainting (e.g. when another object moves over
+    it) doesn't need to copy or scale the full resolution mask."""
+
+    def __init__(self, **options) -> None:
+        # Initialised before super().__init__() which may set the mask property.
+        self._level_surfaces = {}  # type: MutableMapping[int, cairo.ImageSurface]
+        super().__init__(**options)
+
     def _do_draw(self, cr: cairo.Context) -> None:
-        mask = self._mask
-        if mask is None:
+        pyramid = self._pyramid
+        if pyramid is None:
             return
 
         scale = self._parent._widget_dist_from_canvas((1, 1))
         offset = self._parent._widget_coord_from_canvas((0, 0))
 
+        level = pyramid.level_for_scale(max(scale))
+        mask_surface = self._get_level_surface(level)
+        level_scale = pyramid.get_level_scale(level)
+
         with cairo_saved(cr):
             cr.translate(*offset)
-            cr.scale(*scale)
+            cr.scale(scale[0] * level_scale[0], scale[1] * level_scale[1])
 
-            mask_width = mask.shape[1]
-            mask_height = mask.shape[0]
+            cr.set_source_rgba(*self._color)
+            cr.mask_surface(mask_surface, 0, 0)
 
-            required_stride_len = cairo.Format.A8.stride_for_width(mask_width)
-            required_padding = required_stride_len - mask_width
+    def _get_level_surface(self, level: int) -> cairo.ImageSurface:
+        try:
+            return self._level_surfaces[level]
+        except KeyError:
+            pass
 
-            if required_padding:
-                mask = np.pad(mask, pad_width=((0, 0), (0, required_padding)), mode='constant', constant_values=0)
+        mask = self._pyramid.get_level(level)
+        mask_height, mask_width = mask.shape
 
-            mask_surface = cairo.ImageSurface.create_for_data(
-                memoryview(mask),
-                cairo.FORMAT_A8,
-                mask_width,
-                mask_height,
-            )
+        # Copy into a buffer with the row stride Cairo requires.
+        stride = cairo.Format.A8.stride_for_width(mask_width)
+        data = np.zeros((mask_height, stride), dtype=np.uint8)
+        data[:, :mask_width] = mask
 
-            cr.set_source_rgba(*self._color)
-            cr.mask_surface(mask_surface, 0, 0)
+        mask_surface = cairo.ImageSurface.create_for_data(
+            memoryview(data),
+            cairo.FORMAT_A8,
+            mask_width,
+            mask_height,
+            stride,
+        )
+        self._level_surfaces[level] = mask_surface
+
+        return mask_surface
+
+    def get_bounds(self) -> Optional[Rect2[float]]:
+        mask = self._mask
+        if mask is None:
+            return Rect2(0, 0, 0, 0)
+
+        return self._widget_bounds_from_canvas(Rect2(0, 0, mask.shape[1], mask.shape[0]))
 
     _mask = None  # type: Optional[np.ndarray]
+    _pyramid = None  # type: Optional[ImagePyramid]
 
     @GObject.Property
     def mask(self) -> np.ndarray:
@@ -78,6 +112,8 @@ class MaskFill(abc.RenderObject):
     @mask.setter
     def mask(self, mask: np.ndarray) -> None:
         self._mask = mask
+        self._pyramid = ImagePyramid(np.asarray(mask, dtype=np.uint8)) if mask is not None else None
+        self._level_surfaces.clear()
         self.emit('request-draw')
 
     _color = (0.0, 0.0, 0.0)
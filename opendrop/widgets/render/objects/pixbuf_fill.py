@@ -27,24 +27,47 @@
 # with this software.  If not, see <https://www.gnu.org/licenses/>.
 
 
-from typing import Optional
+from typing import Optional, MutableMapping, Tuple
 
 import cairo
+import numpy as np
 from gi.repository import GObject, GdkPixbuf, Gdk
 
 from opendrop.utility.cairomisc import cairo_saved
+from opendrop.utility.gmisc import pixbuf_from_array
+from opendrop.utility.imagepyramid import ImagePyramid
 from .. import abc
 
 
 class PixbufFill(abc.RenderObject):
-    def _do_draw(self, cr: cairo.Context) -> None:
-        pixbuf = self.props.pixbuf
-        if pixbuf is None:
-            return
+    """Paint a pixbuf over the canvas, or an image array if the `image` property is set instead.
 
+    Images are drawn from a downsampled level of an `ImagePyramid` chosen for the current display scale, so a large
+    image shown in a small widget is only copied into a pixbuf at about the widget's resolution, and the full
+    resolution is only used once the viewport is zoomed in far enough to need it. Pixbufs of the previous image are
+    reused for the next image if they are the same size."""
+
+    def __init__(self, **options) -> None:
+        # Initialised before super().__init__() which may set the image property.
+        self._level_pixbufs = {}  # type: MutableMapping[int, GdkPixbuf.Pixbuf]
+        self._spare_pixbufs = {}  # type: MutableMapping[Tuple[int, int], GdkPixbuf.Pixbuf]
+        super().__init__(**options)
+
+    def _do_draw(self, cr: cairo.Context) -> None:
         scale = self._parent._widget_dist_from_canvas((1, 1))
         offset = self._parent._widget_coord_from_canvas((0, 0))
 
+        if self._pyramid is not None:
+            level = self._pyramid.level_for_scale(max(scale))
+            pixbuf = self._get_level_pixbuf(level)
+            level_scale = self._pyramid.get_level_scale(level)
+            scale = (scale[0] * level_scale[0], scale[1] * level_scale[1])
+        else:
+            pixbuf = self._pixbuf
+
+        if pixbuf is None:
+            return
+
         with cairo_saved(cr):
             cr.translate(*offset)
             cr.scale(*scale)
@@ -53,6 +76,18 @@ class PixbufFill(abc.RenderObject):
             cr.get_source().set_filter(cairo.Filter.FAST)
             cr.paint()
 
+    def _get_level_pixbuf(self, level: int) -> GdkPixbuf.Pixbuf:
+        try:
+            return self._level_pixbufs[level]
+        except KeyError:
+            pass
+
+        image = self._pyramid.get_level(level)
+        pixbuf = pixbuf_from_array(image, pixbuf=self._spare_pixbufs.pop(image.shape[:2], None))
+        self._level_pixbufs[level] = pixbuf
+
+        return pixbuf
+
     _pixbuf = None  # type: Optional[GdkPixbuf.Pixbuf]
 
     @GObject.Property
@@ -61,5 +96,34 @@ class PixbufFill(abc.RenderObject):
 
     @pixbuf.setter
     def pixbuf(self, value: Optional[GdkPixbuf.Pixbuf]) -> None:
+        self._set_pyramid(None)
         self._pixbuf = value
         self.emit('request-draw')
+
+    _pyramid = None  # type: Optional[ImagePyramid]
+
+    @GObject.Property
+    def image(self) -> Optional[np.ndarray]:
+        if self._pyramid is None:
+            return None
+
+        return self._pyramid.image
+
+    @image.setter
+    def image(self, value: Optional[np.ndarray]) -> None:
+        if self._pyramid is not None and self._pyramid.image is value:
+            return
+
+        self._pixbuf = None
+        self._set_pyramid(ImagePyramid(value) if value is not None else None)
+        self.emit('request-draw')
+
+    def _set_pyramid(self, pyramid: Optional[ImagePyramid]) -> None:
+        # Keep the pixbufs of the old image around so they can be reused by the new image, as consecutive images
+        # are usually the same size.
+        self._spare_pixbufs = {
+            (pixbuf.props.height, pixbuf.props.width): pixbuf
+            for pixbuf in self._level_pixbufs.values()
+        }
+        self._level_pixbufs = {}
+        self._pyramid = pyramid
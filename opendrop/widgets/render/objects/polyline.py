@@ -31,10 +31,11 @@ import itertools
 from typing import Optional, Tuple, Sequence, Union
 
 import cairo
+import numpy as np
 from gi.repository import GObject
 
 from opendrop.utility.cairomisc import cairo_saved
-from opendrop.utility.geometry import Vector2
+from opendrop.utility.geometry import Rect2, Vector2
 from .. import abc
 
 PolylineType = Sequence[Vector2[float]]
@@ -47,6 +48,7 @@ class Polyline(abc.RenderObject):
     _stroke_color = (0.0, 0.0, 0.0)
     _stroke_width = 1.0  # type: float
     _cache = None
+    _extents = None  # type: Optional[Rect2[float]]
 
     def draw(self, cr: cairo.Context) -> None:
         polyline = self._polyline
@@ -70,6 +72,22 @@ class Polyline(abc.RenderObject):
         cr.set_line_width(stroke_width)
         cr.stroke()
 
+    def get_bounds(self) -> Optional[Rect2[float]]:
+        polyline = self._polyline
+        if polyline is None:
+            return Rect2(0, 0, 0, 0)
+
+        if self._extents is None:
+            points = [np.reshape(p, (-1, 2)) for p in polyline if len(p) > 0]
+            if not points:
+                return Rect2(0, 0, 0, 0)
+
+            points = np.concatenate(points)
+            self._extents = Rect2(*points.min(axis=0), *points.max(axis=0))
+
+        # Allow for line joins, which can stick out further than half the stroke width.
+        return self._widget_bounds_from_canvas(self._extents, padding=5*self._stroke_width)
+
     def _draw_paths(self, cr: cairo.Context, polylines: Sequence[PolylineType]) -> None:
         if len(polylines) == 0:
             return
@@ -100,6 +118,7 @@ class Polyline(abc.RenderObject):
     def polyline(self, value: Optional[Union[PolylineType, Sequence[PolylineType]]]) -> None:
         self._polyline = value
         self._cache = None
+        self._extents = None
         self.emit('request-draw')
 
     @GObject.Property
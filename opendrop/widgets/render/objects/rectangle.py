@@ -52,6 +52,13 @@ class Rectangle(abc.RenderObject):
         cr.set_source_rgb(*border_color)
         cr.stroke()
 
+    def get_bounds(self) -> Optional[Rect2[float]]:
+        extents = self.props.extents
+        if extents is None:
+            return Rect2(0, 0, 0, 0)
+
+        return self._widget_bounds_from_canvas(extents, padding=self.props.border_width/2)
+
     _extents = None  # type: Optional[Rect2[float]]
 
     @GObject.Property
@@ -101,10 +108,37 @@ class RectangleWithLabel(Rectangle):
         text_pos = self._parent._widget_coord_from_canvas(extents.position + (0, extents.size.y)) + (0, 10)
 
         cr.set_source_rgb(*border_color)
-        cr.set_font_size(10)
+        cr.set_font_size(self._LABEL_FONT_SIZE)
         cr.move_to(*text_pos)
         cr.show_text(label)
 
+    def get_bounds(self) -> Optional[Rect2[float]]:
+        bounds = super().get_bounds()
+
+        extents = self.props.extents
+        label = self.props.label
+
+        if extents is None or not label:
+            return bounds
+
+        text_pos = self._parent._widget_coord_from_canvas(extents.position + (0, extents.size.y)) + (0, 10)
+        text_extents = _text_extents(label, self._LABEL_FONT_SIZE)
+
+        # Leave some room for differences between the measuring context and the widget's.
+        padding = self._LABEL_FONT_SIZE/2
+        text_x0 = text_pos.x + text_extents.x_bearing - padding
+        text_y0 = text_pos.y + text_extents.y_bearing - padding
+        text_x1 = text_x0 + text_extents.width + 2*padding
+        text_y1 = text_y0 + text_extents.height + 2*padding
+
+        return Rect2(
+            min(bounds.x0, text_x0),
+            min(bounds.y0, text_y0),
+            max(bounds.x1, text_x1),
+            max(bounds.y1, text_y1),
+        )
+
+    _LABEL_FONT_SIZE = 10
     _label = ''
 
     @GObject.Property
@@ -115,3 +149,15 @@ class RectangleWithLabel(Rectangle):
     def label(self, value: str) -> None:
         self._label = value
         self.emit('request-draw')
+
+
+_measure_cr = None  # type: Optional[cairo.Context]
+
+
+def _text_extents(text: str, font_size: float) -> cairo.TextExtents:
+    global _measure_cr
+    if _measure_cr is None:
+        _measure_cr = cairo.Context(cairo.ImageSurface(cairo.FORMAT_A8, 1, 1))
+
+    _measure_cr.set_font_size(font_size)
+    return _measure_cr.text_extents(text)
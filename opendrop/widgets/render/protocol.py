@@ -34,6 +34,8 @@ from typing import Optional, Any
 import cairo
 from gi.repository import Gdk
 
+from opendrop.utility.geometry import Rect2
+
 
 class Render:
     class ViewportStretch(Enum):
@@ -75,6 +77,10 @@ class RenderObject:
     def draw(self, cr: cairo.Context) -> None:
         pass
 
+    @abstractmethod
+    def get_bounds(self) -> Optional[Rect2[float]]:
+        pass
+
     @abstractmethod
     def destroy(self) -> None:
         pass
@@ -27,7 +27,8 @@
 # with this software.  If not, see <https://www.gnu.org/licenses/>.
 
 
-from typing import MutableSequence, Sequence, Tuple
+import math
+from typing import MutableSequence, Optional, Sequence, Tuple
 
 import cairo
 from gi.repository import Gtk, GObject, Gdk
@@ -56,6 +57,9 @@ class Render(Gtk.DrawingArea, protocol.Render):
             self.render_object = render_object
             self.handler_ids = tuple(handler_ids)
 
+            # Area of the widget the object was last drawn in, None if unknown.
+            self.bounds = None  # type: Optional[Rect2[float]]
+
     def __init__(self, *, can_focus=True, **options) -> None:
         super().__init__(focus_on_click=True, can_focus=can_focus, **options)
         self._ro_containers = []  # type: MutableSequence[Render.RenderObjectContainer]
@@ -78,8 +82,20 @@ class Render(Gtk.DrawingArea, protocol.Render):
         with cairo_saved(cr):
             cr.rectangle(*viewport_widget_extents.position, *viewport_widget_extents.size)
             cr.clip()
-            for ro in self._render_objects:
-                ro.draw(cr)
+
+            # Only draw the objects that overlap the area being redrawn.
+            clip_extents = Rect2(*cr.clip_extents())
+
+            for container in self._ro_containers:
+                ro = container.render_object
+                bounds = ro.get_bounds()
+                container.bounds = bounds
+
+                if bounds is not None and not bounds.intersects(clip_extents):
+                    continue
+
+                with cairo_saved(cr):
+                    ro.draw(cr)
 
         if self.has_focus():
             # Draw focus indicator
@@ -93,18 +109,16 @@ class Render(Gtk.DrawingArea, protocol.Render):
 
     @property
     def _render_objects(self) -> Sequence[protocol.RenderObject]:
-        return sorted(
-            (container.render_object for container in self._ro_containers),
-            key=lambda ro: ro.props.z_index,
-        )
+        return [container.render_object for container in self._ro_containers]
 
     def add_render_object(self, ro: protocol.RenderObject) -> None:
-        handler_ids = (
-            ro.connect('request-draw', lambda _: self.queue_draw()),
+        container = self.RenderObjectContainer(render_object=ro, handler_ids=())
+        container.handler_ids = (
+            ro.connect('request-draw', lambda _: self._hdl_ro_request_draw(container)),
+            ro.connect('notify::z-index', lambda *_: self._sort_ro_containers()),
         )
-        self._ro_containers.append(self.RenderObjectContainer(
-            render_object=ro,
-            handler_ids=handler_ids))
+        self._ro_containers.append(container)
+        self._sort_ro_containers()
         ro.set_parent(self)
 
         self.queue_draw()
@@ -116,7 +130,39 @@ class Render(Gtk.DrawingArea, protocol.Render):
             ro.disconnect(handler_id)
         self._ro_containers.remove(container)
 
-        self.queue_draw()
+        self._queue_draw_bounds(container.bounds)
+
+    def _sort_ro_containers(self) -> None:
+        # Sorted when objects are added or change z-index instead of on every frame. The sort is stable so objects
+        # with the same z-index are drawn in the order they were added.
+        self._ro_containers.sort(key=lambda container: container.render_object.props.z_index)
+
+    def _hdl_ro_request_draw(self, container: 'Render.RenderObjectContainer') -> None:
+        old_bounds = container.bounds
+        new_bounds = container.render_object.get_bounds()
+
+        # Redraw where the object was and where it is now, instead of the whole widget.
+        self._queue_draw_bounds(old_bounds)
+        self._queue_draw_bounds(new_bounds)
+
+        container.bounds = new_bounds
+
+    def _queue_draw_bounds(self, bounds: Optional[Rect2[float]]) -> None:
+        if bounds is None or not all(map(math.isfinite, (*bounds.pt0, *bounds.pt1))):
+            self.queue_draw()
+            return
+
+        if bounds.w == 0 and bounds.h == 0:
+            # Object doesn't draw anything.
+            return
+
+        # Pad by a pixel to cover antialiasing.
+        x0 = math.floor(bounds.x0) - 1
+        y0 = math.floor(bounds.y0) - 1
+        x1 = math.ceil(bounds.x1) + 1
+        y1 = math.ceil(bounds.y1) + 1
+
+        self.queue_draw_area(x0, y0, x1 - x0, y1 - y0)
 
     def _ro_container_from_ro(self, ro: protocol.RenderObject) -> 'Render.RenderObjectContainer':
         for container in self._ro_containers:
@@ -0,0 +1,203 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import asyncio
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+
+from opendrop.analysis import ConanParams, FrameResult, Pipeline, PipelineError, conan_pipeline
+from opendrop.analysis import PendantEdgeDetectionParams, PendantPhysicalParams, conan_results_to_array, ift_pipeline
+from opendrop.utility.diskcache import DiskCache
+from opendrop.utility.geometry import Line2, Rect2
+
+EXAMPLE_IMAGES_DIR = Path(__file__).resolve().parent.parent.parent/'example_images'
+
+
+def mean(image, timestamp, delays=None):
+    if delays is not None:
+        time.sleep(delays[int(timestamp)])
+
+    if image.ndim == 0:
+        raise ValueError('no pixels')
+
+    return float(image.mean())
+
+
+@pytest.fixture
+def executor():
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        yield executor
+
+
+def test_ordered(executor):
+    # Later frames finish first.
+    delays = [0.04, 0.03, 0.02, 0.01, 0]
+    frames = [np.full((2, 2), i) for i in range(5)]
+    pipeline = Pipeline(functools.partial(mean, delays=delays), executor=executor)
+
+    results = list(pipeline.run(frames))
+
+    assert all(isinstance(r, FrameResult) for r in results)
+    assert [r.index for r in results] == [0, 1, 2, 3, 4]
+    assert [r.value for r in results] == [0, 1, 2, 3, 4]
+    assert [r.timestamp for r in results] == [0, 1, 2, 3, 4]
+
+
+def test_as_completed(executor):
+    delays = [0.2, 0, 0, 0, 0]
+    frames = [(np.full((2, 2), i), i) for i in range(5)]
+    pipeline = Pipeline(functools.partial(mean, delays=delays), ordered=False, executor=executor)
+
+    results = list(pipeline.run(frames))
+
+    assert sorted(r.index for r in results) == [0, 1, 2, 3, 4]
+    assert results[-1].index == 0
+
+
+def test_window_bounds_frames_in_flight(executor):
+    num_taken = 0
+    max_in_flight = 0
+
+    def frames():
+        nonlocal num_taken
+        for i in range(20):
+            num_taken += 1
+            yield np.full((2, 2), i)
+
+    def analyse(image, timestamp):
+        time.sleep(0.001)
+        return image
+
+    pipeline = Pipeline(analyse, window=3, executor=executor)
+
+    for result in pipeline.run(frames()):
+        max_in_flight = max(max_in_flight, num_taken - result.index)
+
+    assert max_in_flight <= 3
+
+
+def test_errors(executor):
+    frames = [np.zeros((2, 2)), np.array(0), np.ones((2, 2))]
+
+    with pytest.raises(PipelineError) as exc_info:
+        list(Pipeline(mean, executor=executor).run(frames))
+    assert exc_info.value.result.index == 1
+
+    results = list(Pipeline(mean, raise_errors=False, executor=executor).run(frames))
+    assert [r.value for r in results] == [0, None, 1]
+    assert results[1].error == 'ValueError: no pixels'
+
+
+def test_frame_with_read(executor):
+    class LazyFrame:
+        def __init__(self, value, timestamp):
+            self.value = value
+            self.timestamp = timestamp
+
+        def read(self):
+            return np.full((2, 2), self.value)
+
+    frames = [LazyFrame(3, 0.5), LazyFrame(4, 1.5)]
+
+    results = list(Pipeline(mean, executor=executor).run(frames))
+
+    assert [(r.timestamp, r.value) for r in results] == [(0.5, 3), (1.5, 4)]
+    assert results[0].frame is frames[0]
+
+
+def test_run_async(executor):
+    async def frames():
+        for i in range(5):
+            await asyncio.sleep(0)
+            yield np.full((2, 2), i)
+
+    async def collect():
+        return [r.value async for r in Pipeline(mean, executor=executor).run_async(frames())]
+
+    loop = asyncio.new_event_loop()
+    try:
+        assert loop.run_until_complete(collect()) == [0, 1, 2, 3, 4]
+    finally:
+        loop.close()
+
+
+def test_conan_pipeline():
+    image = cv2.cvtColor(cv2.imread(str(EXAMPLE_IMAGES_DIR/'drop_on_surface.png')), cv2.COLOR_BGR2RGB)
+    params = ConanParams(
+        thresh=30,
+        drop_region=Rect2(100, 300, 620, 665),
+        surface_line=Line2((0, 668), (1160, 655)),
+    )
+
+    # Run on worker processes, to check everything pickles.
+    results = [r.value for r in conan_pipeline(params, jobs=2).run([(image, 0.0), (image, 2.0)])]
+
+    array = conan_results_to_array(results)
+    assert array['timestamp'].tolist() == [0.0, 2.0]
+    assert ((100 < np.degrees(array['left_angle'])) & (np.degrees(array['left_angle']) < 140)).all()
+    assert ((100 < np.degrees(array['right_angle'])) & (np.degrees(array['right_angle']) < 140)).all()
+
+
+def test_ift_pipeline_cached(tmp_path):
+    image = cv2.cvtColor(cv2.imread(str(EXAMPLE_IMAGES_DIR/'water_in_air.png')), cv2.COLOR_BGR2RGB)
+    edge_params = PendantEdgeDetectionParams(
+        canny_min=30,
+        canny_max=60,
+        drop_region=Rect2(280, 170, 740, 700),
+        needle_region=Rect2(410, 0, 600, 150),
+    )
+    phys_params = PendantPhysicalParams(
+        drop_density=1000,
+        continuous_density=0,
+        needle_diameter=0.0007176,
+        gravity=9.80035,
+    )
+    cache = DiskCache(tmp_path, max_size=2**30)
+
+    first, = [r.value for r in ift_pipeline(edge_params, phys_params, cache, jobs=2).run([(image, 0.0)])]
+    assert cache.total_size > 0
+
+    # Only physical parameters changed, so the cached stages can be reused.
+    phys_params = PendantPhysicalParams(
+        drop_density=2000,
+        continuous_density=0,
+        needle_diameter=0.0007176,
+        gravity=9.80035,
+    )
+    second, = [r.value for r in ift_pipeline(edge_params, phys_params, cache, jobs=2).run([(image, 0.0)])]
+
+    assert second.bond_number == first.bond_number
+    assert second.needle_width_px == first.needle_width_px
+    assert second.interfacial_tension == pytest.approx(2*first.interfacial_tension)
@@ -0,0 +1,227 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from opendrop.app.common.analysis_saver.export_job import ExportJob
+
+
+def test_runs_all_tasks(loop, executor, wait_for):
+    results = []
+    tasks = [lambda i=i: results.append(i) for i in range(10)]
+
+    job = ExportJob(tasks, num_tasks=len(tasks), executor=executor, max_workers=2, loop=loop)
+
+    assert wait_for(job.wait()) is ExportJob.Status.FINISHED
+    assert sorted(results) == list(range(10))
+    assert job.bn_progress.get() == 1
+    assert job.bn_is_done.get()
+    assert job.exception is None
+
+
+def test_no_tasks(loop, executor):
+    job = ExportJob((), num_tasks=0, executor=executor, loop=loop)
+
+    assert job.bn_status.get() is ExportJob.Status.FINISHED
+    assert job.bn_progress.get() == 1
+
+
+def test_tasks_are_submitted_lazily(loop, executor, wait_for):
+    release = threading.Event()
+    num_taken = 0
+
+    def tasks():
+        nonlocal num_taken
+        for _ in range(10):
+            num_taken += 1
+            yield lambda: release.wait(5)
+
+    job = ExportJob(tasks(), num_tasks=10, executor=executor, max_workers=2, loop=loop)
+
+    # Two tasks in flight per worker.
+    assert num_taken == 4
+
+    release.set()
+    assert wait_for(job.wait()) is ExportJob.Status.FINISHED
+    assert num_taken == 10
+
+
+def test_progress(loop, executor, wait_for):
+    releases = [threading.Event() for _ in range(4)]
+    tasks = [lambda r=r: r.wait(5) for r in releases]
+    progress = []
+
+    job = ExportJob(tasks, num_tasks=len(tasks), executor=executor, max_workers=1, loop=loop)
+    job.bn_progress.on_changed.connect(lambda: progress.append(job.bn_progress.get()), weak_ref=False)
+
+    assert job.bn_progress.get() == 0
+
+    for release in releases:
+        release.set()
+    wait_for(job.wait())
+
+    assert progress == [0.25, 0.5, 0.75, 1.0]
+
+
+def test_task_exception_fails_job(loop, executor, wait_for):
+    release = threading.Event()
+    error = ValueError('bad')
+    ran = []
+
+    def fail():
+        raise error
+
+    def task(i):
+        release.wait(5)
+        ran.append(i)
+
+    tasks = [fail] + [lambda i=i: task(i) for i in range(10)]
+
+    job = ExportJob(tasks, num_tasks=len(tasks), executor=executor, max_workers=1, loop=loop)
+
+    assert wait_for(job.wait()) is ExportJob.Status.FAILED
+    assert job.exception is error
+    assert job.bn_is_done.get()
+
+    release.set()
+    executor.shutdown(wait=True)
+
+    # At most the task that had started when the job failed still runs.
+    assert len(ran) <= 1
+
+
+def test_task_iterator_exception_fails_job(loop, executor, wait_for):
+    error = ValueError('bad')
+
+    def tasks():
+        yield lambda: None
+        raise error
+
+    job = ExportJob(tasks(), num_tasks=2, executor=executor, loop=loop)
+
+    assert wait_for(job.wait()) is ExportJob.Status.FAILED
+    assert job.exception is error
+
+
+def test_cancel(loop, wait_for):
+    executor = ThreadPoolExecutor(max_workers=1)
+    started = threading.Event()
+    release = threading.Event()
+    ran = []
+
+    def task(i):
+        started.set()
+        release.wait(5)
+        ran.append(i)
+
+    tasks = [lambda i=i: task(i) for i in range(10)]
+
+    job = ExportJob(tasks, num_tasks=len(tasks), executor=executor, max_workers=1, loop=loop)
+    assert started.wait(5)
+    job.cancel()
+
+    assert job.bn_status.get() is ExportJob.Status.CANCELLED
+    assert wait_for(job.wait()) is ExportJob.Status.CANCELLED
+
+    release.set()
+    executor.shutdown(wait=True)
+
+    # Only the task already running is left to finish, the queued one is cancelled and nothing else is submitted.
+    assert ran == [0]
+    assert job.bn_status.get() is ExportJob.Status.CANCELLED
+    assert job.bn_progress.get() == 0
+
+    # Cancelling a finished job does nothing.
+    job.cancel()
+    assert job.bn_status.get() is ExportJob.Status.CANCELLED
+
+
+def test_keep_open(loop, executor, wait_for):
+    results = []
+
+    job = ExportJob(
+        [lambda: results.append(0)],
+        num_tasks=3,
+        executor=executor,
+        keep_open=True,
+        loop=loop,
+    )
+
+    # Running out of tasks doesn't finish an open job.
+    loop.run_until_complete(asyncio.sleep(0.1))
+    assert results == [0]
+    assert job.bn_status.get() is ExportJob.Status.EXPORTING
+
+    job.add_tasks([lambda: results.append(1)])
+    job.add_tasks([lambda: results.append(2)])
+    loop.run_until_complete(asyncio.sleep(0.1))
+    assert sorted(results) == [0, 1, 2]
+    assert job.bn_status.get() is ExportJob.Status.EXPORTING
+
+    job.close()
+
+    assert wait_for(job.wait()) is ExportJob.Status.FINISHED
+    assert job.bn_progress.get() == 1
+
+
+def test_close_waits_for_queued_tasks(loop, executor, wait_for):
+    release = threading.Event()
+    results = []
+
+    def task(i):
+        release.wait(5)
+        results.append(i)
+
+    job = ExportJob((), num_tasks=5, executor=executor, max_workers=1, keep_open=True, loop=loop)
+    job.add_tasks([lambda i=i: task(i) for i in range(5)])
+    job.close()
+
+    assert job.bn_status.get() is ExportJob.Status.EXPORTING
+
+    release.set()
+    assert wait_for(job.wait()) is ExportJob.Status.FINISHED
+    assert sorted(results) == list(range(5))
+
+
+def test_add_tasks_after_cancel_does_nothing(loop, executor):
+    results = []
+
+    job = ExportJob((), num_tasks=1, executor=executor, keep_open=True, loop=loop)
+    job.cancel()
+    job.add_tasks([lambda: results.append(0)])
+    job.close()
+
+    loop.run_until_complete(asyncio.sleep(0.1))
+
+    assert results == []
+    assert job.bn_status.get() is ExportJob.Status.CANCELLED
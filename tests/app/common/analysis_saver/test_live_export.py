@@ -0,0 +1,190 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from opendrop.app.common.analysis_saver.export_job import ExportJob
+from opendrop.app.common.analysis_saver.live_export import LiveExport, SaveRecord, _fingerprint
+from opendrop.utility.bindable import VariableBindable
+
+
+class FakeAnalysis:
+    def __init__(self, is_done=False):
+        self.bn_is_done = VariableBindable(is_done)
+
+
+class Snapshot:
+    def __init__(self, value, image=None):
+        self.value = value
+        self.image = image
+
+
+def test_fingerprint():
+    assert _fingerprint(Snapshot(1.0)) == _fingerprint(Snapshot(1.0))
+    assert _fingerprint(Snapshot(1.0)) != _fingerprint(Snapshot(2.0))
+
+    image = np.zeros((4, 4), dtype=np.uint8)
+    changed_image = image.copy()
+    changed_image[0, 0] = 1
+
+    assert _fingerprint(Snapshot(1.0, image)) == _fingerprint(Snapshot(1.0, image.copy()))
+    assert _fingerprint(Snapshot(1.0, image)) != _fingerprint(Snapshot(1.0, changed_image))
+
+
+def test_save_record_reuse(tmp_path):
+    record = SaveRecord()
+
+    # Nothing recorded yet.
+    assert not record.reuse(tmp_path, 'options')
+    assert record.reuse(tmp_path, 'options')
+
+    # Different options or directory start a new record.
+    assert not record.reuse(tmp_path, 'other options')
+    assert not record.reuse(tmp_path/'other', 'other options')
+
+    # A directory that no longer exists can't be updated.
+    assert not record.reuse(tmp_path/'other', 'other options')
+
+
+def test_save_record_update(tmp_path):
+    record = SaveRecord()
+    record.reuse(tmp_path, 'options')
+
+    assert record.has_changed(0, Snapshot(1.0))
+    assert record.update(0, Snapshot(1.0))
+    assert not record.has_changed(0, Snapshot(1.0))
+    assert not record.update(0, Snapshot(1.0))
+
+    assert record.has_changed(0, Snapshot(2.0))
+    assert record.has_changed(1, Snapshot(1.0))
+
+    assert record.update(0, Snapshot(2.0))
+    assert not record.has_changed(0, Snapshot(2.0))
+
+
+def test_save_record_forgets_on_new_save(tmp_path):
+    record = SaveRecord()
+    record.reuse(tmp_path, 'options')
+    record.update(0, Snapshot(1.0))
+
+    record.reuse(tmp_path, 'other options')
+
+    assert record.has_changed(0, Snapshot(1.0))
+
+
+def test_save_record_clear(tmp_path):
+    record = SaveRecord()
+    record.reuse(tmp_path, 'options')
+    record.update(0, Snapshot(1.0))
+
+    record.clear()
+
+    assert record.has_changed(0, Snapshot(1.0))
+    assert not record.reuse(tmp_path, 'options')
+
+
+class Recorder:
+    def __init__(self):
+        self.saved = []
+        self.ran = []
+        self.finished = False
+
+    def save(self, indices):
+        indices = list(indices)
+        self.saved.append(indices)
+        return [lambda i=i: self.ran.append(i) for i in indices]
+
+    def finish(self):
+        self.finished = True
+        return [lambda: self.ran.append('summary')]
+
+
+def test_live_export_all_finished(loop, executor, wait_for):
+    analyses = [FakeAnalysis(True) for _ in range(3)]
+    recorder = Recorder()
+
+    job = ExportJob((), num_tasks=4, executor=executor, keep_open=True, loop=loop)
+    LiveExport(job, analyses, save=recorder.save, finish=recorder.finish, loop=loop)
+
+    assert recorder.saved == [[0, 1, 2]]
+    assert recorder.finished
+
+    assert wait_for(job.wait()) is ExportJob.Status.FINISHED
+    assert sorted(recorder.ran, key=str) == [0, 1, 2, 'summary']
+
+
+def test_live_export_batches_finished_analyses(loop, executor, wait_for):
+    analyses = [FakeAnalysis(i == 1) for i in range(4)]
+    recorder = Recorder()
+
+    job = ExportJob((), num_tasks=5, executor=executor, keep_open=True, loop=loop)
+    LiveExport(job, analyses, save=recorder.save, finish=recorder.finish, flush_interval=0.05, loop=loop)
+
+    # Analyses already done are saved straight away.
+    assert recorder.saved == [[1]]
+
+    # Others are collected and saved together, in order.
+    analyses[3].bn_is_done.set(True)
+    analyses[0].bn_is_done.set(True)
+    assert recorder.saved == [[1]]
+
+    loop.run_until_complete(asyncio.sleep(0.2))
+    assert recorder.saved == [[1], [0, 3]]
+    assert not recorder.finished
+    assert not job.bn_is_done.get()
+
+    # The last one flushes immediately and finishes the job.
+    analyses[2].bn_is_done.set(True)
+    assert recorder.saved == [[1], [0, 3], [2]]
+    assert recorder.finished
+
+    assert wait_for(job.wait()) is ExportJob.Status.FINISHED
+    assert recorder.ran[-1] == 'summary'
+    assert job.bn_progress.get() == 1
+
+
+def test_live_export_stops_when_job_cancelled(loop, executor):
+    analyses = [FakeAnalysis() for _ in range(2)]
+    recorder = Recorder()
+
+    job = ExportJob((), num_tasks=3, executor=executor, keep_open=True, loop=loop)
+    LiveExport(job, analyses, save=recorder.save, finish=recorder.finish, flush_interval=0.05, loop=loop)
+
+    analyses[0].bn_is_done.set(True)
+    job.cancel()
+
+    analyses[1].bn_is_done.set(True)
+    loop.run_until_complete(asyncio.sleep(0.2))
+
+    assert recorder.saved == []
+    assert not recorder.finished
+    assert job.bn_status.get() is ExportJob.Status.CANCELLED
@@ -0,0 +1,117 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import operator
+
+import numpy as np
+import pytest
+
+from opendrop.app.common.image_processing.plugins.preview.model import ImageSequenceAcquirerController
+from opendrop.app.common.services.acquisition import ImageStackAcquirer
+from opendrop.utility.bindable import VariableBindable
+from opendrop.utility.mmstack import ImageStack
+
+
+class RecordingController(ImageSequenceAcquirerController):
+    def __init__(self, **kwargs) -> None:
+        self.registered = []
+        self.deregistered = []
+        super().__init__(**kwargs)
+
+    def _on_image_registered(self, image_id) -> None:
+        self.registered.append(image_id)
+
+    def _on_image_deregistered(self, image_id) -> None:
+        self.deregistered.append(image_id)
+
+
+@pytest.fixture
+def stack_path(tmp_path):
+    data = np.arange(10*4*5, dtype=np.uint16).reshape(10, 4, 5) << 6
+    path = tmp_path/'stack.npy'
+    np.save(str(path), data)
+    return path
+
+
+@pytest.fixture
+def converted(monkeypatch):
+    converted = []
+    get_rgb8 = ImageStack.get_rgb8
+
+    def get_rgb8_spy(self, index):
+        converted.append(index)
+        return get_rgb8(self, index)
+
+    monkeypatch.setattr(ImageStack, 'get_rgb8', get_rgb8_spy)
+
+    return converted
+
+
+def test_opening_stack_only_reads_showing_frame(stack_path, converted):
+    acquirer = ImageStackAcquirer()
+    source_image = VariableBindable(None, check_equals=operator.is_)
+    controller = RecordingController(acquirer=acquirer, source_image_out=source_image)
+
+    acquirer.load_stack(stack_path)
+
+    assert len(controller.registered) == 10
+    assert controller.bn_num_images.get() == 10
+    assert converted == [0]
+    assert source_image.get().shape == (4, 5, 3)
+
+    controller.bn_showing_image_index.set(7)
+
+    assert converted == [0, 7]
+
+
+def test_changing_frame_range_keeps_registrations(stack_path, converted):
+    acquirer = ImageStackAcquirer()
+    acquirer.load_stack(stack_path)
+
+    controller = RecordingController(
+        acquirer=acquirer,
+        source_image_out=VariableBindable(None, check_equals=operator.is_),
+    )
+    registered = list(controller.registered)
+
+    acquirer.bn_frame_start.set(2)
+    acquirer.bn_frame_step.set(2)
+
+    assert controller.registered == registered
+    assert set(controller.deregistered) == set(registered[:2] + registered[3::2])
+    assert controller.bn_num_images.get() == 4
+
+    # Frame 2 of the stack is now the first image.
+    assert converted == [0, 2]
+
+    # Frames of a reloaded stack are new images, even from the same file.
+    acquirer.load_stack(stack_path)
+
+    assert set(controller.deregistered) == set(registered)
+    assert len(controller.registered) == 10 + 4
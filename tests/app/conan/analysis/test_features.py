@@ -0,0 +1,224 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import asyncio
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from opendrop.app.conan.analysis.features import FeatureExtractorPool
+
+
+class FakeExtractor:
+    def __init__(self, name, *, priority=False, log=None, block=None, started=None, duration=0.0, exc=None):
+        self.name = name
+        self.priority = priority
+        self.is_busy = Mock()
+
+        self._log = log if log is not None else []
+        self._block = block
+        self._started = started
+        self._duration = duration
+        self._exc = exc
+
+    def _update(self):
+        self._log.append(self.name)
+
+        if self._started is not None:
+            self._started.set()
+        if self._block is not None:
+            self._block.wait(5)
+        if self._duration:
+            time.sleep(self._duration)
+        if self._exc is not None:
+            raise self._exc
+
+
+def test_queue_while_running_runs_once_more(loop, wait_for):
+    pool = FeatureExtractorPool(max_workers=2, loop=loop)
+    log = []
+    started = threading.Event()
+    release = threading.Event()
+    extractor = FakeExtractor('a', log=log, block=release, started=started)
+
+    pool.queue(extractor)
+    assert started.wait(5)
+
+    # Queueing while running should coalesce into a single extra update.
+    pool.queue(extractor)
+    pool.queue(extractor)
+    pool.queue(extractor)
+    assert pool.is_queued(extractor)
+
+    release.set()
+    wait_for(pool.wait_until_not_busy())
+
+    assert log == ['a', 'a']
+    assert not pool.is_queued(extractor)
+    assert extractor.is_busy.poke.call_count == 1
+
+    pool.shutdown()
+
+
+def test_queue_while_pending_does_nothing(loop, wait_for):
+    pool = FeatureExtractorPool(max_workers=1, loop=loop)
+    log = []
+    started = threading.Event()
+    release = threading.Event()
+    blocker = FakeExtractor('blocker', log=log, block=release, started=started)
+    extractor = FakeExtractor('a', log=log)
+
+    pool.queue(blocker)
+    assert started.wait(5)
+
+    pool.queue(extractor)
+    pool.queue(extractor)
+
+    release.set()
+    wait_for(pool.wait_until_not_busy())
+
+    assert log == ['blocker', 'a']
+
+    pool.shutdown()
+
+
+def test_priority_extractors_run_first(loop, wait_for):
+    pool = FeatureExtractorPool(max_workers=1, loop=loop)
+    log = []
+    started = threading.Event()
+    release = threading.Event()
+    blocker = FakeExtractor('blocker', log=log, block=release, started=started)
+
+    pool.queue(blocker)
+    assert started.wait(5)
+
+    a = FakeExtractor('a', log=log)
+    b = FakeExtractor('b', log=log)
+    c = FakeExtractor('c', log=log, priority=True)
+    pool.queue(a)
+    pool.queue(b)
+    pool.queue(c)
+
+    # Prioritising an extractor that is already waiting moves it to the front of the priority queue.
+    b.priority = True
+    pool.reprioritize(b)
+
+    release.set()
+    wait_for(pool.wait_until_not_busy())
+
+    assert log == ['blocker', 'b', 'c', 'a']
+
+    pool.shutdown()
+
+
+def test_bounded_concurrency(loop, wait_for):
+    max_workers = 2
+    pool = FeatureExtractorPool(max_workers=max_workers, loop=loop)
+
+    lock = threading.Lock()
+    running = 0
+    max_running = 0
+    log = []
+
+    class CountingExtractor(FakeExtractor):
+        def _update(self):
+            nonlocal running, max_running
+            with lock:
+                running += 1
+                max_running = max(max_running, running)
+            try:
+                super()._update()
+            finally:
+                with lock:
+                    running -= 1
+
+    extractors = [CountingExtractor(i, log=log, duration=0.02) for i in range(8)]
+    for extractor in extractors:
+        pool.queue(extractor)
+
+    wait_for(pool.wait_until_not_busy())
+
+    assert sorted(log) == list(range(8))
+    assert max_running <= max_workers
+
+    pool.shutdown()
+
+
+def test_wait_until_not_busy(loop, wait_for):
+    pool = FeatureExtractorPool(max_workers=2, loop=loop)
+    release = threading.Event()
+    extractors = [FakeExtractor(i, block=release) for i in range(3)]
+
+    assert not pool.is_busy.get()
+    wait_for(pool.wait_until_not_busy())
+
+    for extractor in extractors:
+        pool.queue(extractor)
+
+    assert pool.is_busy.get()
+
+    with pytest.raises(asyncio.TimeoutError):
+        wait_for(pool.wait_until_not_busy(), 0.1)
+
+    release.set()
+    wait_for(pool.wait_until_not_busy())
+
+    assert not pool.is_busy.get()
+    for extractor in extractors:
+        assert not pool.is_queued(extractor)
+
+    pool.shutdown()
+
+
+def test_failed_update_is_reported_and_queue_continues(loop, wait_for):
+    pool = FeatureExtractorPool(max_workers=1, loop=loop)
+    exception_handler = Mock()
+    loop.set_exception_handler(exception_handler)
+
+    log = []
+    error = ValueError('bad')
+    bad = FakeExtractor('bad', log=log, exc=error)
+    good = FakeExtractor('good', log=log)
+
+    pool.queue(bad)
+    pool.queue(good)
+    wait_for(pool.wait_until_not_busy())
+    # Let the loop run the exception handler callback.
+    loop.run_until_complete(asyncio.sleep(0))
+
+    assert log == ['bad', 'good']
+
+    exception_handler.assert_called_once()
+    context = exception_handler.call_args[0][1]
+    assert context['exception'] is error
+    assert context['extractor'] is bad
+
+    pool.shutdown()
@@ -0,0 +1,229 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import asyncio
+import csv
+import math
+
+import numpy as np
+import pytest
+
+from opendrop.app.common.analysis_saver.export_job import ExportJob
+from opendrop.app.common.analysis_saver.live_export import SaveRecord
+from opendrop.app.conan.analysis_saver.model import ConanAnalysisSaverOptions
+from opendrop.app.conan.analysis_saver.save_functions import save_drops
+from opendrop.utility.bindable import VariableBindable
+from opendrop.utility.geometry import Line2, Rect2, Vector2
+
+
+class FakeDrop:
+    def __init__(self, timestamp, left_angle, right_angle, *, is_done=True):
+        self.is_image_replicated = False
+
+        self.bn_is_done = VariableBindable(is_done)
+        self.bn_image = VariableBindable(np.zeros((40, 60, 3), dtype=np.uint8))
+        self.bn_image_timestamp = VariableBindable(timestamp)
+        self.bn_left_angle = VariableBindable(math.radians(left_angle))
+        self.bn_left_point = VariableBindable(Vector2(10.0, 30.0))
+        self.bn_left_tangent = VariableBindable(np.poly1d((-1.0, 40.0)))
+        self.bn_right_angle = VariableBindable(math.radians(right_angle))
+        self.bn_right_point = VariableBindable(Vector2(50.0, 30.0))
+        self.bn_right_tangent = VariableBindable(np.poly1d((1.0, -20.0)))
+        self.bn_surface_line = VariableBindable(Line2((0, 30), (1, 30)))
+        self.bn_drop_region = VariableBindable(Rect2(5, 5, 55, 35))
+        self.bn_drop_profile_extract = VariableBindable(np.array([[10, 30], [30, 10], [50, 30]], dtype=np.int32))
+
+
+# The files written by the serial implementation of save_drops(), for two drops saved to 'drop'.
+BASELINE_LAYOUT = {
+    'timeline.csv',
+    'left_angle_plot.png',
+    'right_angle_plot.png',
+    *(
+        'drop{}/{}'.format(n, name)
+        for n in (1, 2)
+        for name in (
+            'image_original.png',
+            'image_annotated.png',
+            'profile_extracted.csv',
+            'tangents.csv',
+            'surface.csv',
+        )
+    ),
+}
+
+
+@pytest.fixture
+def options(tmp_path):
+    options = ConanAnalysisSaverOptions()
+    options.bn_save_dir_parent.set(tmp_path)
+    options.bn_save_dir_name.set('drop')
+    options.angle_figure_opts.bn_dpi.set(20)
+    return options
+
+
+def read_layout(root_dir):
+    return {str(path.relative_to(root_dir)) for path in root_dir.rglob('*') if path.is_file()}
+
+
+@pytest.mark.parametrize('live', [False, True], ids=['finished', 'live'])
+def test_save_drops_layout(loop, options, live, wait_for):
+    drops = [
+        FakeDrop(0.0, 80.0, 85.0),
+        FakeDrop(1.0, 70.0, 75.0, is_done=not live),
+    ]
+
+    job = save_drops(drops, options)
+
+    if live:
+        loop.run_until_complete(asyncio.sleep(0.1))
+        assert not job.bn_is_done.get()
+        drops[1].bn_is_done.set(True)
+
+    assert wait_for(job.wait(), 60) is ExportJob.Status.FINISHED, job.exception
+
+    root_dir = options.save_root_dir
+    assert read_layout(root_dir) == BASELINE_LAYOUT
+
+    with (root_dir/'timeline.csv').open(newline='') as in_file:
+        rows = list(csv.reader(in_file))
+
+    assert rows == [
+        [
+            'Time (s)',
+            'Left angle (degrees)',
+            'Right angle (degrees)',
+            'Left contact x-coordinate (px)',
+            'Left contact y-coordinate (px)',
+            'Right contact x-coordinate (px)',
+            'Right contact y-coordinate (px)',
+        ],
+        ['0.0', '80.0', '85.0', '10.0', '30.0', '50.0', '30.0'],
+        ['1.0', '70.0', '75.0', '10.0', '30.0', '50.0', '30.0'],
+    ]
+
+    np.testing.assert_array_equal(
+        np.loadtxt(str(root_dir/'drop1'/'profile_extracted.csv'), delimiter=','),
+        [[10, 30], [30, 10], [50, 30]],
+    )
+    np.testing.assert_allclose(
+        np.loadtxt(str(root_dir/'drop2'/'tangents.csv'), delimiter=','),
+        [[-1, 40], [1, -20]],
+    )
+    np.testing.assert_allclose(np.loadtxt(str(root_dir/'drop1'/'surface.csv'), delimiter=','), [0, 30])
+
+
+def test_save_single_drop_has_no_figures(options, wait_for):
+    job = save_drops([FakeDrop(0.0, 80.0, 85.0)], options)
+
+    assert wait_for(job.wait(), 60) is ExportJob.Status.FINISHED, job.exception
+    assert read_layout(options.save_root_dir) == {
+        'timeline.csv',
+        'drop1/image_original.png',
+        'drop1/image_annotated.png',
+        'drop1/profile_extracted.csv',
+        'drop1/tangents.csv',
+        'drop1/surface.csv',
+    }
+
+
+def read_timeline(root_dir):
+    with (root_dir/'timeline.csv').open(newline='') as in_file:
+        return [row[:3] for row in csv.reader(in_file)][1:]
+
+
+def test_live_save_appends_rows_then_rewrites_in_order(options, wait_for):
+    drops = [
+        FakeDrop(0.0, 80.0, 85.0, is_done=False),
+        FakeDrop(1.0, 70.0, 75.0),
+        FakeDrop(2.0, 60.0, 65.0, is_done=False),
+    ]
+
+    job = save_drops(drops, options)
+    root_dir = options.save_root_dir
+
+    # Rows of drops that have finished are appended straight away.
+    assert read_timeline(root_dir) == [['1.0', '70.0', '75.0']]
+
+    drops[2].bn_is_done.set(True)
+    drops[0].bn_is_done.set(True)
+
+    assert wait_for(job.wait(), 60) is ExportJob.Status.FINISHED, job.exception
+
+    # Once every drop has been saved, the timeline is rewritten in order.
+    assert read_timeline(root_dir) == [
+        ['0.0', '80.0', '85.0'],
+        ['1.0', '70.0', '75.0'],
+        ['2.0', '60.0', '65.0'],
+    ]
+
+
+def test_resave_skips_unchanged_drops(options, wait_for):
+    drops = [
+        FakeDrop(0.0, 80.0, 85.0),
+        FakeDrop(1.0, 70.0, 75.0),
+    ]
+    record = SaveRecord()
+    root_dir = options.save_root_dir
+
+    assert wait_for(save_drops(drops, options, record).wait(), 60) is ExportJob.Status.FINISHED
+
+    (root_dir/'drop1'/'marker').touch()
+    (root_dir/'drop2'/'marker').touch()
+
+    drops[1].bn_left_angle.set(math.radians(50.0))
+
+    job = save_drops(drops, options, record)
+    assert wait_for(job.wait(), 60) is ExportJob.Status.FINISHED, job.exception
+
+    # The unchanged drop wasn't written again, the changed drop's directory was replaced.
+    assert (root_dir/'drop1'/'marker').exists()
+    assert not (root_dir/'drop2'/'marker').exists()
+    assert read_layout(root_dir) == BASELINE_LAYOUT | {'drop1/marker'}
+
+    assert read_timeline(root_dir) == [
+        ['0.0', '80.0', '85.0'],
+        ['1.0', '50.0', '75.0'],
+    ]
+
+
+def test_resave_with_new_record_rewrites_everything(options, wait_for):
+    drops = [
+        FakeDrop(0.0, 80.0, 85.0),
+        FakeDrop(1.0, 70.0, 75.0),
+    ]
+    root_dir = options.save_root_dir
+
+    assert wait_for(save_drops(drops, options, SaveRecord()).wait(), 60) is ExportJob.Status.FINISHED
+
+    (root_dir/'drop1'/'marker').touch()
+
+    assert wait_for(save_drops(drops, options, SaveRecord()).wait(), 60) is ExportJob.Status.FINISHED
+
+    assert read_layout(root_dir) == BASELINE_LAYOUT
@@ -0,0 +1,118 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+
+from opendrop.app.common.analysis_saver.export_job import ExportJob
+from opendrop.app.conan.services import session as session_module
+from opendrop.app.conan.services.session import ConanSession
+
+
+class FakeSaveDrops:
+    """Stands in for save_drops(), returns open jobs whose tasks are added by the test."""
+
+    def __init__(self, loop, executor):
+        self.loop = loop
+        self.executor = executor
+        self.record = None
+        self.job = None
+
+    def __call__(self, drops, options, record):
+        self.record = record
+        # Pretend drop 0 was written.
+        record.update(0, 'drop 0')
+        self.job = ExportJob((), num_tasks=1, executor=self.executor, keep_open=True, loop=self.loop)
+        return self.job
+
+
+@pytest.fixture
+def save_drops(monkeypatch, loop, executor):
+    save_drops = FakeSaveDrops(loop, executor)
+    monkeypatch.setattr(session_module, 'save_drops', save_drops)
+    return save_drops
+
+
+@pytest.fixture
+def session():
+    session = ConanSession(
+        image_acquisition=Mock(),
+        feature_extractor_params=Mock(),
+        feature_extractor_pool=Mock(),
+        conancalc_params=Mock(),
+        conancalc_batch=Mock(),
+    )
+    session._analyses = (Mock(),)
+    return session
+
+
+def test_finished_save_keeps_record(session, save_drops, wait_for):
+    session.save_analyses(Mock())
+    assert session.save_job is save_drops.job
+    assert not session.safe_to_discard()
+
+    save_drops.job.close()
+    assert wait_for(save_drops.job.wait()) is ExportJob.Status.FINISHED
+
+    assert session.analyses_saved
+    assert not save_drops.record.has_changed(0, 'drop 0')
+
+
+def test_cancelled_save_clears_record(loop, session, save_drops):
+    session.save_analyses(Mock())
+    session.cancel_save()
+
+    assert save_drops.job.bn_status.get() is ExportJob.Status.CANCELLED
+    assert not session.analyses_saved
+    assert save_drops.record.has_changed(0, 'drop 0')
+
+
+def test_failed_save_clears_record_and_is_reported(loop, session, save_drops, wait_for):
+    exception_handler = Mock()
+    loop.set_exception_handler(exception_handler)
+    save_failed = Mock()
+    session.connect('save-failed', save_failed)
+
+    error = OSError('disk full')
+
+    def fail():
+        raise error
+
+    session.save_analyses(Mock())
+    save_drops.job.add_tasks([fail])
+    assert wait_for(save_drops.job.wait()) is ExportJob.Status.FAILED
+
+    assert not session.analyses_saved
+    assert save_drops.record.has_changed(0, 'drop 0')
+
+    exception_handler.assert_called_once()
+    assert exception_handler.call_args[0][1]['exception'] is error
+    save_failed.assert_called_once_with(session, 'disk full')
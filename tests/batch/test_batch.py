@@ -0,0 +1,167 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import csv
+import shutil
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+
+from opendrop.batch import main
+from opendrop.batch.inputs import count_frames, expand_inputs, iter_frames
+from opendrop.utility.resultsarchive import ResultsArchive
+
+EXAMPLE_IMAGES_DIR = Path(__file__).resolve().parent.parent.parent/'example_images'
+
+
+@pytest.fixture
+def frames_dir(tmp_path):
+    rng = np.random.RandomState(0)
+
+    for i in (2, 0, 1):
+        cv2.imwrite(str(tmp_path/'image{}.png'.format(i)), rng.randint(0, 256, size=(20, 30, 3), dtype=np.uint8))
+
+    np.save(str(tmp_path/'stack.npy'), rng.randint(0, 256, size=(4, 20, 30), dtype=np.uint8))
+
+    return tmp_path
+
+
+def test_expand_inputs_sorts_matches(frames_dir):
+    paths = expand_inputs([str(frames_dir/'image*.png'), str(frames_dir/'stack.npy')])
+
+    assert [p.name for p in paths] == ['image0.png', 'image1.png', 'image2.png', 'stack.npy']
+
+
+def test_expand_inputs_with_no_matches(frames_dir):
+    with pytest.raises(ValueError):
+        expand_inputs([str(frames_dir/'*.jpg')])
+
+
+def test_iter_frames(frames_dir):
+    paths = [frames_dir/'image0.png', frames_dir/'stack.npy']
+
+    frames = list(iter_frames(paths, frame_interval=0.5))
+
+    assert count_frames(paths) == 5
+    assert [f.number for f in frames] == [0, 1, 2, 3, 4]
+    assert [f.index for f in frames] == [None, 0, 1, 2, 3]
+    assert [f.timestamp for f in frames] == [0.0, 0.5, 1.0, 1.5, 2.0]
+
+    for frame in frames:
+        assert frame.read().shape == (20, 30, 3)
+
+
+def test_conan(tmp_path):
+    shutil.copy(str(EXAMPLE_IMAGES_DIR/'drop_on_surface.png'), str(tmp_path/'drop0.png'))
+    shutil.copy(str(EXAMPLE_IMAGES_DIR/'drop_on_surface.png'), str(tmp_path/'drop1.png'))
+
+    config_path = tmp_path/'config.ini'
+    config_path.write_text(
+        '[conan]\n'
+        'drop_region = 100, 300, 620, 665\n'
+        'surface_line = 0, 668, 1160, 655  ; (x0, y0, x1, y1)\n'
+    )
+
+    returncode = main([
+        'conan',
+        '--config', str(config_path),
+        '--threshold', '30',
+        '--frame-interval', '2',
+        '--jobs', '1',
+        '--quiet',
+        '--output', str(tmp_path/'out'),
+        str(tmp_path/'drop*.png'),
+    ])
+
+    assert returncode == 0
+
+    with (tmp_path/'out'/'timeline.csv').open(newline='') as in_file:
+        rows = list(csv.reader(in_file))
+
+    assert len(rows) == 3
+    assert [row[0] for row in rows[1:]] == ['0.0', '2.0']
+    for row in rows[1:]:
+        left_angle, right_angle = float(row[1]), float(row[2])
+        assert 100 < left_angle < 140
+        assert 100 < right_angle < 140
+
+
+def test_ift(tmp_path, capsys):
+    shutil.copy(str(EXAMPLE_IMAGES_DIR/'water_in_air.png'), str(tmp_path/'drop0.png'))
+    shutil.copy(str(EXAMPLE_IMAGES_DIR/'water_in_air.png'), str(tmp_path/'drop1.png'))
+
+    config_path = tmp_path/'config.ini'
+    config_path.write_text(
+        '[ift]\n'
+        'drop_region = 290, 160, 730, 690\n'
+        'needle_region = 420, 0, 580, 140\n'
+        'drop_density = 1000\n'
+        'continuous_density = 0\n'
+        'needle_diameter = 0.0007176\n'
+        'gravity = 9.80035\n'
+    )
+
+    returncode = main([
+        'ift',
+        '--config', str(config_path),
+        '--frame-interval', '2',
+        '--jobs', '1',
+        '--no-cache',
+        '--quiet',
+        '--output', str(tmp_path/'out'),
+        str(tmp_path/'drop*.png'),
+    ])
+
+    assert returncode == 0
+    assert 'Analysed 2 frames (0 failed)' in capsys.readouterr().err
+
+    with (tmp_path/'out'/'timeline.csv').open(newline='') as in_file:
+        rows = list(csv.reader(in_file))
+
+    assert len(rows) == 3
+    assert [row[0] for row in rows[1:]] == ['0.0', '2.0']
+    for row in rows[1:]:
+        ift, volume = float(row[1]), float(row[2])
+        # Water in air.
+        assert ift == pytest.approx(0.072, abs=0.002)
+        assert volume > 0
+
+    archive = ResultsArchive(tmp_path/'out'/'results.npz')
+
+    assert archive.num_records == 2
+    assert archive.column('interfacial_tension') == pytest.approx([0.072]*2, abs=0.002)
+    assert archive.metadata['parameters']['drop_density'] == 1000
+    assert archive.metadata['parameters']['needle_diameter'] == 0.0007176
+
+
+def test_missing_drop_region(tmp_path):
+    with pytest.raises(SystemExit):
+        main(['ift', '-o', str(tmp_path/'out'), str(EXAMPLE_IMAGES_DIR/'water_in_air.png')])
@@ -0,0 +1,162 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import math
+
+import numpy as np
+import pytest
+
+from opendrop.processing.conan.contact_angle import ContactAngle, calculate_contact_angles, _cumulative_arclength, \
+    _subarc_end
+
+
+def spherical_cap(contact_angle, *, radius=400.0, tilt=0.0, offset=100.0, num_points=2000):
+    """Return the profile of a spherical cap with `contact_angle` (in radians) sitting on the surface y = tan(tilt)*x
+    + offset, and the surface."""
+    # Angle of the contact points from the centre of the sphere.
+    phi0 = math.pi/2 - contact_angle
+    phi = np.linspace(phi0, math.pi - phi0, num_points)
+
+    profile = np.stack([radius*np.cos(phi), radius*(np.sin(phi) - math.sin(phi0))], axis=1)
+
+    rot_mtx = np.array([[math.cos(tilt), -math.sin(tilt)],
+                        [math.sin(tilt),  math.cos(tilt)]])
+    profile = profile @ rot_mtx.T + [0, offset]
+
+    return profile, np.poly1d((math.tan(tilt), offset))
+
+
+@pytest.mark.parametrize('contact_angle', [30, 60, 90, 120])
+@pytest.mark.parametrize('tilt', [0.0, 0.2])
+def test_spherical_cap(contact_angle, tilt):
+    radius = 400.0
+    profile, surface = spherical_cap(math.radians(contact_angle), radius=radius, tilt=tilt)
+
+    result = ContactAngle(profile, surface)
+
+    # Tangents are fitted to a short section of the contour near each contact point, the curvature of the cap biases
+    # the angle by a few degrees.
+    assert math.degrees(result.left_angle) == pytest.approx(contact_angle, abs=4)
+    assert math.degrees(result.right_angle) == pytest.approx(contact_angle, abs=4)
+
+    half_width = radius * math.sin(math.radians(contact_angle))
+    expected_right = (half_width*math.cos(tilt), surface(half_width*math.cos(tilt)))
+    expected_left = (-half_width*math.cos(tilt), surface(-half_width*math.cos(tilt)))
+
+    assert tuple(result.right_point) == pytest.approx(expected_right, abs=3)
+    assert tuple(result.left_point) == pytest.approx(expected_left, abs=3)
+
+
+@pytest.mark.parametrize('contact_angle, tilt, expected', [
+    (30, 0.0, 28.725097012092903),
+    (60, 0.2, 58.287806713155724),
+    (90, 0.0, 86.6673654678358),
+    (90, 0.2, 86.90622104874694),
+    (120, 0.2, 117.32216533816191),
+])
+def test_spherical_cap_regression(contact_angle, tilt, expected):
+    # Angles given by the implementation before contours were measured by cumulative arc length.
+    profile, surface = spherical_cap(math.radians(contact_angle), tilt=tilt)
+
+    result = ContactAngle(profile, surface)
+
+    assert math.degrees(result.left_angle) == pytest.approx(expected, abs=1e-9)
+    assert math.degrees(result.right_angle) == pytest.approx(expected, abs=1e-9)
+
+
+def test_batched_matches_single():
+    surface = np.poly1d((0.1, 50.0))
+    profiles = [
+        spherical_cap(math.radians(contact_angle), radius=radius, tilt=math.atan(0.1), offset=50.0)[0]
+        for contact_angle, radius in [(45, 300.0), (100, 200.0), (75, 350.0)]
+    ]
+
+    batched = calculate_contact_angles(profiles, surface)
+
+    assert len(batched) == len(profiles)
+    for profile, result in zip(profiles, batched):
+        expected = ContactAngle(profile, surface)
+        assert result.left_angle == expected.left_angle
+        assert result.right_angle == expected.right_angle
+        assert tuple(result.left_point) == tuple(expected.left_point)
+        assert tuple(result.right_point) == tuple(expected.right_point)
+
+
+def test_batched_empty():
+    assert calculate_contact_angles([], np.poly1d((0.0, 0.0))) == []
+
+
+def test_profile_below_surface():
+    profile, surface = spherical_cap(math.radians(60))
+
+    result = ContactAngle(profile, surface + 1000)
+
+    assert math.isnan(result.left_angle)
+    assert math.isnan(result.right_angle)
+
+
+def test_cumulative_arclength():
+    curve = np.array([[0, 0], [3, 4], [3, 10], [0, 6]])
+    np.testing.assert_allclose(_cumulative_arclength(curve), [0, 5, 11, 16])
+
+
+@pytest.mark.parametrize('curve', [np.empty((0, 2)), np.array([[2, 3]])])
+def test_cumulative_arclength_short(curve):
+    np.testing.assert_array_equal(_cumulative_arclength(curve), np.zeros(len(curve)))
+
+
+@pytest.mark.parametrize('length, expected', [
+    (0, 2),
+    (5, 2),
+    (6, 3),
+    (11, 3),
+    (16, 4),
+    # Sub-arc longer than the whole curve.
+    (100, 4),
+])
+def test_subarc_end(length, expected):
+    arclength = np.array([0, 5, 11, 16], dtype=float)
+    assert _subarc_end(arclength, length) == expected
+
+
+@pytest.mark.parametrize('num_points', [0, 1])
+def test_subarc_end_short(num_points):
+    assert _subarc_end(np.zeros(num_points), 10) == num_points
+
+
+def test_sample_longer_than_contour():
+    # So few points that the sub-arc sampled near each contact point is clamped to the end of the half contour.
+    profile = np.array([[-100, 0], [-50, 50], [0, 100], [50, 50], [100, 0]])
+
+    result = ContactAngle(profile, np.poly1d((0.0, 0.0)))
+
+    assert math.degrees(result.left_angle) == pytest.approx(45)
+    assert math.degrees(result.right_angle) == pytest.approx(45)
+    assert tuple(result.left_point) == pytest.approx((-100, 0))
+    assert tuple(result.right_point) == pytest.approx((100, 0))
@@ -0,0 +1,113 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+HEADLESS_MODULES = (
+    'opendrop',
+    'opendrop.processing',
+    'opendrop.processing.ift',
+    'opendrop.processing.conan',
+    'opendrop.analysis',
+    'opendrop.analysis.cache',
+    'opendrop.analysis.ift',
+    'opendrop.analysis.conan',
+    'opendrop.analysis.export',
+    'opendrop.analysis.pipeline',
+    'opendrop.batch',
+    'opendrop.utility.diskcache',
+    'opendrop.utility.remote',
+)
+
+
+def run_isolated(code: str) -> subprocess.CompletedProcess:
+    # Block gi and cairo, so these tests fail even if GTK happens to be installed on the machine running them.
+    code = textwrap.dedent('''
+        import importlib.abc
+        import sys
+
+        class BlockGUI(importlib.abc.MetaPathFinder):
+            def find_spec(self, fullname, path, target=None):
+                if fullname.split('.')[0] in ('gi', 'cairo'):
+                    raise ImportError('{} imported by headless module'.format(fullname))
+
+        sys.meta_path.insert(0, BlockGUI())
+    ''') + textwrap.dedent(code)
+
+    return subprocess.run(
+        [sys.executable, '-c', code],
+        cwd=str(ROOT_DIR),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+
+
+@pytest.mark.parametrize('module', HEADLESS_MODULES)
+def test_import_without_gui(module):
+    result = run_isolated('''
+        import asyncio
+        import importlib
+
+        importlib.import_module({!r})
+
+        assert type(asyncio.get_event_loop_policy()) is asyncio.DefaultEventLoopPolicy
+    '''.format(module))
+
+    assert result.returncode == 0, result.stderr
+
+
+def test_analysis_functions_pickle_by_reference():
+    # Worker processes unpickle these, which must not pull in the GUI either.
+    result = run_isolated('''
+        import pickle
+        import sys
+
+        from opendrop.analysis import conan, ift
+
+        for fn in (ift.pendant_edge_detect, ift.young_laplace_fit, ift.pendant_derive_properties,
+                   conan.conan_foreground_detect, conan.conan_extract_drop_profile,
+                   conan.conan_calculate_contact_angles):
+            assert pickle.loads(pickle.dumps(fn)) is fn
+
+        params = ift.PendantEdgeDetectionParams(canny_min=30, canny_max=60, needle_region=None, drop_region=None)
+        assert pickle.loads(pickle.dumps(params)) == params
+
+        assert not any(name.startswith('opendrop.app') for name in sys.modules)
+    ''')
+
+    assert result.returncode == 0, result.stderr
@@ -31,7 +31,7 @@ from unittest.mock import Mock, patch
 
 import pytest
 
-from opendrop.utility.bindable import abc, VariableBindable, AccessorBindable
+from opendrop.utility.bindable import abc, VariableBindable, AccessorBindable, batch
 
 
 class TestBindable:
@@ -198,3 +198,16 @@ class StubBindable(abc.Bindable):
 
     def _set_value(self, new_value):
         pass
+
+
+def test_batch_notifies_once():
+    bindable = VariableBindable(0)
+    values = []
+    bindable.on_changed.connect(lambda: values.append(bindable.get()), weak_ref=False)
+
+    with batch():
+        bindable.set(1)
+        bindable.set(2)
+        assert bindable.get() == 2
+
+    assert values == [2]
@@ -320,3 +320,104 @@ class TestEvent:
         for i, cb in enumerate(cbs):
             self.event.disconnect_by_func(cb)
             assert self.event.num_connections == len(cbs) - i - 1
+
+
+class TestBatch:
+    def test_fire_deferred_until_batch_ends(self):
+        event = events.Event()
+        cb = Mock()
+        event.connect(cb)
+
+        with events.batch():
+            event.fire(1)
+            cb.assert_not_called()
+
+        cb.assert_called_once_with(1)
+
+    def test_fires_once_with_last_arguments(self):
+        event0, event1 = events.Event(), events.Event()
+        calls = []
+        event0.connect(lambda *args: calls.append((0, args)), weak_ref=False)
+        event1.connect(lambda *args: calls.append((1, args)), weak_ref=False)
+
+        with events.batch():
+            event0.fire('a')
+            event1.fire('b')
+            event0.fire('c')
+
+        assert calls == [(1, ('b',)), (0, ('c',))]
+
+    def test_nested_batches(self):
+        event = events.Event()
+        cb = Mock()
+        event.connect(cb)
+
+        with events.batch():
+            with events.batch():
+                event.fire()
+            cb.assert_not_called()
+
+        cb.assert_called_once_with()
+
+    def test_handlers_fire_immediately_after_batch(self):
+        event0, event1 = events.Event(), events.Event()
+        cb = Mock()
+        event0.connect(event1.fire, weak_ref=False)
+        event1.connect(cb)
+
+        with events.batch():
+            event0.fire(123)
+
+        cb.assert_called_once_with(123)
+
+    def test_handler_of_many_events_called_once(self):
+        event0, event1 = events.Event(), events.Event()
+        cb = Mock()
+        event0.connect(cb)
+        event1.connect(cb)
+
+        with events.batch():
+            event0.fire()
+            event1.fire()
+
+        cb.assert_called_once_with()
+
+    def test_handler_exception_does_not_stop_other_events(self):
+        event0, event1, event2 = events.Event(), events.Event(), events.Event()
+        error0, error1 = ValueError('first'), ValueError('second')
+        cb = Mock()
+
+        def raise_(error):
+            raise error
+
+        event0.connect(lambda: raise_(error0), weak_ref=False)
+        event1.connect(lambda: raise_(error1), weak_ref=False)
+        event2.connect(cb)
+
+        with pytest.raises(ValueError) as exc_info:
+            with events.batch():
+                event0.fire()
+                event1.fire()
+                event2.fire()
+
+        # Every event fires, then the first exception is raised.
+        assert exc_info.value is error0
+        cb.assert_called_once_with()
+
+    def test_block_exception_takes_precedence(self):
+        event0, event1 = events.Event(), events.Event()
+        cb = Mock()
+
+        def raise_():
+            raise ValueError('handler')
+
+        event0.connect(raise_, weak_ref=False)
+        event1.connect(cb)
+
+        with pytest.raises(KeyError):
+            with events.batch():
+                event0.fire()
+                event1.fire()
+                raise KeyError('block')
+
+        cb.assert_called_once_with()
@@ -0,0 +1,95 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import numpy as np
+from matplotlib.figure import Figure
+
+from opendrop.utility.decimate import DecimatedLine, decimate
+
+
+def test_small_series_unchanged():
+    x = np.arange(10.0)
+    y = x**2
+
+    x_dec, y_dec = decimate(x, y, num_buckets=100)
+
+    assert (x_dec == x).all()
+    assert (y_dec == y).all()
+
+
+def test_keeps_extremes_of_each_bucket():
+    rng = np.random.RandomState(0)
+    x = np.arange(100000.0)
+    y = rng.normal(size=len(x))
+
+    x_dec, y_dec = decimate(x, y, num_buckets=100)
+
+    assert len(x_dec) <= 4 * 100
+    assert (np.diff(x_dec) > 0).all()
+
+    # Every bucket keeps its first, last, minimum and maximum points.
+    for bucket in np.array_split(np.arange(len(x)), 100):
+        kept = np.isin(x[bucket], x_dec)
+        assert kept[0] and kept[-1]
+        assert x[bucket][np.argmin(y[bucket])] in x_dec
+        assert x[bucket][np.argmax(y[bucket])] in x_dec
+
+    assert y_dec.min() == y.min()
+    assert y_dec.max() == y.max()
+
+
+def test_x_range():
+    x = np.arange(100000.0)
+    y = np.sin(x)
+
+    x_dec, _ = decimate(x, y, num_buckets=10, x_range=(1000.0, 2000.0))
+
+    # Points outside the range are collapsed into one bucket either side.
+    assert len(x_dec[x_dec < 1000]) <= 4
+    assert len(x_dec[x_dec >= 2000]) <= 4
+    assert len(x_dec) <= 4 * 12
+
+
+def test_decimated_line_follows_xlim():
+    fig = Figure(figsize=(2, 1), dpi=100)
+    axes = fig.add_subplot(1, 1, 1)
+    line = DecimatedLine(axes.plot([], [])[0])
+
+    x = np.arange(100000.0)
+    line.set_data((x, np.sin(x)))
+    axes.set_xlim(0, 100000)
+    coarse = len(axes.lines[0].get_xdata())
+
+    axes.set_xlim(5000, 5100)
+    fine = axes.lines[0].get_xdata()
+
+    assert coarse < 1000
+    assert len(line.get_xdata()) == len(x)
+    assert fine.min() == 4999 and fine.max() == 5101
+    assert len(fine) == 103
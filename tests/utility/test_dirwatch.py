@@ -0,0 +1,85 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import threading
+
+import pytest
+
+from opendrop.utility.dirwatch import DirectoryWatcher
+
+
+@pytest.mark.parametrize('use_inotify', [True, False])
+def test_reports_new_files(tmp_path, use_inotify):
+    (tmp_path/'existing.png').write_bytes(b'0')
+
+    ready = []
+    all_ready = threading.Event()
+
+    def on_file_ready(path):
+        ready.append(path.name)
+        if len(ready) == 2:
+            all_ready.set()
+
+    watcher = DirectoryWatcher(tmp_path, on_file_ready, pattern='*.png', poll_interval=0.05, use_inotify=use_inotify)
+    watcher.start()
+    try:
+        (tmp_path/'a.png').write_bytes(b'1')
+        (tmp_path/'b.txt').write_bytes(b'2')
+        # Files moved into the directory after being written should also be picked up.
+        (tmp_path/'c.tmp').write_bytes(b'3')
+        (tmp_path/'c.tmp').rename(tmp_path/'c.png')
+
+        assert all_ready.wait(timeout=5)
+    finally:
+        watcher.stop()
+
+    assert ready == ['a.png', 'c.png']
+
+
+@pytest.mark.parametrize('use_inotify', [True, False])
+def test_stop_without_blocking(tmp_path, use_inotify):
+    ready = []
+
+    watcher = DirectoryWatcher(tmp_path, ready.append, poll_interval=0.05, use_inotify=use_inotify)
+    watcher.start()
+    watcher.stop(block=False)
+
+    (tmp_path/'a.png').write_bytes(b'1')
+
+    # Watcher thread should exit on its own without reporting the new file.
+    watcher._thread.join(timeout=5)
+    assert not watcher._thread.is_alive()
+    assert ready == []
+
+
+def test_start_on_missing_directory_raises(tmp_path):
+    watcher = DirectoryWatcher(tmp_path/'missing', lambda path: None)
+
+    with pytest.raises(ValueError):
+        watcher.start()
@@ -0,0 +1,110 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import os
+import pickle
+
+import numpy as np
+
+from opendrop.utility.diskcache import DiskCache, cache_key
+
+
+def test_cache_key():
+    a = np.arange(6, dtype=np.uint8)
+
+    assert cache_key('x', a) == cache_key('x', a.copy())
+    assert cache_key('x', a) != cache_key('x', a.reshape(2, 3))
+    assert cache_key('x', a) != cache_key('x', a.astype(np.int16))
+    assert cache_key('ab', 'c') != cache_key('a', 'bc')
+
+
+def test_get_and_put(tmp_path):
+    cache = DiskCache(tmp_path, max_size=2**20)
+
+    assert cache.get('0123') is None
+    assert cache.get('0123', 'default') == 'default'
+
+    cache.put('0123', {'a': np.arange(3)})
+
+    value = cache.get('0123')
+    assert (value['a'] == np.arange(3)).all()
+
+    # Entries persist.
+    assert DiskCache(tmp_path, max_size=2**20).get('0123') is not None
+
+
+def test_evicts_least_recently_used(tmp_path):
+    value = bytes(1000)
+    entry_size = len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    cache = DiskCache(tmp_path, max_size=3*entry_size)
+
+    for i, key in enumerate(['aa', 'bb', 'cc']):
+        cache.put(key, value)
+        os.utime(str(cache._path(key)), (i, i))
+
+    # Mark 'aa' as most recently used.
+    cache.get('aa')
+
+    cache.put('dd', value)
+
+    assert cache.get('aa') is not None
+    assert cache.get('bb') is None
+    assert cache.get('dd') is not None
+    assert cache.total_size <= cache.max_size
+
+
+def test_corrupt_entry_is_a_miss(tmp_path):
+    cache = DiskCache(tmp_path, max_size=2**20)
+
+    cache.put('0123', 1)
+    cache._path('0123').write_bytes(b'garbage')
+
+    assert cache.get('0123') is None
+    assert not cache._path('0123').exists()
+
+
+def test_clear(tmp_path):
+    cache = DiskCache(tmp_path, max_size=2**20)
+    cache.put('0123', 1)
+
+    cache.clear()
+
+    assert cache.get('0123') is None
+    assert cache.total_size == 0
+
+
+def test_unpickles_to_same_instance(tmp_path):
+    cache = DiskCache(tmp_path, max_size=2**20)
+
+    copy1 = pickle.loads(pickle.dumps(cache))
+    copy2 = pickle.loads(pickle.dumps(cache))
+
+    assert copy1 is copy2
+    assert copy1.directory == cache.directory
+    assert copy1.max_size == cache.max_size
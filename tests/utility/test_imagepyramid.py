@@ -0,0 +1,77 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import numpy as np
+import pytest
+
+from opendrop.utility.imagepyramid import ImagePyramid
+
+
+def test_levels_halve_until_min_size():
+    pyramid = ImagePyramid(np.zeros((1000, 1600, 3), np.uint8), min_size=100)
+
+    assert pyramid.num_levels == 4
+    assert pyramid.get_level(3).shape == (125, 200, 3)
+    assert pyramid.get_level_scale(3) == (8.0, 8.0)
+
+
+def test_level_zero_is_original():
+    image = np.zeros((10, 10, 3), np.uint8)
+    pyramid = ImagePyramid(image, min_size=1)
+
+    assert pyramid.get_level(0) is image
+
+
+def test_level_is_area_average():
+    image = np.array([[0, 100], [200, 100]], np.uint8)
+    pyramid = ImagePyramid(image, min_size=1)
+
+    np.testing.assert_array_equal(pyramid.get_level(1), [[100]])
+
+
+def test_level_from_broadcast_image():
+    mono = np.arange(16, dtype=np.uint8).reshape(4, 4)
+    image = np.broadcast_to(mono[..., np.newaxis], (4, 4, 3))
+    pyramid = ImagePyramid(image, min_size=1)
+
+    assert pyramid.get_level(1).shape == (2, 2, 3)
+
+
+@pytest.mark.parametrize('scale, expected', [
+    (2.0, 0),
+    (0.6, 0),
+    (0.5, 0),
+    (0.3, 1),
+    (0.25, 2),
+    (0.01, 3),
+])
+def test_level_for_scale(scale, expected):
+    pyramid = ImagePyramid(np.zeros((800, 800), np.uint8), min_size=100)
+
+    assert pyramid.level_for_scale(scale) == expected
@@ -0,0 +1,99 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import asyncio
+import threading
+
+import pytest
+
+from opendrop.utility.jobchannel import CoalescingJobChannel
+
+
+def test_latest_wins(loop, executor):
+    release = threading.Event()
+    calls = []
+
+    def job(x):
+        calls.append(x)
+        release.wait()
+        return x * 2
+
+    channel = CoalescingJobChannel(executor, loop=loop)
+
+    fut1 = channel.submit('key', job, 1)
+    fut2 = channel.submit('key', job, 2)
+    fut3 = channel.submit('key', job, 3)
+    release.set()
+
+    assert loop.run_until_complete(fut3) == 6
+    assert fut1.cancelled()
+    assert fut2.cancelled()
+    assert calls == [1, 3]
+
+
+def test_keys_are_independent(loop, executor):
+    channel = CoalescingJobChannel(executor, loop=loop)
+
+    fut1 = channel.submit('a', abs, -1)
+    fut2 = channel.submit('b', abs, -2)
+
+    assert loop.run_until_complete(asyncio.gather(fut1, fut2)) == [1, 2]
+
+
+def test_cancelled_pending_job_does_not_run(loop, executor):
+    release = threading.Event()
+    calls = []
+
+    def job(x):
+        calls.append(x)
+        release.wait()
+        return x
+
+    channel = CoalescingJobChannel(executor, loop=loop)
+
+    fut1 = channel.submit('key', job, 1)
+    fut2 = channel.submit('key', job, 2)
+    fut2.cancel()
+    release.set()
+
+    assert loop.run_until_complete(channel.submit('other', job, 3)) == 3
+    loop.run_until_complete(asyncio.sleep(0.1))
+
+    assert fut1.cancelled()
+    assert calls == [1, 3]
+
+
+def test_exception_is_propagated(loop, executor):
+    def job():
+        raise ValueError('bad')
+
+    channel = CoalescingJobChannel(executor, loop=loop)
+
+    with pytest.raises(ValueError):
+        loop.run_until_complete(channel.submit('key', job))
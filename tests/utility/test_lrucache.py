@@ -0,0 +1,88 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+from opendrop.utility.lrucache import LRUCache
+
+
+def test_evicts_least_recently_used():
+    evicted = []
+    cache = LRUCache(max_size=3, on_evict=lambda k, v: evicted.append(k))
+
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.put('c', 3)
+    cache.get('a')
+    cache.put('d', 4)
+
+    assert evicted == ['b']
+    assert 'a' in cache and 'c' in cache and 'd' in cache
+    assert len(cache) == 3
+
+
+def test_evicts_by_size():
+    cache = LRUCache(max_size=10)
+
+    cache.put('a', 1, size=4)
+    cache.put('b', 2, size=4)
+    cache.put('c', 3, size=4)
+
+    assert 'a' not in cache
+    assert cache.total_size == 8
+
+
+def test_keeps_oversized_entry():
+    cache = LRUCache(max_size=10)
+
+    cache.put('a', 1, size=4)
+    cache.put('b', 2, size=20)
+
+    assert list(cache.keys()) == ['b']
+
+
+def test_peek_does_not_affect_order():
+    cache = LRUCache(max_size=2)
+
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.peek('a') == 1
+    cache.put('c', 3)
+
+    assert 'a' not in cache
+
+
+def test_discard():
+    evicted = []
+    cache = LRUCache(max_size=2, on_evict=lambda k, v: evicted.append(k))
+
+    cache.put('a', 1, size=2)
+
+    assert cache.discard('a') == 1
+    assert cache.discard('a') is None
+    assert cache.total_size == 0
+    assert evicted == []
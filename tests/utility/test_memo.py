@@ -0,0 +1,73 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import numpy as np
+
+from opendrop.utility.memo import MemoizedStage
+
+
+def test_same_inputs_reuse_result():
+    calls = []
+    stage = MemoizedStage(lambda x, y: calls.append((x, y)) or x + y)
+
+    assert stage(1, 2) == 3
+    assert stage(1, 2) == 3
+    assert calls == [(1, 2)]
+
+    assert stage(1, 3) == 4
+    assert len(calls) == 2
+
+
+def test_arrays_compared_by_identity():
+    calls = []
+    stage = MemoizedStage(lambda a: calls.append(a) or a.sum())
+
+    a = np.arange(3)
+    stage(a)
+    stage(a)
+    assert len(calls) == 1
+
+    stage(a.copy())
+    assert len(calls) == 2
+
+
+def test_store_and_matches():
+    stage = MemoizedStage()
+
+    assert not stage.matches(1)
+
+    stage.store((1,), 'one')
+
+    assert stage.matches(1)
+    assert not stage.matches(2)
+    assert stage.value == 'one'
+
+    stage.clear()
+
+    assert not stage.matches(1)
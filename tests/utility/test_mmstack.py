@@ -0,0 +1,94 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import cv2
+import numpy as np
+import pytest
+
+from opendrop.utility.mmstack import ImageStack, frame_to_rgb8
+
+
+@pytest.fixture
+def mono8_frames():
+    rng = np.random.RandomState(0)
+    return [rng.randint(0, 256, size=(20, 30), dtype=np.uint8) for _ in range(5)]
+
+
+def test_open_uncompressed_tiff(tmp_path, mono8_frames):
+    path = tmp_path/'stack.tif'
+    cv2.imwritemulti(str(path), mono8_frames, [cv2.IMWRITE_TIFF_COMPRESSION, 1])
+
+    stack = ImageStack.open(path)
+
+    assert len(stack) == 5
+    assert stack.frame_size == (30, 20)
+    for frame, expected in zip(stack, mono8_frames):
+        np.testing.assert_array_equal(frame, expected)
+
+
+def test_open_compressed_tiff_raises(tmp_path, mono8_frames):
+    path = tmp_path/'stack.tif'
+    cv2.imwritemulti(str(path), mono8_frames, [cv2.IMWRITE_TIFF_COMPRESSION, 5])
+
+    with pytest.raises(ValueError):
+        ImageStack.open(path)
+
+
+def test_open_npy(tmp_path):
+    data = np.arange(3*4*5, dtype=np.uint16).reshape(3, 4, 5) << 8
+    path = tmp_path/'stack.npy'
+    np.save(str(path), data)
+
+    stack = ImageStack.open(path)
+
+    assert len(stack) == 3
+    assert stack.bit_depth == 16
+    np.testing.assert_array_equal(stack[1], data[1])
+    np.testing.assert_array_equal(stack.get_rgb8(1)[..., 0], data[1] >> 8)
+
+
+def test_rgb8_frames_range(tmp_path, mono8_frames):
+    path = tmp_path/'stack.tif'
+    cv2.imwritemulti(str(path), mono8_frames, [cv2.IMWRITE_TIFF_COMPRESSION, 1])
+
+    frames = ImageStack.open(path).rgb8_frames(1, None, 2)
+
+    assert len(frames) == 2
+    assert frames[0] is frames[0]
+    np.testing.assert_array_equal(frames[1][..., 2], mono8_frames[3])
+
+
+def test_frame_to_rgb8_mono8_is_view():
+    frame = np.zeros((4, 5), dtype=np.uint8)
+
+    image = frame_to_rgb8(frame)
+    frame[1, 2] = 7
+
+    assert image.shape == (4, 5, 3)
+    assert (image[1, 2] == 7).all()
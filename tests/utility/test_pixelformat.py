@@ -0,0 +1,78 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import numpy as np
+import pytest
+
+from opendrop.utility.pixelformat import PixelFormatConverter, UnsupportedPixelFormat, SUPPORTED_PIXEL_FORMATS
+
+
+@pytest.mark.parametrize('data_format', SUPPORTED_PIXEL_FORMATS)
+def test_convert_output_shape(data_format):
+    width, height = 8, 6
+    channels = 3 if data_format.startswith(('RGB', 'BGR')) else 1
+    dtype = np.uint8 if data_format.endswith('8') else np.uint16
+    data = np.zeros((height, width*channels), dtype=dtype)
+
+    image = PixelFormatConverter().convert(data_format, data, width, height)
+
+    assert image.shape == (height, width, 3)
+    assert image.dtype == np.uint8
+
+
+def test_convert_mono12():
+    data = np.array([[0, 16, 4095, 2048]], dtype=np.uint16)
+
+    image = PixelFormatConverter().convert('Mono12', data, width=4, height=1)
+
+    np.testing.assert_array_equal(image[..., 0], [[0, 1, 255, 128]])
+    np.testing.assert_array_equal(image[..., 0], image[..., 2])
+
+
+def test_convert_bgr10_swaps_channels():
+    data = np.array([[4, 512, 1020]], dtype=np.uint16)
+
+    image = PixelFormatConverter().convert('BGR10', data, width=1, height=1)
+
+    np.testing.assert_array_equal(image, [[[255, 128, 1]]])
+
+
+def test_convert_padded_rows():
+    # Rows of 3 pixels, padded to 4.
+    buf = np.arange(8, dtype=np.uint8).reshape(2, 4)
+    data = buf[:, :3]
+
+    image = PixelFormatConverter().convert('Mono8', data, width=3, height=2)
+
+    np.testing.assert_array_equal(image[..., 1], [[0, 1, 2], [4, 5, 6]])
+
+
+def test_convert_unsupported_format():
+    with pytest.raises(UnsupportedPixelFormat):
+        PixelFormatConverter().convert('YUV422_8', np.zeros((1, 2), np.uint8), width=1, height=1)
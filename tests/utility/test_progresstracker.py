@@ -0,0 +1,90 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import math
+
+from opendrop.utility.progresstracker import ProgressTracker
+
+
+def test_counts():
+    tracker = ProgressTracker()
+
+    tracker.update('a', is_done=False, is_cancelled=False)
+    tracker.update('b', is_done=True, is_cancelled=False)
+    tracker.update('c', is_done=True, is_cancelled=True)
+
+    assert len(tracker) == 3
+    assert tracker.num_done == 2
+    assert tracker.num_cancelled == 1
+    assert tracker.num_finished == 1
+
+    tracker.update('a', is_done=True, is_cancelled=False)
+    tracker.discard('c')
+    tracker.discard('c')
+
+    assert len(tracker) == 2
+    assert tracker.num_done == 2
+    assert tracker.num_cancelled == 0
+    assert tracker.num_finished == 2
+
+
+def test_times():
+    tracker = ProgressTracker()
+    assert tracker.time_start is None
+    assert tracker.time_est_complete is None
+
+    tracker.update('a', is_done=False, is_cancelled=False, time_start=10.0, time_est_complete=20.0)
+    tracker.update('b', is_done=False, is_cancelled=False, time_start=5.0, time_est_complete=30.0)
+    tracker.update('c', is_done=False, is_cancelled=False, time_start=math.nan, time_est_complete=math.nan)
+
+    assert tracker.time_start == 5.0
+    assert tracker.time_est_complete == 30.0
+
+    tracker.update('b', is_done=False, is_cancelled=False, time_start=15.0, time_est_complete=25.0)
+    assert tracker.time_start == 10.0
+    assert tracker.time_est_complete == 25.0
+
+    tracker.discard('b')
+    assert tracker.time_start == 10.0
+    assert tracker.time_est_complete == 20.0
+
+    tracker.clear()
+    assert tracker.time_start is None
+    assert tracker.time_est_complete is None
+
+
+def test_many_updates_match_brute_force():
+    tracker = ProgressTracker()
+    est = {}
+
+    for i in range(10000):
+        key = i % 7
+        est[key] = float((i * 37) % 101)
+        tracker.update(key, is_done=False, is_cancelled=False, time_est_complete=est[key])
+        assert tracker.time_est_complete == max(est.values())
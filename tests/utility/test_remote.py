@@ -0,0 +1,191 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import operator
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from opendrop.analysis import Pipeline
+from opendrop.utility.remote import RemoteExecutor, WorkerLost, WorkerServer, _decode, _encode, format_address
+
+AUTHKEY = b'secret'
+
+
+def slow_identity(x, delay):
+    time.sleep(delay)
+    return x
+
+
+def mean(image, timestamp):
+    return float(image.mean())
+
+
+class Worker:
+    def __init__(self, **options) -> None:
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        self.server = WorkerServer(('127.0.0.1', 0), AUTHKEY, jobs=2, executor=self.executor, **options)
+        self.address = format_address(self.server.address)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.thread.join()
+        self.executor.shutdown(wait=False)
+
+
+@pytest.fixture
+def workers():
+    workers = [Worker(), Worker()]
+    yield workers
+    for worker in workers:
+        worker.stop()
+
+
+def payload(parts):
+    return memoryview(bytearray(b''.join(bytes(part) for part in parts)))
+
+
+def test_encode_decode():
+    image = np.arange(24, dtype=np.uint8).reshape(2, 3, 4)
+    value = {'image': image, 'column': image[:, 1], 'empty': np.zeros((0, 2)), 'x': 1.5}
+
+    decoded = _decode(payload(_encode(value)))
+
+    assert (decoded['image'] == image).all()
+    assert (decoded['column'] == image[:, 1]).all()
+    assert decoded['empty'].shape == (0, 2)
+    assert decoded['x'] == 1.5
+
+    # Arrays are sent raw, not pickled.
+    assert len(payload(_encode(image))) < image.nbytes + 200
+    # and are writable once received.
+    decoded['image'][0, 0, 0] = 5
+
+
+def test_runs_jobs_on_workers(workers):
+    executor = RemoteExecutor([worker.address for worker in workers], AUTHKEY, fallback=False)
+    try:
+        assert executor.wait_for_workers(timeout=5) == 2
+        assert executor.capacity == 4
+
+        futures = [executor.submit(operator.mul, i, 2) for i in range(20)]
+        assert [fut.result(timeout=5) for fut in futures] == [2*i for i in range(20)]
+
+        with pytest.raises(ZeroDivisionError):
+            executor.submit(operator.truediv, 1, 0).result(timeout=5)
+    finally:
+        executor.shutdown()
+
+
+def test_pipeline(workers):
+    frames = [np.full((4, 4), i, dtype=np.uint8) for i in range(10)]
+
+    with RemoteExecutor([worker.address for worker in workers], AUTHKEY, fallback=False) as executor:
+        pipeline = Pipeline(mean, executor=executor, jobs=4)
+        results = list(pipeline.run(frames))
+
+    assert [r.value for r in results] == list(range(10))
+
+
+def test_wrong_key(workers):
+    messages = []
+    executor = RemoteExecutor([workers[0].address], b'wrong', fallback=False, on_message=messages.append)
+    try:
+        assert executor.wait_for_workers(timeout=5) == 0
+        assert 'Authentication failed' in messages[0]
+    finally:
+        executor.shutdown()
+
+
+def test_requeues_jobs_of_lost_worker(workers):
+    executor = RemoteExecutor([worker.address for worker in workers], AUTHKEY, fallback=False)
+    try:
+        executor.wait_for_workers(timeout=5)
+
+        futures = [executor.submit(slow_identity, i, 0.2) for i in range(8)]
+        time.sleep(0.1)
+        workers[0].stop()
+
+        assert [fut.result(timeout=10) for fut in futures] == list(range(8))
+    finally:
+        executor.shutdown()
+
+
+def test_gives_up_on_job_after_max_attempts(workers):
+    executor = RemoteExecutor([workers[0].address], AUTHKEY, fallback=False, max_attempts=1)
+    try:
+        executor.wait_for_workers(timeout=5)
+
+        fut = executor.submit(slow_identity, 1, 1.0)
+        time.sleep(0.1)
+        workers[0].stop()
+
+        with pytest.raises(WorkerLost):
+            fut.result(timeout=5)
+    finally:
+        executor.shutdown(wait=False)
+
+
+def test_heartbeats():
+    worker = Worker(heartbeat_interval=0.1)
+    silent_worker = Worker(heartbeat_interval=60)
+
+    executor = RemoteExecutor([worker.address], AUTHKEY, fallback=False, heartbeat_timeout=0.5, max_attempts=1)
+    silent_executor = RemoteExecutor(
+        [silent_worker.address], AUTHKEY, fallback=False, heartbeat_timeout=0.5, max_attempts=1
+    )
+    try:
+        fut = executor.submit(slow_identity, 1, 1.0)
+        silent_fut = silent_executor.submit(slow_identity, 1, 1.0)
+
+        # Heartbeats keep the connection alive while a job runs for longer than the timeout.
+        assert fut.result(timeout=5) == 1
+
+        with pytest.raises(WorkerLost):
+            silent_fut.result(timeout=5)
+    finally:
+        executor.shutdown(wait=False)
+        silent_executor.shutdown(wait=False)
+        worker.stop()
+        silent_worker.stop()
+
+
+def test_local_fallback():
+    # Nothing listens on port 1.
+    executor = RemoteExecutor(['127.0.0.1:1'], AUTHKEY, reconnect_interval=60)
+    try:
+        assert executor.wait_for_workers(timeout=5) == 0
+        assert executor.submit(operator.mul, 3, 2).result(timeout=30) == 6
+    finally:
+        executor.shutdown()
@@ -0,0 +1,116 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import zipfile
+
+import numpy as np
+import pytest
+
+from opendrop.utility.resultsarchive import ResultsArchive, write_results_archive
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path/'results.npz'
+    profiles = [np.arange(10).reshape(5, 2), None, np.arange(6).reshape(3, 2)]
+
+    write_results_archive(
+        path,
+        columns={'time': [0.0, 1.0, 2.0], 'region': [(0, 0, 1, 1)]*3},
+        ragged={'profile': profiles},
+        metadata={'software': 'test'},
+    )
+
+    archive = ResultsArchive(path)
+
+    assert archive.num_records == 3
+    assert archive.column_names == ('time', 'region')
+    assert archive.ragged_names == ('profile',)
+    assert archive.metadata == {'software': 'test'}
+
+    assert (archive.column('time') == [0.0, 1.0, 2.0]).all()
+    assert archive.column('region').shape == (3, 4)
+
+    ragged = archive.ragged('profile')
+    assert len(ragged) == 3
+    assert (ragged[0] == profiles[0]).all()
+    assert ragged[1].shape == (0, 2)
+    assert (ragged[-1] == profiles[2]).all()
+    assert (ragged.offsets == [0, 5, 5, 8]).all()
+
+
+def test_arrays_are_memory_mapped(tmp_path):
+    path = tmp_path/'results.npz'
+    write_results_archive(path, columns={'x': np.arange(2.0)}, ragged={'y': [np.ones(3), np.zeros(2)]})
+
+    archive = ResultsArchive(path)
+
+    assert isinstance(archive.column('x'), np.memmap)
+    assert isinstance(archive.ragged('y').data, np.memmap)
+    assert not archive.column('x').flags.writeable
+
+
+def test_readable_with_numpy_load(tmp_path):
+    path = tmp_path/'results.npz'
+    write_results_archive(path, columns={'x': [1, 2, 3]}, ragged={'y': [np.ones(3), np.zeros(2), None]})
+
+    with np.load(str(path)) as npz:
+        assert (npz['columns/x'] == [1, 2, 3]).all()
+        assert (npz['ragged/y/data'] == [1, 1, 1, 0, 0]).all()
+        assert (npz['ragged/y/offsets'] == [0, 3, 5, 5]).all()
+
+
+def test_empty_ragged(tmp_path):
+    path = tmp_path/'results.npz'
+    write_results_archive(path, columns={}, ragged={'y': [None, None]})
+
+    archive = ResultsArchive(path)
+
+    assert archive.num_records == 2
+    assert len(archive.ragged('y')[0]) == 0
+
+
+def test_mismatched_lengths(tmp_path):
+    with pytest.raises(ValueError):
+        write_results_archive(tmp_path/'results.npz', columns={'x': [1, 2]}, ragged={'y': [None]})
+
+
+def test_not_a_results_archive(tmp_path):
+    path = tmp_path/'other.npz'
+    np.savez(str(path), x=np.arange(3))
+
+    with pytest.raises(ValueError):
+        ResultsArchive(path)
+
+
+def test_unknown_name(tmp_path):
+    path = tmp_path/'results.npz'
+    write_results_archive(path, columns={'x': [1]})
+
+    with pytest.raises(KeyError):
+        ResultsArchive(path).column('y')
@@ -0,0 +1,121 @@
+# Copyright © 2020, Joseph Berry, Rico Tabor (opendrop.dev@gmail.com)
+# OpenDrop is released under the GNU GPL License. You are free to
+# modify and distribute the code, but always under the same license
+# (i.e. you cannot make commercial derivatives).
+#
+# If you use this software in your research, please cite the following
+# journal articles:
+#
+# J. D. Berry, M. J. Neeson, R. R. Dagastine, D. Y. C. Chan and
+# R. F. Tabor, Measurement of surface and interfacial tension using
+# pendant drop tensiometry. Journal of Colloid and Interface Science 454
+# (2015) 226–237. https://doi.org/10.1016/j.jcis.2015.05.012
+#
+# E. Huang, T. Denning, A. Skoufis, J. Qi, R. R. Dagastine, R. F. Tabor
+# and J. D. Berry, OpenDrop: Open-source software for pendant drop
+# tensiometry & contact angle measurements, submitted to the Journal of
+# Open Source Software
+#
+# These citations help us not only to understand who is using and
+# developing OpenDrop, and for what purpose, but also to justify
+# continued development of this code and other open source resources.
+#
+# OpenDrop is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.  You
+# should have received a copy of the GNU General Public License along
+# with this software.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import math
+
+import numpy as np
+
+from opendrop.utility.timeseries import TimeSeries
+
+
+def test_keeps_points_sorted():
+    series = TimeSeries()
+
+    series.set('c', 3.0, 30.0)
+    series.set('a', 1.0, 10.0)
+    series.set('d', 4.0, 40.0)
+    series.set('b', 2.0, 20.0)
+
+    t, y = series.data()
+    assert list(t) == [1.0, 2.0, 3.0, 4.0]
+    assert list(y) == [10.0, 20.0, 30.0, 40.0]
+
+
+def test_update_value():
+    series = TimeSeries()
+    series.set('a', 1.0, 10.0)
+    series.set('b', 2.0, 20.0)
+
+    assert series.set('a', 1.0, 11.0)
+    assert not series.set('a', 1.0, 11.0)
+
+    assert list(series.data()[1]) == [11.0, 20.0]
+
+
+def test_update_time():
+    series = TimeSeries()
+    series.set('a', 1.0, 10.0)
+    series.set('b', 2.0, 20.0)
+
+    series.set('a', 3.0, 10.0)
+
+    t, y = series.data()
+    assert list(t) == [2.0, 3.0]
+    assert list(y) == [20.0, 10.0]
+
+
+def test_non_finite_removes_point():
+    series = TimeSeries()
+    series.set('a', 1.0, 10.0)
+    series.set('b', 2.0, 20.0)
+
+    assert series.set('a', 1.0, math.nan)
+    assert not series.set('c', 3.0, None)
+
+    assert 'a' not in series
+    assert list(series.data()[0]) == [2.0]
+
+
+def test_equal_times():
+    series = TimeSeries()
+    series.set('a', 1.0, 10.0)
+    series.set('b', 1.0, 20.0)
+    series.set('c', 1.0, 30.0)
+
+    series.discard('b')
+    series.set('c', 1.0, 31.0)
+
+    assert list(series.data()[1]) == [10.0, 31.0]
+
+
+def test_many_points():
+    rng = np.random.RandomState(0)
+    times = rng.permutation(1000).astype(float)
+
+    series = TimeSeries()
+    for i, t in enumerate(times):
+        series.set(i, t, 2*t)
+    for i in range(0, 1000, 2):
+        series.discard(i)
+
+    t, y = series.data()
+    assert len(series) == 500
+    assert (np.diff(t) > 0).all()
+    assert (y == 2*t).all()
+    assert set(t) == set(times[1::2])
+
+
+def test_data_is_a_copy():
+    series = TimeSeries()
+    series.set('a', 1.0, 10.0)
+
+    t, y = series.data()
+    series.set('a', 1.0, 11.0)
+
+    assert y[0] == 10.0